@@ -5,15 +5,18 @@ Handles stock identification and symbol search operations through Interactive Br
 
 from fastapi import APIRouter, Depends, HTTPException, Body
 from typing import Optional
+import asyncio
 import logging
 
 from backend.app.core.dependencies import get_ibkr_search_service
+from backend.app.core.exceptions import IBKRConnectionError
 from backend.app.services.interfaces import IIBKRSearchService
 from backend.app.models.schemas import (
     UniverseSearchResponse,
     IBKRSearchStats,
     StockSearchRequest,
-    StockSearchResponse
+    StockSearchResponse,
+    IBKRContractDetails
 )
 
 logger = logging.getLogger(__name__)
@@ -43,9 +46,10 @@ router = APIRouter(prefix="/ibkr", tags=["IBKR Search"])
     - Reads from: data/universe.json
     - Creates: data/universe_with_ibkr.json
 
-    **Sequential Processing:**
-    The implementation processes stocks sequentially (no concurrency) with 0.5s delays
-    between searches to maintain identical behavior with the legacy system.
+    **Concurrent Processing:**
+    Uncached stocks are searched concurrently over one shared IBKR connection, paced to
+    stay inside IBKR's message-rate limits. Results are merged in universe order, so the
+    output matches the legacy sequential run.
 
     **Search Statistics:**
     Returns detailed statistics showing:
@@ -133,11 +137,17 @@ async def search_universe_stocks(
     - Currency matching is mandatory
     - Name similarity scoring with different thresholds per search method
     - Corporate suffix filtering for better matching
+
+    **Caching:**
+    Results are served from the IBKR search cache (in-memory layer, then
+    data/ibkr_cache.db) when available, so repeat lookups do not touch disk or
+    the gateway. Set `force_refresh` to discard the cached entry and search IBKR again.
     """
 )
 async def search_individual_stock(
     stock_request: StockSearchRequest = Body(..., description="Stock details to search"),
     verbose: bool = Body(False, description="Enable debug output"),
+    force_refresh: bool = Body(False, description="Ignore cached results and search IBKR again"),
     ibkr_service: IIBKRSearchService = Depends(get_ibkr_search_service)
 ) -> StockSearchResponse:
     """
@@ -148,15 +158,44 @@ async def search_individual_stock(
     logger.info(f"Searching individual stock: {stock_request.ticker}")
 
     try:
-        # This would require a modified service method for individual stock search
-        # For now, we'll indicate this is not implemented in the current service
-        raise HTTPException(
-            status_code=501,
-            detail="Individual stock search not yet implemented. Use /search-universe for complete processing."
+        stock = stock_request.dict()
+        loop = asyncio.get_event_loop()
+        details = await loop.run_in_executor(None, ibkr_service.search_stock, stock, force_refresh)
+
+        source = "cache" if details.get('cached') else "IBKR"
+        if not details.get('found'):
+            return StockSearchResponse(
+                success=True,
+                found=False,
+                message=f"{stock_request.ticker} not found in IBKR (source: {source})",
+                stock=stock_request
+            )
+
+        ibkr_details = IBKRContractDetails(
+            symbol=details.get('symbol', ''),
+            longName=details.get('longName', ''),
+            currency=details.get('currency') or stock_request.currency,
+            exchange=details.get('exchange', ''),
+            primaryExchange=details.get('primaryExchange', ''),
+            conId=details.get('conId', details.get('contract_id', 0)) or 0,
+            search_method=details.get('search_method') or 'unknown',
+            match_score=details.get('match_score', 0.0)
         )
 
-    except HTTPException:
-        raise
+        return StockSearchResponse(
+            success=True,
+            found=True,
+            message=f"Found {ibkr_details.symbol} on {ibkr_details.exchange} (source: {source})",
+            stock=stock_request,
+            ibkr_details=ibkr_details
+        )
+
+    except IBKRConnectionError as e:
+        logger.error(f"Individual stock search could not reach IBKR: {e.message}")
+        raise HTTPException(
+            status_code=503,
+            detail=f"Stock not cached and IBKR Gateway unavailable: {e.message}"
+        )
     except Exception as e:
         logger.error(f"Individual stock search failed: {str(e)}")
         raise HTTPException(
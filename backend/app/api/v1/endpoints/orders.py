@@ -4,14 +4,15 @@ Implements REST API for portfolio rebalancing and order generation
 Following fintech best practices for trading system APIs
 """
 
-from fastapi import APIRouter, HTTPException, Depends, status
+from fastapi import APIRouter, HTTPException, Depends, Query, status
 from fastapi.responses import JSONResponse
 from typing import Dict, Any, List, Optional
+import asyncio
 import logging
 import os
 import json
 import time
-from ....core.dependencies import get_rebalancing_service, get_order_execution_service, get_order_status_service
+from ....core.dependencies import get_rebalancing_service, get_order_execution_service, get_order_status_service, get_order_tracker
 from ....services.interfaces import IOrderStatusService
 from ....core.exceptions import ValidationError
 from ....models.schemas import (
@@ -225,7 +226,7 @@ async def get_target_quantities(
 async def execute_orders(
     orders_file: Optional[str] = None,
     max_orders: Optional[int] = None,
-    delay_between_orders: float = 1.0,
+    delay_between_orders: Optional[float] = None,
     order_type: str = "GTC_MKT",
     order_execution_service = Depends(get_order_execution_service)
 ):
@@ -361,4 +362,59 @@ async def check_order_status(
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error checking order status: {str(e)}"
-        )
\ No newline at end of file
+        )
+
+
+@router.get(
+    "/tracked",
+    summary="Tracked Orders",
+    description="Orders and their fill progress from the streaming order tracker, answered from memory"
+)
+async def get_tracked_orders(
+    status_filter: Optional[str] = Query(None, alias="status", description="Only orders in this IBKR status"),
+    symbol: Optional[str] = None,
+    open_only: bool = False,
+    tracker = Depends(get_order_tracker)
+):
+    """
+    List the orders followed by the order tracker, most recently updated first.
+
+    Each order carries its fills in the order they were received, with the
+    cumulative filled quantity after each one. The first call after startup
+    (or after a dropped IBKR connection) syncs with the gateway; if it cannot
+    be reached the persisted state is returned with `synced` false.
+    """
+    try:
+        await asyncio.to_thread(tracker.start)
+        orders = tracker.list_orders(status=status_filter, symbol=symbol, open_only=open_only)
+        return {
+            "tracker": tracker.get_status(),
+            "total_orders": len(orders),
+            "orders": orders
+        }
+    except Exception as e:
+        logger.error(f"Error reading tracked orders: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error reading tracked orders: {str(e)}"
+        )
+
+
+@router.get(
+    "/tracked/{order_id}",
+    summary="Tracked Order",
+    description="One order and its fill progress by IBKR orderId (or permId)"
+)
+async def get_tracked_order(
+    order_id: int,
+    tracker = Depends(get_order_tracker)
+):
+    """Get a tracked order with its fills; order_id may be the orderId or the permId"""
+    await asyncio.to_thread(tracker.start)
+    order = tracker.get_order(order_id=order_id) or tracker.get_order(perm_id=order_id)
+    if order is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Order {order_id} is not tracked"
+        )
+    return order
@@ -4,9 +4,11 @@ Implements complete REST API for 11-step fintech pipeline execution
 Following fintech best practices with 100% CLI compatibility
 """
 
-from fastapi import APIRouter, HTTPException, Depends, status, BackgroundTasks
-from fastapi.responses import JSONResponse
-from typing import Dict, Any, Optional
+from fastapi import APIRouter, HTTPException, Depends, Header, Query, status, BackgroundTasks
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, StreamingResponse
+from typing import AsyncIterator, Dict, Any, Optional
+import json
 import logging
 
 from ....core.dependencies import get_pipeline_orchestrator_service
@@ -25,6 +27,7 @@ from ....models.schemas import (
     IndividualStepResponse,
     StepRangeResponse,
     ResumeExecutionResponse,
+    CancelExecutionResponse,
     AvailableStepsResponse,
     PipelineHistoryResponse,
     PipelineExecutionLogs,
@@ -39,27 +42,23 @@ logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/pipeline", tags=["Pipeline Orchestration"])
 
 
-# Background task storage for async execution tracking
-_background_executions = {}
-
-
 async def execute_pipeline_in_background(
     orchestrator_service,
     execution_id: str,
     execution_type: str,
     **kwargs
 ):
-    """Execute pipeline in background and store results"""
+    """Execute pipeline in background; results are kept by the orchestrator's execution store"""
     try:
         if execution_type == "full_pipeline":
-            result = await orchestrator_service.run_full_pipeline(execution_id)
+            result = await orchestrator_service.run_full_pipeline(execution_id, force=kwargs.get("force", False))
         elif execution_type == "individual_step":
             result = await orchestrator_service.run_individual_step(
                 kwargs["step_number"], execution_id
             )
         elif execution_type == "step_range":
             result = await orchestrator_service.run_step_range(
-                kwargs["start_step"], kwargs["end_step"], execution_id
+                kwargs["start_step"], kwargs["end_step"], execution_id, force=kwargs.get("force", False)
             )
         elif execution_type == "resume":
             result = await orchestrator_service.resume_failed_pipeline(
@@ -68,16 +67,9 @@ async def execute_pipeline_in_background(
         else:
             result = {"success": False, "error_message": f"Unknown execution type: {execution_type}"}
 
-        _background_executions[execution_id] = result
         logger.info(f"Background execution {execution_id} completed: {result.get('success', False)}")
 
     except Exception as e:
-        error_result = {
-            "execution_id": execution_id,
-            "success": False,
-            "error_message": f"Background execution failed: {str(e)}"
-        }
-        _background_executions[execution_id] = error_result
         logger.error(f"Background execution {execution_id} failed: {e}")
 
 
@@ -133,6 +125,8 @@ async def run_full_pipeline(
     - Real-time status tracking via status endpoint
     - Fail-fast behavior: stops on first step failure
     - Complete file ecosystem creation matching CLI
+    - Steps 2-8 are skipped when their inputs are unchanged since their last
+      successful run (set `force` to re-run them)
 
     **Created Files:**
     - CSV files in data/files_exports/
@@ -162,7 +156,8 @@ async def run_full_pipeline(
             execute_pipeline_in_background,
             orchestrator_service,
             request.execution_id,
-            "full_pipeline"
+            "full_pipeline",
+            force=request.force
         )
 
         logger.info(f"Full pipeline execution queued: {request.execution_id}")
@@ -381,7 +376,8 @@ async def run_step_range(
             result = await orchestrator_service.run_step_range(
                 request.start_step,
                 request.end_step,
-                request.execution_id
+                request.execution_id,
+                force=request.force
             )
             logger.info(f"Step range {start_step}-{end_step} execution completed: {result['success']}")
             return result
@@ -393,7 +389,8 @@ async def run_step_range(
                 request.execution_id,
                 "step_range",
                 start_step=request.start_step,
-                end_step=request.end_step
+                end_step=request.end_step,
+                force=request.force
             )
 
             return {
@@ -531,6 +528,9 @@ async def get_execution_status(
 async def get_execution_logs(
     execution_id: str,
     step_number: Optional[int] = None,
+    level: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=10000),
+    offset: int = Query(0, ge=0),
     orchestrator_service = Depends(get_pipeline_orchestrator_service)
 ):
     """
@@ -545,6 +545,8 @@ async def get_execution_logs(
     **Parameters:**
     - `step_number`: Optional filter to get logs for specific step only
     - If not specified, returns all logs grouped by step
+    - `level`: Optional log level filter
+    - `limit` / `offset`: Page through long logs; `total_log_entries` counts all matching entries
 
     **Log Levels:**
     - `INFO`: General information about pipeline progress
@@ -560,7 +562,9 @@ async def get_execution_logs(
     try:
         logger.info(f"Getting execution logs for: {execution_id}")
 
-        logs_info = await orchestrator_service.get_execution_logs(execution_id, step_number)
+        logs_info = await orchestrator_service.get_execution_logs(
+            execution_id, step_number, level=level, limit=limit, offset=offset
+        )
 
         return logs_info
 
@@ -572,6 +576,91 @@ async def get_execution_logs(
         )
 
 
+def _sse_message(event: Dict[str, Any]) -> str:
+    """Server-sent event for a pipeline event; log events carry the next offset as their id"""
+    if event["event"] == "heartbeat":
+        return ": heartbeat\n\n"
+    lines = []
+    if event["offset"] is not None:
+        lines.append(f"id: {event['offset'] + 1}")
+    lines.append(f"event: {event['event']}")
+    lines.append(f"data: {json.dumps(jsonable_encoder(event['data']))}")
+    return "\n".join(lines) + "\n\n"
+
+
+@router.get(
+    "/runs/{execution_id}/events",
+    summary="Stream Execution Events",
+    description="Server-sent events with the live status, step progress and logs of a pipeline run",
+    response_class=StreamingResponse,
+    responses={
+        200: {
+            "description": "Event stream",
+            "content": {
+                "text/event-stream": {
+                    "example": (
+                        "event: status\n"
+                        'data: {"execution_id": "550e8400-e29b-41d4-a716-446655440000", "status": "running", '
+                        '"current_step": 2, "progress_percentage": 9.1}\n\n'
+                        "id: 8\n"
+                        "event: log\n"
+                        'data: {"step_number": 2, "level": "INFO", "message": "Starting Parse Data"}\n\n'
+                    )
+                }
+            }
+        },
+        404: {
+            "description": "Execution not found",
+            "model": ErrorResponse
+        }
+    }
+)
+async def stream_execution_events(
+    execution_id: str,
+    offset: int = Query(0, ge=0),
+    last_event_id: Optional[str] = Header(None),
+    orchestrator_service = Depends(get_pipeline_orchestrator_service)
+):
+    """
+    Push progress of a pipeline run instead of polling status and logs
+
+    The stream starts with a `status` event and the run's log entries from
+    `offset` on, then sends events as they happen until the run finishes:
+
+    - `status`: status, current and running steps, completed steps, progress
+    - `step_start` / `step_complete`: a step started or finished
+    - `log`: a log entry (including step console output); its `id` is the
+      offset of the next entry
+
+    To resume after a disconnect, reconnect with `offset` (or the standard
+    `Last-Event-ID` header) set to the last received id. A comment line is
+    sent while the run is idle to keep the connection open. For a finished
+    run the stream replays its logs and final status, then closes.
+    """
+    status_info = await orchestrator_service.get_execution_status(execution_id)
+    if status_info["status"] == "not_found":
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Execution {execution_id} not found"
+        )
+    if last_event_id and last_event_id.isdigit():
+        offset = max(offset, int(last_event_id))
+
+    async def messages() -> AsyncIterator[str]:
+        try:
+            async for event in orchestrator_service.stream_execution_events(execution_id, offset):
+                yield _sse_message(event)
+        except Exception as e:
+            logger.error(f"Error streaming events for {execution_id}: {e}")
+            yield f"event: error\ndata: {json.dumps({'detail': 'Internal server error streaming events'})}\n\n"
+
+    return StreamingResponse(
+        messages(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
 @router.get(
     "/runs/{execution_id}/results",
     response_model=PipelineExecutionFiles,
@@ -752,6 +841,45 @@ async def resume_failed_execution(
         )
 
 
+@router.post(
+    "/runs/{execution_id}/cancel",
+    response_model=CancelExecutionResponse,
+    summary="Cancel Execution",
+    description="Stop a running full pipeline or step range",
+    responses={
+        404: {
+            "description": "Execution not running",
+            "model": ErrorResponse
+        }
+    }
+)
+async def cancel_execution(
+    execution_id: str,
+    orchestrator_service = Depends(get_pipeline_orchestrator_service)
+):
+    """
+    Stop a running full pipeline or step range
+
+    Running steps are cancelled and reported as failed, no further step
+    starts and the execution ends with status `cancelled`. A blocking step
+    already running in a worker thread cannot be interrupted: it finishes in
+    the background, and steps writing the same files are refused until then.
+    """
+    try:
+        result = await orchestrator_service.cancel_execution(execution_id)
+    except Exception as e:
+        logger.error(f"Error cancelling execution {execution_id}: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal server error cancelling execution"
+        )
+
+    if not result["success"]:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=result["message"])
+    logger.info(f"Cancellation requested for execution {execution_id}")
+    return result
+
+
 @router.get(
     "/history",
     response_model=PipelineHistoryResponse,
@@ -790,6 +918,7 @@ async def resume_failed_execution(
 async def get_pipeline_history(
     limit: int = 50,
     status_filter: Optional[str] = None,
+    offset: int = Query(0, ge=0),
     orchestrator_service = Depends(get_pipeline_orchestrator_service)
 ):
     """
@@ -797,8 +926,9 @@ async def get_pipeline_history(
 
     Provides paginated history of pipeline executions with optional filtering:
     - Recent executions first (sorted by start_time descending)
-    - Configurable limit (default 50, max 1000)
+    - Configurable limit (default 50, max 1000) and offset for further pages
     - Optional status filtering
+    - Kept across restarts, within the configured retention limits
 
     **Status Filter Values:**
     - `completed`: Successfully completed executions
@@ -820,7 +950,7 @@ async def get_pipeline_history(
     - Audit trail maintenance
     """
     try:
-        logger.info(f"Getting pipeline history (limit: {limit}, filter: {status_filter})")
+        logger.info(f"Getting pipeline history (limit: {limit}, offset: {offset}, filter: {status_filter})")
 
         # Validate limit
         if limit < 1 or limit > 1000:
@@ -829,7 +959,7 @@ async def get_pipeline_history(
                 detail="Limit must be between 1 and 1000"
             )
 
-        history = await orchestrator_service.get_pipeline_history(limit, status_filter)
+        history = await orchestrator_service.get_pipeline_history(limit, status_filter, offset)
 
         logger.info(f"Retrieved {len(history['executions'])} executions from history")
 
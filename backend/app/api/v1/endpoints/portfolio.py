@@ -4,12 +4,16 @@ Implements REST API for portfolio optimization functionality
 Following fintech best practices for financial data APIs
 """
 
-from fastapi import APIRouter, HTTPException, Depends, status
+from fastapi import APIRouter, HTTPException, Depends, Query, status
 from fastapi.responses import JSONResponse
-from typing import Dict, Any
+from typing import Dict, Any, Optional
+import asyncio
 import logging
 from ....core.dependencies import get_portfolio_optimizer_service, get_quantity_orchestrator_service
 from ....core.exceptions import ValidationError
+from ....services.bootstrap_engine import DEFAULT_CONFIDENCE, DEFAULT_SAMPLES, MAX_SAMPLES
+from ....services.frontier_engine import DEFAULT_FRONTIER_POINTS, MAX_FRONTIER_POINTS
+from ....services.universe_cache import get_universe_cache
 from ....models.schemas import (
     PortfolioOptimizationResponse,
     QuarterlyReturnsResponse
@@ -300,6 +304,241 @@ async def get_quarterly_returns(
         )
 
 
+@router.get(
+    "/allocation-methods",
+    response_model=Dict[str, Any],
+    summary="Compare Allocation Methods",
+    description="Max-Sharpe, minimum-variance, risk-parity, inverse-volatility and equal weights plus the efficient frontier",
+    responses={
+        200: {
+            "description": "Allocation methods computed",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "screeners": ["screener_1", "screener_2"],
+                        "methods": {
+                            "risk_parity": {
+                                "weights": {"screener_1": 0.42, "screener_2": 0.58},
+                                "risk_contributions": {"screener_1": 0.5, "screener_2": 0.5},
+                                "expected_annual_return": 0.11,
+                                "annual_volatility": 0.12,
+                                "sharpe_ratio": 0.75
+                            }
+                        },
+                        "efficient_frontier": [
+                            {
+                                "expected_annual_return": 0.09,
+                                "annual_volatility": 0.10,
+                                "sharpe_ratio": 0.7,
+                                "weights": {"screener_1": 0.3, "screener_2": 0.7}
+                            }
+                        ]
+                    }
+                }
+            }
+        },
+        404: {
+            "description": "Universe data or historical performance not found",
+            "model": ErrorResponse
+        },
+        422: {
+            "description": "Invalid historical data format",
+            "model": ErrorResponse
+        }
+    }
+)
+async def get_allocation_methods(
+    frontier_points: int = Query(
+        DEFAULT_FRONTIER_POINTS, ge=2, le=MAX_FRONTIER_POINTS, description="Number of efficient frontier points"
+    ),
+    portfolio_service=Depends(get_portfolio_optimizer_service)
+):
+    """
+    Compare inter-screener allocation methods without re-running step 4
+
+    All methods are solved in one pass over the same quarterly returns, which
+    are parsed once per universe.json version. universe.json is not modified;
+    step 4 (POST /optimize) still stores the max-Sharpe allocation.
+
+    **Methods:**
+    - max_sharpe: same solve as step 4
+    - min_variance: long-only global minimum variance
+    - risk_parity: equal risk contribution, using the full covariance matrix
+    - inverse_volatility: weights proportional to 1 / volatility
+    - equal_weight: 1 / number of screeners
+    """
+    try:
+        logger.info(f"Computing allocation methods with {frontier_points} frontier points")
+
+        snapshot = get_universe_cache().get(portfolio_service.universe_path)
+        if snapshot is None:
+            raise FileNotFoundError(portfolio_service.universe_path)
+
+        returns_df = snapshot.quarterly_returns
+        if returns_df.empty:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="No quarterly returns found - run historical data parsing first"
+            )
+
+        # CPU-bound (frontier_points solves); keep the event loop responsive
+        loop = asyncio.get_running_loop()
+        results = await loop.run_in_executor(
+            None,
+            lambda: portfolio_service.calculate_allocation_methods(returns_df, frontier_points=frontier_points)
+        )
+
+        logger.info(f"Allocation methods computed for {len(returns_df.columns)} screeners")
+        return results
+
+    except HTTPException:
+        raise
+    except FileNotFoundError as e:
+        logger.error(f"Universe file not found: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Universe data not found - run data fetching and parsing steps first"
+        )
+    except KeyError as e:
+        logger.error(f"Historical performance data not found: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Historical performance data not found - run historical data parsing first"
+        )
+    except ValidationError as e:
+        logger.error(f"Validation error computing allocation methods: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Invalid data for optimization: {str(e)}"
+        )
+    except Exception as e:
+        logger.error(f"Error computing allocation methods: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal server error computing allocation methods"
+        )
+
+
+@router.get(
+    "/robustness",
+    response_model=Dict[str, Any],
+    summary="Bootstrap Weight Robustness",
+    description="Re-optimise the max-Sharpe weights on bootstrapped quarterly returns and report their spread",
+    responses={
+        200: {
+            "description": "Bootstrap analysis complete",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "samples": 2000,
+                        "successful_samples": 2000,
+                        "confidence": 0.9,
+                        "block_size": 1,
+                        "point_estimate": {"screener_1": 0.78, "screener_2": 0.22},
+                        "resampled_allocation": {"screener_1": 0.64, "screener_2": 0.36},
+                        "weights": {
+                            "screener_1": {
+                                "point_estimate": 0.78,
+                                "mean": 0.64,
+                                "std": 0.38,
+                                "median": 0.78,
+                                "ci_lower": 0.0,
+                                "ci_upper": 1.0,
+                                "zero_weight_share": 0.13
+                            }
+                        },
+                        "full_sample_sharpe": {
+                            "point_estimate": 0.71,
+                            "resampled_allocation": 0.70,
+                            "median": 0.71,
+                            "ci_lower": 0.60,
+                            "ci_upper": 0.71
+                        }
+                    }
+                }
+            }
+        },
+        404: {
+            "description": "Universe data or historical performance not found",
+            "model": ErrorResponse
+        },
+        422: {
+            "description": "Invalid historical data format",
+            "model": ErrorResponse
+        }
+    }
+)
+async def get_weight_robustness(
+    samples: int = Query(DEFAULT_SAMPLES, ge=10, le=MAX_SAMPLES, description="Number of bootstrap samples"),
+    confidence: float = Query(DEFAULT_CONFIDENCE, gt=0, lt=1, description="Confidence interval width"),
+    block_size: int = Query(1, ge=1, le=8, description="Consecutive quarters drawn together"),
+    seed: Optional[int] = Query(None, description="Random seed for reproducible results"),
+    portfolio_service=Depends(get_portfolio_optimizer_service)
+):
+    """
+    Measure how stable the step 4 screener weights are
+
+    Quarters are resampled with replacement (in blocks when block_size > 1)
+    and the Sharpe ratio is re-optimised on every sample, spread over all
+    CPU cores. Wide intervals or a high zero_weight_share mean the step 4
+    allocation for that screener is mostly estimation noise; the
+    resampled_allocation is the usual more stable alternative.
+    universe.json is not modified.
+    """
+    try:
+        logger.info(f"Bootstrapping portfolio weights with {samples} samples")
+
+        snapshot = get_universe_cache().get(portfolio_service.universe_path)
+        if snapshot is None:
+            raise FileNotFoundError(portfolio_service.universe_path)
+
+        returns_df = snapshot.quarterly_returns
+        if returns_df.empty:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="No quarterly returns found - run historical data parsing first"
+            )
+
+        # CPU-bound; keep the event loop responsive while the pool works
+        loop = asyncio.get_running_loop()
+        results = await loop.run_in_executor(
+            None,
+            lambda: portfolio_service.bootstrap_portfolio_weights(
+                returns_df, n_samples=samples, confidence=confidence, block_size=block_size, seed=seed
+            )
+        )
+
+        logger.info(f"Bootstrap complete: {results['successful_samples']}/{samples} samples optimised")
+        return results
+
+    except HTTPException:
+        raise
+    except FileNotFoundError as e:
+        logger.error(f"Universe file not found: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Universe data not found - run data fetching and parsing steps first"
+        )
+    except KeyError as e:
+        logger.error(f"Historical performance data not found: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Historical performance data not found - run historical data parsing first"
+        )
+    except ValidationError as e:
+        logger.error(f"Validation error during bootstrap: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Invalid data for optimization: {str(e)}"
+        )
+    except Exception as e:
+        logger.error(f"Error bootstrapping portfolio weights: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal server error during bootstrap analysis"
+        )
+
+
 # Add health check endpoint for portfolio optimization service
 @router.get(
     "/health",
@@ -699,15 +938,14 @@ async def get_quantities_data(
         universe_service = orchestrator_service.quantity_service
         universe_path = universe_service.universe_path
 
-        if not universe_path.exists():
+        # Parsed once per universe.json version; coverage counts are precomputed per version
+        snapshot = get_universe_cache().get(universe_path)
+        if snapshot is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Universe data not found - run data parsing first"
             )
-
-        import json
-        with open(universe_path, 'r', encoding='utf-8') as f:
-            universe_data = json.load(f)
+        universe_data = snapshot.data
 
         # Check for account value data
         if "account_total_value" not in universe_data:
@@ -717,39 +955,10 @@ async def get_quantities_data(
             )
 
         account_value_info = universe_data["account_total_value"]
-
-        # Count stocks with quantities
-        stocks_with_quantities = 0
-        total_stocks = 0
-        sample_stocks = []
-
-        # Process screens
-        for screen_name, screen_data in universe_data.get("screens", {}).items():
-            if isinstance(screen_data, dict) and "stocks" in screen_data:
-                for stock in screen_data["stocks"]:
-                    if isinstance(stock, dict):
-                        total_stocks += 1
-                        if "quantity" in stock:
-                            stocks_with_quantities += 1
-                            # Add to sample (first 5 stocks with quantities)
-                            if len(sample_stocks) < 5:
-                                sample_stocks.append({
-                                    "ticker": stock.get("ticker", "Unknown"),
-                                    "screen": screen_name,
-                                    "eur_price": stock.get("eur_price", 0),
-                                    "target_value_eur": stock.get("target_value_eur", 0),
-                                    "quantity": stock.get("quantity", 0),
-                                    "final_target": stock.get("final_target", 0),
-                                    "currency": stock.get("currency", "Unknown"),
-                                    "allocation_note": stock.get("allocation_note")
-                                })
-
-        # Process all_stocks if present
-        for ticker, stock in universe_data.get("all_stocks", {}).items():
-            if isinstance(stock, dict):
-                total_stocks += 1
-                if "quantity" in stock:
-                    stocks_with_quantities += 1
+        summary = snapshot.quantity_summary
+        stocks_with_quantities = summary["stocks_with_quantities"]
+        total_stocks = summary["total_stocks"]
+        sample_stocks = summary["sample_stocks"]
 
         response_data = {
             "account_total_value": account_value_info,
@@ -146,7 +146,7 @@ async def get_allocation_summary(
         logger.info("Retrieving allocation summary")
 
         # Load universe and calculate allocations
-        universe_data = service.load_universe_data()
+        universe_data = service.load_universe_data(read_only=True)
         final_allocations = service.calculate_final_allocations(universe_data)
 
         if not final_allocations:
@@ -240,7 +240,7 @@ async def get_screener_allocations(
         logger.info("Retrieving screener allocations")
 
         # Load universe data
-        universe_data = service.load_universe_data()
+        universe_data = service.load_universe_data(read_only=True)
 
         # Extract screener allocations
         screener_allocations = service.extract_screener_allocations(universe_data)
@@ -315,7 +315,7 @@ async def get_screener_rankings(
         logger.info(f"Retrieving rankings for screener: {screener_id}")
 
         # Load universe data
-        universe_data = service.load_universe_data()
+        universe_data = service.load_universe_data(read_only=True)
 
         # Find the screener
         screener_data = None
@@ -411,7 +411,7 @@ async def get_current_target_allocations(
         logger.info("Retrieving current target allocations from universe")
 
         # Load universe data
-        universe_data = service.load_universe_data()
+        universe_data = service.load_universe_data(read_only=True)
 
         # Check if we have allocation data in the universe
         allocation_data = {}
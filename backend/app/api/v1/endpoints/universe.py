@@ -2,10 +2,13 @@
 Universe API endpoints
 Handles universe data parsing, retrieval, and field operations
 """
+import base64
+import json
 import time
+from itertools import islice
 from fastapi import APIRouter, HTTPException, Depends, Path, Query
-from fastapi.responses import JSONResponse
-from typing import Optional
+from fastapi.responses import JSONResponse, StreamingResponse
+from typing import List, Optional
 
 from ....core.dependencies import get_universe_service
 from ....models.schemas import (
@@ -21,6 +24,32 @@ from ....core.exceptions import ValidationError, ConfigurationError
 
 router = APIRouter(prefix="/universe", tags=["universe"])
 
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+
+def _encode_cursor(offset: int) -> str:
+    return base64.urlsafe_b64encode(json.dumps({"offset": offset}).encode()).decode()
+
+
+def _decode_cursor(cursor: Optional[str]) -> int:
+    if not cursor:
+        return 0
+    try:
+        offset = json.loads(base64.urlsafe_b64decode(cursor.encode()))["offset"]
+        if not isinstance(offset, int) or offset < 0:
+            raise ValueError(offset)
+        return offset
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def _split_csv(value: Optional[str]) -> Optional[List[str]]:
+    if value is None:
+        return None
+    items = [item.strip() for item in value.split(",") if item.strip()]
+    return items or None
+
 
 @router.post("/parse", response_model=ParseUniverseResponse)
 async def parse_universe(
@@ -224,6 +253,89 @@ async def get_universe_metadata(
         )
 
 
+@router.get("/stocks")
+async def list_universe_stocks(
+    universe_path: str = Query(
+        default="data/universe.json",
+        description="Path to the universe.json file"
+    ),
+    screens: Optional[str] = Query(
+        default=None,
+        description="Comma-separated screen keys or names to filter by"
+    ),
+    fields: Optional[str] = Query(
+        default=None,
+        description="Comma-separated stock fields to return, e.g. 'ticker,price,quantity'"
+    ),
+    cursor: Optional[str] = Query(
+        default=None,
+        description="Opaque cursor from a previous page's next_cursor"
+    ),
+    limit: Optional[int] = Query(
+        default=None,
+        ge=1,
+        le=MAX_PAGE_SIZE,
+        description=f"Page size (default {DEFAULT_PAGE_SIZE} for JSON, unlimited for NDJSON)"
+    ),
+    response_format: str = Query(
+        default="json",
+        alias="format",
+        pattern="^(json|ndjson)$",
+        description="'json' for a paginated page, 'ndjson' to stream one stock per line"
+    ),
+    universe_service: IUniverseRepository = Depends(get_universe_service)
+):
+    """
+    List universe stocks with pagination, field projection and screen filters
+
+    Stocks are produced lazily from the cached universe, so clients can pull
+    only the stocks and fields they need. In NDJSON mode a truncated stream
+    ends with a {"next_cursor": ...} line.
+    """
+    offset = _decode_cursor(cursor)
+    screen_filter = _split_csv(screens)
+    field_list = _split_csv(fields)
+
+    try:
+        universe = universe_service.load_universe(universe_path)
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to load universe: {str(e)}"
+        )
+
+    if universe is None:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Universe file not found at {universe_path}"
+        )
+
+    stocks = islice(universe_service.iter_stocks(universe, screen_filter, field_list), offset, None)
+
+    if response_format == "ndjson":
+        def stream():
+            sent = 0
+            for stock in stocks:
+                if limit is not None and sent == limit:
+                    yield json.dumps({"next_cursor": _encode_cursor(offset + sent)}) + "\n"
+                    return
+                yield json.dumps(stock, ensure_ascii=False) + "\n"
+                sent += 1
+
+        return StreamingResponse(stream(), media_type="application/x-ndjson")
+
+    page_size = limit or DEFAULT_PAGE_SIZE
+    page = list(islice(stocks, page_size + 1))
+    has_more = len(page) > page_size
+    page = page[:page_size]
+
+    return {
+        "stocks": page,
+        "returned_count": len(page),
+        "next_cursor": _encode_cursor(offset + page_size) if has_more else None
+    }
+
+
 @router.get("/stocks/{ticker}")
 async def get_stock_by_ticker(
     ticker: str = Path(..., description="Stock ticker symbol"),
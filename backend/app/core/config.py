@@ -19,6 +19,11 @@ class UncleStockSettings(BaseServiceSettings):
     user_id: Optional[str] = None
     uncle_stock_timeout: int = 60
     retry_attempts: int = 3
+    # Base delay of the jittered exponential backoff between retries (seconds)
+    retry_backoff: float = 1.0
+    # Requests in flight at once, and pooled keep-alive connections to unclestock.com
+    max_concurrent_requests: int = 6
+    connections_per_host: int = 6
     max_results_per_screener: int = 200
 
     # Screener configurations matching legacy config.py
@@ -51,6 +56,15 @@ class IBKRSettings(BaseServiceSettings):
     ibkr_port: int = 4002
     ibkr_client_id: int = 1
     connection_timeout: int = 10
+    # Stocks searched concurrently over the shared data session during Step 8
+    search_concurrency: int = 8
+    # Step 10 order submissions per second, and how long to wait for their acknowledgements (seconds)
+    orders_per_second: float = 20.0
+    order_ack_timeout: float = 10.0
+    # Step 11 order tracker: time allowed for its one-time sync of orders and executions (seconds),
+    # and days that finished orders and their fills are kept in data/order_tracker.db
+    order_sync_timeout: float = 15.0
+    order_history_days: int = 30
 
     class Config:
         env_prefix = "IBKR_"
@@ -60,6 +74,8 @@ class PortfolioSettings(BaseServiceSettings):
     max_allocation: float = 0.10
     min_allocation: float = 0.01
     risk_free_rate: float = 0.02
+    # Minimum tradable lot per currency, applied when rounding step 7 quantities
+    lot_sizes: Dict[str, int] = {"JPY": 100}
 
     class Config:
         env_prefix = "PORTFOLIO_"
@@ -74,6 +90,25 @@ class TelegramSettings(BaseServiceSettings):
         env_prefix = "TELEGRAM_"
         env_file = str(Path(__file__).parent.parent / ".env")
 
+class PipelineSettings(BaseServiceSettings):
+    # Execution history kept in data/pipeline_executions.db
+    history_max_executions: int = 500
+    history_retention_days: int = 90
+    # Log entries of a running execution kept in memory (all are persisted)
+    live_log_capacity: int = 2000
+    # Console lines of a step kept in its result (all are streamed to the log)
+    console_tail_lines: int = 200
+    # Live event streams: heartbeat interval (seconds) and events a client may fall behind
+    event_heartbeat: float = 15.0
+    event_queue_size: int = 1000
+    # Worker threads for blocking steps, and how long a step may run (seconds)
+    step_workers: int = 4
+    step_timeout: float = 3600.0
+    step_timeouts: Dict[int, float] = {}
+
+    class Config:
+        env_prefix = "PIPELINE_"
+
 class Settings(BaseServiceSettings):
     """Main application settings"""
     # File paths
@@ -85,6 +120,7 @@ class Settings(BaseServiceSettings):
     ibkr: IBKRSettings = IBKRSettings()
     portfolio: PortfolioSettings = PortfolioSettings()
     telegram: TelegramSettings = TelegramSettings()
+    pipeline: PipelineSettings = PipelineSettings()
 
     class Config:
         extra = "ignore"
@@ -29,6 +29,8 @@ from ..services.implementations.currency_service import CurrencyService
 from ..services.implementations.ibkr_search_service import IBKRSearchService
 from ..services.implementations.historical_data_service import HistoricalDataService
 from ..services.implementations.telegram_service import TelegramService
+from ..services import order_tracker
+from ..services.order_tracker import OrderTracker
 
 @lru_cache()
 def get_settings() -> Settings:
@@ -71,6 +73,12 @@ def get_uncle_stock_provider() -> UncleStockProvider:
     return _uncle_stock_provider
 
 
+async def close_uncle_stock_provider() -> None:
+    """Close the Uncle Stock provider's pooled session, if one was created"""
+    if _uncle_stock_provider is not None:
+        await _uncle_stock_provider.close()
+
+
 def get_screener_service() -> IScreenerService:
     """Get screener service instance"""
     global _screener_service
@@ -130,6 +138,11 @@ def get_order_status_service() -> IOrderStatusService:
     return _order_status_service
 
 
+def get_order_tracker() -> OrderTracker:
+    """Get the shared streaming order tracker"""
+    return order_tracker.get_order_tracker()
+
+
 def get_rebalancing_service() -> IRebalancingService:
     """Get rebalancing service instance"""
     global _rebalancing_service
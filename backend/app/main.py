@@ -54,6 +54,18 @@ app.include_router(pipeline_router, prefix="/api/v1")
 app.include_router(ibkr_search_router, prefix="/api/v1")
 app.include_router(currency_router, prefix="/api/v1")
 
+# Release pooled outbound connections
+@app.on_event("shutdown")
+async def close_http_sessions():
+    from .core.dependencies import close_uncle_stock_provider
+    await close_uncle_stock_provider()
+
+# Drop queued pipeline steps so worker threads do not hold up shutdown
+@app.on_event("shutdown")
+async def stop_pipeline_workers():
+    from .services.pipeline_workers import shutdown_pipeline_worker_pool
+    shutdown_pipeline_worker_pool()
+
 # Exception handlers
 @app.exception_handler(BaseServiceError)
 async def service_error_handler(request, exc: BaseServiceError):
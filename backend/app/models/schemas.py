@@ -757,9 +757,9 @@ class OrderExecutionRequest(BaseModel):
         description="Limit execution to first N orders (None for all)",
         ge=1
     )
-    delay_between_orders: float = Field(
-        default=1.0,
-        description="Delay in seconds between order submissions",
+    delay_between_orders: Optional[float] = Field(
+        default=None,
+        description="Minimum seconds between order submissions (None for the configured order rate)",
         ge=0.1,
         le=10.0
     )
@@ -836,6 +836,10 @@ class OrderExecutionSummary(BaseModel):
     successful_submissions: int = Field(description="Successfully submitted orders", ge=0)
     failed_submissions: int = Field(description="Failed order submissions", ge=0)
     success_rate: float = Field(description="Success rate (0.0-1.0)", ge=0.0, le=1.0)
+    acknowledged_orders: Optional[int] = Field(default=None, description="Orders acknowledged by the gateway", ge=0)
+    submission_seconds: Optional[float] = Field(default=None, description="Time taken to submit every order")
+    median_ack_latency_ms: Optional[float] = Field(default=None, description="Median order acknowledgement latency")
+    max_ack_latency_ms: Optional[float] = Field(default=None, description="Slowest order acknowledgement")
 
 
 class OrderStatusResponse(BaseModel):
@@ -1201,6 +1205,10 @@ class PipelineExecutionStatus(str, Enum):
     NOT_FOUND = "not_found"
 
 
+# The status model below reuses the enum's name; this alias keeps the enum importable
+PipelineExecutionStatusEnum = PipelineExecutionStatus
+
+
 class PipelineStepStatus(str, Enum):
     """Individual step execution status"""
     PENDING = "pending"
@@ -1216,9 +1224,11 @@ class PipelineStepInfo(BaseModel):
     step_name: str = Field(description="Human-readable step name")
     description: str = Field(description="Step description")
     aliases: List[str] = Field(description="CLI aliases for this step")
-    dependencies: List[int] = Field(description="Step numbers this step depends on")
+    dependencies: List[int] = Field(description="Step numbers this step depends on", default_factory=list)
     creates_files: List[str] = Field(description="Files this step creates")
     modifies_files: List[str] = Field(description="Files this step modifies")
+    inputs: List[str] = Field(description="Artifacts this step reads", default_factory=list)
+    outputs: List[str] = Field(description="Artifacts this step produces", default_factory=list)
 
 
 class AvailableStepsResponse(BaseModel):
@@ -1248,6 +1258,7 @@ class PipelineStepResult(BaseModel):
     console_output: List[str] = Field(description="Console output lines from step", default_factory=list)
     error_message: Optional[str] = Field(description="Error message if step failed", default=None)
     error_traceback: Optional[str] = Field(description="Error traceback if step failed", default=None)
+    fingerprint: Optional[str] = Field(description="Input fingerprint (steps that can be skipped when unchanged)", default=None)
 
 
 class PipelineLogEntry(BaseModel):
@@ -1274,6 +1285,7 @@ class PipelineExecutionMetadata(BaseModel):
     start_step: Optional[int] = Field(description="Start step for range execution", default=None)
     end_step: Optional[int] = Field(description="End step for range execution", default=None)
     single_step: Optional[int] = Field(description="Single step for individual execution", default=None)
+    force: bool = Field(description="Whether steps with unchanged inputs were re-run", default=False)
 
     # Resume functionality
     is_resumed: bool = Field(description="Whether this is a resumed execution", default=False)
@@ -1287,6 +1299,7 @@ class PipelineExecutionStatus(BaseModel):
     status: PipelineExecutionStatus = Field(description="Current execution status")
     current_step: Optional[int] = Field(description="Currently executing step number", ge=1, le=11)
     current_step_name: Optional[str] = Field(description="Currently executing step name")
+    running_steps: List[int] = Field(description="Step numbers currently executing", default_factory=list)
     completed_steps: List[int] = Field(description="Successfully completed step numbers")
     failed_step: Optional[int] = Field(description="Step number that failed (None if no failure)")
     progress_percentage: float = Field(description="Execution progress (0-100)", ge=0, le=100)
@@ -1345,20 +1358,16 @@ class PipelineExecutionLogs(BaseModel):
     execution_id: str = Field(description="Execution identifier")
     logs: List[PipelineLogEntry] = Field(description="List of log entries in chronological order")
     step_logs: Optional[Dict[int, List[PipelineLogEntry]]] = Field(description="Logs grouped by step")
-    total_log_entries: int = Field(description="Total number of log entries", ge=0)
-
-    @validator('total_log_entries', always=True)
-    def calculate_total_logs(cls, v, values):
-        """Auto-calculate total log entries"""
-        logs = values.get('logs', [])
-        return len(logs)
+    total_log_entries: int = Field(description="Number of log entries matching the filters", ge=0)
+    offset: int = Field(default=0, description="Index of the first returned entry", ge=0)
+    limit: Optional[int] = Field(default=None, description="Maximum entries returned (None for all)")
 
 
 class PipelineHistoryEntry(BaseModel):
     """Pipeline execution history entry"""
     execution_id: str = Field(description="Unique execution identifier")
     execution_type: str = Field(description="Type of execution")
-    status: PipelineExecutionStatus = Field(description="Final execution status")
+    status: PipelineExecutionStatusEnum = Field(description="Final execution status")
     success: bool = Field(description="Whether execution was successful")
     start_time: datetime = Field(description="Execution start timestamp")
     end_time: Optional[datetime] = Field(description="Execution end timestamp")
@@ -1372,15 +1381,10 @@ class PipelineHistoryEntry(BaseModel):
 class PipelineHistoryResponse(BaseModel):
     """Pipeline execution history response"""
     executions: List[PipelineHistoryEntry] = Field(description="List of execution history entries")
-    total_executions: int = Field(description="Total executions in history", ge=0)
-    filtered_count: int = Field(description="Number of executions matching filter", ge=0)
+    total_executions: int = Field(description="Executions in history matching the filter", ge=0)
+    filtered_count: int = Field(description="Number of executions returned", ge=0)
     status_filter: Optional[str] = Field(description="Status filter applied")
-
-    @validator('total_executions', always=True)
-    def calculate_total(cls, v, values):
-        """Auto-calculate total executions"""
-        executions = values.get('executions', [])
-        return len(executions)
+    offset: int = Field(default=0, description="Index of the first returned execution", ge=0)
 
 
 class PipelineDependencyCheck(BaseModel):
@@ -1411,6 +1415,7 @@ class PipelineExecutionRequest(BaseModel):
     """Request model for full pipeline execution"""
     execution_id: Optional[str] = Field(description="Optional execution ID (generated if not provided)")
     started_by: Optional[str] = Field(description="User identifier starting the execution")
+    force: bool = Field(default=False, description="Re-run steps whose inputs are unchanged since their last run")
 
 
 class StepExecutionRequest(BaseModel):
@@ -1426,6 +1431,7 @@ class StepRangeExecutionRequest(BaseModel):
     end_step: int = Field(description="Last step to execute (1-11)", ge=1, le=11)
     execution_id: Optional[str] = Field(description="Optional execution ID")
     started_by: Optional[str] = Field(description="User identifier starting the execution")
+    force: bool = Field(default=False, description="Re-run steps whose inputs are unchanged since their last run")
 
     @validator('end_step')
     def validate_step_range(cls, v, values):
@@ -1445,7 +1451,8 @@ class ResumeExecutionRequest(BaseModel):
 class PipelineHistoryRequest(BaseModel):
     """Request model for pipeline execution history"""
     limit: int = Field(default=50, description="Maximum executions to return", ge=1, le=1000)
-    status_filter: Optional[PipelineExecutionStatus] = Field(description="Filter by execution status")
+    offset: int = Field(default=0, description="Executions to skip", ge=0)
+    status_filter: Optional[PipelineExecutionStatusEnum] = Field(description="Filter by execution status")
     execution_type_filter: Optional[str] = Field(description="Filter by execution type")
 
 
@@ -1455,6 +1462,7 @@ class PipelineLogsRequest(BaseModel):
     step_number: Optional[int] = Field(description="Filter by step number", ge=1, le=11)
     level_filter: Optional[str] = Field(description="Filter by log level")
     limit: Optional[int] = Field(description="Limit number of log entries", ge=1, le=10000)
+    offset: int = Field(default=0, description="Log entries to skip", ge=0)
 
 
 # Response models for pipeline API endpoints
@@ -1489,6 +1497,7 @@ class StepRangeResponse(BaseModel):
     completed_steps: List[int] = Field(description="Successfully completed steps")
     failed_step: Optional[int] = Field(description="Step that failed")
     execution_time: float = Field(description="Total execution time")
+    skipped_steps: List[int] = Field(default_factory=list, description="Steps skipped because their inputs were unchanged")
     step_results: Dict[int, PipelineStepResult] = Field(description="Results for each step")
 
 
@@ -1500,6 +1509,13 @@ class ResumeExecutionResponse(BaseModel):
     success: bool = Field(description="Whether resume was successful")
     message: str = Field(description="Resume status message")
 
+
+class CancelExecutionResponse(BaseModel):
+    """Response for cancelling a running execution"""
+    execution_id: str = Field(description="Execution identifier")
+    success: bool = Field(description="Whether cancellation was requested")
+    message: str = Field(description="Cancellation status message")
+
 # IBKR Search API Models
 # Exact replication of comprehensive_enhanced_search.py behavior
 
@@ -0,0 +1,222 @@
+"""
+Vectorised target allocation for step 6
+Ranks the stocks of every screener in one grouped pass and computes pocket and
+final allocations as array operations, reproducing legacy
+targetter.calculate_final_allocations exactly
+"""
+
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from ..core.config import settings
+from .implementations.legacy.targetter import parse_180d_change, rank_stocks_in_screener
+from .universe_store import set_if_changed
+
+
+def parse_performance(values: List[Any]) -> np.ndarray:
+    """
+    parse_180d_change for a whole column of raw price_180d_change values
+
+    Uses float() semantics for every value (whitespace, underscores, 'nan'),
+    so the result is identical to parsing each stock separately. Batches with
+    missing or malformed values take the per-value path.
+    """
+    try:
+        return np.array([float(value.replace('%', '')) for value in values], dtype=float)
+    except (ValueError, AttributeError, TypeError):
+        return np.fromiter(map(parse_180d_change, values), dtype=float, count=len(values))
+
+
+class AllocationEngine:
+    """
+    Grouped ranking and linear pocket allocation across all screeners
+
+    Pocket allocation follows calculate_pocket_allocation: rank 1 gets
+    max_allocation, the last of the top max_ranked_stocks gets
+    min_allocation, linearly in between, and 0 beyond.
+    """
+
+    def __init__(
+        self,
+        max_ranked_stocks: Optional[int] = None,
+        max_allocation: Optional[float] = None,
+        min_allocation: Optional[float] = None
+    ):
+        self.max_ranked_stocks = settings.portfolio.max_ranked_stocks if max_ranked_stocks is None else max_ranked_stocks
+        self.max_allocation = settings.portfolio.max_allocation if max_allocation is None else max_allocation
+        self.min_allocation = settings.portfolio.min_allocation if min_allocation is None else min_allocation
+
+    def pocket_allocations(self, ranks: np.ndarray, totals: np.ndarray) -> np.ndarray:
+        """calculate_pocket_allocation as an array operation"""
+        max_ranked = self.max_ranked_stocks
+        effective_max_rank = np.minimum(max_ranked, totals)
+        span = np.where(effective_max_rank > 1, effective_max_rank - 1, 1)
+
+        pocket = self.max_allocation - ((ranks - 1) / span) * (self.max_allocation - self.min_allocation)
+        single = (totals == 1) | (max_ranked == 1) | (effective_max_rank == 1)
+        pocket = np.where(single, self.max_allocation, pocket)
+        return np.where(ranks > max_ranked, 0.0, pocket)
+
+    def rank_screens(self, universe_data: Dict[str, Any], screener_allocations: Dict[str, float]) -> pd.DataFrame:
+        """
+        One row per screen stock in legacy output order (screen order, then rank)
+
+        Columns: screen, screener, stock, ticker, rank, performance_180d,
+        pocket_allocation, screener_target, final_allocation
+        """
+        screen_names, screen_targets, stocks, screen_index = [], [], [], []
+        for screen_key, screen_data in universe_data.get('screens', {}).items():
+            screen_name = screen_data.get('name', screen_key)
+            screen_stocks = screen_data.get('stocks', [])
+            if not screen_stocks:
+                continue
+
+            # Get screener allocation (handle different key formats)
+            screener_target = 0.0
+            for alloc_key, alloc_value in screener_allocations.items():
+                if alloc_key == screen_key or alloc_key.replace('_', ' ').lower() == screen_name.lower():
+                    screener_target = alloc_value
+                    break
+
+            screen_index.extend([len(screen_names)] * len(screen_stocks))
+            screen_names.append(screen_name)
+            screen_targets.append(screener_target)
+            stocks.extend(screen_stocks)
+
+        screen_index = np.asarray(screen_index, dtype=np.int64)
+        performance = parse_performance([stock.get('price_180d_change', '0%') for stock in stocks])
+        position = np.arange(len(stocks))
+
+        # Stable descending sort per screen: ties keep their original order, like list.sort(reverse=True)
+        order = np.lexsort((position, -performance, screen_index))
+        totals = np.bincount(screen_index, minlength=len(screen_names))
+        group_start = np.concatenate(([0], np.cumsum(totals)[:-1])) if len(screen_names) else np.zeros(0, np.int64)
+        ranks = np.empty(len(stocks), dtype=np.int64)
+        ranks[order] = np.arange(len(stocks)) - group_start[screen_index[order]] + 1
+
+        # NaN performances make Python's sort order implementation-defined; use the legacy ranking there
+        for index in np.unique(screen_index[np.isnan(performance)]).tolist():
+            members = np.flatnonzero(screen_index == index)
+            by_identity = {id(stocks[i]): i for i in members.tolist()}
+            for rank_position, (stock, rank, _) in enumerate(rank_stocks_in_screener([stocks[i] for i in members])):
+                row = by_identity[id(stock)]
+                ranks[row] = rank
+                order[group_start[index] + rank_position] = row
+
+        stock_totals = totals[screen_index]
+        pocket = self.pocket_allocations(ranks, stock_totals)
+        targets = np.asarray(screen_targets, dtype=float)[screen_index] if len(stocks) else np.zeros(0)
+        final = targets * pocket
+
+        frame = pd.DataFrame({
+            'screen': screen_index,
+            'stock': pd.Series(stocks, dtype=object),
+            'rank': ranks,
+            'performance_180d': performance,
+            'pocket_allocation': pocket,
+            'final_allocation': final,
+        }).iloc[order].reset_index(drop=True)
+        frame['screener'] = [screen_names[i] for i in frame['screen'].tolist()]
+        # Keep the optimizer's original value (and type) for output
+        frame['screener_target'] = pd.Series([screen_targets[i] for i in frame['screen'].tolist()], dtype=object)
+        frame['ticker'] = [stock.get('ticker', 'UNKNOWN') for stock in frame['stock'].tolist()]
+        return frame
+
+    def calculate_final_allocations(
+        self,
+        universe_data: Dict[str, Any],
+        screener_allocations: Dict[str, float],
+        verbose: bool = True
+    ) -> Dict[str, Dict[str, Any]]:
+        """Final allocation per ticker, keyed, ordered and printed exactly like the legacy function"""
+        frame = self.rank_screens(universe_data, screener_allocations)
+        rows = list(zip(
+            frame['ticker'].tolist(), frame['screener'].tolist(), frame['rank'].tolist(),
+            frame['performance_180d'].tolist(), frame['pocket_allocation'].tolist(),
+            frame['screener_target'].tolist(), frame['final_allocation'].tolist()
+        ))
+
+        if verbose:
+            print(f"\n{'='*60}")
+            print("CALCULATING FINAL STOCK ALLOCATIONS")
+            print(f"{'='*60}")
+
+        final_allocations: Dict[str, Dict[str, Any]] = {}
+        offset = 0
+        for screen_key, screen_data in universe_data.get('screens', {}).items():
+            screen_name = screen_data.get('name', screen_key)
+            stock_count = len(screen_data.get('stocks', []))
+            if not stock_count:
+                if verbose:
+                    print(f"\nX {screen_name}: No stocks found")
+                continue
+
+            screen_rows = rows[offset:offset + stock_count]
+            offset += stock_count
+            if verbose:
+                print(f"\n{screen_name} (Target: {screen_rows[0][5]*100:.2f}%):")
+                print(f"  Processing {stock_count} stocks...")
+
+            lines = []
+            for ticker, screener, rank, performance, pocket_allocation, screener_target, final_allocation in screen_rows:
+                final_allocations[ticker] = {
+                    'ticker': ticker,
+                    'screener': screener,
+                    'rank': rank,
+                    'performance_180d': performance,
+                    'pocket_allocation': pocket_allocation,
+                    'screener_target': screener_target,
+                    'final_allocation': final_allocation
+                }
+                if verbose:
+                    lines.append(
+                        f"  {rank:2d}. {ticker:<12} | {performance:+6.2f}% | "
+                        f"Pocket: {pocket_allocation*100:4.1f}% | Final: {final_allocation*100:5.2f}%"
+                    )
+            if lines:
+                print("\n".join(lines))
+
+        return final_allocations
+
+    @staticmethod
+    def apply_allocations(universe_data: Dict[str, Any], final_allocations: Dict[str, Dict[str, Any]]) -> int:
+        """
+        Write rank, allocation_target, screen_target and final_target onto every instance of each ticker
+
+        Returns:
+            Number of screen stocks updated (all_stocks entries are not counted, as in the legacy function)
+        """
+        updated_count = 0
+        for screen_data in universe_data.get('screens', {}).values():
+            for stock in screen_data.get('stocks', []):
+                alloc_data = final_allocations.get(stock.get('ticker'))
+                if alloc_data is not None:
+                    _write_allocation(stock, alloc_data)
+                    updated_count += 1
+
+        for ticker, stock in universe_data.get('all_stocks', {}).items():
+            alloc_data = final_allocations.get(ticker)
+            if alloc_data is not None:
+                _write_allocation(stock, alloc_data)
+        return updated_count
+
+    @staticmethod
+    def allocation_fields(final_allocations: Dict[str, Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        """Ticker -> the stock fields apply_allocations writes, for UniverseStore.update_stock_fields"""
+        return {ticker: _allocation_fields(alloc_data) for ticker, alloc_data in final_allocations.items()}
+
+
+def _allocation_fields(alloc_data: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        'rank': alloc_data['rank'],
+        'allocation_target': alloc_data['pocket_allocation'],
+        'screen_target': alloc_data['screener_target'],
+        'final_target': alloc_data['final_allocation']
+    }
+
+
+def _write_allocation(stock: Dict[str, Any], alloc_data: Dict[str, Any]) -> None:
+    for key, value in _allocation_fields(alloc_data).items():
+        set_if_changed(stock, key, value)
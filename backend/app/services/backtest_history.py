@@ -0,0 +1,201 @@
+"""
+Streaming parser for Uncle Stock backtest history exports
+Reads the file once, line by line, carrying the current quarter header as
+state, and produces typed quarter records; parsed files are memoised per
+file version
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .file_version_cache import FileVersionCache
+
+# The metadata block ("Date", "Begin", "Rebalance timing", ...) is the first 13 lines
+METADATA_LINES = 13
+
+# "Quarter return" rows look back this many lines for their "<year> Q<n>,Stocks" header
+QUARTER_HEADER_LOOKBACK = 4
+
+
+def parse_number(text: str) -> Optional[float]:
+    """'1.19%' -> 1.19, '0.88' -> 0.88, '' or unparseable -> None (percentages stay in percent)"""
+    try:
+        return float(text.replace('%', '').replace(',', '')) if text else None
+    except ValueError:
+        return None
+
+
+@dataclass(frozen=True)
+class QuarterRecord:
+    """
+    One "Quarter return" row
+
+    Percentages are in percent (1.19 for "1.19%"). `cells` keeps the stripped
+    row cells so the legacy string format can be rebuilt exactly.
+    """
+    quarter: str
+    return_pct: Optional[float]
+    period_sd_pct: Optional[float]
+    beta: Optional[float]
+    benchmark_return_pct: Optional[float]
+    cells: Tuple[str, ...] = field(repr=False)
+
+    @classmethod
+    def from_cells(cls, quarter: str, cells: Tuple[str, ...]) -> "QuarterRecord":
+        quarter_return = cells[2].strip('"')
+        return cls(
+            quarter=quarter,
+            return_pct=parse_number(quarter_return),
+            period_sd_pct=parse_number(cells[3].strip('"') if len(cells) > 3 else ""),
+            beta=parse_number(cells[4].strip('"') if len(cells) > 4 else ""),
+            benchmark_return_pct=parse_number(_benchmark_cell(cells, quarter_return) or ""),
+            cells=cells
+        )
+
+    @classmethod
+    def from_legacy_dict(cls, entry: Dict[str, str]) -> "QuarterRecord":
+        """
+        Typed record for a quarterly_data entry of universe.json
+
+        Inverse of to_legacy_dict(). Raises KeyError without "quarter" or "return".
+        """
+        cells = ("", "", entry["return"], entry.get("period_sd", ""), entry.get("beta", ""))
+        if "benchmark_return" in entry:
+            cells += (entry["benchmark_return"],)
+        return cls.from_cells(entry["quarter"], cells)
+
+    def to_legacy_dict(self) -> Dict[str, str]:
+        """The history_parser quarterly_performance entry ('%' strings)"""
+        quarter_return = self.cells[2].strip('"')
+        entry = {
+            "quarter": self.quarter,
+            "return": quarter_return,
+            "period_sd": self.cells[3].strip('"') if len(self.cells) > 3 else "",
+            "beta": self.cells[4].strip('"') if len(self.cells) > 4 else ""
+        }
+        benchmark = _benchmark_cell(self.cells, quarter_return)
+        if benchmark is not None:
+            entry["benchmark_return"] = benchmark
+        return entry
+
+
+def _benchmark_cell(cells: Tuple[str, ...], quarter_return: str) -> Optional[str]:
+    """Last percentage cell that differs from the portfolio return (the benchmark column)"""
+    for cell in reversed(cells):
+        value = cell.strip('"')
+        if value and "%" in value and value != quarter_return:
+            return value
+    return None
+
+
+@dataclass
+class BacktestHistory:
+    """Parsed backtest export"""
+    metadata: Dict[str, str] = field(default_factory=dict)
+    statistics: Dict[str, str] = field(default_factory=dict)
+    quarters: List[QuarterRecord] = field(default_factory=list)
+
+    def to_legacy_dict(self) -> Dict[str, Any]:
+        """The dict history_parser.parse_backtest_csv has always returned"""
+        return {
+            "metadata": dict(self.metadata),
+            "quarterly_performance": [quarter.to_legacy_dict() for quarter in self.quarters],
+            "statistics": dict(self.statistics)
+        }
+
+
+def parse_backtest_lines(lines: Iterable[str], debug: bool = False) -> BacktestHistory:
+    """
+    Parse backtest export lines in a single pass
+
+    Follows the legacy three-pass parser exactly:
+    - metadata: "key,value" lines among the first 13
+    - statistics: the first line containing "Return" and "Period SD" headers,
+      used only when the next two lines are "Total return" and "Yearly return"
+    - quarters: every "Quarter return" line with at least three cells, named
+      after the nearest "<quarter>,Stocks" line in the 4 lines above it
+    """
+    history = BacktestHistory()
+
+    # Statistics state: header cells, then the "Total return" row, waiting for "Yearly return"
+    stats_headers: Optional[List[str]] = None
+    total_row: Optional[List[str]] = None
+    stats_done = False
+
+    # Quarter header state: (line number, quarter name) of the latest header line
+    quarter_header: Optional[Tuple[int, str]] = None
+
+    for number, line in enumerate(lines):
+        if number < METADATA_LINES and ',' in line and not line.startswith('sep='):
+            parts = line.strip().split(',', 1)
+            if len(parts) == 2:
+                history.metadata[parts[0].strip('"')] = parts[1].strip('"')
+
+        if not stats_done:
+            if stats_headers is None:
+                if '"Return"' in line and '"Period SD"' in line:
+                    stats_headers = [h.strip('"') for h in line.split(',')]
+            elif total_row is None:
+                if 'Total return' in line:
+                    total_row = line.split(',')
+                else:
+                    stats_done = True
+            else:
+                if 'Yearly return' in line:
+                    yearly_row = line.split(',')
+                    for i, header in enumerate(stats_headers):
+                        if i < len(total_row) and i < len(yearly_row) and header and header not in ['', ' ']:
+                            history.statistics[f"{header}_total"] = total_row[i].strip('"')
+                            history.statistics[f"{header}_yearly"] = yearly_row[i].strip('"')
+                stats_done = True
+
+        stripped = line.strip()
+        if 'Quarter return' in stripped:
+            cells = tuple(stripped.split(','))
+            if len(cells) >= 3:
+                quarter_return = cells[2].strip('"')
+                period_sd = cells[3].strip('"') if len(cells) > 3 else ""
+
+                quarter = ""
+                if quarter_header is not None and number - quarter_header[0] <= QUARTER_HEADER_LOOKBACK:
+                    quarter = quarter_header[1]
+
+                if debug:
+                    print(f"Found quarter: {quarter}, return: {quarter_return}, sd: {period_sd}")
+
+                if quarter:
+                    history.quarters.append(QuarterRecord.from_cells(quarter, cells))
+
+        if ' Q' in stripped and 'Stocks' in stripped:
+            quarter_header = (number, stripped.split(',')[0].strip('"'))
+
+    return history
+
+
+def parse_backtest_file(csv_path: str, debug: bool = False) -> BacktestHistory:
+    """Stream-parse a backtest export; raises OSError / UnicodeDecodeError on unreadable files"""
+    with open(csv_path, 'r', encoding='utf-8') as f:
+        return parse_backtest_lines(f, debug)
+
+
+class BacktestHistoryCache(FileVersionCache[BacktestHistory]):
+    """
+    Parsed backtest exports, one parse per file version
+
+    Step 1 rewrites exports in place; see FileVersionCache.
+    """
+
+    def __init__(self):
+        super().__init__(lambda path, version: parse_backtest_file(path))
+
+
+# Singleton instance
+_backtest_history_cache: Optional[BacktestHistoryCache] = None
+
+
+def get_backtest_history_cache() -> BacktestHistoryCache:
+    """Get the process-wide backtest history cache"""
+    global _backtest_history_cache
+    if _backtest_history_cache is None:
+        _backtest_history_cache = BacktestHistoryCache()
+    return _backtest_history_cache
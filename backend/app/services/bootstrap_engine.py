@@ -0,0 +1,186 @@
+"""
+Bootstrap robustness analysis of step 4 screener weights
+Resamples quarters (with replacement, optionally in blocks), re-optimises the
+Sharpe ratio on every sample across a process pool and summarises how stable
+each screener's weight is
+"""
+
+import math
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from .sharpe_optimizer import PERIODS_PER_YEAR, SharpeOptimizer
+
+DEFAULT_SAMPLES = 2000
+MAX_SAMPLES = 20000
+DEFAULT_CONFIDENCE = 0.90
+
+# Weights below 0.01% count as "not allocated" (SLSQP leaves residue of this order)
+ZERO_WEIGHT = 1e-4
+
+# Below this many samples a pool costs more to start than it saves
+MIN_SAMPLES_FOR_POOL = 200
+# Chunks per worker, so a slow chunk does not leave the other cores idle
+CHUNKS_PER_WORKER = 4
+# Workers start from a fresh interpreter: forking the multithreaded API server
+# would copy locks held by its other threads into every child
+POOL_START_METHOD = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+
+
+def bootstrap_indices(n_quarters: int, n_samples: int, block_size: int = 1, seed: Optional[int] = None) -> np.ndarray:
+    """
+    Row indices (n_samples x n_quarters) of resampled quarters
+
+    block_size > 1 draws circular blocks of consecutive quarters (moving-block
+    bootstrap), keeping short-range autocorrelation in each sample. Whole
+    quarters are drawn, so cross-screener correlation is preserved.
+    """
+    rng = np.random.default_rng(seed)
+    block_size = max(1, min(block_size, n_quarters))
+    n_blocks = math.ceil(n_quarters / block_size)
+    starts = rng.integers(0, n_quarters, size=(n_samples, n_blocks))
+    indices = (starts[:, :, None] + np.arange(block_size)) % n_quarters
+    return indices.reshape(n_samples, -1)[:, :n_quarters]
+
+
+def sample_moments(values: np.ndarray, indices: np.ndarray):
+    """Mean vectors (k x n) and ddof=1 covariance matrices (k x n x n) of every sample at once"""
+    samples = values[indices]
+    means = samples.mean(axis=1)
+    centered = samples - means[:, None, :]
+    covariances = np.einsum('kti,ktj->kij', centered, centered) / (indices.shape[1] - 1)
+    return means, covariances
+
+
+def optimise_samples(values: np.ndarray, indices: np.ndarray, risk_free_rate: float) -> np.ndarray:
+    """
+    Max-Sharpe weights for each bootstrap sample (one row per sample)
+
+    Runs in worker processes, so it only takes arrays. Every sample starts
+    from equal weights like step 4 does; warm-starting from the full-sample
+    optimum lets SLSQP stop at its first iterate whenever the improvement is
+    below ftol, biasing the distribution towards the point estimate. Rows
+    whose optimisation fails are NaN.
+    """
+    means, covariances = sample_moments(values, indices)
+    columns = range(values.shape[1])
+    weights = np.full((len(indices), values.shape[1]), np.nan)
+    for row, (mean, covariance) in enumerate(zip(means, covariances)):
+        result = SharpeOptimizer.from_moments(columns, mean, covariance, risk_free_rate).optimize()
+        if result.success:
+            clipped = np.clip(result.x, 0, 1)
+            weights[row] = clipped / clipped.sum()
+    return weights
+
+
+class BootstrapEngine:
+    """
+    Resampled max-Sharpe weights and their confidence intervals
+
+    The sample moments are computed for a whole chunk at once; each sample
+    is then re-optimised with the analytic-gradient SharpeOptimizer. Chunks
+    are spread over a ProcessPoolExecutor when there is more than one core
+    to use.
+    """
+
+    def __init__(self, returns: pd.DataFrame, risk_free_rate: float = 0.02/4, max_workers: Optional[int] = None):
+        self.optimizer = SharpeOptimizer(returns, risk_free_rate)
+        self.values = returns.to_numpy(dtype=float)
+        self.columns = list(returns.columns)
+        self.risk_free_rate = risk_free_rate
+        self.max_workers = max_workers or os.cpu_count() or 1
+
+    def _chunks(self, indices: np.ndarray, workers: int) -> List[np.ndarray]:
+        size = max(1, math.ceil(len(indices) / (workers * CHUNKS_PER_WORKER)))
+        return [indices[start:start + size] for start in range(0, len(indices), size)]
+
+    def resample(self, indices: np.ndarray) -> np.ndarray:
+        """Optimised weights for every sample, in sample order"""
+        workers = min(self.max_workers, math.ceil(len(indices) / MIN_SAMPLES_FOR_POOL))
+        if workers <= 1:
+            return optimise_samples(self.values, indices, self.risk_free_rate)
+
+        chunks = self._chunks(indices, workers)
+        # optimise_samples stays a module-level function so the workers can import it
+        with ProcessPoolExecutor(
+            max_workers=workers, mp_context=multiprocessing.get_context(POOL_START_METHOD)
+        ) as executor:
+            results = executor.map(
+                optimise_samples,
+                [self.values] * len(chunks),
+                chunks,
+                [self.risk_free_rate] * len(chunks)
+            )
+            return np.vstack(list(results))
+
+    def run(
+        self,
+        n_samples: int = DEFAULT_SAMPLES,
+        confidence: float = DEFAULT_CONFIDENCE,
+        block_size: int = 1,
+        seed: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Bootstrap the max-Sharpe weights
+
+        Returns:
+            Dict with the full-sample point estimate, the resampled-average
+            allocation, per-screener weight distribution (mean, std, median,
+            confidence interval, share of samples with zero weight) and the
+            full-sample Sharpe ratio of the resampled allocations
+        """
+        point = self.optimizer.optimize()
+        point_weights = np.clip(point.x, 0, 1)
+        point_weights = point_weights / point_weights.sum()
+
+        indices = bootstrap_indices(len(self.values), n_samples, block_size, seed)
+        weights = self.resample(indices)
+        valid = weights[~np.isnan(weights).any(axis=1)]
+        if not len(valid):
+            raise ValueError("No bootstrap sample could be optimised")
+
+        tail = (1 - confidence) / 2 * 100
+        lower, median, upper = np.percentile(valid, [tail, 50, 100 - tail], axis=0)
+        average = valid.mean(axis=0)
+        average = average / average.sum()
+
+        # Sharpe of each resampled allocation evaluated on the full sample
+        excess = (valid @ self.optimizer.mean - self.risk_free_rate) * PERIODS_PER_YEAR
+        volatility = np.sqrt(np.einsum('ki,ij,kj->k', valid, self.optimizer.covariance, valid) * PERIODS_PER_YEAR)
+        sharpe = np.divide(excess, volatility, out=np.zeros_like(excess), where=volatility > 0)
+
+        return {
+            'samples': n_samples,
+            'successful_samples': int(len(valid)),
+            'confidence': confidence,
+            'block_size': block_size,
+            'point_estimate': self._as_dict(point_weights),
+            'resampled_allocation': self._as_dict(average),
+            'weights': {
+                column: {
+                    'point_estimate': float(point_weights[i]),
+                    'mean': float(average[i]),
+                    'std': float(valid[:, i].std(ddof=1)) if len(valid) > 1 else 0.0,
+                    'median': float(median[i]),
+                    'ci_lower': float(lower[i]),
+                    'ci_upper': float(upper[i]),
+                    'zero_weight_share': float(np.mean(valid[:, i] < ZERO_WEIGHT))
+                }
+                for i, column in enumerate(self.columns)
+            },
+            'full_sample_sharpe': {
+                'point_estimate': float(self.optimizer.portfolio_stats(point_weights)[2]),
+                'resampled_allocation': float(self.optimizer.portfolio_stats(average)[2]),
+                'median': float(np.median(sharpe)),
+                'ci_lower': float(np.percentile(sharpe, tail)),
+                'ci_upper': float(np.percentile(sharpe, 100 - tail))
+            }
+        }
+
+    def _as_dict(self, values: Sequence[float]) -> Dict[str, float]:
+        return {column: float(value) for column, value in zip(self.columns, values)}
@@ -5,13 +5,33 @@ SQLite database service for IBKR search result caching
 import sqlite3
 import json
 import logging
+import threading
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, Iterable, List, Tuple
 from dataclasses import dataclass
 
+from .memory_cache import TTLLRUCache, MISSING
+
 logger = logging.getLogger(__name__)
 
+# Hot in-memory layer in front of SQLite. Found contracts rarely change, so they
+# stay in memory for hours; "not found" results are kept briefly so repeated
+# runs don't re-query IBKR, while daily runs still retry them.
+MEMORY_CACHE_MAX_ENTRIES = 20000
+POSITIVE_RESULT_TTL = timedelta(hours=6)
+NEGATIVE_RESULT_TTL = timedelta(hours=1)
+
+# Connection tuning: WAL lets readers run alongside the writer, NORMAL sync is
+# durable across application crashes in WAL mode, mmap avoids read() copies
+CONNECTION_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-16000",
+)
+
 @dataclass
 class IBKRCacheEntry:
     """Represents a cached IBKR search result"""
@@ -27,17 +47,54 @@ class IBKRCacheEntry:
     raw_ibkr_details: Dict[str, Any]
 
 class IBKRDatabaseService:
-    """Service for managing IBKR search result cache in SQLite"""
-
-    def __init__(self, db_path: str = "data/ibkr_cache.db"):
+    """
+    Service for managing IBKR search result cache in SQLite
+
+    Holds one long-lived connection per database file (serialized by a lock,
+    so the singleton can be shared across worker threads) instead of opening
+    a new connection and transaction for every lookup or insert.
+
+    An LRU layer keyed by (isin, ticker) sits in front of SQLite. It remembers
+    both rows and confirmed absences, so repeat lookups never touch disk.
+    """
+
+    def __init__(
+        self,
+        db_path: str = "data/ibkr_cache.db",
+        memory_cache_size: int = MEMORY_CACHE_MAX_ENTRIES,
+        positive_ttl: timedelta = POSITIVE_RESULT_TTL,
+        negative_ttl: timedelta = NEGATIVE_RESULT_TTL
+    ):
         self.db_path = Path(db_path)
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.RLock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self.positive_ttl = positive_ttl
+        self.negative_ttl = negative_ttl
+        self._memory = TTLLRUCache(max_entries=memory_cache_size, default_ttl=negative_ttl.total_seconds())
         self._initialize_database()
 
+    def _connection(self) -> sqlite3.Connection:
+        """Return the shared connection, opening and tuning it on first use"""
+        if self._conn is None:
+            conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            for pragma in CONNECTION_PRAGMAS:
+                conn.execute(pragma)
+            self._conn = conn
+        return self._conn
+
+    def close(self):
+        """Close the shared connection; the next call reopens it"""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
     def _initialize_database(self):
         """Initialize database with required schema"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._lock, self._connection() as conn:
                 conn.execute("""
                     CREATE TABLE IF NOT EXISTS ibkr_search_cache (
                         id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -75,6 +132,75 @@ class IBKRDatabaseService:
             logger.error(f"Failed to initialize database: {e}")
             raise
 
+    @staticmethod
+    def _row_to_entry(row: sqlite3.Row) -> IBKRCacheEntry:
+        return IBKRCacheEntry(
+            isin=row['isin'],
+            ticker=row['ticker'],
+            name=row['name'],
+            currency=row['currency'],
+            found=bool(row['found']),
+            ibkr_symbol=row['ibkr_symbol'],
+            ibkr_contract_id=row['ibkr_contract_id'],
+            search_method=row['search_method'],
+            search_date=datetime.fromisoformat(row['search_date']),
+            raw_ibkr_details=json.loads(row['raw_ibkr_details']) if row['raw_ibkr_details'] else {}
+        )
+
+    def _remember(self, key: Tuple[str, str], entry: Optional[IBKRCacheEntry]) -> None:
+        """Keep a row (or a confirmed absence) in the memory layer"""
+        ttl = self.positive_ttl if entry is not None and entry.found else self.negative_ttl
+        self._memory.set(key, entry, ttl.total_seconds())
+
+    def _lookup(self, keys: List[Tuple[str, str]]) -> Dict[Tuple[str, str], Optional[IBKRCacheEntry]]:
+        """
+        Resolve keys to their cache row (None when absent), memory first
+
+        Rows are cached regardless of age; callers apply max_age_days on top,
+        so one memory entry serves every expiry policy.
+        """
+        resolved: Dict[Tuple[str, str], Optional[IBKRCacheEntry]] = {}
+        pending = []
+        for key in keys:
+            entry = self._memory.get(key)
+            if entry is MISSING:
+                pending.append(key)
+            else:
+                resolved[key] = entry
+
+        if not pending:
+            return resolved
+
+        with self._lock:
+            conn = self._connection()
+            if len(pending) == 1:
+                rows = conn.execute(
+                    "SELECT * FROM ibkr_search_cache WHERE isin = ? AND ticker = ?", pending[0]
+                ).fetchall()
+            else:
+                # Temp-table join keeps any universe size inside SQLite's bound-parameter limit
+                conn.execute("""
+                    CREATE TEMP TABLE IF NOT EXISTS cache_lookup (
+                        isin TEXT NOT NULL,
+                        ticker TEXT NOT NULL
+                    )
+                """)
+                conn.execute("DELETE FROM cache_lookup")
+                conn.executemany("INSERT INTO cache_lookup (isin, ticker) VALUES (?, ?)", pending)
+                rows = conn.execute("""
+                    SELECT c.* FROM cache_lookup l
+                    JOIN ibkr_search_cache c ON c.isin = l.isin AND c.ticker = l.ticker
+                """).fetchall()
+                conn.execute("DELETE FROM cache_lookup")
+                conn.commit()
+
+        found = {(row['isin'], row['ticker']): self._row_to_entry(row) for row in rows}
+        for key in pending:
+            entry = found.get(key)
+            self._remember(key, entry)
+            resolved[key] = entry
+        return resolved
+
     def get_cached_result(self, isin: str, ticker: str, max_age_days: int = 365) -> Optional[IBKRCacheEntry]:
         """
         Get cached IBKR search result if exists and not expired
@@ -87,37 +213,49 @@ class IBKRDatabaseService:
         Returns:
             IBKRCacheEntry if found and valid, None otherwise
         """
+        return self.get_cached_results([(isin, ticker)], max_age_days).get((isin, ticker))
+
+    def get_cached_results(
+        self,
+        keys: Iterable[Tuple[str, str]],
+        max_age_days: int = 365
+    ) -> Dict[Tuple[str, str], IBKRCacheEntry]:
+        """
+        Bulk version of get_cached_result
+
+        Keys already in the memory layer are answered without touching disk; the
+        rest are loaded into a temp table and joined against the cache in a
+        single query.
+
+        Args:
+            keys: (isin, ticker) pairs to look up
+            max_age_days: Maximum age in days before cache expires (default: 365)
+
+        Returns:
+            Dict mapping (isin, ticker) to IBKRCacheEntry for every valid hit
+        """
+        keys = list(dict.fromkeys(keys))
+        if not keys:
+            return {}
+
         try:
             cutoff_date = datetime.now() - timedelta(days=max_age_days)
-
-            with sqlite3.connect(self.db_path) as conn:
-                conn.row_factory = sqlite3.Row
-                cursor = conn.execute("""
-                    SELECT * FROM ibkr_search_cache
-                    WHERE isin = ? AND ticker = ? AND search_date > ?
-                    ORDER BY search_date DESC
-                    LIMIT 1
-                """, (isin, ticker, cutoff_date.isoformat()))
-
-                row = cursor.fetchone()
-                if row:
-                    return IBKRCacheEntry(
-                        isin=row['isin'],
-                        ticker=row['ticker'],
-                        name=row['name'],
-                        currency=row['currency'],
-                        found=bool(row['found']),
-                        ibkr_symbol=row['ibkr_symbol'],
-                        ibkr_contract_id=row['ibkr_contract_id'],
-                        search_method=row['search_method'],
-                        search_date=datetime.fromisoformat(row['search_date']),
-                        raw_ibkr_details=json.loads(row['raw_ibkr_details']) if row['raw_ibkr_details'] else {}
-                    )
+            return {
+                key: entry for key, entry in self._lookup(keys).items()
+                if entry is not None and entry.search_date > cutoff_date
+            }
 
         except Exception as e:
-            logger.error(f"Failed to get cached result for {isin}/{ticker}: {e}")
+            logger.error(f"Failed to get cached results for {len(keys)} stocks: {e}")
+            return {}
+
+    def invalidate(self, isin: str, ticker: str) -> bool:
+        """
+        Forget the in-memory entry for a stock so the next lookup reads SQLite
 
-        return None
+        Called before a forced re-search; the fresh result then replaces the row.
+        """
+        return self._memory.invalidate((isin, ticker))
 
     def store_result(self,
                     isin: str,
@@ -130,7 +268,7 @@ class IBKRDatabaseService:
         Store IBKR search result in cache
 
         Args:
-            isin: Stock ISIN
+            isin: Stock ISIN, or '' for stocks without one
             ticker: Stock ticker
             name: Stock name
             currency: Stock currency
@@ -140,39 +278,82 @@ class IBKRDatabaseService:
         Returns:
             True if stored successfully, False otherwise
         """
-        try:
-            search_date = datetime.now()
+        stored = self.store_results_bulk([{
+            'isin': isin,
+            'ticker': ticker,
+            'name': name,
+            'currency': currency,
+            'found': found,
+            'ibkr_details': ibkr_details
+        }])
+        if stored:
+            logger.debug(f"Stored cache entry for {isin}/{ticker}, found: {found}")
+        return stored == 1
+
+    def store_results_bulk(self, results: Iterable[Dict[str, Any]]) -> int:
+        """
+        Store many IBKR search results in one transaction
 
-            # Extract specific fields from ibkr_details
-            ibkr_symbol = ibkr_details.get('symbol') if found else None
-            ibkr_contract_id = ibkr_details.get('contract_id') if found else None
-            search_method = ibkr_details.get('search_method') if found else None
+        Args:
+            results: Dicts with the store_result() arguments
+                     (isin, ticker, name, currency, found, ibkr_details)
 
-            with sqlite3.connect(self.db_path) as conn:
-                conn.execute("""
+        Returns:
+            Number of rows stored (0 if the transaction failed)
+        """
+        search_date = datetime.now().isoformat()
+        rows = []
+        entries = []
+        for result in results:
+            found = result['found']
+            ibkr_details = result['ibkr_details']
+            rows.append((
+                result['isin'], result['ticker'], result['name'], result['currency'], found,
+                # Extract specific fields from ibkr_details
+                ibkr_details.get('symbol') if found else None,
+                ibkr_details.get('contract_id') if found else None,
+                ibkr_details.get('search_method') if found else None,
+                search_date,
+                json.dumps(ibkr_details)
+            ))
+            entries.append(IBKRCacheEntry(
+                isin=result['isin'],
+                ticker=result['ticker'],
+                name=result['name'],
+                currency=result['currency'],
+                found=bool(found),
+                ibkr_symbol=rows[-1][5],
+                ibkr_contract_id=rows[-1][6],
+                search_method=rows[-1][7],
+                search_date=datetime.fromisoformat(search_date),
+                raw_ibkr_details=json.loads(rows[-1][9])
+            ))
+
+        if not rows:
+            return 0
+
+        try:
+            with self._lock, self._connection() as conn:
+                conn.executemany("""
                     INSERT OR REPLACE INTO ibkr_search_cache
                     (isin, ticker, name, currency, found, ibkr_symbol, ibkr_contract_id,
                      search_method, search_date, raw_ibkr_details)
                     VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    isin, ticker, name, currency, found,
-                    ibkr_symbol, ibkr_contract_id, search_method,
-                    search_date.isoformat(),
-                    json.dumps(ibkr_details)
-                ))
-                conn.commit()
+                """, rows)
 
-                logger.debug(f"Stored cache entry for {isin}/{ticker}, found: {found}")
-                return True
+            for entry in entries:
+                self._remember((entry.isin, entry.ticker), entry)
+            return len(rows)
 
         except Exception as e:
-            logger.error(f"Failed to store result for {isin}/{ticker}: {e}")
-            return False
+            logger.error(f"Failed to store {len(rows)} cache results: {e}")
+            return 0
 
     def get_cache_stats(self) -> Dict[str, Any]:
         """Get cache statistics"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._lock:
+                conn = self._connection()
                 cursor = conn.execute("SELECT COUNT(*) as total FROM ibkr_search_cache")
                 total = cursor.fetchone()[0]
 
@@ -191,7 +372,8 @@ class IBKRDatabaseService:
                     'found_entries': found,
                     'not_found_entries': total - found,
                     'recent_entries_30d': recent,
-                    'hit_rate': (found / total * 100) if total > 0 else 0
+                    'hit_rate': (found / total * 100) if total > 0 else 0,
+                    'memory_cache': self._memory.get_stats()
                 }
 
         except Exception as e:
@@ -211,17 +393,17 @@ class IBKRDatabaseService:
         try:
             cutoff_date = datetime.now() - timedelta(days=max_age_days)
 
-            with sqlite3.connect(self.db_path) as conn:
+            with self._lock, self._connection() as conn:
                 cursor = conn.execute("""
                     DELETE FROM ibkr_search_cache
                     WHERE search_date < ?
                 """, (cutoff_date.isoformat(),))
 
                 removed_count = cursor.rowcount
-                conn.commit()
+            self._memory.clear()
 
-                logger.info(f"Cleaned up {removed_count} expired cache entries")
-                return removed_count
+            logger.info(f"Cleaned up {removed_count} expired cache entries")
+            return removed_count
 
         except Exception as e:
             logger.error(f"Failed to cleanup expired entries: {e}")
@@ -241,16 +423,23 @@ class IBKRDatabaseService:
         uncached_stocks = []
 
         try:
+            # One query for the whole universe instead of one per stock;
+            # stocks without an ISIN are cached under ('', ticker)
+            cached_entries = self.get_cached_results(
+                (stock.get('isin') or '', stock['ticker']) for stock in stocks
+                if stock.get('ticker')
+            )
+
             for stock in stocks:
-                isin = stock.get('isin', '')
+                isin = stock.get('isin') or ''
                 ticker = stock.get('ticker', '')
                 name = stock.get('name', 'Unknown')
 
-                if not isin or not ticker:
+                if not ticker:
                     uncached_stocks.append(stock)
                     continue
 
-                cached_entry = self.get_cached_result(isin, ticker)
+                cached_entry = cached_entries.get((isin, ticker))
 
                 if cached_entry:
                     # Check if cached entry has valid IBKR details with conId
@@ -276,10 +465,13 @@ class IBKRDatabaseService:
                             is_valid_cache = False
                             logger.info(f"Cache entry for {ticker} found but has no valid conId ({con_id}) - forcing IBKR API search")
 
-                    # For not found entries, ALWAYS force fresh IBKR search as requested
+                    # Not-found entries are retried against IBKR unless the miss is recent
                     if not cached_entry.found:
-                        is_valid_cache = False
-                        logger.info(f"Cache entry for {ticker} is not found - forcing fresh IBKR API search as requested")
+                        if datetime.now() - cached_entry.search_date < self.negative_ttl:
+                            logger.debug(f"Cache entry for {ticker} is a recent not-found - skipping IBKR retry")
+                        else:
+                            is_valid_cache = False
+                            logger.info(f"Cache entry for {ticker} is not found - forcing fresh IBKR API search")
 
                     if is_valid_cache:
                         # Create stock copy with cached IBKR details
@@ -0,0 +1,276 @@
+"""
+SQLite store for pipeline execution history and logs
+Keeps one summary row per execution (indexed by status and start time) next to
+its full state as JSON, and log entries in their own table, so history and
+logs survive restarts and are paged by the database instead of scanned in memory
+"""
+
+import json
+import logging
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .shared_store import PathRegistry, SQLiteStore
+
+logger = logging.getLogger(__name__)
+
+# Statuses of executions that have not finished
+LIVE_STATUSES = ("pending", "running")
+
+SUMMARY_COLUMNS = (
+    "execution_id, execution_type, status, start_time, end_time, execution_time, "
+    "completed_steps, failed_step, total_files_created, is_resumed"
+)
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if hasattr(value, "model_dump"):
+        return value.model_dump(mode="json")
+    return str(value)
+
+
+def _dumps(value: Any) -> str:
+    return json.dumps(value, default=_json_default, ensure_ascii=False)
+
+
+def _timestamp(value: Any) -> Optional[str]:
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+class PipelineExecutionStore(SQLiteStore):
+    """
+    Execution history and logs in SQLite
+
+    Executions still marked pending/running when the store is opened belong to
+    a previous process and are marked cancelled.
+    """
+
+    def __init__(self, db_path: str = "data/pipeline_executions.db"):
+        super().__init__(db_path)
+
+    def _initialize_database(self):
+        with self._lock, self._connection() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS pipeline_executions (
+                    execution_id TEXT PRIMARY KEY,
+                    execution_type TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    start_time TEXT NOT NULL,
+                    end_time TEXT,
+                    execution_time REAL,
+                    completed_steps TEXT NOT NULL,
+                    failed_step INTEGER,
+                    total_files_created INTEGER NOT NULL DEFAULT 0,
+                    is_resumed INTEGER NOT NULL DEFAULT 0,
+                    record TEXT NOT NULL
+                )
+            """)
+            conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_executions_start
+                ON pipeline_executions(start_time)
+            """)
+            conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_executions_status_start
+                ON pipeline_executions(status, start_time)
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS pipeline_logs (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    execution_id TEXT NOT NULL,
+                    timestamp TEXT NOT NULL,
+                    step_number INTEGER,
+                    level TEXT NOT NULL,
+                    message TEXT NOT NULL,
+                    details TEXT
+                )
+            """)
+            conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_logs_execution
+                ON pipeline_logs(execution_id, id)
+            """)
+            conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_logs_execution_step
+                ON pipeline_logs(execution_id, step_number, id)
+            """)
+            interrupted = conn.execute(
+                f"UPDATE pipeline_executions SET status = 'cancelled' "
+                f"WHERE status IN ({', '.join('?' * len(LIVE_STATUSES))})",
+                LIVE_STATUSES
+            ).rowcount
+        if interrupted:
+            logger.warning(f"Marked {interrupted} interrupted pipeline executions as cancelled")
+
+    def save_execution(self, execution: Dict[str, Any]) -> None:
+        """Insert or replace an execution (the execution manager's state dict)"""
+        metadata = execution.get("metadata") or {}
+        row = (
+            execution["execution_id"],
+            metadata.get("execution_type", "unknown"),
+            str(getattr(execution["status"], "value", execution["status"])),
+            _timestamp(execution["start_time"]),
+            _timestamp(execution.get("end_time")),
+            execution.get("execution_time"),
+            json.dumps(sorted(execution.get("completed_steps", []))),
+            execution.get("failed_step"),
+            sum(len(files) for files in execution.get("created_files", {}).values()),
+            int(bool(metadata.get("is_resumed", False))),
+            _dumps(execution)
+        )
+        with self._lock, self._connection() as conn:
+            conn.execute(
+                f"INSERT OR REPLACE INTO pipeline_executions ({SUMMARY_COLUMNS}, record) "
+                f"VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                row
+            )
+
+    def get_execution(self, execution_id: str) -> Optional[Dict[str, Any]]:
+        """Full state of an execution as JSON types, or None"""
+        with self._lock:
+            row = self._connection().execute(
+                "SELECT status, record FROM pipeline_executions WHERE execution_id = ?", (execution_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        record = json.loads(row["record"])
+        record["status"] = row["status"]
+        return record
+
+    def list_executions(
+        self,
+        limit: int = 50,
+        offset: int = 0,
+        status: Optional[str] = None,
+        execution_type: Optional[str] = None,
+        since: Optional[datetime] = None
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        One page of execution summaries, most recent first
+
+        Returns (summaries, number of executions matching the filters).
+        """
+        where, params = [], []
+        if status is not None:
+            where.append("status = ?")
+            params.append(str(getattr(status, "value", status)))
+        if execution_type is not None:
+            where.append("execution_type = ?")
+            params.append(execution_type)
+        if since is not None:
+            where.append("start_time >= ?")
+            params.append(since.isoformat())
+        clause = f"WHERE {' AND '.join(where)}" if where else ""
+
+        with self._lock:
+            conn = self._connection()
+            total = conn.execute(f"SELECT COUNT(*) FROM pipeline_executions {clause}", params).fetchone()[0]
+            rows = conn.execute(
+                f"SELECT {SUMMARY_COLUMNS} FROM pipeline_executions {clause} "
+                f"ORDER BY start_time DESC LIMIT ? OFFSET ?",
+                params + [limit, offset]
+            ).fetchall()
+
+        summaries = []
+        for row in rows:
+            summary = dict(row)
+            summary["completed_steps"] = json.loads(summary["completed_steps"])
+            summary["is_resumed"] = bool(summary["is_resumed"])
+            summary["success"] = summary["status"] == "completed"
+            summaries.append(summary)
+        return summaries, total
+
+    def append_logs(self, entries: Iterable[Dict[str, Any]]) -> None:
+        rows = [
+            (
+                entry["execution_id"],
+                _timestamp(entry["timestamp"]),
+                entry.get("step_number"),
+                entry["level"],
+                entry["message"],
+                None if entry.get("details") is None else _dumps(entry["details"])
+            )
+            for entry in entries
+        ]
+        if not rows:
+            return
+        with self._lock, self._connection() as conn:
+            conn.executemany(
+                "INSERT INTO pipeline_logs (execution_id, timestamp, step_number, level, message, details) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                rows
+            )
+
+    def get_logs(
+        self,
+        execution_id: str,
+        step_number: Optional[int] = None,
+        level: Optional[str] = None,
+        limit: Optional[int] = None,
+        offset: int = 0
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        Log entries of an execution in chronological order
+
+        Returns (one page of entries, number of entries matching the filters).
+        """
+        where, params = ["execution_id = ?"], [execution_id]
+        if step_number is not None:
+            where.append("step_number = ?")
+            params.append(step_number)
+        if level is not None:
+            where.append("level = ?")
+            params.append(level.upper())
+        clause = " AND ".join(where)
+
+        with self._lock:
+            conn = self._connection()
+            total = conn.execute(f"SELECT COUNT(*) FROM pipeline_logs WHERE {clause}", params).fetchone()[0]
+            rows = conn.execute(
+                f"SELECT execution_id, timestamp, step_number, level, message, details FROM pipeline_logs "
+                f"WHERE {clause} ORDER BY id LIMIT ? OFFSET ?",
+                params + [-1 if limit is None else limit, offset]
+            ).fetchall()
+
+        entries = []
+        for row in rows:
+            entry = dict(row)
+            entry["timestamp"] = datetime.fromisoformat(entry["timestamp"])
+            entry["details"] = None if entry["details"] is None else json.loads(entry["details"])
+            entries.append(entry)
+        return entries, total
+
+    def prune(self, max_executions: int, max_age_days: int) -> int:
+        """
+        Apply the retention limits to finished executions and their logs
+
+        Keeps at most max_executions finished executions, none older than
+        max_age_days. Executions still running are never removed.
+        """
+        cutoff = (datetime.utcnow() - timedelta(days=max_age_days)).isoformat()
+        live = ", ".join("?" * len(LIVE_STATUSES))
+        with self._lock, self._connection() as conn:
+            expired = [row[0] for row in conn.execute(
+                f"SELECT execution_id FROM pipeline_executions WHERE status NOT IN ({live}) "
+                f"ORDER BY start_time DESC LIMIT -1 OFFSET ?",
+                LIVE_STATUSES + (max_executions,)
+            )]
+            expired += [row[0] for row in conn.execute(
+                f"SELECT execution_id FROM pipeline_executions WHERE status NOT IN ({live}) AND start_time < ?",
+                LIVE_STATUSES + (cutoff,)
+            )]
+            expired = list(dict.fromkeys(expired))
+            self._delete_keys(
+                conn, [("pipeline_logs", "execution_id"), ("pipeline_executions", "execution_id")], expired
+            )
+        if expired:
+            logger.info(f"Pruned {len(expired)} pipeline executions from history")
+        return len(expired)
+
+
+_execution_stores: PathRegistry[PipelineExecutionStore] = PathRegistry(PipelineExecutionStore)
+
+
+def get_execution_store(db_path: str = "data/pipeline_executions.db") -> PipelineExecutionStore:
+    """Get the shared execution store for a database file"""
+    return _execution_stores.get(db_path)
@@ -0,0 +1,97 @@
+"""
+Validators for screener CSV exports
+Remembers, per exported file, the content hash, the server's ETag /
+Last-Modified and a hash of the screen's constituents, so an unchanged
+download can be recognised (and not rewritten) and a conditional request
+can be sent on the next fetch
+"""
+
+import hashlib
+import os
+from datetime import datetime
+from typing import Any, Dict, Iterable, Optional
+
+from .shared_store import JsonSidecar, PathRegistry
+
+STATE_FILENAME = ".export_state.json"
+
+
+def content_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def constituents_hash(symbols: Iterable[str]) -> str:
+    """Order-independent hash of a screen's symbols"""
+    return hashlib.sha256("\n".join(sorted(set(symbols))).encode("utf-8")).hexdigest()
+
+
+class ExportState(JsonSidecar):
+    """
+    JSON sidecar of per-file export validators
+
+    An entry is only trusted while the file on disk still has the size and
+    mtime recorded with it, so a file edited or deleted by hand is fetched
+    and written again.
+    """
+
+    def __init__(self, directory: str):
+        super().__init__(directory, STATE_FILENAME)
+
+    def get(self, filename: str) -> Optional[Dict[str, Any]]:
+        """Stored entry for filename, or None if the file changed on disk since it was recorded"""
+        with self._lock:
+            entry = self._load().get(filename)
+        if entry is None:
+            return None
+        try:
+            stat = os.stat(os.path.join(self.directory, filename))
+        except OSError:
+            return None
+        if stat.st_size != entry.get("size") or stat.st_mtime_ns != entry.get("mtime_ns"):
+            return None
+        return entry
+
+    def conditional_headers(self, filename: str) -> Dict[str, str]:
+        """If-None-Match / If-Modified-Since for the stored response, when the server sent validators"""
+        entry = self.get(filename)
+        headers = {}
+        if entry and entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry and entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def record(
+        self,
+        filename: str,
+        digest: str,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+        symbols_digest: Optional[str] = None,
+        changed: bool = True
+    ) -> None:
+        """Store the validators of the file now on disk"""
+        stat = os.stat(os.path.join(self.directory, filename))
+        now = datetime.now().isoformat()
+        with self._lock:
+            entries = self._load()
+            previous = entries.get(filename, {})
+            entries[filename] = {
+                "sha256": digest,
+                "etag": etag,
+                "last_modified": last_modified,
+                "constituents_sha256": symbols_digest,
+                "size": stat.st_size,
+                "mtime_ns": stat.st_mtime_ns,
+                "fetched_at": now,
+                "changed_at": now if changed else previous.get("changed_at", now)
+            }
+            self._save()
+
+
+_export_states: PathRegistry[ExportState] = PathRegistry(ExportState)
+
+
+def get_export_state(directory: str) -> ExportState:
+    """Get the shared export state for a directory"""
+    return _export_states.get(directory)
@@ -0,0 +1,99 @@
+"""
+Process-wide caches of parsed files
+A value is parsed once per file version and shared until the file is rewritten
+"""
+
+import os
+import threading
+from typing import Any, Callable, Dict, Generic, Iterator, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+# (mtime_ns, size) of a file
+FileVersion = Tuple[int, int]
+
+
+def file_version(path: str) -> Optional[FileVersion]:
+    """(mtime_ns, size) of path, or None if it does not exist"""
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+class FileVersionCache(Generic[T]):
+    """
+    Parsed files keyed on (absolute path, mtime_ns, size)
+
+    The pipeline rewrites files in place; a stat() per lookup picks up the new
+    version. Concurrent misses on the same file wait for a single parse.
+    parse(path, version) builds the value and may raise on unreadable files.
+    """
+
+    def __init__(self, parse: Callable[[str, FileVersion], T]):
+        self._parse = parse
+        self._entries: Dict[str, Tuple[FileVersion, T]] = {}
+        self._path_locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _path_lock(self, path: str) -> threading.Lock:
+        with self._lock:
+            return self._path_locks.setdefault(path, threading.Lock())
+
+    def get(self, file_path) -> Optional[T]:
+        """
+        Return the parsed value for the current version of file_path
+
+        Returns None if the file does not exist. The value is shared between
+        callers and must be treated as read-only.
+        """
+        path = os.path.abspath(file_path)
+        version = file_version(path)
+        if version is None:
+            with self._lock:
+                self._entries.pop(path, None)
+            return None
+
+        entry = self._entries.get(path)
+        if entry is not None and entry[0] == version:
+            self.hits += 1
+            return entry[1]
+
+        with self._path_lock(path):
+            # Another caller may have parsed this version while we waited
+            entry = self._entries.get(path)
+            if entry is not None and entry[0] == version:
+                self.hits += 1
+                return entry[1]
+
+            self.misses += 1
+            value = self._parse(path, version)
+
+            # Only cache if the file was not rewritten while we were reading it
+            if file_version(path) == version:
+                with self._lock:
+                    self._entries[path] = (version, value)
+            return value
+
+    def values(self) -> Iterator[T]:
+        """Every cached value"""
+        return iter([value for _, value in list(self._entries.values())])
+
+    def invalidate(self, file_path=None) -> None:
+        with self._lock:
+            if file_path is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(os.path.abspath(file_path), None)
+
+    def get_stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "files": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": (self.hits / lookups * 100) if lookups > 0 else 0
+        }
@@ -0,0 +1,336 @@
+"""
+Batch allocation engine over screener returns for step 4
+Computes max-Sharpe, minimum-variance, equal-risk-contribution and
+inverse-volatility weights plus the long-only efficient frontier in one run
+from a single set of moments: the mean vector, covariance matrix and its
+factor are computed once and shared by every solve
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from scipy.optimize import minimize
+
+from .backtest_history import QuarterRecord
+from .sharpe_optimizer import PERIODS_PER_YEAR, SharpeOptimizer
+
+DEFAULT_FRONTIER_POINTS = 20
+MAX_FRONTIER_POINTS = 200
+
+QP_STEP_TOLERANCE = 1e-13
+QP_MAX_ITERATIONS_PER_ASSET = 10
+
+RISK_PARITY_TOLERANCE = 1e-10
+RISK_PARITY_MAX_SWEEPS = 500
+
+
+def quarterly_returns_frame(universe_data: Dict[str, Any]) -> pd.DataFrame:
+    """
+    Quarterly returns per screener (decimal) from universe metadata
+
+    Reads the entries as typed QuarterRecords; quarters without a numeric
+    return are skipped, as in src/portfolio_optimizer.py:extract_quarterly_returns().
+    Raises KeyError when there is no historical_performance section.
+    """
+    historical_data = universe_data['metadata']['historical_performance']
+    returns_data = {}
+    quarters: List[str] = []
+
+    for screener_key, screener_data in historical_data.items():
+        if 'quarterly_data' in screener_data:
+            returns = []
+            quarters = []
+
+            for entry in screener_data['quarterly_data']:
+                try:
+                    record = QuarterRecord.from_legacy_dict(entry)
+                except KeyError:
+                    continue
+                if record.return_pct is not None:
+                    # Percent to decimal
+                    returns.append(record.return_pct / 100.0)
+                    quarters.append(record.quarter)
+
+            if returns:
+                returns_data[screener_key] = returns
+
+    # Create DataFrame - all screeners should have same number of quarters
+    df = pd.DataFrame(returns_data)
+    df.index = quarters[:len(df)]
+    return df
+
+
+def factorise_covariance(covariance: np.ndarray) -> np.ndarray:
+    """
+    F with F F' = covariance
+
+    Cholesky when the matrix is positive definite; otherwise (more screeners
+    than quarters, duplicated screeners) an eigen-decomposition with negative
+    round-off eigenvalues clipped to zero.
+    """
+    try:
+        return np.linalg.cholesky(covariance)
+    except np.linalg.LinAlgError:
+        eigenvalues, eigenvectors = np.linalg.eigh(covariance)
+        return eigenvectors * np.sqrt(np.clip(eigenvalues, 0, None))
+
+
+def solve_long_only_qp(
+    covariance: np.ndarray,
+    equality: np.ndarray,
+    target: np.ndarray,
+    start: np.ndarray
+) -> Tuple[np.ndarray, bool]:
+    """
+    min w'Sigma w  subject to  equality @ w = target, w >= 0
+
+    Primal active-set method from a feasible start. Each iteration solves the
+    KKT system on the free (non-zero) screeners only, so starting from a
+    sparse point keeps every system as small as the final portfolio.
+
+    Returns:
+        (weights, converged)
+    """
+    weights = start.astype(float).copy()
+    free = weights > 0
+    n_constraints = equality.shape[0]
+    multiplier_tolerance = 1e-12 * max(float(np.abs(np.diag(covariance)).max()), 1e-300)
+
+    for _ in range(QP_MAX_ITERATIONS_PER_ASSET * len(weights) + 50):
+        free_index = np.flatnonzero(free)
+        size = len(free_index)
+        gradient = covariance @ weights
+
+        kkt = np.zeros((size + n_constraints, size + n_constraints))
+        kkt[:size, :size] = covariance[np.ix_(free_index, free_index)]
+        kkt[:size, size:] = equality[:, free_index].T
+        kkt[size:, :size] = equality[:, free_index]
+        rhs = np.concatenate([-gradient[free_index], np.zeros(n_constraints)])
+        solution = np.linalg.lstsq(kkt, rhs, rcond=None)[0]
+        step, multipliers = solution[:size], solution[size:]
+
+        if np.abs(step).max(initial=0.0) <= QP_STEP_TOLERANCE:
+            # Stationary on the free set: release the bound with the most negative multiplier
+            bound_multipliers = gradient + equality.T @ multipliers
+            bound_multipliers[free] = np.inf
+            release = int(np.argmin(bound_multipliers))
+            if bound_multipliers[release] >= -multiplier_tolerance:
+                return weights, True
+            free[release] = True
+            continue
+
+        decreasing = step < 0
+        ratios = -weights[free_index][decreasing] / step[decreasing]
+        if ratios.size and ratios.min() < 1:
+            blocking = int(np.argmin(ratios))
+            weights[free_index] += ratios[blocking] * step
+            blocked = free_index[decreasing][blocking]
+            weights[blocked] = 0.0
+            free[blocked] = False
+        else:
+            weights[free_index] += step
+
+    return weights, False
+
+
+class FrontierEngine(SharpeOptimizer):
+    """
+    Every long-only allocation method from one returns matrix
+
+    Variance problems use the active-set QP solver on the shared covariance;
+    frontier points are solved in order of increasing target return, each
+    warm-started from the previous point's active set. Portfolio volatilities
+    for a whole batch of weights come from the shared factor F (Sigma = FF').
+    """
+
+    def __init__(self, returns: pd.DataFrame, risk_free_rate: float = 0.02/4):
+        super().__init__(returns, risk_free_rate)
+        self.returns = returns
+        self.factor = factorise_covariance(self.covariance)
+
+    def _variance(self, weights: np.ndarray):
+        projected = self.factor.T @ weights
+        return float(projected @ projected), 2 * (self.factor @ projected)
+
+    def _min_variance(self, start: np.ndarray, target_return: Optional[float] = None) -> np.ndarray:
+        """Minimum-variance weights, optionally at a target quarterly return, from a feasible start"""
+        equality = np.ones((1, len(self.columns)))
+        target = np.ones(1)
+        if target_return is not None:
+            equality = np.vstack([equality, self.mean])
+            target = np.array([1.0, target_return])
+
+        weights, converged = solve_long_only_qp(self.covariance, equality, target, start)
+        if converged:
+            return _clean(weights)
+
+        # Degenerate active sets can cycle; SLSQP is slower but always terminates
+        constraints = [{'type': 'eq', 'fun': lambda x, row=row, value=value: row @ x - value,
+                        'jac': lambda x, row=row: row} for row, value in zip(equality, target)]
+        result = minimize(
+            self._variance,
+            start,
+            jac=True,
+            method='SLSQP',
+            bounds=tuple((0, 1) for _ in range(len(self.columns))),
+            constraints=constraints,
+            options={'ftol': 1e-12, 'maxiter': 500}
+        )
+        return _clean(result.x)
+
+    def min_variance(self) -> np.ndarray:
+        """Long-only minimum-variance weights"""
+        # Start at the least volatile screener so the active set grows from one asset
+        start = np.zeros(len(self.columns))
+        start[int(np.argmin(np.diag(self.covariance)))] = 1.0
+        return self._min_variance(start)
+
+    def max_sharpe(self) -> np.ndarray:
+        """Long-only maximum-Sharpe weights (same solve as optimize_portfolio)"""
+        return _clean(self.optimize().x)
+
+    def inverse_volatility(self) -> np.ndarray:
+        """Weights proportional to 1 / volatility, ignoring correlations"""
+        volatility = np.sqrt(np.diag(self.covariance))
+        if (volatility <= 0).any():
+            return self._positive_variance_only(lambda engine: engine.inverse_volatility())
+        inverse = 1 / volatility
+        return inverse / inverse.sum()
+
+    def risk_parity(self) -> np.ndarray:
+        """
+        Equal-risk-contribution weights: w_i (Sigma w)_i equal for every screener
+
+        Cyclical coordinate descent on the convex problem
+        min 1/2 w'Sigma w - sum(log w_i) / n, whose solution rescaled to sum to
+        one is the unique long-only ERC portfolio. Screeners with zero
+        variance get no weight.
+        """
+        variances = np.diag(self.covariance)
+        if (variances <= 0).any():
+            return self._positive_variance_only(lambda engine: engine.risk_parity())
+
+        n_assets = len(self.columns)
+        budget = 1 / n_assets
+        weights = 1 / np.sqrt(variances) / n_assets
+        cov_weights = self.covariance @ weights
+
+        for _ in range(RISK_PARITY_MAX_SWEEPS):
+            previous = weights.copy()
+            for i in range(n_assets):
+                b = cov_weights[i] - variances[i] * weights[i]
+                updated = (-b + np.sqrt(b * b + 4 * variances[i] * budget)) / (2 * variances[i])
+                cov_weights += self.covariance[:, i] * (updated - weights[i])
+                weights[i] = updated
+            if np.abs(weights - previous).max() <= RISK_PARITY_TOLERANCE * weights.max():
+                break
+
+        return weights / weights.sum()
+
+    def _positive_variance_only(self, method) -> np.ndarray:
+        """Run `method` on the screeners with positive variance; the rest get 0"""
+        keep = np.diag(self.covariance) > 0
+        weights = np.zeros(len(self.columns))
+        if keep.any():
+            weights[keep] = method(FrontierEngine(self.returns.loc[:, keep], self.risk_free_rate))
+        return weights
+
+    def efficient_frontier(
+        self,
+        points: int = DEFAULT_FRONTIER_POINTS,
+        min_variance: Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        """
+        Weights (points x screeners) of the long-only efficient frontier
+
+        Target quarterly returns run evenly from the minimum-variance
+        portfolio's return to the best single screener's mean return.
+        min_variance: the minimum-variance weights, when already solved
+        """
+        if min_variance is None:
+            min_variance = self.min_variance()
+        best = int(np.argmax(self.mean))
+        targets = np.linspace(float(min_variance @ self.mean), float(self.mean[best]), max(points, 2))
+
+        frontier = [min_variance]
+        previous = min_variance
+        for target in targets[1:]:
+            # Feasible warm start: move from the previous point towards the best screener
+            previous_return = float(previous @ self.mean)
+            gap = float(self.mean[best]) - previous_return
+            share = min(max((target - previous_return) / gap, 0.0), 1.0) if gap > 0 else 0.0
+            start = (1 - share) * previous
+            start[best] += share
+            previous = self._min_variance(start, target)
+            frontier.append(previous)
+        return np.vstack(frontier)
+
+    def batch_stats(self, weights: np.ndarray) -> Dict[str, np.ndarray]:
+        """Annualised return, volatility and Sharpe for each row of a weights matrix"""
+        weights = np.atleast_2d(weights)
+        quarterly_return = weights @ self.mean
+        quarterly_volatility = np.linalg.norm(weights @ self.factor, axis=1)
+        expected_return = quarterly_return * PERIODS_PER_YEAR
+        volatility = quarterly_volatility * self._annual_scale
+        with np.errstate(divide='ignore', invalid='ignore'):
+            sharpe = np.where(
+                volatility > 0, (expected_return - self.risk_free_rate * PERIODS_PER_YEAR) / volatility, 0.0
+            )
+        return {'expected_annual_return': expected_return, 'annual_volatility': volatility, 'sharpe_ratio': sharpe}
+
+    def risk_contributions(self, weights: np.ndarray) -> np.ndarray:
+        """Share of portfolio variance contributed by each screener (sums to 1)"""
+        contributions = weights * (self.covariance @ weights)
+        total = contributions.sum()
+        return contributions / total if total > 0 else np.zeros_like(weights)
+
+    def run(self, frontier_points: int = DEFAULT_FRONTIER_POINTS) -> Dict[str, Any]:
+        """
+        Every allocation method and the efficient frontier
+
+        Returns:
+            Dict with 'methods' (weights, stats and risk contributions per
+            method) and 'efficient_frontier' (one entry per point)
+        """
+        methods = {
+            'max_sharpe': self.max_sharpe(),
+            'min_variance': self.min_variance(),
+            'risk_parity': self.risk_parity(),
+            'inverse_volatility': self.inverse_volatility(),
+            'equal_weight': self.initial_weights(),
+        }
+        method_weights = np.vstack(list(methods.values()))
+        method_stats = self.batch_stats(method_weights)
+
+        frontier = self.efficient_frontier(frontier_points, min_variance=methods['min_variance'])
+        frontier_stats = self.batch_stats(frontier)
+
+        return {
+            'screeners': self.columns,
+            'methods': {
+                name: {
+                    'weights': self._as_dict(weights),
+                    'risk_contributions': self._as_dict(self.risk_contributions(weights)),
+                    **{stat: float(values[row]) for stat, values in method_stats.items()}
+                }
+                for row, (name, weights) in enumerate(methods.items())
+            },
+            'efficient_frontier': [
+                {
+                    **{stat: float(values[row]) for stat, values in frontier_stats.items()},
+                    'weights': self._as_dict(weights)
+                }
+                for row, weights in enumerate(frontier)
+            ]
+        }
+
+    def _as_dict(self, values: np.ndarray) -> Dict[str, float]:
+        return {column: float(value) for column, value in zip(self.columns, values)}
+
+
+def _clean(weights: np.ndarray) -> np.ndarray:
+    """Clip solver round-off outside [0, 1] and renormalise to sum to one"""
+    weights = np.clip(weights, 0, 1)
+    total = weights.sum()
+    return weights / total if total > 0 else np.full(len(weights), 1 / len(weights))
@@ -0,0 +1,97 @@
+"""
+Token-bucket pacing for IB Gateway traffic
+IBKR disconnects clients that exceed ~50 messages/second and throttles
+reqMatchingSymbols to one request per second; every shared session paces
+its outbound messages through these buckets so concurrent callers stay inside the limits
+"""
+
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+# Stay a little under IBKR's 50 msg/s hard limit
+MAX_MESSAGES_PER_SECOND = 45.0
+
+# reqMatchingSymbols is throttled separately by the gateway
+MATCHING_SYMBOLS_PER_SECOND = 1.0
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket
+
+    acquire() reserves tokens immediately and sleeps outside the lock until the
+    reservation is covered, so waiting callers are served in arrival order and
+    the long-run rate never exceeds `rate` tokens per second.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep
+    ):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else rate)
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = self.capacity
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+        self.acquired = 0
+        self.throttled = 0
+        self.total_wait = 0.0
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def reserve(self, tokens: float = 1) -> float:
+        """Take tokens now (possibly going into debt) and return the seconds to wait before using them"""
+        with self._lock:
+            self._refill(self._clock())
+            self._tokens -= tokens
+            self.acquired += 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+            if wait > 0:
+                self.throttled += 1
+                self.total_wait += wait
+            return wait
+
+    def acquire(self, tokens: float = 1) -> float:
+        """Block until `tokens` are available; returns the time spent waiting"""
+        wait = self.reserve(tokens)
+        if wait > 0:
+            self._sleep(wait)
+        return wait
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "rate": self.rate,
+                "acquired": self.acquired,
+                "throttled": self.throttled,
+                "total_wait_seconds": round(self.total_wait, 3)
+            }
+
+
+class IBKRPacer:
+    """Message-rate buckets for one IB Gateway connection"""
+
+    def __init__(
+        self,
+        messages_per_second: float = MAX_MESSAGES_PER_SECOND,
+        matching_symbols_per_second: float = MATCHING_SYMBOLS_PER_SECOND
+    ):
+        self.messages = TokenBucket(messages_per_second)
+        self.matching_symbols = TokenBucket(matching_symbols_per_second, capacity=1)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "messages": self.messages.get_stats(),
+            "matching_symbols": self.matching_symbols.get_stats()
+        }
@@ -0,0 +1,466 @@
+"""
+Shared IBKR session manager
+Keeps long-lived IB Gateway connections that every IBKR-touching service reuses
+instead of opening its own socket and paying the connection handshake per call
+"""
+
+import inspect
+import itertools
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional, Tuple
+
+from ibapi.client import EClient
+from ibapi.wrapper import EWrapper
+
+from .ibkr_rate_limiter import IBKRPacer
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 4002
+
+# Account, position and contract lookups share one socket; order traffic keeps its own
+# client ID so orderStatus/openOrder callbacks stay bound to the client that placed them
+DATA_CLIENT_ID = 10
+ORDER_CLIENT_ID = 20
+
+# Request IDs start well above typical order IDs so error(reqId, ...) callbacks
+# can be routed without ambiguity between the two ID spaces
+REQUEST_ID_BASE = 1_000_000
+
+# Informational gateway messages that do not concern any caller
+INFO_ERROR_CODES = {2104, 2106, 2107, 2108, 2119, 2158}
+
+# EWrapper callbacks whose first argument identifies an order rather than a request
+ORDER_CALLBACKS = {"openOrder", "orderStatus"}
+
+# Order lifecycle callbacks also delivered to order observers, whoever owns the order
+ORDER_EVENT_CALLBACKS = ORDER_CALLBACKS | {"completedOrder", "execDetails", "commissionReport", "error"}
+
+# EWrapper callbacks whose first argument identifies the originating request
+REQUEST_CALLBACKS = {
+    name for name, func in inspect.getmembers(EWrapper, inspect.isfunction)
+    if not name.startswith("_")
+    and list(inspect.signature(func).parameters)[1:2] in (["reqId"], ["requestId"], ["tickerId"])
+}
+
+# EClient attributes that are part of the connection lifecycle owned by the session
+LIFECYCLE_METHODS = {"connect", "disconnect", "run", "reset", "setConnState", "keyboardInterrupt"}
+
+
+class IBKRSession(EWrapper, EClient):
+    """
+    One long-lived connection to IB Gateway shared by many callers
+
+    Callbacks are routed to the handler registered for their request ID (or order ID);
+    callbacks without an owner (positions, portfolio updates, gateway notices) are
+    broadcast to every subscribed handler. Handlers are plain EWrapper implementations,
+    so the existing legacy wrapper classes can be used unchanged as callback sinks.
+    """
+
+    def __init__(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, client_id: int = DATA_CLIENT_ID):
+        EClient.__init__(self, self)
+        # EClient.reset() clears host/port/clientId on disconnect, so keep our own copy
+        self.gateway_host = host
+        self.gateway_port = port
+        self.client_id = client_id
+
+        self.account_id: Optional[str] = None
+        self.accounts_list: str = ""
+        self.connected_since: Optional[float] = None
+        self.reconnect_count = 0
+
+        self._state_lock = threading.RLock()
+        self._connect_lock = threading.Lock()
+        self._handshake_done = threading.Event()
+        self._accounts_received = threading.Event()
+        self._reader_thread: Optional[threading.Thread] = None
+
+        self._request_ids = itertools.count(REQUEST_ID_BASE)
+        self._next_order_id: Optional[int] = None
+
+        self._request_handlers: Dict[int, Any] = {}
+        self._order_handlers: Dict[int, Any] = {}
+        self._subscribers: List[Any] = []
+        self._order_observers: List[Any] = []
+
+        # Every caller shares the gateway's per-connection message budget
+        self.pacer = IBKRPacer()
+
+    # ------------------------------------------------------------------
+    # Connection lifecycle
+    # ------------------------------------------------------------------
+
+    @property
+    def is_ready(self) -> bool:
+        """True once the socket is up and the handshake (order ID, accounts) has completed"""
+        return self.isConnected() and self._handshake_done.is_set() and self._accounts_received.is_set()
+
+    def ensure_connected(self, timeout: float = 10) -> bool:
+        """
+        Return a ready connection, (re)connecting if the link is down
+
+        Only the first caller after startup or a dropped link pays the handshake;
+        everyone else returns immediately.
+        """
+        if self.is_ready:
+            return True
+
+        with self._connect_lock:
+            if self.is_ready:
+                return True
+
+            if self.isConnected():
+                # Half-open socket from a previous attempt - start clean
+                EClient.disconnect(self)
+
+            if self.connected_since is not None:
+                self.reconnect_count += 1
+                logger.info(f"Reconnecting IBKR session {self.gateway_host}:{self.gateway_port} clientId={self.client_id}")
+
+            self._handshake_done.clear()
+            self._accounts_received.clear()
+
+            self.connect(self.gateway_host, self.gateway_port, clientId=self.client_id)
+            if not self.isConnected():
+                logger.error(f"Failed to connect to IB Gateway at {self.gateway_host}:{self.gateway_port} (clientId={self.client_id})")
+                return False
+
+            self._reader_thread = threading.Thread(
+                target=self.run,
+                name=f"ibkr-session-{self.client_id}",
+                daemon=True
+            )
+            self._reader_thread.start()
+
+            deadline = time.time() + timeout
+            if not self._handshake_done.wait(timeout):
+                logger.error(f"Timed out waiting for IBKR handshake (clientId={self.client_id})")
+                return False
+            if not self._accounts_received.wait(max(0.0, deadline - time.time())):
+                logger.error(f"Timed out waiting for IBKR managed accounts (clientId={self.client_id})")
+                return False
+
+            self.connected_since = time.time()
+            logger.info(f"IBKR session ready: {self.gateway_host}:{self.gateway_port} clientId={self.client_id} account={self.account_id}")
+            return True
+
+    def close(self) -> None:
+        """Close the underlying socket; the next ensure_connected() reconnects"""
+        with self._connect_lock:
+            if self.isConnected():
+                EClient.disconnect(self)
+            self._handshake_done.clear()
+            self._accounts_received.clear()
+
+    # ------------------------------------------------------------------
+    # Outbound pacing
+    # ------------------------------------------------------------------
+
+    def sendMsg(self, msg):
+        self.pacer.messages.acquire()
+        super().sendMsg(msg)
+
+    def reqMatchingSymbols(self, reqId: int, pattern: str):
+        self.pacer.matching_symbols.acquire()
+        super().reqMatchingSymbols(reqId, pattern)
+
+    # ------------------------------------------------------------------
+    # Request / order ID allocation and callback routing
+    # ------------------------------------------------------------------
+
+    def next_request_id(self) -> int:
+        """Allocate a request ID that is unique across every caller of this session"""
+        with self._state_lock:
+            return next(self._request_ids)
+
+    def register_request(self, handler: Any, req_id: Optional[int] = None) -> int:
+        """Route callbacks for a request ID to handler; allocates the ID when not given"""
+        if req_id is None:
+            req_id = self.next_request_id()
+        with self._state_lock:
+            self._request_handlers[req_id] = handler
+        return req_id
+
+    def release_request(self, req_id: int) -> None:
+        """Stop routing callbacks for a finished request"""
+        with self._state_lock:
+            self._request_handlers.pop(req_id, None)
+
+    def register_order(self, handler: Any) -> int:
+        """Allocate the next valid order ID and route its order callbacks to handler"""
+        with self._state_lock:
+            if self._next_order_id is None:
+                raise RuntimeError("IBKR session has no valid order ID yet - call ensure_connected() first")
+            order_id = self._next_order_id
+            self._next_order_id += 1
+            self._order_handlers[order_id] = handler
+        return order_id
+
+    def release_order(self, order_id: int) -> None:
+        """Stop routing callbacks for an order"""
+        with self._state_lock:
+            self._order_handlers.pop(order_id, None)
+
+    @property
+    def next_order_id(self) -> Optional[int]:
+        """Next order ID that register_order() will hand out"""
+        return self._next_order_id
+
+    def subscribe(self, handler: Any) -> None:
+        """Receive callbacks that are not tied to a registered request or order"""
+        with self._state_lock:
+            if handler not in self._subscribers:
+                self._subscribers.append(handler)
+
+    def unsubscribe(self, handler: Any) -> None:
+        with self._state_lock:
+            if handler in self._subscribers:
+                self._subscribers.remove(handler)
+
+    def observe_orders(self, handler: Any) -> None:
+        """
+        Receive every order lifecycle callback (ORDER_EVENT_CALLBACKS)
+
+        Unlike subscribers, observers also see the callbacks of orders and
+        requests registered to another handler, so an order tracker can follow
+        orders placed by any caller of this session.
+        """
+        with self._state_lock:
+            if handler not in self._order_observers:
+                self._order_observers.append(handler)
+
+    def unobserve_orders(self, handler: Any) -> None:
+        with self._state_lock:
+            if handler in self._order_observers:
+                self._order_observers.remove(handler)
+
+    @contextmanager
+    def subscription(self, handler: Any):
+        """Context manager form of subscribe()/unsubscribe()"""
+        self.subscribe(handler)
+        try:
+            yield handler
+        finally:
+            self.unsubscribe(handler)
+
+    def bind(self, handler: Any, subscribe: bool = True) -> "IBKRSessionView":
+        """
+        Return a view that sends a legacy wrapper's requests over this session
+
+        The handshake callbacks the session already consumed are replayed to the handler
+        so code that checks handler.connected / handler.account_id keeps working.
+        Pass subscribe=False for handlers that only consume callbacks of requests
+        they register themselves.
+        """
+        if subscribe:
+            self.subscribe(handler)
+        self._replay_handshake(handler)
+        return IBKRSessionView(self, handler)
+
+    def _replay_handshake(self, handler: Any) -> None:
+        for name, args in (("connectAck", ()), ("managedAccounts", (self.accounts_list,))):
+            callback = getattr(handler, name, None)
+            if callback is not None and (name != "managedAccounts" or self.accounts_list):
+                self._invoke(callback, name, args)
+
+    def _handlers_for(self, name: str, args: Tuple) -> List[Any]:
+        with self._state_lock:
+            handler = None
+            if args and name in REQUEST_CALLBACKS:
+                handler = self._request_handlers.get(args[0])
+                if handler is None and name == "error":
+                    handler = self._order_handlers.get(args[0])
+            elif args and name in ORDER_CALLBACKS:
+                handler = self._order_handlers.get(args[0])
+            handlers = [handler] if handler is not None else list(self._subscribers)
+            if name in ORDER_EVENT_CALLBACKS:
+                handlers += [observer for observer in self._order_observers if observer not in handlers]
+            return handlers
+
+    def _dispatch(self, name: str, args: Tuple, kwargs: Dict[str, Any]) -> None:
+        for handler in self._handlers_for(name, args):
+            callback = getattr(handler, name, None)
+            if callback is not None:
+                self._invoke(callback, name, args, kwargs)
+
+    @staticmethod
+    def _invoke(callback, name: str, args: Tuple, kwargs: Optional[Dict[str, Any]] = None) -> None:
+        # A failing handler must never take down the shared reader thread
+        try:
+            callback(*args, **(kwargs or {}))
+        except Exception as e:
+            logger.exception(f"IBKR callback {name} raised: {e}")
+
+    # ------------------------------------------------------------------
+    # Handshake callbacks
+    # ------------------------------------------------------------------
+
+    def connectAck(self):
+        super().connectAck()
+        self._dispatch("connectAck", (), {})
+
+    def connectionClosed(self):
+        super().connectionClosed()
+        logger.warning(f"IBKR session closed: {self.gateway_host}:{self.gateway_port} clientId={self.client_id}")
+        self._handshake_done.clear()
+        self._accounts_received.clear()
+        self._dispatch("connectionClosed", (), {})
+
+    def nextValidId(self, orderId: int):
+        super().nextValidId(orderId)
+        with self._state_lock:
+            self._next_order_id = max(orderId, self._next_order_id or 0)
+        self._handshake_done.set()
+
+    def managedAccounts(self, accountsList: str):
+        super().managedAccounts(accountsList)
+        self.accounts_list = accountsList
+        accounts = [a for a in accountsList.split(",") if a]
+        self.account_id = accounts[0] if accounts else None
+        self._accounts_received.set()
+        self._dispatch("managedAccounts", (accountsList,), {})
+
+    def error(self, reqId, errorCode, errorString, *args):
+        if errorCode not in INFO_ERROR_CODES:
+            logger.debug(f"IBKR error reqId={reqId} code={errorCode}: {errorString}")
+        self._dispatch("error", (reqId, errorCode, errorString) + args, {})
+
+    def get_status(self) -> Dict[str, Any]:
+        """Connection and routing state for diagnostics"""
+        with self._state_lock:
+            return {
+                "host": self.gateway_host,
+                "port": self.gateway_port,
+                "client_id": self.client_id,
+                "connected": self.is_ready,
+                "account_id": self.account_id,
+                "connected_since": self.connected_since,
+                "reconnect_count": self.reconnect_count,
+                "pending_requests": len(self._request_handlers),
+                "tracked_orders": len(self._order_handlers),
+                "subscribers": len(self._subscribers),
+                "order_observers": len(self._order_observers),
+                "pacing": self.pacer.get_stats()
+            }
+
+
+def _make_forwarder(name: str):
+    def forward(self, *args, **kwargs):
+        self._dispatch(name, args, kwargs)
+    forward.__name__ = name
+    forward.__doc__ = f"Route EWrapper.{name} to the owning handler or subscribers"
+    return forward
+
+
+for _name, _func in inspect.getmembers(EWrapper, inspect.isfunction):
+    if not _name.startswith("_") and _name not in IBKRSession.__dict__:
+        setattr(IBKRSession, _name, _make_forwarder(_name))
+
+
+# EClient request methods a bound view sends over the shared socket
+_CLIENT_METHODS = {
+    name for name, _ in inspect.getmembers(EClient, inspect.isfunction)
+    if not name.startswith("_") and name not in LIFECYCLE_METHODS
+} | {"clientId"}
+
+
+class IBKRSessionView:
+    """
+    Handler-facing view of a shared session
+
+    Request methods (reqX, cancelX, placeOrder, ...) go to the shared socket and all other
+    attributes resolve on the wrapped handler, so legacy code written against its own
+    EClient subclass runs unchanged. disconnect() only detaches the handler.
+    """
+
+    def __init__(self, session: IBKRSession, handler: Any):
+        object.__setattr__(self, "_session", session)
+        object.__setattr__(self, "_handler", handler)
+
+    @property
+    def session(self) -> IBKRSession:
+        return self._session
+
+    @property
+    def handler(self) -> Any:
+        return self._handler
+
+    def __getattr__(self, name: str):
+        if name in _CLIENT_METHODS:
+            return getattr(self._session, name)
+        return getattr(self._handler, name)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        setattr(self._handler, name, value)
+
+    def disconnect(self) -> None:
+        """Detach the handler; the shared connection stays open for other callers"""
+        self._session.unsubscribe(self._handler)
+        if hasattr(self._handler, "connected"):
+            self._handler.connected = False
+
+
+class IBKRSessionManager:
+    """Process-wide registry of shared IBKR sessions keyed by (host, port, client_id)"""
+
+    def __init__(self):
+        self._sessions: Dict[Tuple[str, int, int], IBKRSession] = {}
+        self._lock = threading.Lock()
+
+    def get_session(
+        self,
+        host: str = DEFAULT_HOST,
+        port: int = DEFAULT_PORT,
+        client_id: int = DATA_CLIENT_ID
+    ) -> IBKRSession:
+        """Get (creating if needed) the shared session for a gateway and client ID"""
+        key = (host, port, client_id)
+        with self._lock:
+            session = self._sessions.get(key)
+            if session is None:
+                session = IBKRSession(host, port, client_id)
+                self._sessions[key] = session
+            return session
+
+    def connect(
+        self,
+        host: str = DEFAULT_HOST,
+        port: int = DEFAULT_PORT,
+        client_id: int = DATA_CLIENT_ID,
+        timeout: float = 10
+    ) -> Optional[IBKRSession]:
+        """Get a ready session, or None if IB Gateway cannot be reached"""
+        session = self.get_session(host, port, client_id)
+        return session if session.ensure_connected(timeout) else None
+
+    def close_all(self) -> None:
+        """Close every shared connection"""
+        with self._lock:
+            sessions = list(self._sessions.values())
+        for session in sessions:
+            try:
+                session.close()
+            except Exception as e:
+                logger.warning(f"Error closing IBKR session clientId={session.client_id}: {e}")
+
+    def get_status(self) -> List[Dict[str, Any]]:
+        """Status of every known session"""
+        with self._lock:
+            sessions = list(self._sessions.values())
+        return [session.get_status() for session in sessions]
+
+
+# Singleton instance shared by all services in the process
+_session_manager = None
+
+
+def get_ibkr_session_manager() -> IBKRSessionManager:
+    """Get the process-wide IBKR session manager"""
+    global _session_manager
+    if _session_manager is None:
+        _session_manager = IBKRSessionManager()
+    return _session_manager
@@ -16,13 +16,26 @@ sys.path.append(str(legacy_path))
 
 from ib_utils.ib_fetch import IBApi
 from ..interfaces import IAccountService
+from ..ibkr_session_manager import get_ibkr_session_manager, DATA_CLIENT_ID
 from ...core.config import IBKRSettings
 
 
+class AccountSummaryApi(IBApi):
+    """Legacy account wrapper that also signals when the account summary is complete"""
+
+    def __init__(self):
+        super().__init__()
+        self.summary_received = threading.Event()
+
+    def accountSummaryEnd(self, reqId: int):
+        super().accountSummaryEnd(reqId)
+        self.summary_received.set()
+
+
 class AccountService(IAccountService):
     """
     IBKR account service implementation
-    Wraps legacy ib_fetch.py functionality with async interface
+    Wraps legacy ib_fetch.py functionality with async interface over the shared IBKR session
     """
 
     def __init__(self):
@@ -30,9 +43,8 @@ class AccountService(IAccountService):
         settings = IBKRSettings()
         self.host = settings.ibkr_host
         self.port = settings.ibkr_port
-        self.client_id = 3  # Same as legacy implementation
+        self.client_id = DATA_CLIENT_ID  # Shared data session
         self.connection_timeout = settings.connection_timeout
-        self.account_id_timeout = 2
         self.data_timeout = 3
 
     async def get_account_total_value(self) -> Tuple[Optional[float], Optional[str]]:
@@ -49,43 +61,32 @@ class AccountService(IAccountService):
 
     def _sync_get_account_value(self) -> Tuple[Optional[float], Optional[str]]:
         """
-        Synchronous IBKR account value fetching (exact legacy behavior)
+        Synchronous IBKR account value fetching over the shared IBKR session
         """
-        # Initialize API client
-        app = IBApi()
+        # Callback sink for this request; the socket itself is shared
+        app = AccountSummaryApi()
+        session = get_ibkr_session_manager().get_session(self.host, self.port, self.client_id)
+        req_id = None
 
         try:
-            # Connect to IB Gateway (host machine via Docker networking)
-            app.connect(self.host, self.port, clientId=self.client_id)
-
-            # Start message processing in separate thread
-            api_thread = threading.Thread(target=app.run, daemon=True)
-            api_thread.start()
-
-            # Wait for connection
-            start_time = time.time()
-            while not app.connected and (time.time() - start_time) < self.connection_timeout:
-                time.sleep(0.1)
-
-            if not app.connected:
+            # Reuses the live connection - only the first call pays the handshake
+            if not session.ensure_connected(self.connection_timeout):
                 print("Failed to connect to IB Gateway")
                 return None, None
 
-            # Wait a moment for account ID
-            time.sleep(self.account_id_timeout)
-
-            if not app.account_id:
+            if not session.account_id:
                 print("No account ID received")
                 return None, None
 
             # Request account summary
-            app.reqAccountSummary(9002, "All", "NetLiquidation")
+            req_id = session.register_request(app)
+            session.reqAccountSummary(req_id, "All", "NetLiquidation")
 
-            # Wait for data to be received
-            time.sleep(self.data_timeout)
+            # Wait until accountSummaryEnd arrives rather than a fixed delay
+            app.summary_received.wait(self.data_timeout)
 
             # Cancel subscription
-            app.cancelAccountSummary(9002)
+            session.cancelAccountSummary(req_id)
 
             # Get total value
             total_value = None
@@ -95,19 +96,16 @@ class AccountService(IAccountService):
                 currency = app.account_summary["NetLiquidation"]["currency"]
                 print(f"Account Total Value: ${total_value:,.2f} {currency}")
 
-            # Disconnect
-            app.disconnect()
-
             return total_value, currency
 
         except Exception as e:
             print(f"Error fetching account value: {e}")
-            try:
-                app.disconnect()
-            except:
-                pass
             return None, None
 
+        finally:
+            if req_id is not None:
+                session.release_request(req_id)
+
     async def test_connection(self) -> Dict[str, Any]:
         """
         Test IBKR connection without fetching account data
@@ -120,41 +118,20 @@ class AccountService(IAccountService):
             "error_message": None
         }
 
-        app = IBApi()
+        session = get_ibkr_session_manager().get_session(self.host, self.port, self.client_id)
 
         try:
-            # Connect to IB Gateway
-            app.connect(self.host, self.port, clientId=self.client_id + 100)  # Different client ID
-
-            # Start message processing
-            api_thread = threading.Thread(target=app.run, daemon=True)
-            api_thread.start()
-
-            # Wait for connection
-            timeout_start = time.time()
-            while not app.connected and (time.time() - timeout_start) < self.connection_timeout:
-                time.sleep(0.1)
-
-            if app.connected:
-                # Wait for account ID
-                time.sleep(self.account_id_timeout)
+            loop = asyncio.get_event_loop()
+            connected = await loop.run_in_executor(None, session.ensure_connected, self.connection_timeout)
 
+            if connected:
                 result["connected"] = True
-                result["account_id"] = app.account_id
-                result["connection_time"] = time.time() - start_time
+                result["account_id"] = session.account_id
             else:
                 result["error_message"] = "Connection timeout"
 
         except Exception as e:
             result["error_message"] = str(e)
 
-        finally:
-            try:
-                app.disconnect()
-            except:
-                pass
-
-            if not result["connected"]:
-                result["connection_time"] = time.time() - start_time
-
-        return result
\ No newline at end of file
+        result["connection_time"] = time.time() - start_time
+        return result
@@ -6,7 +6,7 @@ Maintains 100% behavioral compatibility with CLI implementation
 
 import os
 import sys
-from typing import Dict, Set
+from typing import Dict, Optional, Set
 
 # Add the project root to the Python path to import legacy modules
 current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -105,7 +105,7 @@ class CurrencyService(ICurrencyService):
         """
         legacy_currency.display_exchange_rate_summary(exchange_rates)
 
-    def run_currency_update(self) -> bool:
+    def run_currency_update(self, exchange_rates: Optional[Dict[str, float]] = None) -> bool:
         """
         Execute complete 3-step currency update workflow
 
@@ -117,7 +117,13 @@ class CurrencyService(ICurrencyService):
         - Error handling: Early exit on any step failure
         - Top-level exception handler for unexpected errors
 
+        Args:
+            exchange_rates: Rates fetched ahead of time (the pipeline downloads them
+                while earlier steps run); fetched here when None
+
         Returns:
             bool: True if entire workflow completed successfully, False on failure
         """
-        return legacy_currency.main()
\ No newline at end of file
+        if exchange_rates is None:
+            return legacy_currency.main()
+        return legacy_currency.main(exchange_rates)
\ No newline at end of file
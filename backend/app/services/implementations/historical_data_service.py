@@ -60,18 +60,21 @@ class HistoricalDataService(IHistoricalDataService):
         """
         Parse all backtest CSV files for configured screeners
 
-        Wraps history_parser.get_all_backtest_data() with async interface
+        Async equivalent of history_parser.get_all_backtest_data()
 
         Returns:
             Dict mapping screener IDs to their parsed performance data
             Each screener entry contains metadata, quarterly_performance, and statistics
         """
-        # Run in thread pool to avoid blocking
-        result = await asyncio.get_running_loop().run_in_executor(
-            None,
-            history_parser.get_all_backtest_data
-        )
-        return result
+        # Parse every screener's file concurrently in the thread pool;
+        # unchanged files are served from the per-version parse cache
+        loop = asyncio.get_running_loop()
+        screens = settings.uncle_stock.uncle_stock_screens
+        results = await asyncio.gather(*(
+            loop.run_in_executor(None, history_parser.get_backtest_data, screen_name)
+            for screen_name in screens.values()
+        ))
+        return dict(zip(screens.keys(), results))
 
     async def update_universe_with_history(self) -> bool:
         """
@@ -187,11 +190,7 @@ class HistoricalDataService(IHistoricalDataService):
             }
 
         screen_name = settings.uncle_stock.uncle_stock_screens[screener_id]
-        # Convert screen name to filename format (same logic as in get_all_backtest_data)
-        safe_name = screen_name.replace(' ', '_').replace('/', '_')
-        csv_path = f"data/files_exports/{safe_name}_backtest_results.csv"
-
-        return await self.parse_backtest_csv(csv_path)
+        return await self.parse_backtest_csv(history_parser.backtest_csv_path(screen_name))
 
     def get_available_screeners(self) -> Dict[str, str]:
         """
@@ -17,18 +17,35 @@ from ibapi.contract import Contract
 import threading
 import time
 import os
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError, as_completed
 from pathlib import Path
 from typing import Dict, Any, List, Optional, Tuple
 import unicodedata
 
 from ..interfaces import IIBKRSearchService
 from ..database_service import get_database_service
+from ..ibkr_session_manager import get_ibkr_session_manager, DATA_CLIENT_ID, INFO_ERROR_CODES
+from ..universe_store import get_universe_store
+from ...core.config import IBKRSettings
+from ...core.exceptions import IBKRConnectionError
+
+# Upper bound on a single contract-details / matching-symbols round trip
+REQUEST_TIMEOUT = 30
+
+# Errors that end a contract-details / matching-symbols request: no security
+# definition, no matching data, request validation failed. Other codes
+# (warnings, pacing notices) leave the request waiting for its data.
+REQUEST_FATAL_ERROR_CODES = {162, 200, 321}
 
 
 class IBApi(EWrapper, EClient):
     """
     IBKR API wrapper - identical to legacy implementation
     Extends EWrapper and EClient for Interactive Brokers API communication
+
+    Requests registered through expect() get their own result buffer and a
+    Future resolved on contractDetailsEnd / symbolSamples / error, so callers
+    wait on their exact request instead of polling shared completion flags.
     """
 
     def __init__(self):
@@ -39,6 +56,35 @@ class IBApi(EWrapper, EClient):
         self.next_req_id = 1
         self.search_completed = False
         self.symbol_search_completed = False
+        self._pending: Dict[int, Tuple[Future, List[Dict[str, Any]]]] = {}
+        self._pending_lock = threading.Lock()
+
+    def expect(self, req_id: int) -> Future:
+        """Register a pending request; the returned Future resolves to its result list"""
+        future: Future = Future()
+        with self._pending_lock:
+            self._pending[req_id] = (future, [])
+        return future
+
+    def discard(self, req_id: int) -> None:
+        """Drop a pending request (after timeout) so late callbacks are ignored"""
+        with self._pending_lock:
+            self._pending.pop(req_id, None)
+
+    def _results_for(self, req_id: int) -> Optional[List[Dict[str, Any]]]:
+        with self._pending_lock:
+            pending = self._pending.get(req_id)
+        return pending[1] if pending else None
+
+    def _resolve(self, req_id: int) -> bool:
+        with self._pending_lock:
+            pending = self._pending.pop(req_id, None)
+        if pending is None:
+            return False
+        future, results = pending
+        if not future.done():
+            future.set_result(results)
+        return True
 
     def connectAck(self):
         super().connectAck()
@@ -47,6 +93,12 @@ class IBApi(EWrapper, EClient):
     def connectionClosed(self):
         super().connectionClosed()
         self.connected = False
+        # Nothing more will arrive for in-flight requests
+        with self._pending_lock:
+            pending, self._pending = self._pending, {}
+        for future, results in pending.values():
+            if not future.done():
+                future.set_result(results)
 
     def contractDetails(self, reqId, contractDetails):
         super().contractDetails(reqId, contractDetails)
@@ -61,17 +113,23 @@ class IBApi(EWrapper, EClient):
             "contract": contract
         }
         print(f"        IBKR API RESPONSE - contractDetails: {contract.symbol} ({contractDetails.longName}) on {contract.exchange}, conId={contract.conId}")
-        self.contract_details.append(details)
+        results = self._results_for(reqId)
+        (results if results is not None else self.contract_details).append(details)
 
     def contractDetailsEnd(self, reqId):
         super().contractDetailsEnd(reqId)
-        if not self.contract_details:
+        results = self._results_for(reqId)
+        if not (results if results is not None else self.contract_details):
             print(f"        IBKR API RESPONSE - contractDetailsEnd: No contract details found for reqId={reqId}")
-        self.search_completed = True
+        if not self._resolve(reqId):
+            self.search_completed = True
 
     def symbolSamples(self, reqId, contractDescriptions):
         super().symbolSamples(reqId, contractDescriptions)
-        self.matching_symbols = []
+        results = self._results_for(reqId)
+        if results is None:
+            self.matching_symbols = []
+            results = self.matching_symbols
         print(f"        IBKR API RESPONSE - symbolSamples: Found {len(contractDescriptions)} symbols")
         for desc in contractDescriptions:
             contract = desc.contract
@@ -84,18 +142,22 @@ class IBApi(EWrapper, EClient):
             }
             print(f"          Symbol: {contract.symbol} ({contract.secType}) on {contract.exchange} - {contract.currency}")
             if contract.secType == "STK":  # Only stocks
-                self.matching_symbols.append(details)
+                results.append(details)
+        # symbolSamples is the only response to reqMatchingSymbols
+        self.symbolSamplesEnd(reqId)
 
     def symbolSamplesEnd(self, reqId):
-        super().symbolSamplesEnd(reqId)
-        if not self.matching_symbols:
+        results = self._results_for(reqId)
+        if not (results if results is not None else self.matching_symbols):
             print(f"        IBKR API RESPONSE - symbolSamplesEnd: No matching symbols found for reqId={reqId}")
-        self.symbol_search_completed = True
+        if not self._resolve(reqId):
+            self.symbol_search_completed = True
 
     def error(self, reqId, errorCode, errorString, advancedOrderRejectJson=""):
-        if errorCode != 2104 and errorCode != 2106:  # Skip common harmless messages
+        if errorCode not in INFO_ERROR_CODES:  # Skip harmless connectivity notices
             print(f"        IBKR API ERROR - reqId={reqId}, code={errorCode}: {errorString}")
-        pass
+        if reqId is not None and reqId >= 0 and errorCode in REQUEST_FATAL_ERROR_CODES:
+            self._resolve(reqId)
 
 
 def create_contract_from_ticker(ticker, currency, exchange="SMART"):
@@ -132,6 +194,28 @@ class IBKRSearchService(IIBKRSearchService):
     Contains the exact same logic as the legacy comprehensive_enhanced_search.py
     """
 
+    def _await_request(self, app: Any, send, timeout: float = REQUEST_TIMEOUT) -> List[Dict[str, Any]]:
+        """Send one request under a session-unique request ID and wait for its own Future"""
+        req_id = app.session.register_request(app.handler)
+        future = app.expect(req_id)
+        try:
+            send(req_id)
+            return future.result(timeout=timeout)
+        except FutureTimeoutError:
+            print(f"        IBKR API TIMEOUT - reqId={req_id} after {timeout}s")
+            return []
+        finally:
+            app.discard(req_id)
+            app.session.release_request(req_id)
+
+    def _request_contract_details(self, app: Any, contract: Contract) -> List[Dict[str, Any]]:
+        """reqContractDetails, resolved on contractDetailsEnd or error"""
+        return self._await_request(app, lambda req_id: app.reqContractDetails(req_id, contract))
+
+    def _request_matching_symbols(self, app: Any, pattern: str) -> List[Dict[str, Any]]:
+        """reqMatchingSymbols, resolved on symbolSamples or error"""
+        return self._await_request(app, lambda req_id: app.reqMatchingSymbols(req_id, pattern))
+
     def extract_unique_stocks(self, universe_data: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Extract unique stocks from universe.json - identical to legacy"""
         unique_stocks = {}
@@ -366,18 +450,11 @@ class IBKRSearchService(IIBKRSearchService):
                 continue
 
             try:
-                app.matching_symbols = []
-                app.symbol_search_completed = False
-                app.reqMatchingSymbols(app.next_req_id, term)
-                app.next_req_id += 1
-
-                timeout_start = time.time()
-                while not app.symbol_search_completed and (time.time() - timeout_start) < 30:
-                    time.sleep(0.05)
+                matching_symbols = self._request_matching_symbols(app, term)
 
                 # Convert matching symbols to contract details
-                print(f"        Processing {len(app.matching_symbols)} matching symbols...")
-                for match in app.matching_symbols:
+                print(f"        Processing {len(matching_symbols)} matching symbols...")
+                for match in matching_symbols:
                     symbol = match.get('symbol', '')
                     currency = match.get('currency', '')
                     exchange = match.get('exchange', '')
@@ -394,29 +471,19 @@ class IBKRSearchService(IIBKRSearchService):
                         if symbol and currency:
                             contract = create_contract_from_ticker(symbol, currency, exchange)
 
-                            app.contract_details = []
-                            app.search_completed = False
-                            app.reqContractDetails(app.next_req_id, contract)
-                            app.next_req_id += 1
-
-                            timeout_start = time.time()
-                            while not app.search_completed and (time.time() - timeout_start) < 30:
-                                time.sleep(0.05)
+                            contract_details = self._request_contract_details(app, contract)
 
-                            if app.contract_details:
-                                print(f"            Got {len(app.contract_details)} contract details for {symbol}")
+                            if contract_details:
+                                print(f"            Got {len(contract_details)} contract details for {symbol}")
                             else:
                                 print(f"            No contract details returned for {symbol}")
 
-                            all_matches.extend(app.contract_details)
+                            all_matches.extend(contract_details)
                         else:
                             print(f"            Missing required fields: symbol={symbol}, currency={currency}, exchange={exchange}")
-                        time.sleep(0.1)
                     else:
                         print(f"            Currency mismatch: {match.get('currency')} vs {stock['currency']}")
 
-                time.sleep(0.2)
-
             except Exception as e:
                 pass
 
@@ -445,23 +512,16 @@ class IBKRSearchService(IIBKRSearchService):
             print(f"  Strategy 1 - ISIN: {stock['isin']}")
             contract = create_contract_from_isin(stock['isin'], stock['currency'])
 
-            app.contract_details = []
-            app.search_completed = False
-            app.reqContractDetails(app.next_req_id, contract)
-            app.next_req_id += 1
-
-            timeout_start = time.time()
-            while not app.search_completed and (time.time() - timeout_start) < 30:
-                time.sleep(0.05)
+            contract_details = self._request_contract_details(app, contract)
 
-            if app.contract_details:
-                print(f"    ISIN found: {len(app.contract_details)} results")
+            if contract_details:
+                print(f"    ISIN found: {len(contract_details)} results")
                 # Mark these as ISIN results
-                for contract in app.contract_details:
+                for contract in contract_details:
                     contract['_search_method'] = 'isin'
-                all_contracts.extend(app.contract_details)
+                all_contracts.extend(contract_details)
                 if verbose:
-                    print(f"    ISIN found: {len(app.contract_details)} results")
+                    print(f"    ISIN found: {len(contract_details)} results")
             else:
                 print(f"    ISIN search failed - no results")
 
@@ -479,26 +539,17 @@ class IBKRSearchService(IIBKRSearchService):
                 print(f"    Trying ticker: {variant} ({currency})")
                 contract = create_contract_from_ticker(variant, currency, "SMART")
 
-                app.contract_details = []
-                app.search_completed = False
-                app.reqContractDetails(app.next_req_id, contract)
-                app.next_req_id += 1
+                contract_details = self._request_contract_details(app, contract)
 
-                timeout_start = time.time()
-                while not app.search_completed and (time.time() - timeout_start) < 30:
-                    time.sleep(0.05)
-
-                if app.contract_details:
-                    print(f"      FOUND with {variant}! ({len(app.contract_details)} results)")
+                if contract_details:
+                    print(f"      FOUND with {variant}! ({len(contract_details)} results)")
                     # Mark these as ticker results
-                    for contract in app.contract_details:
+                    for contract in contract_details:
                         contract['_search_method'] = 'ticker'
-                    all_contracts.extend(app.contract_details)
+                    all_contracts.extend(contract_details)
                     break  # Found it, move on
                 else:
                     print(f"      No results for {variant}")
-
-                time.sleep(0.1)
         else:
             print(f"  Skipping ticker search - no ticker available")
 
@@ -600,6 +651,150 @@ class IBKRSearchService(IIBKRSearchService):
                         'search_attempted': True
                     }
 
+    def search_uncached_stock(self, app: Any, stock: Dict[str, Any]) -> Tuple[Optional[Dict[str, Any]], float, str]:
+        """Search one stock and classify how it was found; safe to run from several threads"""
+        ticker = stock['ticker']
+
+        # Debug for L'Oréal specifically
+        debug = ticker == "OR.PA"
+        match, score = self.comprehensive_stock_search(app, stock, verbose=debug)
+
+        if not (match and score > 0.0):
+            return None, 0.0, "not_found"
+
+        # Determine search method
+        search_method = "unknown"
+        if stock.get('isin') and stock.get('isin') not in ['null', '', None]:
+            # Check if found by ISIN
+            test_contract = create_contract_from_isin(stock['isin'], stock['currency'])
+            search_method = "isin" if self._request_contract_details(app, test_contract) else "ticker"
+        else:
+            # If no ISIN, check if found by ticker or name
+            try:
+                if match['symbol'].upper() in [v.upper() for v in self.get_all_ticker_variations(ticker)]:
+                    search_method = "ticker"
+                else:
+                    search_method = "name"
+            except KeyError as e:
+                print(f"❌ Error accessing {e} in match object for {ticker}")
+                search_method = "unknown"
+
+        return match, score, search_method
+
+    def search_stocks_concurrently(
+        self,
+        app: Any,
+        stocks: List[Dict[str, Any]],
+        max_workers: Optional[int] = None,
+        progress_offset: int = 0,
+        progress_total: Optional[int] = None
+    ) -> List[Tuple[Optional[Dict[str, Any]], float, str]]:
+        """
+        Run search_uncached_stock for many stocks with several in flight at once
+
+        All workers share one IBKR connection; request IDs keep their responses
+        apart and the session pacer holds the combined message rate under IBKR's
+        limits. Results are returned in input order.
+        """
+        if not stocks:
+            return []
+
+        max_workers = max(1, min(max_workers or IBKRSettings().search_concurrency, len(stocks)))
+        progress_total = progress_total or len(stocks)
+        outcomes: List[Optional[Tuple[Optional[Dict[str, Any]], float, str]]] = [None] * len(stocks)
+        started = time.time()
+
+        print(f"Searching {len(stocks)} stocks with {max_workers} concurrent workers...")
+
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="ibkr-search") as executor:
+            futures = {
+                executor.submit(self.search_uncached_stock, app, stock): index
+                for index, stock in enumerate(stocks)
+            }
+            for done, future in enumerate(as_completed(futures), 1):
+                index = futures[future]
+                stock = stocks[index]
+                try:
+                    outcomes[index] = future.result()
+                except Exception as e:
+                    print(f"  Search failed for {stock['ticker']}: {e}")
+                    outcomes[index] = (None, 0.0, "not_found")
+
+                match, score, search_method = outcomes[index]
+                elapsed = time.time() - started
+                rate = done / elapsed * 60 if elapsed > 0 else 0.0
+                if match:
+                    result = f"FOUND: {match.get('symbol', 'N/A')} on {match.get('exchange', 'N/A')} (method: {search_method}, score: {score:.1%})"
+                else:
+                    result = "NOT FOUND"
+                print(f"[{progress_offset + done}/{progress_total}] {stock['name']} ({stock['ticker']}) [API call] {result} - {rate:.1f} stocks/min")
+
+        return outcomes
+
+    def _get_db_service(self):
+        """IBKR search cache shared by Step 8 and single-stock lookups (backend/data/ibkr_cache.db)"""
+        backend_db_path = Path(__file__).parent.parent.parent.parent / 'data' / 'ibkr_cache.db'
+        return get_database_service(str(backend_db_path))
+
+    def search_stock(self, stock: Dict[str, Any], force_refresh: bool = False) -> Dict[str, Any]:
+        """
+        Identify one stock, answering from the search cache when possible
+
+        Repeat lookups are served by the cache's in-memory layer without touching
+        SQLite or the gateway. force_refresh drops the cached entry and searches
+        IBKR again; the fresh result replaces it.
+        """
+        db_service = self._get_db_service()
+        isin = stock.get('isin') or ''
+        ticker = stock['ticker']
+
+        if force_refresh:
+            db_service.invalidate(isin, ticker)
+        else:
+            cached_stocks, _ = db_service.get_cached_stocks([stock])
+            if cached_stocks:
+                return {**cached_stocks[0]['ibkr_details'], 'cached': True}
+
+        session = get_ibkr_session_manager().get_session(client_id=DATA_CLIENT_ID)
+        if not session.ensure_connected(timeout=10):
+            raise IBKRConnectionError(
+                message="Failed to connect to IB Gateway",
+                error_code="IBKR_CONNECTION_FAILED"
+            )
+
+        app = session.bind(IBApi(), subscribe=False)
+        try:
+            match, score, search_method = self.search_uncached_stock(app, stock)
+        finally:
+            app.disconnect()
+
+        if match:
+            ibkr_details = {
+                'found': True,
+                'symbol': match.get('symbol', ''),
+                'longName': match.get('longName', ''),
+                'currency': match.get('currency', stock['currency']),
+                'exchange': match.get('exchange', ''),
+                'primaryExchange': match.get('primaryExchange', ''),
+                'contract_id': match.get('conId', 0),
+                'conId': match.get('conId', 0),
+                'search_method': search_method,
+                'match_score': score
+            }
+        else:
+            ibkr_details = {'found': False, 'search_attempted': True}
+
+        db_service.store_result(
+            isin=isin,
+            ticker=ticker,
+            name=stock['name'],
+            currency=stock['currency'],
+            found=ibkr_details['found'],
+            ibkr_details=ibkr_details
+        )
+
+        return {**ibkr_details, 'cached': False}
+
     def process_all_universe_stocks(self) -> Dict[str, Any]:
         """Process all stocks from universe.json and update with IBKR details with caching"""
 
@@ -611,8 +806,8 @@ class IBKRSearchService(IIBKRSearchService):
             print(f"Error: universe.json not found at {universe_path}")
             return {}
 
-        with open(universe_path, 'r', encoding='utf-8') as f:
-            universe_data = json.load(f)
+        # Read through the universe store, which re-imports universe.json only when it changed on disk
+        universe_data = get_universe_store(str(universe_path)).load()
 
         # Extract unique stocks
         unique_stocks = self.extract_unique_stocks(universe_data)
@@ -623,9 +818,7 @@ class IBKRSearchService(IIBKRSearchService):
             return {}
 
         # Get database service for caching (API uses backend/data path)
-        script_dir = Path(__file__).parent
-        backend_db_path = script_dir.parent.parent.parent / 'data' / 'ibkr_cache.db'
-        db_service = get_database_service(str(backend_db_path))
+        db_service = self._get_db_service()
 
         # Separate cached and uncached stocks
         print("Checking cache for IBKR details...")
@@ -697,21 +890,15 @@ class IBKRSearchService(IIBKRSearchService):
         # Connect to IBKR only if we have uncached stocks
         print(f"Processing {len(uncached_stocks)} uncached stocks via IBKR API...")
 
-        app = IBApi()
-        app.connect("127.0.0.1", 4002, clientId=30)
-
-        api_thread = threading.Thread(target=app.run, daemon=True)
-        api_thread.start()
-
-        timeout = 10
-        start_time = time.time()
-        while not app.connected and (time.time() - start_time) < timeout:
-            time.sleep(0.1)
-
-        if not app.connected:
+        # Reuse the shared IBKR session (connects only if the link is down)
+        session = get_ibkr_session_manager().get_session(client_id=DATA_CLIENT_ID)
+        if not session.ensure_connected(timeout=10):
             print("Failed to connect to IB Gateway")
             return {}
 
+        # Every request registers its own ID, so the wrapper needs no broadcast callbacks
+        app = session.bind(IBApi(), subscribe=False)
+
         print("Connected to IB Gateway")
         print("="*80)
 
@@ -752,51 +939,24 @@ class IBKRSearchService(IIBKRSearchService):
                     'country': stock.get('country', 'Unknown')
                 })
 
-        # Process each uncached stock
-        for i, stock in enumerate(uncached_stocks, 1):
-            ticker = stock['ticker']
-            cached_offset = len(cached_stocks)
-            print(f"\n[{cached_offset + i}/{len(unique_stocks)}] Processing: {stock['name']} ({ticker}) [API call]")
+        # Search uncached stocks concurrently; the session pacer keeps traffic inside IBKR limits
+        outcomes = self.search_stocks_concurrently(
+            app, uncached_stocks, progress_offset=len(cached_stocks), progress_total=len(unique_stocks)
+        )
 
-            # Search for the stock
-            # Debug for L'Oréal specifically
-            debug = ticker == "OR.PA"
-            match, score = self.comprehensive_stock_search(app, stock, verbose=debug)
+        # Apply results in universe order so stats and cache match a sequential run
+        cache_rows = []
+        for stock, (match, score, search_method) in zip(uncached_stocks, outcomes):
+            ticker = stock['ticker']
 
             if match and score > 0.0:
-                # Determine search method
-                search_method = "unknown"
-                if stock.get('isin') and stock.get('isin') not in ['null', '', None]:
-                    # Check if found by ISIN
-                    test_contract = create_contract_from_isin(stock['isin'], stock['currency'])
-                    app.contract_details = []
-                    app.search_completed = False
-                    app.reqContractDetails(app.next_req_id, test_contract)
-                    app.next_req_id += 1
-
-                    timeout_start = time.time()
-                    while not app.search_completed and (time.time() - timeout_start) < 30:
-                        time.sleep(0.05)
-
-                    if app.contract_details:
-                        search_method = "isin"
-                        stats['found_isin'] += 1
-                    else:
-                        search_method = "ticker"
-                        stats['found_ticker'] += 1
+                if search_method == "isin":
+                    stats['found_isin'] += 1
+                elif search_method == "ticker":
+                    stats['found_ticker'] += 1
                 else:
-                    # If no ISIN, check if found by ticker or name
-                    try:
-                        if match['symbol'].upper() in [v.upper() for v in self.get_all_ticker_variations(ticker)]:
-                            search_method = "ticker"
-                            stats['found_ticker'] += 1
-                        else:
-                            search_method = "name"
-                            stats['found_name'] += 1
-                    except KeyError as e:
-                        print(f"❌ Error accessing {e} in match object for {ticker}")
-                        search_method = "unknown"
-                        stats['found_name'] += 1
+                    # Name matches and unclassifiable matches are both counted as name hits
+                    stats['found_name'] += 1
 
                 # Add search method and score to match details
                 match['search_method'] = search_method
@@ -805,18 +965,14 @@ class IBKRSearchService(IIBKRSearchService):
                 # Update universe data
                 self.update_universe_with_ibkr_details(universe_data, ticker, match)
 
-                symbol = match.get('symbol', 'N/A')
-                exchange = match.get('exchange', 'N/A')
-                print(f"  FOUND: {symbol} on {exchange} (method: {search_method}, score: {score:.1%})")
-
-                # Store successful result in cache
-                db_service.store_result(
-                    isin=stock.get('isin', ''),
-                    ticker=ticker,
-                    name=stock['name'],
-                    currency=stock['currency'],
-                    found=True,
-                    ibkr_details={
+                # Queue successful result for the cache
+                cache_rows.append({
+                    'isin': stock.get('isin') or '',
+                    'ticker': ticker,
+                    'name': stock['name'],
+                    'currency': stock['currency'],
+                    'found': True,
+                    'ibkr_details': {
                         'found': True,
                         'symbol': match.get('symbol', ''),
                         'longName': match.get('longName', ''),
@@ -826,7 +982,7 @@ class IBKRSearchService(IIBKRSearchService):
                         'search_method': search_method,
                         'match_score': score
                     }
-                )
+                })
             else:
                 # Mark as not found
                 self.mark_stock_not_found(universe_data, ticker)
@@ -837,25 +993,25 @@ class IBKRSearchService(IIBKRSearchService):
                     'currency': stock['currency'],
                     'country': stock.get('country', 'Unknown')
                 })
-                print(f"  NOT FOUND")
-
-                # Store failed result in cache
-                db_service.store_result(
-                    isin=stock.get('isin', ''),
-                    ticker=ticker,
-                    name=stock['name'],
-                    currency=stock['currency'],
-                    found=False,
-                    ibkr_details={
+
+                # Queue failed result for the cache
+                cache_rows.append({
+                    'isin': stock.get('isin') or '',
+                    'ticker': ticker,
+                    'name': stock['name'],
+                    'currency': stock['currency'],
+                    'found': False,
+                    'ibkr_details': {
                         'found': False,
                         'search_attempted': True
                     }
-                )
+                })
 
-            # Small delay between searches
-            time.sleep(0.1)
+        # Persist every new result in a single transaction
+        stored = db_service.store_results_bulk(cache_rows)
+        print(f"Cached {stored} new IBKR search results")
 
-        # Disconnect from IBKR
+        # Detach from the shared IBKR session (connection stays open)
         app.disconnect()
 
         # Add timestamp metadata
@@ -895,4 +1051,36 @@ class IBKRSearchService(IIBKRSearchService):
 
         print(f"\nUpdated universe saved to: {output_path}")
 
-        return stats
\ No newline at end of file
+        return stats
+
+    def refresh_universe_with_ibkr(self) -> bool:
+        """Rewrite universe_with_ibkr.json from the current universe.json, reusing the IBKR details already found"""
+        data_dir = Path(__file__).parent.parent.parent.parent / 'data'
+        universe_path = data_dir / 'universe.json'
+        output_path = data_dir / 'universe_with_ibkr.json'
+
+        if not universe_path.exists() or not output_path.exists():
+            return False
+
+        with open(output_path, 'r', encoding='utf-8') as f:
+            previous = json.load(f)
+
+        ibkr_details = {}
+        for screen_data in previous.get('screens', {}).values():
+            for stock in screen_data.get('stocks', []):
+                if stock.get('ticker') and 'ibkr_details' in stock:
+                    ibkr_details[stock['ticker']] = stock['ibkr_details']
+
+        universe_data = get_universe_store(str(universe_path)).load()
+        for screen_data in universe_data.get('screens', {}).values():
+            for stock in screen_data.get('stocks', []):
+                if stock.get('ticker') in ibkr_details:
+                    stock['ibkr_details'] = ibkr_details[stock['ticker']]
+        if 'ibkr_search_metadata' in previous:
+            universe_data['ibkr_search_metadata'] = previous['ibkr_search_metadata']
+
+        with open(output_path, 'w', encoding='utf-8') as f:
+            json.dump(universe_data, f, indent=2, ensure_ascii=False)
+
+        print(f"Stock identities unchanged - refreshed quantities in: {output_path}")
+        return True
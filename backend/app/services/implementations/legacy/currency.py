@@ -8,7 +8,9 @@ Uses exchangerate-api.com free API
 import json
 import requests
 import os
-from typing import Dict, Any
+from typing import Dict, Any, Optional
+from ...universe_cache import get_universe_cache
+from ...universe_store import ALL_STOCKS_CONTAINER, get_universe_store, screen_container
 
 def fetch_exchange_rates() -> Dict[str, float]:
     """
@@ -95,41 +97,48 @@ def update_universe_with_exchange_rates(exchange_rates: Dict[str, float]) -> boo
         return False
     
     try:
-        # Load universe data
-        with open(universe_path, 'r', encoding='utf-8') as f:
-            universe_data = json.load(f)
-        
+        # Read the shared parse of universe.json; rates are written back per stock row
+        snapshot = get_universe_cache().get(universe_path)
+        if snapshot is None:
+            print(f"X {universe_path} not found")
+            return False
+        universe_data = snapshot.data
+        store = get_universe_store(universe_path)
+
         updated_stocks_screens = 0
         updated_stocks_all = 0
         missing_rates = set()
-        
+
         # Update each screen's stocks
         for screen_key, screen_data in universe_data.get('screens', {}).items():
+            updates = {}
             for stock in screen_data.get('stocks', []):
                 currency = stock.get('currency')
-                
+
                 if currency in exchange_rates:
                     # Add EUR exchange rate to stock
-                    stock['eur_exchange_rate'] = exchange_rates[currency]
+                    updates[stock.get('ticker')] = {'eur_exchange_rate': exchange_rates[currency]}
                     updated_stocks_screens += 1
                 else:
                     missing_rates.add(currency)
-        
+            store.update_stock_fields(updates, container=screen_container(screen_key))
+
         # Update all_stocks
+        updates = {}
         for ticker, stock in universe_data.get('all_stocks', {}).items():
             currency = stock.get('currency')
-            
+
             if currency in exchange_rates:
                 # Add EUR exchange rate to stock
-                stock['eur_exchange_rate'] = exchange_rates[currency]
+                updates[ticker] = {'eur_exchange_rate': exchange_rates[currency]}
                 updated_stocks_all += 1
             else:
                 missing_rates.add(currency)
-        
+        store.update_stock_fields(updates, container=ALL_STOCKS_CONTAINER)
+
         # Save updated universe data
-        with open(universe_path, 'w', encoding='utf-8') as f:
-            json.dump(universe_data, f, indent=2, ensure_ascii=False)
-        
+        store.export()
+
         total_updated = updated_stocks_screens + updated_stocks_all
         print(f"+ Updated {updated_stocks_screens} stocks in screens")
         print(f"+ Updated {updated_stocks_all} stocks in all_stocks")
@@ -157,8 +166,8 @@ def display_exchange_rate_summary(exchange_rates: Dict[str, float]):
         else:
             print(f"{currency}: {rate:.4f} (1 EUR = {rate:.4f} {currency})")
 
-def main():
-    """Main currency exchange rate function"""
+def main(exchange_rates: Optional[Dict[str, float]] = None):
+    """Main currency exchange rate function (exchange_rates: rates already fetched, skips the API call)"""
     print("Uncle Stock Currency Exchange Rate Updater")
     print("=" * 60)
     
@@ -173,7 +182,8 @@ def main():
         
         # Fetch exchange rates
         print("\nStep 2: Fetching current exchange rates...")
-        exchange_rates = fetch_exchange_rates()
+        if exchange_rates is None:
+            exchange_rates = fetch_exchange_rates()
         
         if not exchange_rates:
             print("X Failed to fetch exchange rates")
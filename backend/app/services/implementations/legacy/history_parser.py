@@ -5,10 +5,11 @@ Parses historical performance data from backtest CSV files and updates universe.
 """
 
 import csv
-import json
 import os
 from typing import Dict, List, Any
 from ....core.config import settings
+from ...backtest_history import get_backtest_history_cache, parse_backtest_file
+from ...universe_store import get_universe_store
 
 def parse_backtest_csv(csv_path: str, debug: bool = False) -> Dict[str, Any]:
     """
@@ -23,101 +24,41 @@ def parse_backtest_csv(csv_path: str, debug: bool = False) -> Dict[str, Any]:
     if not os.path.exists(csv_path):
         return {"error": f"File not found: {csv_path}"}
     
-    performance_data = {
-        "metadata": {},
-        "quarterly_performance": [],
-        "statistics": {}
-    }
-    
     try:
-        with open(csv_path, 'r', encoding='utf-8') as f:
-            lines = f.readlines()
-        
-        # Parse metadata from the top section
-        for line in lines[:13]:  # First 13 lines contain metadata
-            if ',' in line and not line.startswith('sep='):
-                parts = line.strip().split(',', 1)
-                if len(parts) == 2:
-                    key = parts[0].strip('"')
-                    value = parts[1].strip('"')
-                    performance_data["metadata"][key] = value
-        
-        # Find the statistics headers (line 14)
-        stats_line = None
-        total_return_line = None
-        yearly_return_line = None
-        
-        for i, line in enumerate(lines):
-            if '"Return"' in line and '"Period SD"' in line:
-                stats_line = i
-                # Next lines should contain total return and yearly return
-                if i + 1 < len(lines) and 'Total return' in lines[i + 1]:
-                    total_return_line = i + 1
-                if i + 2 < len(lines) and 'Yearly return' in lines[i + 2]:
-                    yearly_return_line = i + 2
-                break
-        
-        if stats_line is not None and total_return_line is not None and yearly_return_line is not None:
-            # Parse statistics headers
-            headers = [h.strip('"') for h in lines[stats_line].split(',')]
-            
-            # Parse total return data
-            total_data = lines[total_return_line].split(',')
-            yearly_data = lines[yearly_return_line].split(',')
-            
-            # Extract key statistics
-            for i, header in enumerate(headers):
-                if i < len(total_data) and i < len(yearly_data):
-                    if header and header not in ['', ' ']:
-                        performance_data["statistics"][f"{header}_total"] = total_data[i].strip('"')
-                        performance_data["statistics"][f"{header}_yearly"] = yearly_data[i].strip('"')
-        
-        # Parse quarterly data by looking for "Quarter return" lines directly
-        for i, line in enumerate(lines):
-            line = line.strip()
-            
-            # Look for Quarter return lines
-            if 'Quarter return' in line:
-                return_parts = line.split(',')
-                if len(return_parts) >= 3:
-                    # Extract data: First column is empty, second is "Quarter return", third is the return %
-                    quarter_return = return_parts[2].strip('"')  # 3rd column has the return percentage
-                    period_sd = return_parts[3].strip('"') if len(return_parts) > 3 else ""  # 4th column has SD
-                    beta = return_parts[4].strip('"') if len(return_parts) > 4 else ""  # 5th column has beta
-                    
-                    # Find the corresponding quarter header (should be in previous lines)
-                    quarter = ""
-                    for j in range(i-1, max(i-5, -1), -1):  # Look back up to 5 lines
-                        prev_line = lines[j].strip()
-                        if ' Q' in prev_line and 'Stocks' in prev_line:
-                            quarter = prev_line.split(',')[0].strip('"')
-                            break
-                    
-                    if debug:
-                        print(f"Found quarter: {quarter}, return: {quarter_return}, sd: {period_sd}")
-                    
-                    if quarter:  # Only add if we found a quarter
-                        quarterly_entry = {
-                            "quarter": quarter,
-                            "return": quarter_return,
-                            "period_sd": period_sd,
-                            "beta": beta
-                        }
-                        
-                        # Add benchmark return (usually last non-empty column)
-                        for j in range(len(return_parts)-1, -1, -1):
-                            benchmark = return_parts[j].strip('"')
-                            if benchmark and benchmark != "" and "%" in benchmark and benchmark != quarter_return:
-                                quarterly_entry["benchmark_return"] = benchmark
-                                break
-                        
-                        performance_data["quarterly_performance"].append(quarterly_entry)
-        
-        return performance_data
+        # Single streaming pass, memoised per file version (debug output needs a fresh parse)
+        if debug:
+            history = parse_backtest_file(csv_path, debug=True)
+        else:
+            history = get_backtest_history_cache().get(csv_path)
+            if history is None:
+                return {"error": f"File not found: {csv_path}"}
+        return history.to_legacy_dict()
         
     except Exception as e:
         return {"error": f"Error parsing CSV: {str(e)}"}
 
+def backtest_csv_path(screen_name: str) -> str:
+    """Backtest export path for a screen name"""
+    safe_name = screen_name.replace(' ', '_').replace('/', '_')
+    return f"data/files_exports/{safe_name}_backtest_results.csv"
+
+def get_backtest_data(screen_name: str) -> Dict[str, Any]:
+    """
+    Parse the backtest CSV file of one screener
+    
+    Returns:
+        Parsed performance data, or a dict with an "error" key
+    """
+    print(f"Parsing backtest data for {screen_name}...")
+    performance_data = parse_backtest_csv(backtest_csv_path(screen_name))
+    
+    if "error" in performance_data:
+        print(f"X Error parsing {screen_name}: {performance_data['error']}")
+    else:
+        print(f"+ Parsed {len(performance_data['quarterly_performance'])} quarters for {screen_name}")
+    
+    return performance_data
+
 def get_all_backtest_data() -> Dict[str, Dict[str, Any]]:
     """
     Parse all backtest CSV files for configured screeners
@@ -125,24 +66,10 @@ def get_all_backtest_data() -> Dict[str, Dict[str, Any]]:
     Returns:
         Dict with screener keys and their parsed performance data
     """
-    all_data = {}
-    
-    for key, screen_name in settings.uncle_stock.uncle_stock_screens.items():
-        # Convert screen name to filename format
-        safe_name = screen_name.replace(' ', '_').replace('/', '_')
-        csv_path = f"data/files_exports/{safe_name}_backtest_results.csv"
-        
-        print(f"Parsing backtest data for {screen_name}...")
-        performance_data = parse_backtest_csv(csv_path)
-        
-        if "error" in performance_data:
-            print(f"X Error parsing {screen_name}: {performance_data['error']}")
-        else:
-            print(f"+ Parsed {len(performance_data['quarterly_performance'])} quarters for {screen_name}")
-        
-        all_data[key] = performance_data
-    
-    return all_data
+    return {
+        key: get_backtest_data(screen_name)
+        for key, screen_name in settings.uncle_stock.uncle_stock_screens.items()
+    }
 
 def update_universe_with_history() -> bool:
     """
@@ -158,18 +85,15 @@ def update_universe_with_history() -> bool:
         return False
     
     try:
-        # Load existing universe data
-        with open(universe_path, 'r', encoding='utf-8') as f:
-            universe_data = json.load(f)
+        # Only the metadata section changes; stock rows are left untouched
+        store = get_universe_store(universe_path)
+        metadata = store.get_section("metadata", {})
         
         # Get all backtest data
         backtest_data = get_all_backtest_data()
         
         # Update metadata with historical performance
-        if "metadata" not in universe_data:
-            universe_data["metadata"] = {}
-        
-        universe_data["metadata"]["historical_performance"] = {}
+        metadata["historical_performance"] = {}
         
         for key, performance_data in backtest_data.items():
             screen_name = settings.uncle_stock.uncle_stock_screens[key]
@@ -220,16 +144,16 @@ def update_universe_with_history() -> bool:
                 if quarterly_stds:
                     screen_performance["quarterly_summary"]["quarterly_std"] = f"{sum(quarterly_stds)/len(quarterly_stds):.2f}%"
                 
-                universe_data["metadata"]["historical_performance"][key] = screen_performance
+                metadata["historical_performance"][key] = screen_performance
             else:
-                universe_data["metadata"]["historical_performance"][key] = {
+                metadata["historical_performance"][key] = {
                     "screen_name": screen_name,
                     "error": performance_data["error"]
                 }
         
         # Save updated universe data
-        with open(universe_path, 'w', encoding='utf-8') as f:
-            json.dump(universe_data, f, indent=2, ensure_ascii=False)
+        store.set_section("metadata", metadata)
+        store.export()
         
         print("+ Updated universe.json with historical performance data")
         return True
@@ -9,6 +9,7 @@ import json
 import os
 from glob import glob
 from ....core.config import settings
+from ...screener_table import get_screener_table_cache
 
 def find_column_index(headers, description_row, header_name, subtitle_pattern):
     """
@@ -41,59 +42,16 @@ def extract_field_data(csv_path, header_name, subtitle_pattern, ticker=None):
     Returns:
         dict or list: If ticker specified, returns single stock data, otherwise all stocks
     """
-    results = []
-    
     try:
-        with open(csv_path, 'r', encoding='utf-8') as f:
-            # Skip the sep= line if present
-            first_line = f.readline()
-            if not first_line.startswith('sep='):
-                f.seek(0)
-            
-            reader = csv.reader(f)
-            headers = next(reader)
-            subheaders = next(reader)
-            description_row = next(reader)
-            
-            # Find the target column
-            column_index = find_column_index(headers, description_row, header_name, subtitle_pattern)
-            if column_index is None:
-                return None if ticker else []
-            
-            # Find symbol column
-            symbol_index = None
-            for i, h in enumerate(headers):
-                if h == 'symbol':
-                    symbol_index = i
-                    break
-            
-            if symbol_index is None:
-                return None if ticker else []
-            
-            # Extract data
-            for row in reader:
-                if len(row) <= max(column_index, symbol_index):
-                    continue
-                
-                stock_ticker = row[symbol_index].strip()
-                if not stock_ticker or len(stock_ticker) < 2:
-                    continue
-                
-                value = row[column_index].strip() if column_index < len(row) else ''
-                
-                stock_data = {
-                    'ticker': stock_ticker,
-                    'field': f'{header_name} | {subtitle_pattern}',
-                    'value': value
-                }
-                
-                if ticker and stock_ticker == ticker:
-                    return stock_data
-                elif not ticker:
-                    results.append(stock_data)
-            
-            return None if ticker else results
-            
+        # Parsed once per file version; lookups hit the column map and ticker index
+        table = get_screener_table_cache().get(csv_path)
+        if table is None:
+            raise FileNotFoundError(csv_path)
+
+        if ticker:
+            return table.field_value(ticker, header_name, subtitle_pattern)
+        return table.field_values(header_name, subtitle_pattern)
+
     except Exception as e:
         print(f"Error extracting field data from {csv_path}: {e}")
         return None if ticker else []
@@ -467,20 +425,11 @@ def find_available_fields(csv_path=None):
             return []
     
     try:
-        with open(csv_path, 'r', encoding='utf-8') as f:
-            f.readline()  # skip sep line
-            reader = csv.reader(f)
-            headers = next(reader)
-            subheaders = next(reader)
-            description_row = next(reader)
-            
-            fields = []
-            for i, (h, d) in enumerate(zip(headers, description_row)):
-                if h and d:  # Both header and description exist
-                    fields.append((h, d, i))
-            
-            return fields
-            
+        table = get_screener_table_cache().get(csv_path)
+        if table is None:
+            raise FileNotFoundError(csv_path)
+        return list(table.available_fields)
+
     except Exception as e:
         print(f"Error finding fields in {csv_path}: {e}")
         return []
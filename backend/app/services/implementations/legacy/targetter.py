@@ -7,12 +7,12 @@ Calculates final stock allocations based on:
 3. Linear allocation within screener (best: 10%, worst: 1%)
 """
 
-import json
 import os
 from typing import Dict, List, Any, Tuple
 
 # Import settings from the new configuration system
 from ....core.config import settings
+from ...universe_store import get_universe_store
 
 # Extract constants from settings for backward compatibility
 MAX_RANKED_STOCKS = settings.portfolio.max_ranked_stocks
@@ -25,8 +25,8 @@ def load_universe_data() -> Dict[str, Any]:
     if not os.path.exists(universe_path):
         raise FileNotFoundError("universe.json not found - run previous steps first")
     
-    with open(universe_path, 'r', encoding='utf-8') as f:
-        return json.load(f)
+    # Tracked rows, so save_universe() re-encodes only the stocks that changed
+    return get_universe_store(universe_path).load()
 
 def extract_screener_allocations(universe_data: Dict[str, Any]) -> Dict[str, float]:
     """
@@ -127,64 +127,20 @@ def calculate_final_allocations(universe_data: Dict[str, Any]) -> Dict[str, Dict
     """
     Calculate final allocations for all stocks
     
+    Ranking and pocket allocation run in one grouped pass of the step 6
+    AllocationEngine, with this module's allocation limits.
+    
     Returns:
         Dict with stock tickers as keys and allocation data as values
     """
+    # Imported here: allocation_engine imports the ranking helpers above
+    from ...allocation_engine import AllocationEngine
+    
     # Get screener allocations from optimizer
     screener_allocations = extract_screener_allocations(universe_data)
     
-    final_allocations = {}
-    
-    print(f"\n{'='*60}")
-    print("CALCULATING FINAL STOCK ALLOCATIONS")
-    print(f"{'='*60}")
-    
-    # Process each screener
-    for screen_key, screen_data in universe_data.get('screens', {}).items():
-        screen_name = screen_data.get('name', screen_key)
-        stocks = screen_data.get('stocks', [])
-        
-        if not stocks:
-            print(f"\nX {screen_name}: No stocks found")
-            continue
-        
-        # Get screener allocation (handle different key formats)
-        screener_target = 0.0
-        for alloc_key, alloc_value in screener_allocations.items():
-            if alloc_key == screen_key or alloc_key.replace('_', ' ').lower() == screen_name.lower():
-                screener_target = alloc_value
-                break
-        
-        print(f"\n{screen_name} (Target: {screener_target*100:.2f}%):")
-        print(f"  Processing {len(stocks)} stocks...")
-        
-        # Rank stocks by 180d performance
-        ranked_stocks = rank_stocks_in_screener(stocks)
-        
-        # Calculate allocations for each stock
-        for stock, rank, performance in ranked_stocks:
-            ticker = stock.get('ticker', 'UNKNOWN')
-            
-            # Calculate pocket allocation within screener
-            pocket_allocation = calculate_pocket_allocation(rank, len(stocks))
-            
-            # Calculate final allocation
-            final_allocation = screener_target * pocket_allocation
-            
-            # Store allocation data
-            final_allocations[ticker] = {
-                'ticker': ticker,
-                'screener': screen_name,
-                'rank': rank,
-                'performance_180d': performance,
-                'pocket_allocation': pocket_allocation,
-                'screener_target': screener_target,
-                'final_allocation': final_allocation
-            }
-            
-            print(f"  {rank:2d}. {ticker:<12} | {performance:+6.2f}% | Pocket: {pocket_allocation*100:4.1f}% | Final: {final_allocation*100:5.2f}%")
-    
-    return final_allocations
+    engine = AllocationEngine(MAX_RANKED_STOCKS, MAX_ALLOCATION, MIN_ALLOCATION)
+    return engine.calculate_final_allocations(universe_data, screener_allocations)
 
 def update_universe_with_allocations(universe_data: Dict[str, Any], final_allocations: Dict[str, Dict[str, Any]]) -> bool:
     """
@@ -235,9 +191,9 @@ def update_universe_with_allocations(universe_data: Dict[str, Any], final_alloca
 
 def save_universe(universe_data: Dict[str, Any]) -> None:
     """Save updated universe data"""
-    universe_path = "data/universe.json"
-    with open(universe_path, 'w', encoding='utf-8') as f:
-        json.dump(universe_data, f, indent=2, ensure_ascii=False)
+    store = get_universe_store("data/universe.json")
+    store.save(universe_data)
+    store.export()
 
 def display_allocation_summary(final_allocations: Dict[str, Dict[str, Any]]) -> None:
     """Display summary of final allocations"""
@@ -9,13 +9,24 @@ import sys
 import json
 import time
 import asyncio
+import statistics
 import threading
-from typing import Dict, Any, List, Optional
+from concurrent.futures import Future, InvalidStateError
+from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime
 
 from ...services.interfaces import IOrderExecutionService
+from ...services.ibkr_session_manager import get_ibkr_session_manager, ORDER_CLIENT_ID, INFO_ERROR_CODES
+from ...services.ibkr_rate_limiter import TokenBucket
+from ...core.config import settings
 from ...core.exceptions import BaseServiceError
 
+# Order statuses meaning the gateway did not accept the order
+REJECTED_STATUSES = {"Cancelled", "ApiCancelled", "Inactive"}
+
+# Errors reported against an order that do not stop it (order warnings, outside-RTH notices)
+ORDER_WARNING_CODES = INFO_ERROR_CODES | {399, 2109}
+
 
 class OrderExecutionError(BaseServiceError):
     """Order execution specific errors"""
@@ -27,6 +38,65 @@ class IBKRConnectionError(OrderExecutionError):
     pass
 
 
+class OrderAckTracker:
+    """
+    Order callback sink resolving one future per submitted order
+
+    The session routes the callbacks of every order registered with this
+    tracker here; they are forwarded to the legacy wrapper (which keeps
+    orders_status) and the first orderStatus / openOrder / error of an order
+    resolves its future with the acknowledged status and latency.
+    """
+
+    def __init__(self, wrapper: Any):
+        self.wrapper = wrapper
+        self._lock = threading.Lock()
+        self._pending: Dict[int, Tuple[Future, float]] = {}
+
+    def expect(self, order_id: int) -> Future:
+        """Future of an order about to be placed; resolves to its acknowledgement"""
+        future: Future = Future()
+        with self._lock:
+            self._pending[order_id] = (future, time.monotonic())
+        return future
+
+    def sent(self, order_id: int) -> None:
+        """Measure latency from now, once the (paced) placeOrder message has gone out"""
+        with self._lock:
+            if order_id in self._pending:
+                future, _ = self._pending[order_id]
+                self._pending[order_id] = (future, time.monotonic())
+
+    def _resolve(self, order_id: int, status: str, error: Optional[str] = None) -> None:
+        with self._lock:
+            future, sent_at = self._pending.pop(order_id, (None, None))
+        if future is not None:
+            try:
+                future.set_result({
+                    'status': status,
+                    'latency_ms': round((time.monotonic() - sent_at) * 1000, 1),
+                    'error': error
+                })
+            except InvalidStateError:
+                pass
+
+    def orderStatus(self, orderId, status, *args):
+        self.wrapper.orderStatus(orderId, status, *args)
+        self._resolve(orderId, status)
+
+    def openOrder(self, orderId, contract, order, orderState):
+        self.wrapper.openOrder(orderId, contract, order, orderState)
+        self._resolve(orderId, orderState.status)
+
+    def error(self, reqId, errorCode, errorString, *args):
+        self.wrapper.error(reqId, errorCode, errorString, *args)
+        if errorCode not in ORDER_WARNING_CODES:
+            self._resolve(reqId, "Rejected", f"{errorCode}: {errorString}")
+
+    def __getattr__(self, name):
+        return getattr(self.wrapper, name)
+
+
 class OrderExecutionService(IOrderExecutionService):
     """
     Production-ready Order Execution Service
@@ -36,6 +106,8 @@ class OrderExecutionService(IOrderExecutionService):
     def __init__(self):
         self.orders_data = None
         self.execution_api = None
+        self.session = None
+        self._submitted_order_ids = []
         self._project_root = self._get_project_root()
 
     def _get_project_root(self) -> str:
@@ -114,12 +186,12 @@ class OrderExecutionService(IOrderExecutionService):
         self,
         host: str = "127.0.0.1",
         port: int = 4002,
-        client_id: int = 20,
+        client_id: int = ORDER_CLIENT_ID,
         timeout: int = 15
     ) -> bool:
         """
-        Establish connection to IBKR Gateway/TWS
-        Wraps legacy connection logic with modern async interface
+        Attach to the shared IBKR Gateway/TWS order session
+        Connects only when the shared link is down, so repeated runs skip the handshake
         """
         try:
             print("[CONNECT] Connecting to IB Gateway...")
@@ -127,22 +199,13 @@ class OrderExecutionService(IOrderExecutionService):
             # Import legacy order executor here to avoid global dependencies
             from ...services.implementations.legacy.order_executor import IBOrderExecutor
 
-            # Initialize API client
-            self.execution_api = IBOrderExecutor()
-
-            # Connect to IB Gateway
-            self.execution_api.connect(host, port, clientId=client_id)
+            self.session = get_ibkr_session_manager().get_session(host, port, client_id)
 
-            # Start message processing thread
-            api_thread = threading.Thread(target=self.execution_api.run, daemon=True)
-            api_thread.start()
+            # Handshake (if any) runs off the event loop
+            loop = asyncio.get_event_loop()
+            connected = await loop.run_in_executor(None, self.session.ensure_connected, timeout)
 
-            # Wait for connection and next valid order ID
-            start_time = time.time()
-            while (self.execution_api.nextorderId is None or not self.execution_api.connected) and (time.time() - start_time) < timeout:
-                await asyncio.sleep(0.1)
-
-            if self.execution_api.nextorderId is None or not self.execution_api.connected:
+            if not connected or self.session.next_order_id is None:
                 error_msg = "Failed to connect to IB Gateway or get valid order ID"
                 print(f"[ERROR] {error_msg}")
                 raise IBKRConnectionError(
@@ -150,9 +213,7 @@ class OrderExecutionService(IOrderExecutionService):
                     error_code="IBKR_CONNECTION_FAILED"
                 )
 
-            # Wait for account ID
-            await asyncio.sleep(2.0)
-            if not self.execution_api.account_id:
+            if not self.session.account_id:
                 error_msg = "No account ID received"
                 print(f"[ERROR] {error_msg}")
                 raise IBKRConnectionError(
@@ -160,7 +221,11 @@ class OrderExecutionService(IOrderExecutionService):
                     error_code="IBKR_ACCOUNT_ID_MISSING"
                 )
 
-            print(f"[OK] Connected to IBKR - Account: {self.execution_api.account_id}, Next Order ID: {self.execution_api.nextorderId}")
+            # Legacy wrapper collects this run's order callbacks; requests go over the shared socket
+            self.execution_api = self.session.bind(IBOrderExecutor())
+            self._submitted_order_ids = []
+
+            print(f"[OK] Connected to IBKR - Account: {self.session.account_id}, Next Order ID: {self.session.next_order_id}")
             return True
 
         except IBKRConnectionError:
@@ -178,12 +243,20 @@ class OrderExecutionService(IOrderExecutionService):
     async def execute_orders(
         self,
         max_orders: Optional[int] = None,
-        delay_between_orders: float = 1.0,
+        delay_between_orders: Optional[float] = None,
         order_type: str = "GTC_MKT"
     ) -> Dict[str, Any]:
         """
         Execute loaded orders through IBKR API
-        Maintains exact execution logic and console output from legacy implementation
+        Keeps the legacy order type selection and console output
+
+        Contracts and orders are built up front, then submitted as a paced
+        pipeline: each order is placed as soon as the pacer allows, without
+        waiting for the previous one's acknowledgement, and every order's ack
+        future resolves on its first orderStatus / openOrder / error callback.
+        Submissions are paced at settings.ibkr.orders_per_second, or one per
+        delay_between_orders seconds when given; the session's message pacer
+        keeps the total traffic under the gateway limit either way.
         """
         if not self.orders_data:
             raise OrderExecutionError(
@@ -207,85 +280,89 @@ class OrderExecutionService(IOrderExecutionService):
             print(f"[EXECUTE] Using order type: {order_type}")
             print("=" * 60)
 
-            executed_count = 0
-            failed_count = 0
-            order_results = []
-
-            for i, order_data in enumerate(orders_to_execute, 1):
+            prepared, order_results = self._prepare_orders(orders_to_execute, order_type)
+
+            # Submit without waiting for acks; the pacer spaces out submissions
+            rate = 1 / delay_between_orders if delay_between_orders else settings.ibkr.orders_per_second
+            pacer = TokenBucket(rate, capacity=1)
+            tracker = OrderAckTracker(self.execution_api.handler)
+            loop = asyncio.get_running_loop()
+            submitted = []
+            started = time.monotonic()
+
+            print(f"\n[SUBMIT] Submitting {len(prepared)} orders at up to {rate:g} orders/s")
+            for index, order_data, contract, market_order, selected_order_type in prepared:
+                wait = pacer.reserve()
+                if wait > 0:
+                    await asyncio.sleep(wait)
                 try:
-                    symbol = order_data['symbol']
-                    action = order_data['action']
-                    quantity = order_data['quantity']
-
-                    print(f"\n[{i:3d}/{len(orders_to_execute)}] {action} {quantity:,} {symbol}")
-
-                    # Currency-based order type selection (exact legacy logic)
-                    currency = order_data['stock_info']['currency']
-                    if currency == 'USD':
-                        selected_order_type = "MOO" if order_type == "MOO" else order_type
-                    else:
-                        selected_order_type = "GTC_MKT"
-
-                    print(f"    Currency: {currency}, Selected order type: {selected_order_type}")
-
-                    # Create contract and order using legacy methods
-                    contract_params = self.create_ibkr_contract(order_data)
-                    order_params = self.create_ibkr_order(action, quantity, selected_order_type)
-
-                    # Submit order through legacy API
-                    order_id = self.execution_api.nextorderId
-
-                    # Use legacy contract and order creation
-                    from ...services.implementations.legacy.order_executor import OrderExecutor
-                    legacy_executor = OrderExecutor()
-                    contract = legacy_executor.create_contract_from_order(order_data)
-                    market_order = legacy_executor.create_market_order(action, quantity, selected_order_type)
-
-                    self.execution_api.placeOrder(order_id, contract, market_order)
-                    self.execution_api.nextorderId += 1
-
-                    # Wait for order acknowledgment
-                    await asyncio.sleep(0.5)
-
-                    # Check order status
-                    if order_id in self.execution_api.orders_status:
-                        status = self.execution_api.orders_status[order_id]['status']
-                        print(f"    Order ID {order_id}: {status}")
-                    else:
-                        print(f"    Order ID {order_id}: Submitted (status pending)")
-
-                    order_results.append({
-                        'order_id': order_id,
-                        'symbol': symbol,
-                        'action': action,
-                        'quantity': quantity,
-                        'order_type': selected_order_type,
-                        'status': 'submitted',
-                        'submission_time': datetime.utcnow().isoformat()
-                    })
-                    executed_count += 1
-
-                    # Rate limiting between orders
-                    if i < len(orders_to_execute):
-                        await asyncio.sleep(delay_between_orders)
-
+                    # Reserve a session-wide order ID routed back to this run's tracker
+                    order_id = self.session.register_order(tracker)
+                    self._submitted_order_ids.append(order_id)
+                    ack = tracker.expect(order_id)
+                    # placeOrder may block on the session's message pacer - keep it off the loop
+                    await loop.run_in_executor(None, self.execution_api.placeOrder, order_id, contract, market_order)
+                    tracker.sent(order_id)
                 except Exception as e:
                     print(f"    [ERROR] Failed to execute order: {str(e)}")
-                    order_results.append({
-                        'symbol': order_data.get('symbol', 'unknown'),
-                        'action': order_data.get('action', 'unknown'),
-                        'quantity': order_data.get('quantity', 0),
-                        'status': 'failed',
-                        'error': str(e)
-                    })
-                    failed_count += 1
+                    order_results[index] = self._failed_order_result(order_data, e)
+                    continue
+
+                submitted.append((index, order_id, asyncio.wrap_future(ack)))
+                order_results[index] = {
+                    'order_id': order_id,
+                    'symbol': order_data['symbol'],
+                    'action': order_data['action'],
+                    'quantity': order_data['quantity'],
+                    'order_type': selected_order_type,
+                    'status': 'submitted',
+                    'submission_time': datetime.utcnow().isoformat()
+                }
+            submission_seconds = time.monotonic() - started
+
+            if submitted:
+                await asyncio.wait(
+                    [ack for _, _, ack in submitted], timeout=settings.ibkr.order_ack_timeout
+                )
+
+            latencies = []
+            for index, order_id, ack in submitted:
+                result = order_results[index]
+                if not ack.done():
+                    ack.cancel()
+                    print(f"    Order ID {order_id} ({result['symbol']}): Submitted (status pending)")
+                    result['acknowledged'] = False
                     continue
 
+                acknowledgement = ack.result()
+                latencies.append(acknowledgement['latency_ms'])
+                result.update({
+                    'acknowledged': True,
+                    'ack_status': acknowledgement['status'],
+                    'ack_latency_ms': acknowledgement['latency_ms']
+                })
+                if acknowledgement['error'] or acknowledgement['status'] in REJECTED_STATUSES:
+                    result['status'] = 'rejected'
+                    result['error'] = acknowledgement['error'] or acknowledgement['status']
+                    print(f"    Order ID {order_id} ({result['symbol']}): REJECTED - {result['error']}")
+                else:
+                    print(
+                        f"    Order ID {order_id} ({result['symbol']}): {acknowledgement['status']} "
+                        f"(ack in {acknowledgement['latency_ms']:.0f} ms)"
+                    )
+
+            order_results = [result for result in order_results if result is not None]
+            executed_count = sum(1 for result in order_results if result['status'] == 'submitted')
+            failed_count = len(order_results) - executed_count
+
             print("\n" + "=" * 60)
             print(f"[SUMMARY] Execution complete:")
             print(f"  Executed: {executed_count}")
             print(f"  Failed: {failed_count}")
             print(f"  Total: {len(orders_to_execute)}")
+            print(f"  Submitted in {submission_seconds:.1f}s, acknowledged: {len(latencies)}/{len(submitted)}")
+            if latencies:
+                print(f"  Ack latency: median {statistics.median(latencies):.0f} ms, max {max(latencies):.0f} ms")
 
             return {
                 'success': True,
@@ -298,7 +375,11 @@ class OrderExecutionService(IOrderExecutionService):
                     'total_processed': len(orders_to_execute),
                     'successful_submissions': executed_count,
                     'failed_submissions': failed_count,
-                    'success_rate': executed_count / len(orders_to_execute) if orders_to_execute else 0
+                    'success_rate': executed_count / len(orders_to_execute) if orders_to_execute else 0,
+                    'acknowledged_orders': len(latencies),
+                    'submission_seconds': round(submission_seconds, 3),
+                    'median_ack_latency_ms': statistics.median(latencies) if latencies else None,
+                    'max_ack_latency_ms': max(latencies) if latencies else None
                 }
             }
 
@@ -311,6 +392,64 @@ class OrderExecutionService(IOrderExecutionService):
                 details={"exception": str(e)}
             )
 
+    def _prepare_orders(
+        self,
+        orders_to_execute: List[Dict[str, Any]],
+        order_type: str
+    ) -> Tuple[List[Tuple[int, Dict[str, Any], Any, Any, str]], List[Optional[Dict[str, Any]]]]:
+        """
+        Build the IBKR contract and order of every order before submission
+
+        Returns ((result index, order data, contract, order, order type) per
+        valid order, results list with failed entries filled in). Contracts are
+        built once per instrument with a single legacy executor.
+        """
+        from ...services.implementations.legacy.order_executor import OrderExecutor
+        legacy_executor = OrderExecutor()
+        contracts: Dict[Tuple, Any] = {}
+        prepared = []
+        order_results: List[Optional[Dict[str, Any]]] = [None] * len(orders_to_execute)
+
+        for i, order_data in enumerate(orders_to_execute, 1):
+            try:
+                symbol = order_data['symbol']
+                action = order_data['action']
+                quantity = order_data['quantity']
+
+                print(f"\n[{i:3d}/{len(orders_to_execute)}] {action} {quantity:,} {symbol}")
+
+                # Currency-based order type selection (exact legacy logic)
+                currency = order_data['stock_info']['currency']
+                if currency == 'USD':
+                    selected_order_type = "MOO" if order_type == "MOO" else order_type
+                else:
+                    selected_order_type = "GTC_MKT"
+
+                print(f"    Currency: {currency}, Selected order type: {selected_order_type}")
+
+                contract_key = tuple(sorted(self.create_ibkr_contract(order_data).items()))
+                if contract_key not in contracts:
+                    contracts[contract_key] = legacy_executor.create_contract_from_order(order_data)
+                market_order = legacy_executor.create_market_order(action, quantity, selected_order_type)
+
+                prepared.append((i - 1, order_data, contracts[contract_key], market_order, selected_order_type))
+
+            except Exception as e:
+                print(f"    [ERROR] Failed to execute order: {str(e)}")
+                order_results[i - 1] = self._failed_order_result(order_data, e)
+
+        return prepared, order_results
+
+    @staticmethod
+    def _failed_order_result(order_data: Dict[str, Any], error: Exception) -> Dict[str, Any]:
+        return {
+            'symbol': order_data.get('symbol', 'unknown'),
+            'action': order_data.get('action', 'unknown'),
+            'quantity': order_data.get('quantity', 0),
+            'status': 'failed',
+            'error': str(error)
+        }
+
     async def get_order_statuses(self, wait_time: int = 30) -> Dict[str, Any]:
         """
         Get current status of all submitted orders
@@ -373,10 +512,14 @@ class OrderExecutionService(IOrderExecutionService):
 
     async def disconnect(self) -> None:
         """
-        Disconnect from IBKR Gateway/TWS
+        Detach from the shared IBKR Gateway/TWS session
+        The underlying connection stays open for the next caller
         """
         try:
             if self.execution_api:
+                for order_id in self._submitted_order_ids:
+                    self.session.release_order(order_id)
+                self._submitted_order_ids = []
                 self.execution_api.disconnect()
                 print("[OK] Disconnected from IB Gateway")
                 self.execution_api = None
@@ -387,7 +530,7 @@ class OrderExecutionService(IOrderExecutionService):
         self,
         orders_file: str = "orders.json",
         max_orders: Optional[int] = None,
-        delay_between_orders: float = 1.0,
+        delay_between_orders: Optional[float] = None,
         order_type: str = "GTC_MKT"
     ) -> Dict[str, Any]:
         """
@@ -6,12 +6,64 @@ Provides API-compatible methods while maintaining 100% CLI behavioral compatibil
 
 import os
 import json
+import logging
 from typing import Dict, Any, List, Optional
 from datetime import datetime
 
 # Import from local legacy directory
-from .legacy.order_status_checker import OrderStatusChecker, IBOrderStatusChecker
+from .legacy.order_status_checker import OrderStatusChecker as LegacyOrderStatusChecker, IBOrderStatusChecker
 from ..interfaces import IOrderStatusService
+from ..ibkr_session_manager import get_ibkr_session_manager, ORDER_CLIENT_ID
+from ..order_tracker import get_order_tracker
+
+logger = logging.getLogger(__name__)
+
+
+class OrderStatusChecker(LegacyOrderStatusChecker):
+    """
+    Legacy order status checker reading the streaming order tracker
+    The tracker syncs with the shared IBKR order session once and then follows
+    order, fill and position events, so a check copies its in-memory state
+    instead of requesting a fresh snapshot and waiting on fixed sleeps
+    """
+
+    def connect_to_ibkr(self) -> bool:
+        """Start the order tracker, connecting and syncing only on first use or after a dropped link"""
+        logger.info("[CONNECT] Connecting to IB Gateway...")
+
+        tracker = get_order_tracker()
+        if not tracker.start():
+            logger.error("[ERROR] Failed to connect to IB Gateway")
+            return False
+
+        account_id = get_ibkr_session_manager().get_session(client_id=ORDER_CLIENT_ID).account_id
+        if not account_id:
+            logger.error("[ERROR] No account ID received")
+            return False
+
+        # Unconnected legacy wrapper used as a plain container for the collected data
+        self.api = IBOrderStatusChecker()
+        self.api.connected = True
+        self.api.account_id = account_id
+        return True
+
+    def fetch_account_data(self) -> None:
+        """Copy open orders, completed orders and positions from the tracker's memory"""
+        snapshot = get_order_tracker().legacy_snapshot()
+        self.api.open_orders = snapshot["open_orders"]
+        self.api.completed_orders = snapshot["completed_orders"]
+        self.api.positions = snapshot["positions"]
+        for key in self.api.requests_completed:
+            self.api.requests_completed[key] = True
+        logger.info(
+            f"[OK] Order tracker: {len(self.api.open_orders)} open orders, "
+            f"{len(self.api.completed_orders)} completed orders, {len(self.api.positions)} positions"
+        )
+
+    def disconnect(self) -> None:
+        """Release the collected data; the tracker stays subscribed for the next check"""
+        if self.api:
+            self.api.connected = False
 
 
 class OrderStatusService(IOrderStatusService):
@@ -524,6 +576,7 @@ class OrderStatusService(IOrderStatusService):
                         analysis_row['order_id'] = matching_order.get('order_id', 'N/A')
                         analysis_row['filled_quantity'] = matching_order.get('filled', 0)
                         analysis_row['avg_fill_price'] = matching_order.get('avgFillPrice', 'N/A')
+                        analysis_row['fills'] = matching_order.get('fills', [])
 
                         # Enhanced status classification
                         if status in ['Filled', 'PartFilled']:
@@ -554,6 +607,7 @@ class OrderStatusService(IOrderStatusService):
                         analysis_row['order_id'] = 'N/A'
                         analysis_row['filled_quantity'] = 0
                         analysis_row['avg_fill_price'] = 'N/A'
+                        analysis_row['fills'] = []
                         missing_count += 1
                         missing_orders.append(json_order)
                 else:
@@ -562,6 +616,7 @@ class OrderStatusService(IOrderStatusService):
                     analysis_row['order_id'] = 'N/A'
                     analysis_row['filled_quantity'] = 0
                     analysis_row['avg_fill_price'] = 'N/A'
+                    analysis_row['fills'] = []
                     missing_count += 1
                     missing_orders.append(json_order)
 
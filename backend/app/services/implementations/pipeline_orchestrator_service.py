@@ -9,11 +9,11 @@ import uuid
 import time
 import traceback
 import os
-import sys
+import threading
+from collections import deque
 from datetime import datetime
-from typing import Dict, Any, List, Optional, Tuple, Callable
-from contextlib import contextmanager, redirect_stdout, redirect_stderr
-from io import StringIO
+from typing import Dict, Any, AsyncIterator, Deque, List, Optional, Tuple, Callable
+from contextlib import contextmanager
 
 # Service layer imports for proper dependency injection
 from ..interfaces import (
@@ -32,27 +32,70 @@ from ..interfaces import (
 )
 
 from ..interfaces import IPipelineOrchestrator
+from ..backtest_history import get_backtest_history_cache
+from ..pipeline_fingerprints import digest_files, digest_value, get_pipeline_fingerprints
+from ..execution_store import PipelineExecutionStore, get_execution_store
+from ..pipeline_console import StepConsoleCapture, capture_console
+from ..pipeline_events import PipelineEventBroker
+from ..pipeline_graph import PipelineGraph
+from ..pipeline_workers import get_pipeline_worker_pool
+from ..universe_cache import get_universe_cache
+from ...core.config import settings
 from ...models.schemas import (
-    PipelineExecutionStatus as PipelineExecutionStatusEnum,
+    PipelineExecutionStatusEnum,
     PipelineStepStatus,
     PipelineStepInfo,
     PipelineStepResult,
-    PipelineLogEntry,
     PipelineExecutionMetadata,
     PipelineExecutionResult,
     PipelineDependencyCheck,
     PipelineDependencyValidation
 )
 
+# Executions in these states are persisted and released by the execution manager
+_FINISHED_STATUSES = {
+    PipelineExecutionStatusEnum.COMPLETED.value,
+    PipelineExecutionStatusEnum.FAILED.value,
+    PipelineExecutionStatusEnum.CANCELLED.value,
+}
+# Log entries buffered before they are written to the execution store
+_LOG_FLUSH_BATCH = 50
+# Log entries read per store query when a stream replays missed entries
+_EVENT_REPLAY_PAGE = 500
+# Details of log entries captured from a step's console, by source stream
+_CONSOLE_LOG_DETAILS = {stream: {"console": stream} for stream in ("stdout", "stderr", "log")}
 
 class PipelineExecutionManager:
     """
     Manages execution state, logging, and status tracking for pipeline runs
+
+    Only executions in progress are held in memory, with their most recent log
+    entries in a ring buffer of settings.pipeline.live_log_capacity entries.
+    Every execution and log entry is written to the execution store (logs in
+    batches); finished executions are served from there and dropped from
+    memory, so a long-running server's memory stays flat.
+
+    Log entries may be added from worker threads (a step's console output
+    streams in as it is written), so the log buffers are guarded by a lock.
+
+    Status changes, step starts and completions and log entries are
+    published to self.events as they happen. Log events carry the entry's
+    offset in the execution log - the offset get_execution_logs pages by.
     """
 
-    def __init__(self):
+    def __init__(
+        self,
+        store: Optional[PipelineExecutionStore] = None,
+        live_log_capacity: Optional[int] = None
+    ):
+        self.store = store if store is not None else get_execution_store()
+        self.live_log_capacity = live_log_capacity or settings.pipeline.live_log_capacity
         self._executions: Dict[str, Dict[str, Any]] = {}
-        self._logs: Dict[str, List[PipelineLogEntry]] = {}
+        self._logs: Dict[str, Deque[Dict[str, Any]]] = {}
+        self._log_counts: Dict[str, int] = {}
+        self._pending_logs: List[Dict[str, Any]] = []
+        self._log_lock = threading.RLock()
+        self.events = PipelineEventBroker(settings.pipeline.event_queue_size)
 
     def create_execution(
         self,
@@ -65,6 +108,7 @@ class PipelineExecutionManager:
             "execution_id": execution_id,
             "status": "pending",
             "current_step": None,
+            "running_steps": [],
             "completed_steps": [],
             "failed_step": None,
             "start_time": datetime.utcnow(),
@@ -75,7 +119,10 @@ class PipelineExecutionManager:
             "created_files": {},
             "metadata": metadata
         }
-        self._logs[execution_id] = []
+        with self._log_lock:
+            self._logs[execution_id] = deque(maxlen=self.live_log_capacity)
+            self._log_counts[execution_id] = 0
+        self.store.save_execution(self._executions[execution_id])
 
     def update_execution_status(
         self,
@@ -83,14 +130,66 @@ class PipelineExecutionManager:
         status,
         current_step: Optional[int] = None
     ) -> None:
-        """Update execution status"""
+        """Update execution status; a finished execution is persisted and released"""
         if execution_id in self._executions:
-            self._executions[execution_id]["status"] = status
+            execution = self._executions[execution_id]
+            execution["status"] = status
             if current_step is not None:
-                self._executions[execution_id]["current_step"] = current_step
-            self._executions[execution_id]["execution_time"] = (
-                datetime.utcnow() - self._executions[execution_id]["start_time"]
-            ).total_seconds()
+                execution["current_step"] = current_step
+            execution["execution_time"] = (datetime.utcnow() - execution["start_time"]).total_seconds()
+
+            if getattr(status, "value", status) in _FINISHED_STATUSES:
+                execution["end_time"] = datetime.utcnow()
+                execution["running_steps"] = []
+                self._finish(execution_id)
+            else:
+                self.store.save_execution(execution)
+            self._publish(execution_id, "status", self.status_snapshot(execution))
+
+    def set_progress(self, execution_id: str, progress_percentage: float) -> None:
+        """Update the progress of a running execution"""
+        execution = self._executions.get(execution_id)
+        if execution is not None:
+            execution["progress_percentage"] = progress_percentage
+            self._publish(execution_id, "status", self.status_snapshot(execution))
+
+    @staticmethod
+    def status_snapshot(execution: Dict[str, Any]) -> Dict[str, Any]:
+        """Status fields of an execution as sent in status events"""
+        return {
+            "execution_id": execution["execution_id"],
+            "status": str(getattr(execution["status"], "value", execution["status"])),
+            "current_step": execution["current_step"],
+            "running_steps": list(execution.get("running_steps", [])),
+            "completed_steps": sorted(execution["completed_steps"]),
+            "failed_step": execution["failed_step"],
+            "execution_time": execution["execution_time"],
+            "progress_percentage": execution["progress_percentage"],
+            "end_time": execution.get("end_time")
+        }
+
+    def _publish(self, execution_id: str, event: str, data: Dict[str, Any], offset: Optional[int] = None) -> None:
+        with self._log_lock:
+            self.events.publish(execution_id, {"event": event, "offset": offset, "data": data})
+
+    def _finish(self, execution_id: str) -> None:
+        with self._log_lock:
+            self.flush_logs()
+            self._logs.pop(execution_id, None)
+            self._log_counts.pop(execution_id, None)
+        self.store.save_execution(self._executions.pop(execution_id))
+        self.store.prune(settings.pipeline.history_max_executions, settings.pipeline.history_retention_days)
+
+    def start_step(self, execution_id: str, step_number: int) -> None:
+        """Mark a step as running; with concurrent steps current_step is the lowest running one"""
+        execution = self._executions.get(execution_id)
+        if execution is not None:
+            running = execution.setdefault("running_steps", [])
+            if step_number not in running:
+                running.append(step_number)
+                running.sort()
+            self._publish(execution_id, "step_start", {"step_number": step_number})
+            self.update_execution_status(execution_id, "running", running[0])
 
     def add_step_result(
         self,
@@ -101,13 +200,37 @@ class PipelineExecutionManager:
         if execution_id in self._executions:
             self._executions[execution_id]["step_results"][step_result.step_number] = step_result
 
+            running = self._executions[execution_id].setdefault("running_steps", [])
+            if step_result.step_number in running:
+                running.remove(step_result.step_number)
+                if running:
+                    self._executions[execution_id]["current_step"] = running[0]
+
             if step_result.success:
                 if step_result.step_number not in self._executions[execution_id]["completed_steps"]:
                     self._executions[execution_id]["completed_steps"].append(step_result.step_number)
                 self._executions[execution_id]["created_files"][step_result.step_number] = step_result.created_files
-            else:
+            elif self._executions[execution_id]["failed_step"] is None:
                 self._executions[execution_id]["failed_step"] = step_result.step_number
 
+            self.flush_logs()
+            self.store.save_execution(self._executions[execution_id])
+            self._publish(execution_id, "step_complete", {
+                "step_number": step_result.step_number,
+                "step_name": step_result.step_name,
+                "status": str(getattr(step_result.status, "value", step_result.status)),
+                "success": step_result.success,
+                "execution_time": step_result.execution_time,
+                "error_message": step_result.error_message
+            })
+
+    def update_metadata(self, execution_id: str, **fields: Any) -> None:
+        """Set metadata fields of a running or finished execution"""
+        execution = self.get_execution_status(execution_id)
+        if execution is not None:
+            execution["metadata"].update(fields)
+            self.store.save_execution(execution)
+
     def add_log_entry(
         self,
         execution_id: str,
@@ -117,26 +240,84 @@ class PipelineExecutionManager:
         details: Optional[Dict[str, Any]] = None
     ) -> None:
         """Add structured log entry"""
-        if execution_id not in self._logs:
-            self._logs[execution_id] = []
+        log_entry = {
+            "timestamp": datetime.utcnow(),
+            "execution_id": execution_id,
+            "step_number": step_number,
+            "level": level,
+            "message": message,
+            "details": details
+        }
 
-        log_entry = PipelineLogEntry(
-            timestamp=datetime.utcnow(),
-            execution_id=execution_id,
-            step_number=step_number,
-            level=level,
-            message=message,
-            details=details
-        )
-        self._logs[execution_id].append(log_entry)
+        with self._log_lock:
+            self._pending_logs.append(log_entry)
+            if execution_id in self._logs:
+                self._logs[execution_id].append(log_entry)
+                self._publish(execution_id, "log", log_entry, self._log_counts[execution_id])
+                self._log_counts[execution_id] += 1
+            if execution_id not in self._executions or len(self._pending_logs) >= _LOG_FLUSH_BATCH:
+                self.flush_logs()
+
+    def flush_logs(self) -> None:
+        """Write buffered log entries to the execution store"""
+        with self._log_lock:
+            if self._pending_logs:
+                pending, self._pending_logs = self._pending_logs, []
+                self.store.append_logs(pending)
 
     def get_execution_status(self, execution_id: str) -> Optional[Dict[str, Any]]:
-        """Get current execution status"""
-        return self._executions.get(execution_id)
+        """
+        Get current execution status
+
+        Running executions return their live state; finished ones a copy
+        loaded from the store (changes to it are not saved).
+        """
+        execution = self._executions.get(execution_id)
+        if execution is not None:
+            return execution
+        record = self.store.get_execution(execution_id)
+        return None if record is None else self._restore(record)
+
+    @staticmethod
+    def _restore(record: Dict[str, Any]) -> Dict[str, Any]:
+        """Execution state from its stored JSON form"""
+        for key in ("start_time", "end_time"):
+            if record.get(key):
+                record[key] = datetime.fromisoformat(record[key])
+        record["step_results"] = {
+            int(step): PipelineStepResult.model_validate(result)
+            for step, result in record.get("step_results", {}).items()
+        }
+        record["created_files"] = {int(step): files for step, files in record.get("created_files", {}).items()}
+        return record
 
-    def get_execution_logs(self, execution_id: str) -> List[PipelineLogEntry]:
-        """Get execution logs"""
-        return self._logs.get(execution_id, [])
+    def get_execution_logs(
+        self,
+        execution_id: str,
+        step_number: Optional[int] = None,
+        level: Optional[str] = None,
+        limit: Optional[int] = None,
+        offset: int = 0
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        Get one page of execution logs and the number of matching entries
+
+        Live executions whose logs still fit in the ring buffer are answered
+        from memory; everything else is queried from the store.
+        """
+        with self._log_lock:
+            buffer = self._logs.get(execution_id)
+            if buffer is not None and len(buffer) == self._log_counts.get(execution_id):
+                entries = [
+                    entry for entry in buffer
+                    if (step_number is None or entry["step_number"] == step_number)
+                    and (level is None or entry["level"] == level.upper())
+                ]
+                page = entries[offset:] if limit is None else entries[offset:offset + limit]
+                return page, len(entries)
+
+            self.flush_logs()
+        return self.store.get_logs(execution_id, step_number, level, limit, offset)
 
 
 class PipelineOrchestratorService(IPipelineOrchestrator):
@@ -164,6 +345,9 @@ class PipelineOrchestratorService(IPipelineOrchestrator):
         telegram_service: ITelegramService
     ):
         self.execution_manager = PipelineExecutionManager()
+        self.worker_pool = get_pipeline_worker_pool()
+        # Cancellation signal of each full pipeline / step range in progress
+        self._cancel_events: Dict[str, asyncio.Event] = {}
 
         # Inject service dependencies
         self.screener_service = screener_service
@@ -179,6 +363,10 @@ class PipelineOrchestratorService(IPipelineOrchestrator):
         self.order_status_service = order_status_service
         self.telegram_service = telegram_service
 
+        # Change signal from the last step 1 run: screener_id -> whether the
+        # screen's constituents changed since the previous fetch (None = not fetched)
+        self.screen_changes: Dict[str, Optional[bool]] = {}
+
         # Step function mapping using service layer methods
         self._step_functions: Dict[int, Callable[[], bool]] = {
             1: self._step1_fetch_data,
@@ -194,127 +382,329 @@ class PipelineOrchestratorService(IPipelineOrchestrator):
             11: self._step11_check_order_status,
         }
 
-        # Step metadata from main.py analysis
+        # Work a step can start ahead of itself, once the listed artifacts exist:
+        # step -> (prefetch inputs, function returning keyword arguments for the step)
+        self._step_prefetch: Dict[int, Tuple[List[str], Callable[[], Dict[str, Any]]]] = {
+            3: (["backtest_exports"], self._prefetch_history),
+            5: ([], self._prefetch_exchange_rates),
+            7: ([], self._prefetch_account_value),
+        }
+
+        # Steps that can be skipped when their inputs are unchanged: step -> function
+        # returning the step's inputs and config slice (called with the prefetch kwargs).
+        # Step 1 (remote screens) and steps 9-11 (live positions and orders) always run.
+        self._step_fingerprints: Dict[int, Callable[..., Dict[str, Any]]] = {
+            2: self._fingerprint_parse_data,
+            3: self._fingerprint_parse_history,
+            4: self._fingerprint_portfolio_config,
+            5: self._fingerprint_exchange_rates,
+            6: self._fingerprint_portfolio_config,
+            7: self._fingerprint_account_value,
+            8: self._fingerprint_ibkr_search,
+        }
+
+        # Steps whose fingerprint reads everything they depend on straight from
+        # the upstream files, so upstream output digests are left out of it
+        self._self_contained_fingerprints = {8}
+
+        # Skipped steps whose outputs copy fields their fingerprint ignores:
+        # step -> function bringing the existing outputs up to date
+        self._step_refresh: Dict[int, Callable[[], Any]] = {
+            8: self._refresh_ibkr_search,
+        }
+
+        # Step metadata from main.py analysis; dependencies are derived from inputs/outputs below
         self._step_info: Dict[int, PipelineStepInfo] = {
             1: PipelineStepInfo(
                 step_number=1,
                 step_name="Fetch Data",
                 description="Fetch current stocks and backtest history from all screeners",
                 aliases=["1", "step1", "fetch"],
-                dependencies=[],
                 creates_files=["data/files_exports/*.csv"],
-                modifies_files=[]
+                modifies_files=[],
+                inputs=[],
+                outputs=["screen_exports", "backtest_exports"]
             ),
             2: PipelineStepInfo(
                 step_number=2,
                 step_name="Parse Data",
                 description="Parse CSV files and create universe.json",
                 aliases=["2", "step2", "parse"],
-                dependencies=[1],
                 creates_files=["data/universe.json"],
-                modifies_files=[]
+                modifies_files=[],
+                inputs=["screen_exports"],
+                outputs=["universe"]
             ),
             3: PipelineStepInfo(
                 step_number=3,
                 step_name="Parse History",
                 description="Parse historical performance data and update universe.json",
                 aliases=["3", "step3", "history"],
-                dependencies=[2],
                 creates_files=[],
-                modifies_files=["data/universe.json"]
+                modifies_files=["data/universe.json"],
+                inputs=["backtest_exports", "universe"],
+                outputs=["universe.historical_performance"]
             ),
             4: PipelineStepInfo(
                 step_number=4,
                 step_name="Optimize Portfolio",
                 description="Optimize portfolio allocations using Sharpe ratio maximization",
                 aliases=["4", "step4", "portfolio"],
-                dependencies=[3],
                 creates_files=[],
-                modifies_files=["data/universe.json"]
+                modifies_files=["data/universe.json"],
+                inputs=["universe.historical_performance"],
+                outputs=["universe.screen_allocations"]
             ),
             5: PipelineStepInfo(
                 step_number=5,
                 step_name="Update Currency",
                 description="Update EUR exchange rates",
                 aliases=["5", "step5", "currency"],
-                dependencies=[4],
                 creates_files=[],
-                modifies_files=["data/universe.json"]
+                modifies_files=["data/universe.json"],
+                inputs=["universe"],
+                outputs=["universe.eur_exchange_rates"]
             ),
             6: PipelineStepInfo(
                 step_number=6,
                 step_name="Calculate Targets",
                 description="Calculate final stock allocations",
                 aliases=["6", "step6", "target"],
-                dependencies=[5],
                 creates_files=[],
-                modifies_files=["data/universe.json"]
+                modifies_files=["data/universe.json"],
+                inputs=["universe.screen_allocations"],
+                outputs=["universe.final_targets"]
             ),
             7: PipelineStepInfo(
                 step_number=7,
                 step_name="Calculate Quantities",
                 description="Get account value from IBKR and calculate stock quantities",
                 aliases=["7", "step7", "qty"],
-                dependencies=[6],
                 creates_files=[],
-                modifies_files=["data/universe.json"]
+                modifies_files=["data/universe.json"],
+                inputs=["universe.final_targets", "universe.eur_exchange_rates"],
+                outputs=["universe.quantities"]
             ),
             8: PipelineStepInfo(
                 step_number=8,
                 step_name="IBKR Search",
                 description="Search for all universe stocks on IBKR and update with identification details",
                 aliases=["8", "step8", "ibkr"],
-                dependencies=[7],
                 creates_files=["data/universe_with_ibkr.json"],
-                modifies_files=[]
+                modifies_files=[],
+                inputs=["universe.quantities"],
+                outputs=["universe_with_ibkr"]
             ),
             9: PipelineStepInfo(
                 step_number=9,
                 step_name="Rebalance",
                 description="Generate rebalancing orders based on targets vs current positions",
                 aliases=["9", "step9", "rebalance"],
-                dependencies=[8],
                 creates_files=["data/orders.json"],
-                modifies_files=[]
+                modifies_files=[],
+                inputs=["universe_with_ibkr"],
+                outputs=["orders"]
             ),
             10: PipelineStepInfo(
                 step_number=10,
                 step_name="Execute Orders",
                 description="Execute rebalancing orders through IBKR API",
                 aliases=["10", "step10", "execute"],
-                dependencies=[9],
                 creates_files=[],
-                modifies_files=[]
+                modifies_files=[],
+                inputs=["orders"],
+                outputs=["submitted_orders"]
             ),
             11: PipelineStepInfo(
                 step_number=11,
                 step_name="Check Status",
                 description="Check order status and verify execution",
                 aliases=["11", "step11", "status"],
-                dependencies=[10],
                 creates_files=[],
-                modifies_files=[]
+                modifies_files=[],
+                inputs=["submitted_orders"],
+                outputs=["order_status"]
             )
         }
 
+        # Execution DAG: steps run as soon as the steps producing their inputs have completed
+        self._step_graph = PipelineGraph(
+            self._step_info,
+            prefetch_inputs={step: inputs for step, (inputs, _) in self._step_prefetch.items()}
+        )
+        for step_number, step_info in self._step_info.items():
+            step_info.dependencies = self._step_graph.dependencies(step_number)
+
     @contextmanager
-    def _capture_console_output(self):
-        """Context manager to capture console output from step functions"""
-        stdout_buffer = StringIO()
-        stderr_buffer = StringIO()
+    def _capture_console_output(self, execution_id: str, step_number: int):
+        """
+        Context manager to capture console output from step functions
+
+        Output and log records are captured for the current context only (this
+        task and the worker threads it starts steps in), so concurrent steps
+        and API requests keep their own output. Each line is added to the
+        execution log as it is written; the capture keeps the last
+        settings.pipeline.console_tail_lines lines for the step result.
+        """
+        def sink(level: str, line: str, stream: str) -> None:
+            self.execution_manager.add_log_entry(
+                execution_id, level, line, step_number, _CONSOLE_LOG_DETAILS[stream]
+            )
 
-        try:
-            with redirect_stdout(stdout_buffer), redirect_stderr(stderr_buffer):
-                yield stdout_buffer, stderr_buffer
-        finally:
-            pass
+        with capture_console(sink, settings.pipeline.console_tail_lines) as capture:
+            yield capture
+
+    async def _call_step_function(
+        self,
+        function: Callable,
+        *,
+        key: Optional[int] = None,
+        timeout: Optional[float] = None,
+        **kwargs
+    ) -> Any:
+        """
+        Await async step functions; run sync ones in the pipeline worker pool
+
+        Blocking work never runs on the event loop or its default executor, so
+        API requests are served while steps run; async steps hand their own
+        blocking work (step 1's export writes) to the same pool. key marks the
+        call busy in the pool (a step number); timeout raises
+        asyncio.TimeoutError.
+        """
+        if asyncio.iscoroutinefunction(function):
+            return await asyncio.wait_for(function(**kwargs), timeout)
+        return await self.worker_pool.run(function, key=key, timeout=timeout, **kwargs)
+
+    def _step_timeout(self, step_number: int) -> float:
+        return settings.pipeline.step_timeouts.get(step_number, settings.pipeline.step_timeout)
+
+    def _check_not_busy(self, step_number: int) -> None:
+        """Refuse to start a step while a worker still runs one writing the same files"""
+        for other in sorted(self.worker_pool.busy()):
+            if other == step_number or self._step_graph.conflicts(step_number, other):
+                raise RuntimeError(
+                    f"Step {other} from a cancelled or timed-out run is still running - "
+                    f"not starting step {step_number} until it finishes"
+                )
+
+    async def _run_prefetch(self, step_number: int, execution_id: str) -> Tuple[Dict[str, Any], List[str]]:
+        """Run a step's prefetch, returning (step keyword arguments, console output lines)"""
+        _, prefetch = self._step_prefetch[step_number]
+        with self._capture_console_output(execution_id, step_number) as capture:
+            kwargs = await self._call_step_function(prefetch)
+        return kwargs, capture.lines()
+
+    def _step_files(self, step_number: int) -> List[str]:
+        """Output files of a step whose recorded digests must still match for it to be skipped"""
+        step_info = self._step_info[step_number]
+        return [path for path in step_info.creates_files + step_info.modifies_files if "*" not in path]
+
+    def _check_fingerprint(
+        self,
+        step_number: int,
+        step_kwargs: Dict[str, Any],
+        run_outputs: Dict[int, Optional[str]],
+        force: bool
+    ) -> Tuple[str, Dict[str, Any], Optional[Dict[str, Any]]]:
+        """
+        Fingerprint a step's inputs, config slice and upstream outputs
+
+        Returns (fingerprint, inputs, recorded entry if the step can be skipped).
+        Upstream steps contribute the digest of the files they left behind -
+        in this run, or on their last recorded run if they are not part of it -
+        so a step re-runs whenever anything it reads changed, but not merely
+        because an upstream step ran and wrote the same output again.
+        """
+        store = get_pipeline_fingerprints()
+        inputs = self._step_fingerprints[step_number](**step_kwargs)
+        upstream = {}
+        if step_number not in self._self_contained_fingerprints:
+            for dep in self._step_graph.dependencies(step_number):
+                if dep not in self._step_fingerprints:
+                    continue
+                upstream[str(dep)] = run_outputs[dep] if dep in run_outputs else store.output_digest(dep)
+        fingerprint = digest_value({"step": step_number, "inputs": inputs, "upstream": upstream})
+
+        if force or None in upstream.values():
+            return fingerprint, inputs, None
+        return fingerprint, inputs, store.matches(step_number, fingerprint, self._step_files(step_number))
+
+    def _record_fingerprint(
+        self,
+        step_number: int,
+        fingerprint: str,
+        inputs: Dict[str, Any]
+    ) -> str:
+        """Record a successful run of a step, returning its output digest"""
+        step_info = self._step_info[step_number]
+        return get_pipeline_fingerprints().record(
+            step_number, fingerprint, self._step_files(step_number), inputs,
+            created=[path for path in step_info.creates_files if "*" not in path]
+        )
+
+    async def _skipped_step_result(
+        self,
+        step_number: int,
+        execution_id: str,
+        start_time: datetime,
+        fingerprint: str,
+        recorded: Dict[str, Any],
+        prefetch_output: List[str]
+    ) -> PipelineStepResult:
+        """Report a step whose outputs from its last successful run are reused"""
+        step_info = self._step_info[step_number]
+        end_time = datetime.utcnow()
+        execution_time = (end_time - start_time).total_seconds()
+        message = f"Inputs unchanged since {recorded['recorded_at']} - reusing existing outputs"
+
+        await self.telegram_service.notify_step_complete(
+            step_number=step_number,
+            step_name=step_info.step_name,
+            execution_id=execution_id,
+            success=True,
+            execution_time=execution_time,
+            details={"skipped": message}
+        )
+
+        self.execution_manager.add_log_entry(
+            execution_id,
+            "INFO",
+            f"Skipped {step_info.step_name}: {message}",
+            step_number,
+            {"skipped": True, "fingerprint": fingerprint}
+        )
+
+        return PipelineStepResult(
+            step_number=step_number,
+            step_name=step_info.step_name,
+            status=PipelineStepStatus.SKIPPED,
+            success=True,
+            execution_time=execution_time,
+            start_time=start_time,
+            end_time=end_time,
+            console_output=prefetch_output + [message],
+            fingerprint=fingerprint
+        )
 
     async def _execute_step(
         self,
         step_number: int,
-        execution_id: str
+        execution_id: str,
+        prefetch: Optional["asyncio.Task"] = None,
+        run_outputs: Optional[Dict[int, Optional[str]]] = None,
+        force: bool = False
     ) -> PipelineStepResult:
-        """Execute individual step with console output capture and error handling"""
+        """
+        Execute individual step with console output capture and error handling
+
+        prefetch: the step's prefetch task, if the pipeline started one; its
+        result is passed to the step function and its output is prepended to
+        the step's console output
+        run_outputs: output digests of the fingerprinted steps of this run so
+        far (None if unknown); when given, a fingerprinted step whose inputs
+        match its last successful run is skipped (unless force) and its
+        output digest is added
+        """
         step_info = self._step_info[step_number]
         start_time = datetime.utcnow()
 
@@ -334,29 +724,67 @@ class PipelineOrchestratorService(IPipelineOrchestrator):
         )
 
         # Update execution status
-        self.execution_manager.update_execution_status(
-            execution_id,
-            "running",
-            step_number
-        )
+        self.execution_manager.start_step(execution_id, step_number)
 
+        prefetch_output: List[str] = []
+        capture: Optional[StepConsoleCapture] = None
         try:
+            step_kwargs: Dict[str, Any] = {}
+            if prefetch is not None:
+                step_kwargs, prefetch_output = await prefetch
+
+            fingerprint = None
+            if run_outputs is not None and step_number in self._step_fingerprints:
+                fingerprint, fingerprint_inputs, recorded = await self.worker_pool.run(
+                    self._check_fingerprint, step_number, step_kwargs, run_outputs, force
+                )
+                if recorded is not None and step_number in self._step_refresh:
+                    # Outputs that cannot be brought up to date are rebuilt by running the step
+                    refreshed = await self.worker_pool.run(
+                        self._step_refresh[step_number], key=step_number, timeout=self._step_timeout(step_number)
+                    )
+                    if refreshed:
+                        output_digest = await self.worker_pool.run(
+                            self._record_fingerprint, step_number, fingerprint, fingerprint_inputs
+                        )
+                        recorded = {**recorded, "output_digest": output_digest}
+                    else:
+                        recorded = None
+                if recorded is not None:
+                    run_outputs[step_number] = recorded.get("output_digest")
+                    return await self._skipped_step_result(
+                        step_number, execution_id, start_time, fingerprint, recorded, prefetch_output
+                    )
+
+            self._check_not_busy(step_number)
+
             # Capture console output and execute step function
-            with self._capture_console_output() as (stdout_buffer, stderr_buffer):
+            timeout = self._step_timeout(step_number)
+            with self._capture_console_output(execution_id, step_number) as capture:
                 step_function = self._step_functions[step_number]
-                # Check if function is async
-                if asyncio.iscoroutinefunction(step_function):
-                    success = await step_function()
-                else:
-                    success = step_function()
+                try:
+                    success = await self._call_step_function(
+                        step_function, key=step_number, timeout=timeout, **step_kwargs
+                    )
+                except asyncio.TimeoutError:
+                    raise TimeoutError(f"Step {step_number} timed out after {timeout:g}s")
 
             end_time = datetime.utcnow()
             execution_time = (end_time - start_time).total_seconds()
 
-            # Get console output
-            stdout_lines = stdout_buffer.getvalue().splitlines()
-            stderr_lines = stderr_buffer.getvalue().splitlines()
-            console_output = stdout_lines + stderr_lines
+            console_output = prefetch_output + capture.lines()
+
+            if success and fingerprint is not None:
+                run_outputs[step_number] = None
+                try:
+                    run_outputs[step_number] = await self.worker_pool.run(
+                        self._record_fingerprint, step_number, fingerprint, fingerprint_inputs
+                    )
+                except Exception as e:
+                    # The step succeeded; it and its dependents just run again next time
+                    self.execution_manager.add_log_entry(
+                        execution_id, "WARNING", f"Could not record fingerprint: {e}", step_number
+                    )
 
             # Create step result
             step_result = PipelineStepResult(
@@ -370,7 +798,8 @@ class PipelineOrchestratorService(IPipelineOrchestrator):
                 created_files=step_info.creates_files if success else [],
                 modified_files=step_info.modifies_files if success else [],
                 console_output=console_output,
-                error_message=None if success else f"Step {step_number} failed - stopping pipeline"
+                error_message=None if success else f"Step {step_number} failed - stopping pipeline",
+                fingerprint=fingerprint
             )
 
             # Send Telegram notification for step completion
@@ -434,15 +863,170 @@ class PipelineOrchestratorService(IPipelineOrchestrator):
                 end_time=end_time,
                 created_files=[],
                 modified_files=[],
-                console_output=[],
+                console_output=prefetch_output + (capture.lines() if capture is not None else []),
                 error_message=str(e),
                 error_traceback=error_traceback
             )
 
             return step_result
 
-    async def run_full_pipeline(self, execution_id: Optional[str] = None) -> Dict[str, Any]:
-        """Execute complete 11-step pipeline with fail-fast error handling"""
+    async def _run_steps(
+        self,
+        target_steps: List[int],
+        execution_id: str,
+        run_label: str,
+        force: bool = False
+    ) -> Tuple[List[int], Optional[int], Dict[int, PipelineStepResult], bool]:
+        """
+        Run target steps through the dependency graph with fail-fast behavior
+
+        Every step whose inputs are ready starts right away, so independent
+        steps overlap. Once a step fails no further step starts; steps already
+        running are left to finish rather than abandoning shared files
+        half-written. Steps whose input fingerprint matches their last
+        successful run are skipped unless force is set.
+
+        cancel_execution() stops the run: running steps are cancelled and
+        reported as failed, and nothing else starts.
+
+        Returns:
+            (completed steps, first failed step or None, step results by step number, whether cancelled)
+        """
+        schedule = self._step_graph.schedule(target_steps)
+        prefetches: Dict[int, asyncio.Task] = {}
+        running: Dict[asyncio.Task, int] = {}
+        step_results: Dict[int, PipelineStepResult] = {}
+        run_outputs: Dict[int, Optional[str]] = {}
+        failed_step = None
+        cancel = self._cancel_events[execution_id] = asyncio.Event()
+        cancel_waiter = asyncio.create_task(cancel.wait())
+
+        def record(step_number: int, step_result: PipelineStepResult) -> None:
+            nonlocal failed_step
+            step_results[step_number] = step_result
+
+            # Add step result to execution manager
+            self.execution_manager.add_step_result(execution_id, step_result)
+            schedule.finish(step_number, step_result.success)
+
+            if step_result.success:
+                self.execution_manager.set_progress(execution_id, schedule.progress_percentage)
+            elif failed_step is None:
+                # Fail-fast behavior - start nothing after the first failure
+                failed_step = step_number
+                self.execution_manager.add_log_entry(
+                    execution_id,
+                    "ERROR",
+                    f"{run_label} failed at step {step_number} - stopping execution",
+                    details={"failed_step": step_number, "error": step_result.error_message}
+                )
+
+        try:
+            while not cancel.is_set():
+                for step_number in schedule.ready_prefetches():
+                    schedule.start_prefetch(step_number)
+                    prefetches[step_number] = asyncio.create_task(self._run_prefetch(step_number, execution_id))
+
+                for step_number in schedule.ready_steps():
+                    schedule.start(step_number)
+                    task = asyncio.create_task(
+                        self._execute_step(
+                            step_number, execution_id, prefetches.pop(step_number, None), run_outputs, force
+                        )
+                    )
+                    running[task] = step_number
+
+                if not running:
+                    break
+
+                finished, _ = await asyncio.wait([*running, cancel_waiter], return_when=asyncio.FIRST_COMPLETED)
+                for task in sorted((task for task in finished if task in running), key=running.get):
+                    record(running.pop(task), task.result())
+
+            if cancel.is_set() and running:
+                for task in running:
+                    task.cancel()
+                await asyncio.gather(*running, return_exceptions=True)
+                for task, step_number in sorted(running.items(), key=lambda item: item[1]):
+                    if task.cancelled():
+                        record(step_number, self._cancelled_step_result(step_number))
+                    else:
+                        record(step_number, task.result())
+                running.clear()
+        finally:
+            # Unexpected errors leave nothing running; unused prefetches are dropped
+            self._cancel_events.pop(execution_id, None)
+            cancel_waiter.cancel()
+            for task in list(running) + list(prefetches.values()):
+                task.cancel()
+            if running or prefetches:
+                await asyncio.gather(*running, *prefetches.values(), return_exceptions=True)
+
+        return sorted(schedule.completed), failed_step, step_results, cancel.is_set()
+
+    def _cancelled_step_result(self, step_number: int) -> PipelineStepResult:
+        step_info = self._step_info[step_number]
+        now = datetime.utcnow()
+        error_message = f"Step {step_number} cancelled"
+        if step_number in self.worker_pool.busy():
+            error_message += " - its worker thread finishes in the background"
+        return PipelineStepResult(
+            step_number=step_number,
+            step_name=step_info.step_name,
+            status=PipelineStepStatus.FAILED,
+            success=False,
+            execution_time=0,
+            start_time=now,
+            end_time=now,
+            error_message=error_message
+        )
+
+    async def cancel_execution(self, execution_id: str) -> Dict[str, Any]:
+        """Stop a running full pipeline or step range"""
+        cancel = self._cancel_events.get(execution_id)
+        if cancel is None:
+            return {
+                "execution_id": execution_id,
+                "success": False,
+                "message": f"Execution {execution_id} is not running"
+            }
+
+        cancel.set()
+        self.execution_manager.add_log_entry(execution_id, "WARNING", "Cancellation requested")
+        return {
+            "execution_id": execution_id,
+            "success": True,
+            "message": "Cancellation requested - running steps are being stopped"
+        }
+
+    @staticmethod
+    def _final_status(success: bool, cancelled: bool) -> PipelineExecutionStatusEnum:
+        if cancelled:
+            return PipelineExecutionStatusEnum.CANCELLED
+        return PipelineExecutionStatusEnum.COMPLETED if success else PipelineExecutionStatusEnum.FAILED
+
+    @staticmethod
+    def _run_error_message(
+        failed_step: Optional[int],
+        step_results: Dict[int, PipelineStepResult],
+        cancelled: bool,
+        run_label: str
+    ) -> Optional[str]:
+        if cancelled:
+            return f"{run_label} cancelled"
+        return step_results[failed_step].error_message if failed_step else None
+
+    @staticmethod
+    def _skipped_steps(step_results: Dict[int, PipelineStepResult]) -> List[int]:
+        return sorted(n for n, result in step_results.items() if result.status == PipelineStepStatus.SKIPPED)
+
+    async def run_full_pipeline(self, execution_id: Optional[str] = None, force: bool = False) -> Dict[str, Any]:
+        """
+        Execute complete 11-step pipeline with fail-fast error handling, independent steps concurrently
+
+        Steps whose inputs are unchanged since their last successful run are
+        skipped; force re-runs every step.
+        """
         if execution_id is None:
             execution_id = str(uuid.uuid4())
 
@@ -451,7 +1035,8 @@ class PipelineOrchestratorService(IPipelineOrchestrator):
             execution_id=execution_id,
             execution_type="full_pipeline",
             start_time=datetime.utcnow(),
-            target_steps=list(range(1, 12))
+            target_steps=list(range(1, 12)),
+            force=force
         )
 
         self.execution_manager.create_execution(execution_id, "full_pipeline", metadata.dict())
@@ -472,46 +1057,20 @@ class PipelineOrchestratorService(IPipelineOrchestrator):
         )
 
         overall_start_time = time.time()
-        completed_steps = []
-        failed_step = None
-        step_results = {}
-        created_files = {}
 
         try:
-            # Execute steps 1-11 sequentially with fail-fast behavior
-            for step_number in range(1, 12):
-                step_result = await self._execute_step(step_number, execution_id)
-                step_results[step_number] = step_result
-
-                # Add step result to execution manager
-                self.execution_manager.add_step_result(execution_id, step_result)
-
-                if step_result.success:
-                    completed_steps.append(step_number)
-                    created_files[step_number] = step_result.created_files
-
-                    # Update progress
-                    progress = (step_number / 11) * 100
-                    execution = self.execution_manager.get_execution_status(execution_id)
-                    if execution:
-                        execution["progress_percentage"] = progress
-                else:
-                    # Fail-fast behavior - stop on first failure
-                    failed_step = step_number
-                    self.execution_manager.add_log_entry(
-                        execution_id,
-                        "ERROR",
-                        f"Pipeline failed at step {step_number} - stopping execution",
-                        details={"failed_step": step_number, "error": step_result.error_message}
-                    )
-                    break
+            # Execute steps 1-11 through the dependency graph with fail-fast behavior
+            completed_steps, failed_step, step_results, cancelled = await self._run_steps(
+                list(range(1, 12)), execution_id, "Pipeline", force
+            )
+            created_files = {step: step_results[step].created_files for step in completed_steps}
 
             # Calculate final results
             overall_execution_time = time.time() - overall_start_time
-            success = failed_step is None
+            success = failed_step is None and not cancelled
 
             # Update execution status
-            final_status = PipelineExecutionStatusEnum.COMPLETED if success else PipelineExecutionStatusEnum.FAILED
+            final_status = self._final_status(success, cancelled)
             self.execution_manager.update_execution_status(execution_id, final_status)
 
             # Send Telegram notification for pipeline completion
@@ -529,7 +1088,7 @@ class PipelineOrchestratorService(IPipelineOrchestrator):
             self.execution_manager.add_log_entry(
                 execution_id,
                 "INFO" if success else "ERROR",
-                f"Pipeline {'completed successfully' if success else 'failed'} in {overall_execution_time:.2f}s",
+                f"Pipeline {'completed successfully' if success else final_status.value} in {overall_execution_time:.2f}s",
                 details={
                     "success": success,
                     "execution_time": overall_execution_time,
@@ -545,8 +1104,9 @@ class PipelineOrchestratorService(IPipelineOrchestrator):
                 "failed_step": failed_step,
                 "execution_time": overall_execution_time,
                 "created_files": created_files,
+                "skipped_steps": self._skipped_steps(step_results),
                 "step_results": step_results,
-                "error_message": step_results.get(failed_step, {}).get("error_message") if failed_step else None
+                "error_message": self._run_error_message(failed_step, step_results, cancelled, "Pipeline")
             }
 
         except Exception as e:
@@ -554,6 +1114,12 @@ class PipelineOrchestratorService(IPipelineOrchestrator):
             overall_execution_time = time.time() - overall_start_time
             error_message = f"Pipeline execution failed with unexpected error: {str(e)}"
 
+            # Steps that finished before the error are recorded by the execution manager
+            execution = self.execution_manager.get_execution_status(execution_id) or {}
+            completed_steps = sorted(execution.get("completed_steps", []))
+            step_results = dict(execution.get("step_results", {}))
+            created_files = dict(execution.get("created_files", {}))
+
             self.execution_manager.update_execution_status(execution_id, PipelineExecutionStatusEnum.FAILED)
 
             # Send Telegram notification for pipeline failure due to exception
@@ -581,6 +1147,7 @@ class PipelineOrchestratorService(IPipelineOrchestrator):
                 "failed_step": None,  # Pipeline-level failure
                 "execution_time": overall_execution_time,
                 "created_files": created_files,
+                "skipped_steps": self._skipped_steps(step_results),
                 "step_results": step_results,
                 "error_message": error_message
             }
@@ -638,9 +1205,16 @@ class PipelineOrchestratorService(IPipelineOrchestrator):
         self,
         start_step: int,
         end_step: int,
-        execution_id: Optional[str] = None
+        execution_id: Optional[str] = None,
+        force: bool = False
     ) -> Dict[str, Any]:
-        """Execute range of pipeline steps with fail-fast behavior"""
+        """
+        Execute range of pipeline steps with fail-fast behavior
+
+        Steps before start_step are not run; their outputs are taken from disk.
+        Steps whose inputs are unchanged since their last successful run are
+        skipped; force re-runs every step in the range.
+        """
         if execution_id is None:
             execution_id = str(uuid.uuid4())
 
@@ -666,7 +1240,8 @@ class PipelineOrchestratorService(IPipelineOrchestrator):
             start_time=datetime.utcnow(),
             target_steps=target_steps,
             start_step=start_step,
-            end_step=end_step
+            end_step=end_step,
+            force=force
         )
 
         self.execution_manager.create_execution(execution_id, "step_range", metadata.dict())
@@ -680,38 +1255,19 @@ class PipelineOrchestratorService(IPipelineOrchestrator):
         )
 
         overall_start_time = time.time()
-        completed_steps = []
-        failed_step = None
-        step_results = {}
 
         try:
-            # Execute steps in range sequentially with fail-fast behavior
-            for step_number in range(start_step, end_step + 1):
-                step_result = await self._execute_step(step_number, execution_id)
-                step_results[step_number] = step_result
-
-                # Add step result to execution manager
-                self.execution_manager.add_step_result(execution_id, step_result)
-
-                if step_result.success:
-                    completed_steps.append(step_number)
-                else:
-                    # Fail-fast behavior - stop on first failure
-                    failed_step = step_number
-                    self.execution_manager.add_log_entry(
-                        execution_id,
-                        "ERROR",
-                        f"Step range failed at step {step_number} - stopping execution",
-                        details={"failed_step": step_number, "error": step_result.error_message}
-                    )
-                    break
+            # Execute steps in range through the dependency graph with fail-fast behavior
+            completed_steps, failed_step, step_results, cancelled = await self._run_steps(
+                target_steps, execution_id, "Step range", force
+            )
 
             # Calculate final results
             overall_execution_time = time.time() - overall_start_time
-            success = failed_step is None
+            success = failed_step is None and not cancelled
 
             # Update execution status
-            final_status = PipelineExecutionStatusEnum.COMPLETED if success else PipelineExecutionStatusEnum.FAILED
+            final_status = self._final_status(success, cancelled)
             self.execution_manager.update_execution_status(execution_id, final_status)
 
             return {
@@ -722,7 +1278,9 @@ class PipelineOrchestratorService(IPipelineOrchestrator):
                 "completed_steps": completed_steps,
                 "failed_step": failed_step,
                 "execution_time": overall_execution_time,
-                "step_results": step_results
+                "skipped_steps": self._skipped_steps(step_results),
+                "step_results": step_results,
+                "error_message": self._run_error_message(failed_step, step_results, cancelled, "Step range")
             }
 
         except Exception as e:
@@ -730,6 +1288,11 @@ class PipelineOrchestratorService(IPipelineOrchestrator):
             overall_execution_time = time.time() - overall_start_time
             error_message = f"Step range execution failed with unexpected error: {str(e)}"
 
+            # Steps that finished before the error are recorded by the execution manager
+            execution = self.execution_manager.get_execution_status(execution_id) or {}
+            completed_steps = sorted(execution.get("completed_steps", []))
+            step_results = dict(execution.get("step_results", {}))
+
             self.execution_manager.update_execution_status(execution_id, PipelineExecutionStatusEnum.FAILED)
             self.execution_manager.add_log_entry(
                 execution_id,
@@ -746,6 +1309,7 @@ class PipelineOrchestratorService(IPipelineOrchestrator):
                 "completed_steps": completed_steps,
                 "failed_step": None,
                 "execution_time": overall_execution_time,
+                "skipped_steps": self._skipped_steps(step_results),
                 "step_results": step_results
             }
 
@@ -757,6 +1321,7 @@ class PipelineOrchestratorService(IPipelineOrchestrator):
                 "execution_id": execution_id,
                 "status": PipelineExecutionStatusEnum.NOT_FOUND,
                 "current_step": None,
+                "running_steps": [],
                 "completed_steps": [],
                 "failed_step": None,
                 "start_time": None,
@@ -777,6 +1342,7 @@ class PipelineOrchestratorService(IPipelineOrchestrator):
             "execution_id": execution_id,
             "status": execution["status"],
             "current_step": execution["current_step"],
+            "running_steps": list(execution.get("running_steps", [])),
             "completed_steps": execution["completed_steps"],
             "failed_step": execution["failed_step"],
             "start_time": execution["start_time"],
@@ -788,35 +1354,99 @@ class PipelineOrchestratorService(IPipelineOrchestrator):
     async def get_execution_logs(
         self,
         execution_id: str,
-        step_number: Optional[int] = None
+        step_number: Optional[int] = None,
+        level: Optional[str] = None,
+        limit: Optional[int] = None,
+        offset: int = 0
     ) -> Dict[str, Any]:
-        """Get structured execution logs for pipeline run"""
-        logs = self.execution_manager.get_execution_logs(execution_id)
+        """Get structured execution logs for pipeline run, one page at a time"""
+        logs, total = self.execution_manager.get_execution_logs(execution_id, step_number, level, limit, offset)
 
-        if step_number is not None:
-            # Filter logs for specific step
-            filtered_logs = [log for log in logs if log.step_number == step_number]
-            return {
-                "execution_id": execution_id,
-                "logs": [log.dict() for log in filtered_logs],
-                "step_logs": None,
-                "total_log_entries": len(filtered_logs)
-            }
-        else:
-            # Group logs by step
+        step_logs = None
+        if step_number is None:
+            # Group logs by step, 0 for pipeline-level logs
             step_logs = {}
             for log in logs:
-                step_num = log.step_number if log.step_number is not None else 0  # 0 for pipeline-level logs
-                if step_num not in step_logs:
-                    step_logs[step_num] = []
-                step_logs[step_num].append(log)
+                step_logs.setdefault(log["step_number"] or 0, []).append(log)
 
-            return {
-                "execution_id": execution_id,
-                "logs": [log.dict() for log in logs],
-                "step_logs": {k: [log.dict() for log in v] for k, v in step_logs.items()},
-                "total_log_entries": len(logs)
-            }
+        return {
+            "execution_id": execution_id,
+            "logs": logs,
+            "step_logs": step_logs,
+            "total_log_entries": total,
+            "offset": offset,
+            "limit": limit
+        }
+
+    async def stream_execution_events(
+        self,
+        execution_id: str,
+        offset: int = 0,
+        heartbeat: Optional[float] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream an execution's events until it finishes
+
+        Starts with a status event, then replays log entries from offset
+        (the position in the execution log), then pushes status, step_start,
+        step_complete and log events as they happen. Every log event carries
+        its offset, so a client that reconnects with the last offset + 1
+        misses nothing. A heartbeat event is sent after heartbeat seconds
+        without events. Ends once the execution has finished - right after
+        the replay if it already had; yields nothing for unknown executions.
+        """
+        manager = self.execution_manager
+        heartbeat = heartbeat or settings.pipeline.event_heartbeat
+        # Subscribe first so nothing published during the replay is lost
+        subscription = manager.events.subscribe(execution_id)
+        try:
+            execution = manager.get_execution_status(execution_id)
+            if execution is None:
+                return
+            snapshot = manager.status_snapshot(execution)
+            yield {"event": "status", "offset": None, "data": snapshot}
+
+            offset = max(offset, 0)
+            async for event in self._replay_log_events(execution_id, offset):
+                offset = event["offset"] + 1
+                yield event
+            if snapshot["status"] in _FINISHED_STATUSES:
+                return
+
+            while True:
+                event = await subscription.get(heartbeat)
+                if subscription.overflowed:
+                    # Fell behind: missed log entries are in the store, status is re-read
+                    subscription.overflowed = False
+                    async for replayed in self._replay_log_events(execution_id, offset):
+                        offset = replayed["offset"] + 1
+                        yield replayed
+                    execution = manager.get_execution_status(execution_id)
+                    event = {"event": "status", "offset": None, "data": manager.status_snapshot(execution)}
+                if event is None:
+                    yield {"event": "heartbeat", "offset": None, "data": {}}
+                    continue
+                if event["event"] == "log":
+                    if event["offset"] < offset:
+                        continue
+                    offset = event["offset"] + 1
+                yield event
+                if event["event"] == "status" and event["data"]["status"] in _FINISHED_STATUSES:
+                    return
+        finally:
+            manager.events.unsubscribe(subscription)
+
+    async def _replay_log_events(self, execution_id: str, offset: int) -> AsyncIterator[Dict[str, Any]]:
+        """Log events of the entries from offset on, read a page at a time"""
+        while True:
+            entries, _ = self.execution_manager.get_execution_logs(
+                execution_id, limit=_EVENT_REPLAY_PAGE, offset=offset
+            )
+            for entry in entries:
+                yield {"event": "log", "offset": offset, "data": entry}
+                offset += 1
+            if len(entries) < _EVENT_REPLAY_PAGE:
+                return
 
     async def get_execution_results(self, execution_id: str) -> Dict[str, Any]:
         """Get detailed execution results and created files"""
@@ -910,11 +1540,12 @@ class PipelineOrchestratorService(IPipelineOrchestrator):
         result = await self.run_step_range(from_step, 11, new_execution_id)
 
         # Mark as resumed execution
-        execution = self.execution_manager.get_execution_status(new_execution_id)
-        if execution and "metadata" in execution:
-            execution["metadata"]["is_resumed"] = True
-            execution["metadata"]["original_execution_id"] = execution_id
-            execution["metadata"]["resumed_from_step"] = from_step
+        self.execution_manager.update_metadata(
+            new_execution_id,
+            is_resumed=True,
+            original_execution_id=execution_id,
+            resumed_from_step=from_step
+        )
 
         return {
             "execution_id": new_execution_id,
@@ -928,36 +1559,18 @@ class PipelineOrchestratorService(IPipelineOrchestrator):
     async def get_pipeline_history(
         self,
         limit: int = 50,
-        status_filter: Optional[str] = None
+        status_filter: Optional[str] = None,
+        offset: int = 0
     ) -> Dict[str, Any]:
-        """Get history of pipeline executions"""
-        # Get all executions
-        all_executions = []
-        for exec_id, execution in self.execution_manager._executions.items():
-            if status_filter is None or execution.get("status") == status_filter:
-                all_executions.append({
-                    "execution_id": exec_id,
-                    "execution_type": execution.get("metadata", {}).get("execution_type", "unknown"),
-                    "status": execution.get("status"),
-                    "success": execution.get("status") == PipelineExecutionStatusEnum.COMPLETED,
-                    "start_time": execution.get("start_time"),
-                    "end_time": execution.get("end_time"),
-                    "execution_time": execution.get("execution_time"),
-                    "completed_steps": execution.get("completed_steps", []),
-                    "failed_step": execution.get("failed_step"),
-                    "total_files_created": sum(len(files) for files in execution.get("created_files", {}).values()),
-                    "is_resumed": execution.get("metadata", {}).get("is_resumed", False)
-                })
-
-        # Sort by start time (most recent first) and limit
-        all_executions.sort(key=lambda x: x["start_time"], reverse=True)
-        limited_executions = all_executions[:limit]
+        """Get one page of pipeline executions, most recent first"""
+        executions, total = self.execution_manager.store.list_executions(limit, offset, status_filter)
 
         return {
-            "executions": limited_executions,
-            "total_executions": len(all_executions),
-            "filtered_count": len(limited_executions),
-            "status_filter": status_filter
+            "executions": executions,
+            "total_executions": total,
+            "filtered_count": len(executions),
+            "status_filter": status_filter,
+            "offset": offset
         }
 
     def get_available_steps(self) -> Dict[str, Any]:
@@ -1098,13 +1711,21 @@ class PipelineOrchestratorService(IPipelineOrchestrator):
     # Service layer step implementations
     # Each step wraps the corresponding service method to return boolean success status
 
-    def _step1_fetch_data(self) -> bool:
-        """Step 1: Fetch data from screeners"""
+    async def _step1_fetch_data(self) -> bool:
+        """Step 1: Fetch current stocks and backtest history from screeners"""
         try:
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            result = loop.run_until_complete(self.screener_service.fetch_all_screener_data())
-            loop.close()
+            # Runs on the server's event loop, reusing the provider's pooled session
+            result, _ = await asyncio.gather(
+                self.screener_service.fetch_all_screener_data(),
+                self.screener_service.fetch_all_screener_histories()
+            )
+
+            self.screen_changes = {
+                screener_id: screen_data.get('constituents_changed') if screen_data.get('success') else None
+                for screener_id, screen_data in result.items()
+            }
+            if result and not any(self.screen_changes.values()):
+                print("Screener constituents unchanged since the last fetch")
             # Check if any screeners returned data
             return any(screen_data.get('success', False) for screen_data in result.values())
         except Exception as e:
@@ -1142,10 +1763,12 @@ class PipelineOrchestratorService(IPipelineOrchestrator):
             print(f"Step 4 failed: {e}")
             return False
 
-    def _step5_update_currency(self) -> bool:
-        """Step 5: Update EUR exchange rates"""
+    def _step5_update_currency(self, exchange_rates: Optional[Dict[str, float]] = None) -> bool:
+        """Step 5: Update EUR exchange rates (exchange_rates: already fetched by the prefetch)"""
         try:
-            return self.currency_service.run_currency_update()
+            if exchange_rates is None:
+                return self.currency_service.run_currency_update()
+            return self.currency_service.run_currency_update(exchange_rates)
         except Exception as e:
             print(f"Step 5 failed: {e}")
             return False
@@ -1158,14 +1781,19 @@ class PipelineOrchestratorService(IPipelineOrchestrator):
             print(f"Step 6 failed: {e}")
             return False
 
-    async def _step7_calculate_quantities(self) -> bool:
-        """Step 7: Calculate quantities from IBKR account value"""
+    def _step7_calculate_quantities(
+        self,
+        account: Optional[Tuple[Optional[float], Optional[str]]] = None
+    ) -> bool:
+        """Step 7: Calculate quantities from IBKR account value (account: already fetched by the prefetch)"""
         try:
             # Get account value and calculate quantities
             from ...core.dependencies import get_quantity_orchestrator_service
             quantity_orchestrator = get_quantity_orchestrator_service()
-            result = await quantity_orchestrator.main()
-            return result
+            if account is None:
+                # Runs in a worker thread, which has no event loop of its own
+                account = asyncio.run(quantity_orchestrator.account_service.get_account_total_value())
+            return quantity_orchestrator.update_quantities(account)
         except Exception as e:
             print(f"Step 7 failed: {e}")
             return False
@@ -1200,6 +1828,91 @@ class PipelineOrchestratorService(IPipelineOrchestrator):
             print(f"Step 10 failed: {e}")
             return False
 
+    # Step prefetches
+    # Started by the pipeline as soon as their inputs exist; each returns keyword
+    # arguments for its step function and must not touch files other steps write
+
+    def _prefetch_history(self) -> Dict[str, Any]:
+        """Step 3 prefetch: parse the backtest exports into the history cache while step 2 runs"""
+        from .legacy import history_parser
+        cache = get_backtest_history_cache()
+        for screen_name in settings.uncle_stock.uncle_stock_screens.values():
+            try:
+                cache.get(history_parser.backtest_csv_path(screen_name))
+            except Exception:
+                # Step 3 parses the file again and reports the error itself
+                pass
+        return {}
+
+    def _prefetch_exchange_rates(self) -> Dict[str, Any]:
+        """Step 5 prefetch: download EUR exchange rates at pipeline start"""
+        return {"exchange_rates": self.currency_service.fetch_exchange_rates()}
+
+    async def _prefetch_account_value(self) -> Dict[str, Any]:
+        """Step 7 prefetch: read the IBKR account value at pipeline start"""
+        from ...core.dependencies import get_quantity_orchestrator_service
+        account_service = get_quantity_orchestrator_service().account_service
+        return {"account": await account_service.get_account_total_value()}
+
+    # Step input fingerprints
+    # Each returns what the step's outputs depend on besides upstream steps,
+    # called with the same keyword arguments as the step function
+
+    def _export_paths(self, suffix: str) -> List[str]:
+        paths = []
+        for screen_name in settings.uncle_stock.uncle_stock_screens.values():
+            safe_name = screen_name.replace(' ', '_').replace('/', '_')
+            paths.append(os.path.join(settings.uncle_stock.data_exports_dir, f"{safe_name}_{suffix}.csv"))
+        return paths
+
+    def _fingerprint_parse_data(self) -> Dict[str, Any]:
+        return {
+            "exports": digest_files(self._export_paths("current_screen")),
+            "screens": settings.uncle_stock.uncle_stock_screens,
+            "additional_fields": settings.uncle_stock.additional_fields,
+            "extract_additional_fields": settings.uncle_stock.extract_additional_fields
+        }
+
+    def _fingerprint_parse_history(self) -> Dict[str, Any]:
+        return {
+            "backtests": digest_files(self._export_paths("backtest_results")),
+            "screens": settings.uncle_stock.uncle_stock_screens
+        }
+
+    def _fingerprint_portfolio_config(self) -> Dict[str, Any]:
+        return {"portfolio": settings.portfolio.model_dump(include={
+            "max_ranked_stocks", "max_allocation", "min_allocation", "risk_free_rate"
+        })}
+
+    def _fingerprint_exchange_rates(self, exchange_rates: Optional[Dict[str, float]] = None) -> Dict[str, Any]:
+        return {"exchange_rates": exchange_rates}
+
+    def _fingerprint_account_value(
+        self,
+        account: Optional[Tuple[Optional[float], Optional[str]]] = None
+    ) -> Dict[str, Any]:
+        account_value, currency = account or (None, None)
+        if account_value is not None:
+            # Quantities only depend on the value rounded for allocation
+            account_value = self.quantity_service.round_account_value_conservatively(account_value)
+        return {
+            "account_value": account_value,
+            "currency": currency,
+            "lot_sizes": settings.portfolio.lot_sizes
+        }
+
+    def _fingerprint_ibkr_search(self) -> Dict[str, Any]:
+        # Searches only read the identity of the stocks to buy; their quantities
+        # are copied into the output on every run by _refresh_ibkr_search
+        snapshot = get_universe_cache().get("data/universe.json")
+        stocks = self.ibkr_search_service.extract_unique_stocks(snapshot.data) if snapshot else []
+        return {"stocks": sorted(
+            [stock["ticker"], stock.get("isin"), stock.get("name"), stock.get("currency")] for stock in stocks
+        )}
+
+    def _refresh_ibkr_search(self) -> bool:
+        return self.ibkr_search_service.refresh_universe_with_ibkr()
+
     def _step11_check_order_status(self) -> bool:
         """Step 11: Check order status and verification"""
         try:
@@ -4,13 +4,16 @@ Wraps src/portfolio_optimizer.py functions with Interface-First Design
 Maintains 100% behavioral compatibility with CLI implementation
 """
 
-import json
 import numpy as np
 import pandas as pd
 from scipy.optimize import minimize
-from typing import Dict, List, Tuple, Any
+from typing import Dict, List, Tuple, Any, Optional
 import os
 from ..interfaces import IPortfolioOptimizer
+from ..bootstrap_engine import DEFAULT_CONFIDENCE, DEFAULT_SAMPLES, BootstrapEngine
+from ..frontier_engine import DEFAULT_FRONTIER_POINTS, FrontierEngine, quarterly_returns_frame
+from ..sharpe_optimizer import SharpeOptimizer
+from ..universe_store import get_universe_store
 from ...core.exceptions import ValidationError
 
 
@@ -37,43 +40,24 @@ class PortfolioOptimizerService(IPortfolioOptimizer):
         if not os.path.exists(self.universe_path):
             raise FileNotFoundError("universe.json not found - run steps 2 and 3 first")
 
-        with open(self.universe_path, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        return get_universe_store(self.universe_path).load()
+
+    def load_metadata(self) -> Dict[str, Any]:
+        """
+        Load only the metadata section of universe.json
+        Everything the optimizer reads and writes lives there, so no stock rows are parsed
+        """
+        if not os.path.exists(self.universe_path):
+            raise FileNotFoundError("universe.json not found - run steps 2 and 3 first")
+
+        return get_universe_store(self.universe_path).get_section('metadata')
 
     def extract_quarterly_returns(self, universe_data: Dict[str, Any]) -> pd.DataFrame:
         """
         Extract quarterly returns for each screener from universe data
         Exact replication of src/portfolio_optimizer.py:extract_quarterly_returns()
         """
-        historical_data = universe_data['metadata']['historical_performance']
-        returns_data = {}
-
-        for screener_key, screener_data in historical_data.items():
-            if 'quarterly_data' in screener_data:
-                quarterly_data = screener_data['quarterly_data']
-
-                # Extract returns and convert to float
-                returns = []
-                quarters = []
-
-                for quarter in quarterly_data:
-                    try:
-                        # Remove % sign and convert to decimal
-                        return_str = quarter['return'].replace('%', '')
-                        return_float = float(return_str) / 100.0  # Convert percentage to decimal
-                        returns.append(return_float)
-                        quarters.append(quarter['quarter'])
-                    except (ValueError, KeyError):
-                        continue
-
-                if returns:
-                    returns_data[screener_key] = returns
-
-        # Create DataFrame - all screeners should have same number of quarters
-        df = pd.DataFrame(returns_data)
-        df.index = quarters[:len(df)]  # Use quarters as index
-
-        return df
+        return quarterly_returns_frame(universe_data)
 
     def calculate_portfolio_stats(
         self,
@@ -113,30 +97,43 @@ class PortfolioOptimizerService(IPortfolioOptimizer):
     def optimize_portfolio(
         self,
         returns: pd.DataFrame,
-        risk_free_rate: float = 0.02/4
+        risk_free_rate: float = 0.02/4,
+        previous_weights: Optional[Dict[str, float]] = None
     ) -> Dict[str, Any]:
         """
         Optimize portfolio to maximize Sharpe ratio
         Exact replication of src/portfolio_optimizer.py:optimize_portfolio()
+
+        Uses SharpeOptimizer (precomputed moments, analytic gradient),
+        warm-started from previous_weights when given. Returns with missing
+        values use the legacy pandas objective from equal weights.
         """
         n_assets = len(returns.columns)
 
-        # Constraints and bounds
-        constraints = {'type': 'eq', 'fun': lambda x: np.sum(x) - 1}  # Weights sum to 1
-        bounds = tuple((0, 1) for _ in range(n_assets))  # Weights between 0 and 1 (long only)
-
-        # Initial guess: equal weights
-        initial_weights = np.array([1/n_assets] * n_assets)
-
-        # Optimization
-        result = minimize(
-            self._negative_sharpe_ratio,
-            initial_weights,
-            args=(returns, risk_free_rate),
-            method='SLSQP',
-            bounds=bounds,
-            constraints=constraints
-        )
+        try:
+            optimizer = SharpeOptimizer(returns, risk_free_rate)
+        except ValueError:
+            optimizer = None
+
+        if optimizer is not None:
+            result = optimizer.optimize(optimizer.initial_weights(previous_weights))
+        else:
+            # Constraints and bounds
+            constraints = {'type': 'eq', 'fun': lambda x: np.sum(x) - 1}  # Weights sum to 1
+            bounds = tuple((0, 1) for _ in range(n_assets))  # Weights between 0 and 1 (long only)
+
+            # Initial guess: equal weights
+            initial_weights = np.array([1/n_assets] * n_assets)
+
+            # Optimization
+            result = minimize(
+                self._negative_sharpe_ratio,
+                initial_weights,
+                args=(returns, risk_free_rate),
+                method='SLSQP',
+                bounds=bounds,
+                constraints=constraints
+            )
 
         if not result.success:
             print(f"Optimization warning: {result.message}")
@@ -176,6 +173,41 @@ class PortfolioOptimizerService(IPortfolioOptimizer):
             'optimization_message': result.message if hasattr(result, 'message') else 'Success'
         }
 
+    def calculate_allocation_methods(
+        self,
+        returns: pd.DataFrame,
+        risk_free_rate: float = 0.02/4,
+        frontier_points: int = DEFAULT_FRONTIER_POINTS
+    ) -> Dict[str, Any]:
+        """
+        Compare allocation methods and compute the efficient frontier in one run
+
+        Does not modify universe.json; step 4 still stores the max-Sharpe weights.
+        """
+        try:
+            return FrontierEngine(returns, risk_free_rate).run(frontier_points)
+        except ValueError as e:
+            raise ValidationError(str(e), "INVALID_RETURNS_DATA")
+
+    def bootstrap_portfolio_weights(
+        self,
+        returns: pd.DataFrame,
+        risk_free_rate: float = 0.02/4,
+        n_samples: int = DEFAULT_SAMPLES,
+        confidence: float = DEFAULT_CONFIDENCE,
+        block_size: int = 1,
+        seed: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Bootstrap the max-Sharpe weights to measure their stability
+
+        Does not modify universe.json.
+        """
+        try:
+            return BootstrapEngine(returns, risk_free_rate).run(n_samples, confidence, block_size, seed)
+        except ValueError as e:
+            raise ValidationError(str(e), "INVALID_RETURNS_DATA")
+
     def update_universe_with_portfolio(
         self,
         universe_data: Dict[str, Any],
@@ -213,8 +245,10 @@ class PortfolioOptimizerService(IPortfolioOptimizer):
         Save updated universe data
         Exact replication of src/portfolio_optimizer.py:save_universe()
         """
-        with open(self.universe_path, 'w', encoding='utf-8') as f:
-            json.dump(universe_data, f, indent=2, ensure_ascii=False)
+        # Only metadata changes in this step, so it is the only section written back
+        store = get_universe_store(self.universe_path)
+        store.set_section('metadata', universe_data['metadata'])
+        store.export()
 
     def display_portfolio_results(self, portfolio_results: Dict[str, Any]) -> None:
         """
@@ -271,7 +305,8 @@ class PortfolioOptimizerService(IPortfolioOptimizer):
         try:
             # Load universe data
             print("Loading universe data...")
-            universe_data = self.load_universe_data()
+            # The optimizer only reads and writes metadata; stock rows are never loaded
+            universe_data = {'metadata': self.load_metadata()}
 
             # Extract quarterly returns
             print("Extracting quarterly returns...")
@@ -283,7 +318,8 @@ class PortfolioOptimizerService(IPortfolioOptimizer):
 
             # Optimize portfolio
             print("\nOptimizing portfolio allocation...")
-            portfolio_results = self.optimize_portfolio(returns_df)
+            previous_weights = universe_data['metadata'].get('portfolio_optimization', {}).get('optimal_allocations')
+            portfolio_results = self.optimize_portfolio(returns_df, previous_weights=previous_weights)
 
             # Display results
             self.display_portfolio_results(portfolio_results)
@@ -8,6 +8,7 @@ from typing import Dict, Any, Tuple, Optional
 from .account_service import AccountService
 from .quantity_service import QuantityService
 from ..interfaces import IAccountService, IQuantityCalculator
+from ..pipeline_workers import get_pipeline_worker_pool
 
 
 class QuantityOrchestratorService:
@@ -25,15 +26,32 @@ class QuantityOrchestratorService:
         self.account_service = account_service or AccountService()
         self.quantity_service = quantity_service or QuantityService()
 
-    async def main(self) -> bool:
+    async def main(self, account: Optional[Tuple[Optional[float], Optional[str]]] = None) -> bool:
         """
         Main function to get account value and update universe.json
         Exact behavioral compatibility with legacy qty.py main() function
+
+        Args:
+            account: (account value, currency) already fetched from IBKR; fetched here when None
         """
         print("Starting quantity calculator...")
 
         # Get account total value from IBKR
-        account_value, currency = await self.account_service.get_account_total_value()
+        if account is None:
+            account = await self.account_service.get_account_total_value()
+
+        # The quantity engine and universe.json writes block; keep them off the event loop
+        return await get_pipeline_worker_pool().run(self.update_quantities, account)
+
+    def update_quantities(self, account: Tuple[Optional[float], Optional[str]]) -> bool:
+        """
+        Round the account value and update universe.json with it and all stock quantities
+        Blocking: async callers run it in the pipeline worker pool
+
+        Args:
+            account: (account value, currency) as returned by the account service
+        """
+        account_value, currency = account
 
         if account_value is None or currency is None:
             print("Failed to get account value from IBKR")
@@ -74,7 +92,9 @@ class QuantityOrchestratorService:
         print(f"Using provided account value: €{account_value:,.2f}")
         print(f"Rounded account value for calculations: €{rounded_account_value:,.2f}")
 
-        success = self.quantity_service.update_universe_json(rounded_account_value, currency)
+        success = await get_pipeline_worker_pool().run(
+            self.quantity_service.update_universe_json, rounded_account_value, currency
+        )
 
         if success:
             print(f"Successfully calculated quantities with account value: €{rounded_account_value:,.2f}")
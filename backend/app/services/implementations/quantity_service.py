@@ -3,12 +3,15 @@ QuantityService implementation wrapping legacy qty.py calculation functionality
 Maintains 100% behavioral compatibility with CLI step7_calculate_quantities()
 """
 
-import json
 import time
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Iterable, List, Optional, Tuple
 
 from ..interfaces import IQuantityCalculator
+from ..quantity_engine import QuantityEngine
+from ..universe_cache import get_universe_cache
+from ..universe_store import ALL_STOCKS_CONTAINER, REMOVE_FIELD, get_universe_store, screen_container
+from ...core.config import settings
 
 
 class QuantityService(IQuantityCalculator):
@@ -20,6 +23,7 @@ class QuantityService(IQuantityCalculator):
     def __init__(self):
         """Initialize QuantityService with path configuration"""
         self.universe_path = Path("data/universe.json")
+        self.quantity_engine = QuantityEngine(settings.portfolio.lot_sizes)
 
     def calculate_stock_quantities(
         self,
@@ -28,7 +32,7 @@ class QuantityService(IQuantityCalculator):
     ) -> int:
         """
         Calculate EUR prices and quantities for all stocks based on account value and target allocations
-        Exact copy of legacy calculate_stock_quantities function
+        Same results as legacy calculate_stock_quantities, computed one vectorised batch per screen
         """
         print("Calculating stock quantities...")
 
@@ -55,38 +59,59 @@ class QuantityService(IQuantityCalculator):
                         # Get the correct screen allocation for this screen
                         screen_allocation = screen_allocations.get(screen_name, 0)
 
+                        stocks = []
                         for stock in screen_data["stocks"]:
                             if isinstance(stock, dict):  # Make sure it's a stock dictionary
-                                self.calculate_stock_fields(stock, account_value, screen_allocation)
-                                total_stocks_processed += 1
-
-                                # Count allocation types
-                                final_target = float(stock.get("final_target", 0))
-                                if final_target < 1e-10 and final_target > 0:
-                                    minimal_allocation_count += 1
-                                elif final_target > 0:
-                                    meaningful_allocation_count += 1
+                                stocks.append(stock)
                             else:
                                 print(f"Warning: Non-dict stock found in {screen_name}: {stock}")
+
+                        stats = self._apply_quantity_engine(stocks, account_value, screen_allocation)
+                        total_stocks_processed += stats["processed"]
+
+                        # Count allocation types
+                        minimal_allocation_count += stats["minimal_allocations"]
+                        meaningful_allocation_count += stats["meaningful_allocations"]
                     else:
                         print(f"Warning: Screen {screen_name} has no stocks or is not a dict: {type(screen_data)}")
 
             elif category == "all_stocks":
                 # Process all_stocks category - it's a dict with ticker keys
                 print(f"Processing all_stocks category")
+                stocks = []
                 for ticker, stock in universe_data["all_stocks"].items():
                     if isinstance(stock, dict):  # Make sure it's a stock dictionary
-                        # For all_stocks, use the stored final_target
-                        self.calculate_stock_fields(stock, account_value, None)
-                        total_stocks_processed += 1
+                        stocks.append(stock)
                     else:
                         print(f"Warning: Non-dict stock found in all_stocks: {ticker}: {stock}")
 
+                # For all_stocks, use the stored final_target
+                stats = self._apply_quantity_engine(stocks, account_value, None)
+                total_stocks_processed += stats["processed"]
+
         print(f"Processed {total_stocks_processed} stocks with quantity calculations")
         print(f"  - {meaningful_allocation_count} stocks with meaningful allocations (>1e-10)")
         print(f"  - {minimal_allocation_count} stocks with minimal allocations (<1e-10)")
         return total_stocks_processed
 
+    def _apply_quantity_engine(
+        self,
+        stocks: List[Dict[str, Any]],
+        account_value: float,
+        screen_allocation: Optional[float]
+    ) -> Dict[str, Any]:
+        """
+        Run calculate_stock_fields semantics over a batch of stocks in one vectorised pass
+        Rows the engine cannot reproduce exactly go through calculate_stock_fields itself
+        """
+        stats = self.quantity_engine.apply(
+            stocks, account_value, screen_allocation, fallback=self.calculate_stock_fields
+        )
+        for currency, count in stats["lot_adjustments"].items():
+            lot_size = self.quantity_engine.lot_sizes[currency]
+            print(f"Adjusted {count} {currency} stock quantities down to whole lots (lot size {lot_size})")
+        return stats
+
     def calculate_stock_fields(
         self,
         stock: Dict[str, Any],
@@ -125,18 +150,16 @@ class QuantityService(IQuantityCalculator):
             # Calculate quantity (shares to buy)
             quantity = target_value_eur / eur_price if eur_price > 0 else 0
 
-            # Apply Japanese stock lot size rounding (100 shares minimum)
+            # Apply lot size rounding (settings.portfolio.lot_sizes, e.g. 100 shares for JPY)
             currency = stock.get("currency", "").upper()
-            if currency == "JPY" and quantity > 0:
+            lot_size = self.quantity_engine.lot_sizes.get(currency, 1)
+            if lot_size > 1 and quantity > 0:
                 original_quantity = quantity
-                # For Japanese stocks: always round to nearest 100 shares
-                # For buying: round DOWN to nearest 100 (conservative approach)
-                # For selling: round UP to nearest 100 (sell enough to meet lot requirements)
-                # Since we can't distinguish buy/sell here, we'll round DOWN (conservative for buying)
-                quantity = (int(quantity) // 100) * 100
+                # Round DOWN to whole lots: buy/sell is unknown here, so stay conservative for buying
+                quantity = (int(quantity) // lot_size) * lot_size
 
                 if original_quantity != quantity:
-                    print(f"Japanese stock {stock.get('ticker', 'Unknown')}: adjusted quantity from {original_quantity:.1f} to {quantity} (lot size 100)")
+                    print(f"{currency} stock {stock.get('ticker', 'Unknown')}: adjusted quantity from {original_quantity:.1f} to {quantity} (lot size {lot_size})")
 
             # Add new fields to the stock
             stock["eur_price"] = round(eur_price, 6)
@@ -171,23 +194,42 @@ class QuantityService(IQuantityCalculator):
             return False
 
         try:
-            # Read current universe.json
-            with open(self.universe_path, 'r', encoding='utf-8') as f:
-                universe_data = json.load(f)
+            store = get_universe_store(str(self.universe_path))
+            snapshot = get_universe_cache().get(str(self.universe_path))
+            if snapshot is None:
+                print(f"Universe file not found at: {self.universe_path}")
+                return False
+
+            # Calculate stock quantities on copies of the shared parsed universe
+            universe_data = self._stock_copies(snapshot.data)
+            stocks_processed = self.calculate_stock_quantities(universe_data, account_value)
 
             # Add account value at the top level
-            universe_data["account_total_value"] = {
+            store.set_section("account_total_value", {
                 "value": account_value,
                 "currency": currency,
                 "timestamp": time.strftime("%Y-%m-%d %H:%M:%S")
-            }
-
-            # Calculate stock quantities for all stocks
-            stocks_processed = self.calculate_stock_quantities(universe_data, account_value)
+            })
+
+            # Write the fields back per section; only rows whose values changed are re-encoded
+            for screen_name, screen_data in universe_data.get("screens", {}).items():
+                if isinstance(screen_data, dict) and "stocks" in screen_data:
+                    originals = snapshot.data["screens"][screen_name]["stocks"]
+                    updates = self._stock_updates(
+                        (stock.get("ticker"), original, stock)
+                        for original, stock in zip(originals, screen_data["stocks"]) if isinstance(stock, dict)
+                    )
+                    store.update_stock_fields(updates, container=screen_container(screen_name))
+            if isinstance(universe_data.get("all_stocks"), dict):
+                originals = snapshot.data["all_stocks"]
+                updates = self._stock_updates(
+                    (ticker, originals[ticker], stock)
+                    for ticker, stock in universe_data["all_stocks"].items() if isinstance(stock, dict)
+                )
+                store.update_stock_fields(updates, container=ALL_STOCKS_CONTAINER)
 
             # Write back to file
-            with open(self.universe_path, 'w', encoding='utf-8') as f:
-                json.dump(universe_data, f, indent=2, ensure_ascii=False)
+            store.export()
 
             print(f"Updated universe.json with account value: ${account_value:,.2f}")
             print(f"Added quantity calculations for {stocks_processed} stocks")
@@ -197,6 +239,38 @@ class QuantityService(IQuantityCalculator):
             print(f"Error updating universe.json: {e}")
             return False
 
+    @staticmethod
+    def _stock_copies(universe_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Universe dict whose stock dicts are private copies, safe to calculate on in place"""
+        copied = dict(universe_data)
+        screens = universe_data.get("screens")
+        if isinstance(screens, dict):
+            copied["screens"] = {
+                screen_name: (
+                    {**screen_data, "stocks": [dict(stock) if isinstance(stock, dict) else stock
+                                               for stock in screen_data["stocks"]]}
+                    if isinstance(screen_data, dict) and "stocks" in screen_data else screen_data
+                )
+                for screen_name, screen_data in screens.items()
+            }
+        if isinstance(universe_data.get("all_stocks"), dict):
+            copied["all_stocks"] = {
+                ticker: dict(stock) if isinstance(stock, dict) else stock
+                for ticker, stock in universe_data["all_stocks"].items()
+            }
+        return copied
+
+    @staticmethod
+    def _stock_updates(rows: Iterable[Tuple[str, Dict[str, Any], Dict[str, Any]]]) -> Dict[str, Dict[str, Any]]:
+        """Ticker -> fields for UniverseStore.update_stock_fields from (ticker, original, calculated copy) rows"""
+        updates = {}
+        for ticker, original, updated in rows:
+            if ticker:
+                fields = dict(updated)
+                fields.update({key: REMOVE_FIELD for key in original if key not in updated})
+                updates[ticker] = fields
+        return updates
+
     def round_account_value_conservatively(self, account_value: float) -> float:
         """
         Round account value DOWN to nearest 100€ for conservative allocation calculations
@@ -8,7 +8,6 @@ Maintains 100% behavioral compatibility with CLI step9_rebalancer()
 import json
 import os
 import time
-import threading
 from collections import defaultdict
 from typing import Dict, List, Tuple, Optional, Any
 from datetime import datetime
@@ -28,6 +27,7 @@ if os.path.exists(src_path):
 from rebalancer import IBRebalancerApi, PortfolioRebalancer
 
 from ..interfaces import IRebalancingService
+from ..ibkr_session_manager import get_ibkr_session_manager, DATA_CLIENT_ID
 
 
 class RebalancingService(IRebalancingService):
@@ -185,59 +185,45 @@ class RebalancingService(IRebalancingService):
             - contract_details: Dict mapping symbol to IBKR contract info
 
         Side Effects:
-            - Establishes connection to IBKR Gateway (127.0.0.1:4002)
+            - Uses the shared IBKR Gateway session (127.0.0.1:4002), connecting if needed
             - Prints connection status and position data to console
-            - Uses threading for IBKR API message processing
 
         Raises:
             Exception: If connection to IBKR Gateway fails or timeout
         """
         print("\n[FETCH] Fetching current positions from IBKR...")
 
-        # Initialize API client
+        # Initialize callback sink; the IB Gateway connection is shared and stays open
         app = IBRebalancerApi()
+        session = get_ibkr_session_manager().get_session(client_id=DATA_CLIENT_ID)
 
-        # Connect to IB Gateway
-        app.connect("127.0.0.1", 4002, clientId=10)
-
-        # Start message processing thread
-        api_thread = threading.Thread(target=app.run, daemon=True)
-        api_thread.start()
-
-        # Wait for connection
-        timeout = 10
-        start_time = time.time()
-        while not app.connected and (time.time() - start_time) < timeout:
-            time.sleep(0.1)
-
-        if not app.connected:
+        # Reuse the live connection (connects only if the link is down)
+        if not session.ensure_connected(timeout=10):
             raise Exception("Failed to connect to IB Gateway")
 
-        # Wait for account ID
-        time.sleep(2)
-        if not app.account_id:
+        if not session.account_id:
             raise Exception("No account ID received")
 
-        # Request positions
-        app.reqPositions()
-        app.reqAccountUpdates(True, app.account_id)
+        with session.subscription(app):
+            # Request positions
+            session.reqPositions()
+            session.reqAccountUpdates(True, session.account_id)
 
-        # Wait for data
-        start_time = time.time()
-        while not app.data_ready and (time.time() - start_time) < 10:
-            time.sleep(0.1)
+            # Wait for data
+            start_time = time.time()
+            while not app.data_ready and (time.time() - start_time) < 10:
+                time.sleep(0.1)
 
-        if not app.data_ready:
-            print("[WARNING] Timeout waiting for position data, using partial data")
+            if not app.data_ready:
+                print("[WARNING] Timeout waiting for position data, using partial data")
 
-        # Store current positions and contract details
-        current_positions = app.current_positions.copy()
-        current_contract_details = app.contract_details.copy()
+            # Store current positions and contract details
+            current_positions = app.current_positions.copy()
+            current_contract_details = app.contract_details.copy()
 
-        # Cancel subscriptions and disconnect
-        app.cancelPositions()
-        app.reqAccountUpdates(False, app.account_id)
-        app.disconnect()
+            # Cancel subscriptions (connection stays open for other callers)
+            session.cancelPositions()
+            session.reqAccountUpdates(False, session.account_id)
 
         print(f"[OK] Current portfolio has {len(current_positions)} positions")
         if current_positions:
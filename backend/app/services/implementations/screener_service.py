@@ -2,6 +2,7 @@
 High-level screener service implementation
 Orchestrates data fetching operations with legacy compatibility
 """
+import asyncio
 import logging
 from typing import Dict, Any, Optional
 
@@ -165,11 +166,14 @@ class ScreenerService(IScreenerService):
             if r.get("success", False) and isinstance(r.get("data"), list)
         )
 
+        changed_count = sum(1 for r in results.values() if r.get("constituents_changed"))
+
         logger.info(
             "Completed batch fetch of all screener data",
             extra={
                 "total_screeners": len(results),
                 "successful_screeners": successful_count,
+                "changed_screeners": changed_count,
                 "total_symbols": total_symbols
             }
         )
@@ -217,6 +221,10 @@ class ScreenerService(IScreenerService):
         """
         return self.data_provider.get_screener_configurations()
 
+    async def close(self) -> None:
+        """Release the data provider's pooled connections"""
+        await self.data_provider.close()
+
     async def run_step1_equivalent(self) -> bool:
         """
         Run the equivalent of CLI step1_fetch_data() function
@@ -233,13 +241,12 @@ class ScreenerService(IScreenerService):
         screener_configs = self.get_available_screeners()
         print(f"Configured screeners: {list(screener_configs.values())}")
 
-        # Fetch current stocks from all screeners
-        print("\nFetching current stocks from all screeners...")
-        all_stocks = await self.fetch_all_screener_data()
-
-        # Fetch backtest history from all screeners
-        print("\nFetching backtest history from all screeners...")
-        all_histories = await self.fetch_all_screener_histories()
+        # Fetch current stocks and backtest history from all screeners at once
+        print("\nFetching current stocks and backtest history from all screeners...")
+        all_stocks, all_histories = await asyncio.gather(
+            self.fetch_all_screener_data(),
+            self.fetch_all_screener_histories()
+        )
 
         # Display summary (exact legacy format)
         print("\n" + "=" * 50)
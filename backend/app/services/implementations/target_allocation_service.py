@@ -2,13 +2,15 @@
 Target Allocation Service Implementation
 Wraps legacy targetter.py functions following Interface-First Design principles
 """
-import json
 import os
 from typing import Dict, List, Any, Tuple, Optional
 import sys
 import logging
 
+from ..allocation_engine import AllocationEngine
 from ..interfaces import ITargetAllocationService
+from ..universe_cache import get_universe_cache
+from ..universe_store import get_universe_store
 from ...core.config import settings
 
 # Add the root directory to path to access legacy modules
@@ -18,16 +20,11 @@ sys.path.append(str(root_dir))
 
 # Import legacy functions
 from .legacy.targetter import (
-    load_universe_data as legacy_load_universe_data,
     extract_screener_allocations as legacy_extract_screener_allocations,
     parse_180d_change as legacy_parse_180d_change,
     rank_stocks_in_screener as legacy_rank_stocks_in_screener,
     calculate_pocket_allocation as legacy_calculate_pocket_allocation,
-    calculate_final_allocations as legacy_calculate_final_allocations,
-    update_universe_with_allocations as legacy_update_universe_with_allocations,
-    save_universe as legacy_save_universe,
-    display_allocation_summary as legacy_display_allocation_summary,
-    main as legacy_main
+    display_allocation_summary as legacy_display_allocation_summary
 )
 
 logger = logging.getLogger(__name__)
@@ -42,6 +39,7 @@ class TargetAllocationService(ITargetAllocationService):
     def __init__(self):
         """Initialize the target allocation service"""
         self.config = settings
+        self.allocation_engine = AllocationEngine()
         # Change to the root directory for file access compatibility
         self._original_cwd = os.getcwd()
         root_dir = Path(settings.data_directory).parent
@@ -52,10 +50,14 @@ class TargetAllocationService(ITargetAllocationService):
         if hasattr(self, '_original_cwd'):
             os.chdir(self._original_cwd)
 
-    def load_universe_data(self) -> Dict[str, Any]:
+    def load_universe_data(self, read_only: bool = False) -> Dict[str, Any]:
         """
         Load universe.json data from data/universe.json
 
+        Args:
+            read_only: Return the shared parse from the process-wide universe cache
+                instead of a private copy; the result must not be modified
+
         Returns:
             Dict containing complete universe data structure
 
@@ -64,7 +66,15 @@ class TargetAllocationService(ITargetAllocationService):
         """
         logger.info("Loading universe data")
         try:
-            return legacy_load_universe_data()
+            if not os.path.exists("data/universe.json"):
+                raise FileNotFoundError("universe.json not found - run previous steps first")
+            if read_only:
+                snapshot = get_universe_cache().get("data/universe.json")
+                if snapshot is None:
+                    raise FileNotFoundError("universe.json not found - run previous steps first")
+                return snapshot.data
+            # Stocks come back change-tracked so save_universe() only rewrites the ones ranked here
+            return get_universe_store("data/universe.json").load()
         except Exception as e:
             logger.error(f"Failed to load universe data: {e}")
             raise
@@ -153,7 +163,9 @@ class TargetAllocationService(ITargetAllocationService):
         """
         logger.info("Calculating final allocations for all stocks")
         try:
-            return legacy_calculate_final_allocations(universe_data)
+            screener_allocations = self.extract_screener_allocations(universe_data)
+            # Ranks every screener in one grouped pass; identical results and output to the legacy loop
+            return self.allocation_engine.calculate_final_allocations(universe_data, screener_allocations)
         except Exception as e:
             logger.error(f"Failed to calculate final allocations: {e}")
             raise
@@ -179,11 +191,51 @@ class TargetAllocationService(ITargetAllocationService):
         """
         logger.info("Updating universe data with allocation information")
         try:
-            return legacy_update_universe_with_allocations(universe_data, final_allocations)
+            updated_count = self.allocation_engine.apply_allocations(universe_data, final_allocations)
+            print(f"\n+ Updated {updated_count} stocks with allocation data")
+            return True
         except Exception as e:
+            print(f"X Error updating stocks with allocations: {e}")
             logger.error(f"Failed to update universe with allocations: {e}")
             return False
 
+    def save_allocations(
+        self,
+        universe_data: Dict[str, Any],
+        final_allocations: Dict[str, Dict[str, Any]]
+    ) -> bool:
+        """
+        Write allocation fields straight to the universe store and export universe.json
+
+        Args:
+            universe_data: Universe data the allocations were calculated from (not modified)
+            final_allocations: Final allocation data for each ticker
+
+        Returns:
+            bool: True if successful, False otherwise
+
+        Side Effects:
+            Sets rank, allocation_target, screen_target, final_target on every
+            instance of each ticker; only rows whose values changed are rewritten
+        """
+        logger.info("Writing allocation information to the universe store")
+        try:
+            updated_count = sum(
+                1
+                for screen_data in universe_data.get('screens', {}).values()
+                for stock in screen_data.get('stocks', [])
+                if stock.get('ticker') in final_allocations
+            )
+            store = get_universe_store("data/universe.json")
+            store.update_stock_fields(self.allocation_engine.allocation_fields(final_allocations))
+            store.export()
+            print(f"\n+ Updated {updated_count} stocks with allocation data")
+            return True
+        except Exception as e:
+            print(f"X Error updating stocks with allocations: {e}")
+            logger.error(f"Failed to write allocations to universe store: {e}")
+            return False
+
     def save_universe(self, universe_data: Dict[str, Any]) -> None:
         """
         Save updated universe data to data/universe.json
@@ -196,7 +248,9 @@ class TargetAllocationService(ITargetAllocationService):
         """
         logger.info("Saving updated universe data")
         try:
-            legacy_save_universe(universe_data)
+            store = get_universe_store("data/universe.json")
+            store.save(universe_data)
+            store.export()
         except Exception as e:
             logger.error(f"Failed to save universe data: {e}")
             raise
@@ -284,8 +338,34 @@ class TargetAllocationService(ITargetAllocationService):
             - Prints progress and results to console
         """
         logger.info("Starting target allocation calculation process")
+        print("Uncle Stock Portfolio Targetter")
+        print("=" * 60)
+
         try:
-            return legacy_main()
+            print("Loading universe data...")
+            # Allocations are written field by field through the store, so the shared read-only copy suffices
+            universe_data = self.load_universe_data(read_only=True)
+
+            final_allocations = self.calculate_final_allocations(universe_data)
+
+            if not final_allocations:
+                print("X No allocations calculated")
+                return False
+
+            self.display_allocation_summary(final_allocations)
+
+            print(f"\nUpdating universe.json with allocation data...")
+            success = self.save_allocations(universe_data, final_allocations)
+
+            if success:
+                print("\n+ Portfolio targeting complete!")
+                print("+ Results saved to universe.json")
+                print("+ Each stock now has: rank, allocation_target, screen_target, final_target")
+            else:
+                print("\nX Failed to update universe.json with allocation data")
+
+            return success
         except Exception as e:
+            print(f"X Error in portfolio targetter: {e}")
             logger.error(f"Target allocation process failed: {e}")
             return False
\ No newline at end of file
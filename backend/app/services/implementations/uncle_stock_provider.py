@@ -4,8 +4,11 @@ Wraps legacy screener functions with exact behavioral compatibility
 """
 import asyncio
 import logging
-from typing import Dict, Any, Optional
-import requests
+import os
+import random
+import threading
+from typing import Dict, Any, List, Mapping, Optional, Tuple
+import aiohttp
 from datetime import datetime
 
 from ..interfaces import IDataProvider
@@ -16,17 +19,28 @@ from ...core.exceptions import (
     UncleStockInvalidQueryError,
     UncleStockRateLimitError
 )
+from ..export_state import constituents_hash, content_hash, get_export_state
+from ..pipeline_workers import get_pipeline_worker_pool
 from .file_manager import FileManager
 
 logger = logging.getLogger(__name__)
 
+# Rate limiting and transient server errors are worth another attempt
+RETRYABLE_STATUSES = {429, 500, 502, 503, 504}
+
+# Idle pooled connections are kept open this long between requests
+KEEPALIVE_SECONDS = 30
+
 
 class UncleStockProvider(IDataProvider):
     """
     Uncle Stock API provider with 100% legacy compatibility
 
     This implementation exactly replicates the behavior of the legacy
-    screener.py functions while providing an async interface
+    screener.py functions while providing an async interface. All requests
+    share one keep-alive aiohttp session, so the per-screen fetches of
+    get_all_screeners / get_all_screener_histories run concurrently
+    (bounded by max_concurrent_requests) over pooled connections.
     """
 
     def __init__(self, file_manager: Optional[FileManager] = None):
@@ -41,6 +55,14 @@ class UncleStockProvider(IDataProvider):
         self.timeout = settings.uncle_stock.uncle_stock_timeout
         self.user_id = settings.uncle_stock.user_id
         self.screener_configs = settings.uncle_stock.uncle_stock_screens
+        self.retry_attempts = settings.uncle_stock.retry_attempts
+        self.retry_backoff = settings.uncle_stock.retry_backoff
+        self.max_concurrent_requests = settings.uncle_stock.max_concurrent_requests
+        self.connections_per_host = settings.uncle_stock.connections_per_host
+
+        # (session, request semaphore) per event loop, created lazily (see _get_session)
+        self._sessions: Dict[asyncio.AbstractEventLoop, Tuple[aiohttp.ClientSession, asyncio.Semaphore]] = {}
+        self._sessions_lock = threading.Lock()
 
         if not self.user_id:
             raise UncleStockInvalidQueryError(
@@ -48,6 +70,98 @@ class UncleStockProvider(IDataProvider):
                 details={"missing_config": "uncle_stock_user_id"}
             )
 
+    @property
+    def session(self) -> Optional[aiohttp.ClientSession]:
+        """The running loop's session, or None if it has none"""
+        try:
+            entry = self._sessions.get(asyncio.get_running_loop())
+        except RuntimeError:
+            return None
+        return entry[0] if entry else None
+
+    async def _get_session(self) -> Tuple[aiohttp.ClientSession, asyncio.Semaphore]:
+        """
+        Get or create the running loop's keep-alive session and request semaphore
+
+        aiohttp sessions and asyncio semaphores belong to the loop that created
+        them, and pipeline step 1 may run on another loop than the API server,
+        so each loop keeps its own pair. Entries of closed loops are dropped.
+        """
+        loop = asyncio.get_running_loop()
+        with self._sessions_lock:
+            for closed_loop in [other for other in self._sessions if other.is_closed()]:
+                del self._sessions[closed_loop]
+
+            entry = self._sessions.get(loop)
+            if entry is None or entry[0].closed:
+                connector = aiohttp.TCPConnector(
+                    limit_per_host=self.connections_per_host,
+                    keepalive_timeout=KEEPALIVE_SECONDS
+                )
+                session = aiohttp.ClientSession(
+                    connector=connector,
+                    timeout=aiohttp.ClientTimeout(total=self.timeout)
+                )
+                entry = (session, asyncio.Semaphore(max(1, self.max_concurrent_requests)))
+                self._sessions[loop] = entry
+        return entry
+
+    async def close(self) -> None:
+        """Close the running loop's session; other loops' sessions are left to them"""
+        with self._sessions_lock:
+            entry = self._sessions.pop(asyncio.get_running_loop(), None)
+        if entry and not entry[0].closed:
+            await entry[0].close()
+
+    def _retry_delay(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        """Full-jitter exponential backoff, never shorter than a numeric Retry-After"""
+        delay = random.uniform(0, self.retry_backoff * 2 ** attempt)
+        try:
+            return max(delay, float(retry_after)) if retry_after else delay
+        except ValueError:
+            return delay
+
+    async def _get(
+        self,
+        path: str,
+        params: Dict[str, Any],
+        headers: Optional[Dict[str, str]] = None
+    ) -> Tuple[int, str, Mapping[str, str]]:
+        """
+        GET an Uncle Stock endpoint over the shared session
+
+        429/5xx responses and connection errors are retried up to
+        retry_attempts times with jittered backoff.
+
+        Returns:
+            Final (status code, body text, response headers)
+
+        Raises:
+            asyncio.TimeoutError, aiohttp.ClientError: If the last attempt fails
+        """
+        session, request_slots = await self._get_session()
+        attempts = max(1, self.retry_attempts)
+
+        for attempt in range(attempts):
+            retry_after = None
+            try:
+                async with request_slots:
+                    async with session.get(f"{self.base_url}/{path}", params=params, headers=headers) as response:
+                        status = response.status
+                        text = await response.text()
+                        response_headers = response.headers.copy()
+                        retry_after = response_headers.get("Retry-After")
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                if attempt == attempts - 1:
+                    raise
+                logger.warning(f"Uncle Stock /{path} request failed ({e!r}), retrying")
+            else:
+                if status not in RETRYABLE_STATUSES or attempt == attempts - 1:
+                    return status, text, response_headers
+                logger.warning(f"Uncle Stock /{path} returned {status}, retrying")
+
+            await asyncio.sleep(self._retry_delay(attempt, retry_after))
+
     async def get_current_stocks(
         self,
         query_name: str,
@@ -75,37 +189,34 @@ class UncleStockProvider(IDataProvider):
         }
 
         try:
-            # Execute HTTP request in thread pool to avoid blocking
-            loop = asyncio.get_event_loop()
-            response = await loop.run_in_executor(
-                None,
-                lambda: requests.get(
-                    f"{self.base_url}/csv",
-                    params=params,
-                    timeout=self.timeout
-                )
-            )
-
-            if response.status_code == 200:
-                return await self._process_current_stocks_response(response, query_name)
-            elif response.status_code == 429:
+            filename = self.file_manager.get_csv_filename(query_name, "current_screen")
+            pool = get_pipeline_worker_pool()
+            conditional_headers = await pool.run(self._conditional_headers, filename)
+            status_code, text, headers = await self._get("csv", params, conditional_headers)
+
+            if status_code == 304:
+                text = await pool.run(self._read_export, filename)
+                return await self._process_current_stocks_response(text, query_name, headers)
+            elif status_code == 200:
+                return await self._process_current_stocks_response(text, query_name, headers)
+            elif status_code == 429:
                 raise UncleStockRateLimitError(
                     f"Rate limit exceeded for query: {query_name}",
-                    details={"query_name": query_name, "status_code": response.status_code}
+                    details={"query_name": query_name, "status_code": status_code}
                 )
             else:
                 return {
                     'success': False,
-                    'data': f"API returned status {response.status_code}",
-                    'raw_response': response.text
+                    'data': f"API returned status {status_code}",
+                    'raw_response': text
                 }
 
-        except requests.exceptions.Timeout:
+        except asyncio.TimeoutError:
             raise UncleStockTimeoutError(
                 f"Timeout while fetching current stocks for: {query_name}",
                 details={"query_name": query_name, "timeout": self.timeout}
             )
-        except requests.exceptions.RequestException as e:
+        except aiohttp.ClientError as e:
             return {
                 'success': False,
                 'data': str(e),
@@ -133,37 +244,34 @@ class UncleStockProvider(IDataProvider):
         }
 
         try:
-            # Execute HTTP request in thread pool
-            loop = asyncio.get_event_loop()
-            response = await loop.run_in_executor(
-                None,
-                lambda: requests.get(
-                    f"{self.base_url}/backtest-result",
-                    params=params,
-                    timeout=self.timeout
-                )
-            )
-
-            if response.status_code == 200:
-                return await self._process_history_response(response, query_name)
-            elif response.status_code == 429:
+            filename = self.file_manager.get_csv_filename(query_name, "backtest_results")
+            pool = get_pipeline_worker_pool()
+            conditional_headers = await pool.run(self._conditional_headers, filename)
+            status_code, text, headers = await self._get("backtest-result", params, conditional_headers)
+
+            if status_code == 304:
+                text = await pool.run(self._read_export, filename)
+                return await self._process_history_response(text, query_name, headers)
+            elif status_code == 200:
+                return await self._process_history_response(text, query_name, headers)
+            elif status_code == 429:
                 raise UncleStockRateLimitError(
                     f"Rate limit exceeded for history query: {query_name}",
-                    details={"query_name": query_name, "status_code": response.status_code}
+                    details={"query_name": query_name, "status_code": status_code}
                 )
             else:
                 return {
                     'success': False,
-                    'data': f"API returned status {response.status_code}",
-                    'raw_response': response.text
+                    'data': f"API returned status {status_code}",
+                    'raw_response': text
                 }
 
-        except requests.exceptions.Timeout:
+        except asyncio.TimeoutError:
             raise UncleStockTimeoutError(
                 f"Timeout while fetching history for: {query_name}",
                 details={"query_name": query_name, "timeout": self.timeout}
             )
-        except requests.exceptions.RequestException as e:
+        except aiohttp.ClientError as e:
             return {
                 'success': False,
                 'data': str(e),
@@ -174,69 +282,67 @@ class UncleStockProvider(IDataProvider):
         """
         Fetch current stocks from all configured screeners
 
-        Maintains exact legacy behavior including console output
+        Screens are fetched concurrently; results keep the configured order.
+        Maintains legacy console output per screen.
         """
-        results = {}
-
-        for key, screen_name in self.screener_configs.items():
+        async def fetch(screen_name: str) -> Dict[str, Any]:
             # Print progress message (legacy compatibility)
             print(f"\nFetching stocks for {screen_name}...")
 
             try:
                 result = await self.get_current_stocks(query_name=screen_name)
-                results[key] = result
 
                 # Print result summary (legacy compatibility)
                 if result['success']:
                     print(f"+ Found {len(result['data'])} stocks for {screen_name}")
                 else:
                     print(f"X Error fetching {screen_name}: {result['data']}")
+                return result
 
             except Exception as e:
                 # Handle individual screener failures gracefully
-                error_result = {
+                print(f"X Error fetching {screen_name}: {str(e)}")
+                return {
                     'success': False,
                     'data': str(e),
                     'raw_response': None
                 }
-                results[key] = error_result
-                print(f"X Error fetching {screen_name}: {str(e)}")
 
-        return results
+        results = await asyncio.gather(*(fetch(name) for name in self.screener_configs.values()))
+        return dict(zip(self.screener_configs.keys(), results))
 
     async def get_all_screener_histories(self) -> Dict[str, Dict[str, Any]]:
         """
         Fetch backtest history from all configured screeners
 
-        Maintains exact legacy behavior including console output
+        Screens are fetched concurrently; results keep the configured order.
+        Maintains legacy console output per screen.
         """
-        results = {}
-
-        for key, screen_name in self.screener_configs.items():
+        async def fetch(screen_name: str) -> Dict[str, Any]:
             # Print progress message (legacy compatibility)
             print(f"\nFetching history for {screen_name}...")
 
             try:
                 result = await self.get_screener_history(query_name=screen_name)
-                results[key] = result
 
                 # Print result summary (legacy compatibility)
                 if result['success']:
                     print(f"+ Retrieved history for {screen_name}")
                 else:
                     print(f"X Error fetching history for {screen_name}: {result['data']}")
+                return result
 
             except Exception as e:
                 # Handle individual screener failures gracefully
-                error_result = {
+                print(f"X Error fetching history for {screen_name}: {str(e)}")
+                return {
                     'success': False,
                     'data': str(e),
                     'raw_response': None
                 }
-                results[key] = error_result
-                print(f"X Error fetching history for {screen_name}: {str(e)}")
 
-        return results
+        results = await asyncio.gather(*(fetch(name) for name in self.screener_configs.values()))
+        return dict(zip(self.screener_configs.keys(), results))
 
     def get_screener_configurations(self) -> Dict[str, str]:
         """
@@ -246,28 +352,81 @@ class UncleStockProvider(IDataProvider):
         """
         return self.screener_configs.copy()
 
+    def _conditional_headers(self, filename: str) -> Dict[str, str]:
+        return get_export_state(settings.uncle_stock.data_exports_dir).conditional_headers(filename)
+
+    def _read_export(self, filename: str) -> str:
+        """Content of an export the server reported as not modified (304)"""
+        with open(os.path.join(settings.uncle_stock.data_exports_dir, filename), 'r', encoding='utf-8') as f:
+            return f.read()
+
+    def _save_export(
+        self,
+        text: str,
+        filename: str,
+        headers: Optional[Mapping[str, str]] = None,
+        symbols: Optional[List[str]] = None
+    ) -> Tuple[str, bool, Optional[bool]]:
+        """
+        Save an export unless it is identical to the file already on disk
+
+        An unchanged download is a no-op: the file (and its mtime) is left
+        alone. The validators are recorded either way.
+
+        Returns:
+            (file path, content changed, constituents changed - None when
+            no symbols are given)
+        """
+        directory = settings.uncle_stock.data_exports_dir
+        state = get_export_state(directory)
+        previous = state.get(filename)
+        digest = content_hash(text)
+        changed = previous is None or previous.get('sha256') != digest
+
+        if changed:
+            # Save CSV file (this handles directory creation and console output)
+            csv_file_path = self.file_manager.save_csv_data(text, filename, directory)
+        else:
+            csv_file_path = os.path.join(directory, filename)
+            print(f"Unchanged {filename}, keeping: {csv_file_path}")
+
+        symbols_digest = constituents_hash(symbols) if symbols is not None else None
+        constituents_changed = None
+        if symbols is not None:
+            constituents_changed = previous is None or previous.get('constituents_sha256') != symbols_digest
+
+        headers = headers or {}
+        try:
+            state.record(
+                filename,
+                digest,
+                etag=headers.get('ETag'),
+                last_modified=headers.get('Last-Modified'),
+                symbols_digest=symbols_digest,
+                changed=changed
+            )
+        except OSError as e:
+            logger.warning(f"Could not record export state for {filename}: {e}")
+
+        return csv_file_path, changed, constituents_changed
+
     async def _process_current_stocks_response(
         self,
-        response: requests.Response,
-        query_name: str
+        text: str,
+        query_name: str,
+        headers: Optional[Mapping[str, str]] = None
     ) -> Dict[str, Any]:
         """
         Process successful current stocks response
 
-        Replicates exact legacy CSV processing and file saving logic
+        Replicates exact legacy CSV processing; the file is only rewritten
+        when its content changed
         """
         # Generate filename using legacy format
         filename = self.file_manager.get_csv_filename(query_name, "current_screen")
 
-        # Save CSV file (this handles directory creation and console output)
-        csv_file_path = self.file_manager.save_csv_data(
-            response.text,
-            filename,
-            settings.uncle_stock.data_exports_dir
-        )
-
         # Parse CSV to extract symbols (exact legacy logic)
-        lines = response.text.split('\n')
+        lines = text.split('\n')
         symbols = []
 
         # Skip metadata and header lines (legacy: not line.startswith('sep='))
@@ -283,35 +442,40 @@ class UncleStockProvider(IDataProvider):
                         if symbol:
                             symbols.append(symbol)
 
+        # File and export-state writes block; run them in the pipeline worker pool
+        csv_file_path, changed, constituents_changed = await get_pipeline_worker_pool().run(
+            self._save_export, text, filename, headers, symbols
+        )
+
         return {
             'success': True,
             'data': symbols,
-            'raw_response': response.text,
-            'csv_file': csv_file_path
+            'raw_response': text,
+            'csv_file': csv_file_path,
+            'changed': changed,
+            'constituents_changed': constituents_changed
         }
 
     async def _process_history_response(
         self,
-        response: requests.Response,
-        query_name: str
+        text: str,
+        query_name: str,
+        headers: Optional[Mapping[str, str]] = None
     ) -> Dict[str, Any]:
         """
         Process successful history response
 
-        Replicates exact legacy CSV processing and file saving logic
+        Replicates exact legacy CSV processing; the file is only rewritten
+        when its content changed
         """
         # Generate filename using legacy format
         filename = self.file_manager.get_csv_filename(query_name, "backtest_results")
-
-        # Save CSV file
-        csv_file_path = self.file_manager.save_csv_data(
-            response.text,
-            filename,
-            settings.uncle_stock.data_exports_dir
+        csv_file_path, changed, _ = await get_pipeline_worker_pool().run(
+            self._save_export, text, filename, headers
         )
 
         # Parse CSV to structured data (exact legacy logic)
-        lines = response.text.split('\n')
+        lines = text.split('\n')
         history_data = {}
 
         for line in lines:
@@ -326,6 +490,7 @@ class UncleStockProvider(IDataProvider):
         return {
             'success': True,
             'data': history_data,
-            'raw_response': response.text,
-            'csv_file': csv_file_path
-        }
\ No newline at end of file
+            'raw_response': text,
+            'csv_file': csv_file_path,
+            'changed': changed
+        }
@@ -2,10 +2,10 @@
 Universe Service Implementation
 Wraps legacy parser.py functions with service interface
 """
-import json
 import os
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, Iterator, List, Optional
 from ..interfaces import IDataParser, IUniverseRepository
+from ..universe_cache import get_universe_cache
 
 # Import legacy parser functions
 import sys
@@ -169,6 +169,9 @@ class UniverseService(IUniverseRepository):
         """
         Load universe data from JSON file
 
+        Served from the process-wide universe cache: the file is parsed once per
+        version and the returned dictionary is shared, so treat it as read-only.
+
         Args:
             file_path: Path to the universe JSON file
 
@@ -187,12 +190,8 @@ class UniverseService(IUniverseRepository):
             # Change to project root for consistent path behavior
             os.chdir(project_root)
 
-            if not os.path.exists(file_path):
-                return None
-
-            with open(file_path, 'r', encoding='utf-8') as f:
-                universe = json.load(f)
-            return universe
+            snapshot = get_universe_cache().get(file_path)
+            return snapshot.data if snapshot is not None else None
         except Exception as e:
             print(f"Error loading universe from {file_path}: {e}")
             return None
@@ -295,6 +294,11 @@ class UniverseService(IUniverseRepository):
         Returns:
             List of tuples (ticker, stock_data) for multi-screen stocks
         """
+        # Universes loaded through the cache have this list precomputed per file version
+        snapshot = get_universe_cache().snapshot_of(universe)
+        if snapshot is not None:
+            return snapshot.multi_screen_stocks
+
         all_stocks = self.get_all_stocks(universe)
         multi_screen_stocks = [
             (ticker, data) for ticker, data in all_stocks.items()
@@ -302,6 +306,42 @@ class UniverseService(IUniverseRepository):
         ]
         return multi_screen_stocks
 
+    def iter_stocks(
+        self,
+        universe: Dict[str, Any],
+        screens: Optional[List[str]] = None,
+        fields: Optional[List[str]] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Lazily iterate unique stocks in all_stocks order
+
+        Args:
+            universe: Universe dictionary
+            screens: Optional screen keys or names; only stocks in at least one are yielded
+            fields: Optional field projection; ticker is always included
+
+        Returns:
+            Iterator of (projected) stock dictionaries
+        """
+        screen_names = None
+        if screens:
+            # all_stocks entries list screen display names, so map keys to names
+            screen_config = universe.get('screens', {})
+            screen_names = {
+                screen_config[screen].get('name', screen) if screen in screen_config else screen
+                for screen in screens
+            }
+
+        for ticker, stock in self.get_all_stocks(universe).items():
+            if screen_names is not None and not screen_names.intersection(stock.get('screens', [])):
+                continue
+            if fields is None:
+                yield stock
+            else:
+                projected = {'ticker': stock.get('ticker', ticker)}
+                projected.update((field, stock[field]) for field in fields if field in stock)
+                yield projected
+
 
 def create_universe_service() -> UniverseService:
     """
@@ -2,7 +2,7 @@
 Service interfaces following Interface-First Design principles
 """
 from abc import ABC, abstractmethod
-from typing import Dict, Any, List, Optional, Tuple
+from typing import Dict, Any, AsyncIterator, Iterator, List, Optional, Tuple
 from datetime import datetime
 import pandas as pd
 import numpy as np
@@ -28,7 +28,9 @@ class IDataProvider(ABC):
             max_results: Maximum number of stocks to return
 
         Returns:
-            Dict with keys: success, data, raw_response, csv_file
+            Dict with keys: success, data, raw_response, csv_file, and on
+            success changed (export content differs from the last fetch)
+            and constituents_changed (the screen's symbols differ)
         """
         pass
 
@@ -44,7 +46,8 @@ class IDataProvider(ABC):
             query_name: Screener query identifier
 
         Returns:
-            Dict with keys: success, data, raw_response, csv_file
+            Dict with keys: success, data, raw_response, csv_file, and on
+            success changed (export content differs from the last fetch)
         """
         pass
 
@@ -78,6 +81,10 @@ class IDataProvider(ABC):
         """
         pass
 
+    async def close(self) -> None:
+        """Release pooled HTTP connections (no-op for providers without any)"""
+        pass
+
 
 class IFileManager(ABC):
     """
@@ -177,6 +184,10 @@ class IScreenerService(ABC):
         """
         pass
 
+    async def close(self) -> None:
+        """Release the data provider's pooled connections"""
+        pass
+
 
 class IDataParser(ABC):
     """
@@ -294,6 +305,9 @@ class IUniverseRepository(ABC):
         """
         Load universe data from JSON file
 
+        The returned dictionary may be shared with other callers and must be
+        treated as read-only.
+
         Args:
             file_path: Path to the universe JSON file
 
@@ -324,6 +338,26 @@ class IUniverseRepository(ABC):
         """
         pass
 
+    @abstractmethod
+    def iter_stocks(
+        self,
+        universe: Dict[str, Any],
+        screens: Optional[List[str]] = None,
+        fields: Optional[List[str]] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Lazily iterate unique stocks in all_stocks order
+
+        Args:
+            universe: Universe dictionary
+            screens: Optional screen keys or names; only stocks in at least one are yielded
+            fields: Optional field projection; ticker is always included
+
+        Returns:
+            Iterator of (projected) stock dictionaries
+        """
+        pass
+
 
 class IHistoricalDataService(ABC):
     """
@@ -466,7 +500,8 @@ class IPortfolioOptimizer(ABC):
     def optimize_portfolio(
         self,
         returns: pd.DataFrame,
-        risk_free_rate: float = 0.02/4
+        risk_free_rate: float = 0.02/4,
+        previous_weights: Optional[Dict[str, float]] = None
     ) -> Dict[str, Any]:
         """
         Optimize portfolio to maximize Sharpe ratio using SLSQP
@@ -474,6 +509,8 @@ class IPortfolioOptimizer(ABC):
         Args:
             returns: Quarterly returns DataFrame from extract_quarterly_returns()
             risk_free_rate: Quarterly risk-free rate
+            previous_weights: Optimal allocations from a previous run, used as the
+                starting point (screeners without one start at the equal weight)
 
         Returns:
             Dict with keys:
@@ -486,6 +523,70 @@ class IPortfolioOptimizer(ABC):
         """
         pass
 
+    @abstractmethod
+    def calculate_allocation_methods(
+        self,
+        returns: pd.DataFrame,
+        risk_free_rate: float = 0.02/4,
+        frontier_points: int = 20
+    ) -> Dict[str, Any]:
+        """
+        Compare long-only allocation methods over the same returns in one run
+
+        Args:
+            returns: Quarterly returns DataFrame from extract_quarterly_returns()
+            risk_free_rate: Quarterly risk-free rate
+            frontier_points: Number of efficient frontier points to compute
+
+        Returns:
+            Dict with keys:
+            - screeners: List of screener names
+            - methods: Dict[method, {weights, risk_contributions, expected_annual_return,
+              annual_volatility, sharpe_ratio}] for max_sharpe, min_variance,
+              risk_parity, inverse_volatility and equal_weight
+            - efficient_frontier: List of {expected_annual_return, annual_volatility,
+              sharpe_ratio, weights} from minimum variance to maximum return
+
+        Raises:
+            ValidationError: If the returns contain missing values
+        """
+        pass
+
+    @abstractmethod
+    def bootstrap_portfolio_weights(
+        self,
+        returns: pd.DataFrame,
+        risk_free_rate: float = 0.02/4,
+        n_samples: int = 2000,
+        confidence: float = 0.90,
+        block_size: int = 1,
+        seed: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Re-optimise the max-Sharpe weights on bootstrapped quarterly returns
+
+        Args:
+            returns: Quarterly returns DataFrame from extract_quarterly_returns()
+            risk_free_rate: Quarterly risk-free rate
+            n_samples: Number of bootstrap samples
+            confidence: Width of the reported weight intervals (0.90 = 5th-95th percentile)
+            block_size: Consecutive quarters drawn together (1 = plain bootstrap)
+            seed: Random seed for reproducible samples
+
+        Returns:
+            Dict with keys:
+            - point_estimate: Dict[screener_name, weight] from the full sample
+            - resampled_allocation: Dict[screener_name, weight] averaged over samples
+            - weights: Dict[screener_name, {point_estimate, mean, std, median,
+              ci_lower, ci_upper, zero_weight_share}]
+            - full_sample_sharpe: Sharpe ratio of the resampled allocations on the full sample
+            - samples, successful_samples, confidence, block_size
+
+        Raises:
+            ValidationError: If the returns contain missing values or no sample could be optimised
+        """
+        pass
+
     @abstractmethod
     def update_universe_with_portfolio(
         self,
@@ -594,9 +695,8 @@ class IOrderExecutionService(ABC):
             True if connection successful and ready for trading, False otherwise
 
         Side Effects:
-            - Establishes TCP connection to IBKR
-            - Starts background thread for message processing
-            - Retrieves account ID and next valid order ID
+            - Attaches to the shared IBKR session, connecting only if the link is down
+            - Order IDs are allocated by the session so concurrent callers never collide
         """
         pass
 
@@ -604,23 +704,28 @@ class IOrderExecutionService(ABC):
     async def execute_orders(
         self,
         max_orders: Optional[int] = None,
-        delay_between_orders: float = 1.0,
+        delay_between_orders: Optional[float] = None,
         order_type: str = "GTC_MKT"
     ) -> Dict[str, Any]:
         """
         Execute loaded orders through IBKR API
 
+        Orders are submitted as a paced pipeline without waiting for each
+        acknowledgement before placing the next order.
+
         Args:
             max_orders: Limit execution to first N orders (None for all)
-            delay_between_orders: Delay in seconds between order submissions
+            delay_between_orders: Minimum seconds between order submissions
+                (None for the configured order rate)
             order_type: Order type (MKT, GTC_MKT, MOO, DAY)
 
         Returns:
             Dict containing:
-            - executed_count: Number of orders successfully submitted
-            - failed_count: Number of orders that failed to submit
+            - executed_count: Number of orders submitted and not rejected
+            - failed_count: Number of orders that failed to submit or were rejected
             - total_orders: Total orders processed
             - order_statuses: Dict mapping order_id to status info
+            - order_results: Per-order results including acknowledgement status and latency
 
         Side Effects:
             - Places actual orders in IBKR account
@@ -667,7 +772,7 @@ class IOrderExecutionService(ABC):
         self,
         orders_file: str = "orders.json",
         max_orders: Optional[int] = None,
-        delay_between_orders: float = 1.0,
+        delay_between_orders: Optional[float] = None,
         order_type: str = "GTC_MKT"
     ) -> Dict[str, Any]:
         """
@@ -676,7 +781,7 @@ class IOrderExecutionService(ABC):
         Args:
             orders_file: Orders JSON filename in data directory
             max_orders: Limit execution to first N orders
-            delay_between_orders: Delay between order submissions
+            delay_between_orders: Minimum seconds between order submissions (None for the configured rate)
             order_type: IBKR order type
 
         Returns:
@@ -746,10 +851,14 @@ class ITargetAllocationService(ABC):
     """
 
     @abstractmethod
-    def load_universe_data(self) -> Dict[str, Any]:
+    def load_universe_data(self, read_only: bool = False) -> Dict[str, Any]:
         """
         Load universe.json data from data/universe.json
 
+        Args:
+            read_only: Return a shared cached parse that callers must not modify;
+                used by GET endpoints that only read allocations
+
         Returns:
             Dict containing complete universe data structure
 
@@ -1041,7 +1150,7 @@ class ICurrencyService(ABC):
         pass
 
     @abstractmethod
-    def run_currency_update(self) -> bool:
+    def run_currency_update(self, exchange_rates: Optional[Dict[str, float]] = None) -> bool:
         """
         Execute complete 3-step currency update workflow
 
@@ -1057,13 +1166,17 @@ class ICurrencyService(ABC):
         - Success confirmation with feature description
         - Error messages for each step failure
 
+        Args:
+            exchange_rates: Rates already fetched with fetch_exchange_rates(); the
+                API call in step 2 is skipped when given
+
         Returns:
             bool: True if entire workflow completed successfully, False on any step failure
 
         Side Effects:
         - Complete console output matching original CLI behavior exactly
         - File I/O: Reads and updates data/universe.json
-        - External API call: Fetches from exchangerate-api.com
+        - External API call: Fetches from exchangerate-api.com (unless exchange_rates is given)
         - All individual function side effects included
 
         Error Handling:
@@ -1127,9 +1240,8 @@ class IRebalancingService(ABC):
             - contract_details: Dict mapping symbol to IBKR contract info
 
         Side Effects:
-            - Establishes connection to IBKR Gateway (127.0.0.1:4002)
+            - Uses the shared IBKR Gateway session (127.0.0.1:4002), connecting if needed
             - Prints connection status and position data to console
-            - Uses threading for IBKR API message processing
 
         Raises:
             Exception: If connection to IBKR Gateway fails or timeout
@@ -1258,19 +1370,17 @@ class IOrderStatusService(ABC):
         Establish connection to IBKR Gateway with enhanced order detection
 
         Connection Details:
-            - Host: 127.0.0.1:4002
-            - Client ID: 99 (high ID to avoid conflicts and see ALL orders)
-            - Timeout: 15 seconds for connection
-            - Extended wait: 10 seconds to capture orders with high IDs (up to 500+)
-            - Threading: Daemon thread for API message processing
+            - Shared order session from the IBKR session manager (127.0.0.1:4002)
+            - Starts the streaming order tracker, which syncs open orders, completed
+              orders, executions and positions once and then follows their events
+            - Timeout: 15 seconds, only paid on first use or when the shared link is down
 
         Returns:
             True if connected and account ID received, False otherwise
 
         Side Effects:
-            - Creates IBKR API connection thread
-            - Console output for connection status and immediate order callbacks
-            - Populates initial order data during connection phase
+            - Subscribes the order tracker to the shared IBKR connection
+            - Console output for connection status
 
         Raises:
             Exception: If connection to IBKR Gateway fails
@@ -1280,24 +1390,16 @@ class IOrderStatusService(ABC):
     @abstractmethod
     def fetch_account_data(self) -> None:
         """
-        Comprehensive data fetching using multiple IBKR API methods
-
-        API Methods Used:
-            - reqAllOpenOrders(): Gets ALL open orders (not just from current client)
-            - reqOpenOrders(): Gets orders from current client
-            - reqAutoOpenOrders(True): Requests automatic order binding
-            - reqPositions(): Gets all positions
-            - reqCompletedOrders(False): Gets all completed orders (not just API orders)
-            - reqExecutions(1, exec_filter): Gets executions from today
+        Copy the order tracker's current state of orders, fills and positions
 
-        Timeouts:
-            - 20-second extended timeout for high order IDs (up to 500+)
-            - Progress updates every 6 seconds
+        Data Sources (kept current by the tracker, no gateway round trip):
+            - orderStatus / openOrder / completedOrder: order status and filled quantity
+            - execDetails / commissionReport: fills with price, cumulative quantity and commission
+            - position: current positions
 
         Side Effects:
-            - Populates open_orders, completed_orders, positions, executions data
-            - Console progress updates with counts and max order ID
-            - Request completion tracking via flags
+            - Populates open_orders, completed_orders and positions data
+            - Console output with counts
         """
         pass
 
@@ -1450,12 +1552,13 @@ class IPipelineOrchestrator(ABC):
     """
 
     @abstractmethod
-    async def run_full_pipeline(self, execution_id: Optional[str] = None) -> Dict[str, Any]:
+    async def run_full_pipeline(self, execution_id: Optional[str] = None, force: bool = False) -> Dict[str, Any]:
         """
         Execute complete 11-step pipeline with fail-fast error handling (equivalent to CLI run_all_steps())
 
         Args:
             execution_id: Optional execution ID for tracking (generated if not provided)
+            force: Re-run steps whose inputs are unchanged since their last successful run
 
         Returns:
             Dict containing:
@@ -1465,6 +1568,7 @@ class IPipelineOrchestrator(ABC):
             - failed_step: Step number that failed (None if all successful)
             - execution_time: Total execution time in seconds
             - created_files: Dict mapping step numbers to created files
+            - skipped_steps: Steps skipped because their inputs were unchanged
             - step_results: Dict mapping step numbers to detailed results
             - error_message: Error description if pipeline failed
 
@@ -1511,7 +1615,8 @@ class IPipelineOrchestrator(ABC):
         self,
         start_step: int,
         end_step: int,
-        execution_id: Optional[str] = None
+        execution_id: Optional[str] = None,
+        force: bool = False
     ) -> Dict[str, Any]:
         """
         Execute range of pipeline steps with fail-fast behavior
@@ -1520,6 +1625,7 @@ class IPipelineOrchestrator(ABC):
             start_step: First step number to execute (1-11)
             end_step: Last step number to execute (1-11)
             execution_id: Optional execution ID for tracking
+            force: Re-run steps whose inputs are unchanged since their last successful run
 
         Returns:
             Dict containing:
@@ -1530,6 +1636,7 @@ class IPipelineOrchestrator(ABC):
             - completed_steps: List of successfully completed step numbers
             - failed_step: Step number that failed (None if all successful)
             - execution_time: Total execution time in seconds
+            - skipped_steps: Steps skipped because their inputs were unchanged
             - step_results: Dict mapping step numbers to detailed results
 
         Side Effects:
@@ -1565,7 +1672,10 @@ class IPipelineOrchestrator(ABC):
     async def get_execution_logs(
         self,
         execution_id: str,
-        step_number: Optional[int] = None
+        step_number: Optional[int] = None,
+        level: Optional[str] = None,
+        limit: Optional[int] = None,
+        offset: int = 0
     ) -> Dict[str, Any]:
         """
         Get structured execution logs for pipeline run
@@ -1573,13 +1683,39 @@ class IPipelineOrchestrator(ABC):
         Args:
             execution_id: Execution identifier
             step_number: Optional step number to filter logs (None for all steps)
+            level: Optional log level filter (INFO, WARNING, ERROR)
+            limit: Maximum entries to return (None for all)
+            offset: Matching entries to skip
 
         Returns:
             Dict containing:
             - execution_id: Execution identifier
-            - logs: List of structured log entries with timestamp, step, level, message
-            - step_logs: Dict mapping step numbers to their specific logs (if step_number is None)
-            - total_log_entries: Total number of log entries
+            - logs: Page of structured log entries with timestamp, step, level, message
+            - step_logs: Dict mapping step numbers to their logs in the page (if step_number is None)
+            - total_log_entries: Number of log entries matching the filters
+            - offset, limit: The page requested
+        """
+        pass
+
+    @abstractmethod
+    def stream_execution_events(
+        self,
+        execution_id: str,
+        offset: int = 0,
+        heartbeat: Optional[float] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream live events of a pipeline execution until it finishes
+
+        Args:
+            execution_id: Execution identifier
+            offset: Position in the execution log to replay log entries from
+            heartbeat: Seconds without events before a heartbeat event
+
+        Yields:
+            Dicts with event (status, step_start, step_complete, log or
+            heartbeat), offset (the log position of log events, else None)
+            and data. Nothing is yielded for unknown executions.
         """
         pass
 
@@ -1626,24 +1762,47 @@ class IPipelineOrchestrator(ABC):
         """
         pass
 
+    @abstractmethod
+    async def cancel_execution(self, execution_id: str) -> Dict[str, Any]:
+        """
+        Stop a running full pipeline or step range
+
+        Running steps are cancelled and reported as failed, no further step
+        starts and the execution ends with status cancelled. A blocking step
+        already in a worker thread finishes in the background.
+
+        Args:
+            execution_id: Execution identifier
+
+        Returns:
+            Dict containing:
+            - execution_id: Execution identifier
+            - success: Whether the execution was running and cancellation was requested
+            - message: Status message
+        """
+        pass
+
     @abstractmethod
     async def get_pipeline_history(
         self,
         limit: int = 50,
-        status_filter: Optional[str] = None
+        status_filter: Optional[str] = None,
+        offset: int = 0
     ) -> Dict[str, Any]:
         """
-        Get history of pipeline executions
+        Get history of pipeline executions, most recent first
 
         Args:
             limit: Maximum number of executions to return
             status_filter: Optional status filter (completed, failed, running)
+            offset: Matching executions to skip
 
         Returns:
             Dict containing:
-            - executions: List of execution summaries
-            - total_executions: Total number of executions in history
-            - filtered_count: Number of executions matching filter
+            - executions: Page of execution summaries
+            - total_executions: Number of executions in history matching the filter
+            - filtered_count: Number of executions returned
+            - offset: Index of the first returned execution
         """
         pass
 
@@ -1702,9 +1861,8 @@ class IAccountService(ABC):
         Connect to IBKR and fetch account net liquidation value
 
         IBKR Integration Details:
-        - Connects to 127.0.0.1:4002 (paper trading gateway)
-        - Uses threading for API message processing
-        - 10-second connection timeout with retry logic
+        - Uses the shared IBKR data session (paper trading gateway)
+        - 10-second connection timeout, only paid when the shared link is down
         - Requests NetLiquidation from account summary
 
         Returns:
@@ -1712,9 +1870,8 @@ class IAccountService(ABC):
             Tuple of (None, None) on failure (connection issues, timeout, etc.)
 
         Side Effects:
-            - Creates/destroys IBKR API connection
+            - Reuses (or re-establishes) the shared IBKR API connection
             - Console output for connection status and values
-            - Threading: Spawns daemon thread for message processing
 
         Error Handling:
             - Connection failures to IB Gateway
@@ -1798,9 +1955,9 @@ class IQuantityCalculator(ABC):
         - If screen_allocation provided: final_target = allocation_target * screen_allocation
         - If screen_allocation None: uses existing final_target (for all_stocks context)
 
-        Japanese Stock Handling:
-        - Detects JPY currency stocks
-        - Rounds to 100-share lots (minimum lot size requirement)
+        Lot Size Handling:
+        - Looks up the stock's currency in settings.portfolio.lot_sizes (JPY: 100 by default)
+        - Rounds to whole lots (minimum lot size requirement)
         - Conservative rounding DOWN to avoid fractional lot purchases
 
         Args:
@@ -1814,7 +1971,7 @@ class IQuantityCalculator(ABC):
               * target_value_eur: Target value in EUR (2 decimal precision)
               * quantity: Integer quantity to purchase
               * allocation_note: "minimal_allocation" flag for very small allocations
-            - Console output for Japanese stock lot size adjustments
+            - Console output for lot size adjustments
 
         Error Handling:
             - ValueError, TypeError, ZeroDivisionError with graceful fallback to 0 values
@@ -1980,7 +2137,7 @@ class IIBKRSearchService(ABC):
         Fallback method when ISIN and ticker searches fail
 
         Args:
-            app: IBApi instance for IBKR communication
+            app: IBApi wrapper bound to the shared IBKR session (IBKRSessionView)
             stock: Stock dictionary with name, currency fields
 
         Returns:
@@ -2006,7 +2163,7 @@ class IIBKRSearchService(ABC):
         Comprehensive search using multiple strategies with validation
 
         Args:
-            app: IBApi instance for IBKR communication
+            app: IBApi wrapper bound to the shared IBKR session (IBKRSessionView)
             stock: Stock dictionary with ticker, isin, name, currency
             verbose: Enable debug console output
 
@@ -2081,7 +2238,7 @@ class IIBKRSearchService(ABC):
     @abstractmethod
     def process_all_universe_stocks(self) -> Dict[str, Any]:
         """
-        Main orchestration function - process all stocks from universe.json sequentially
+        Main orchestration function - process all stocks from universe.json
         Maintains exact behavior compatibility with legacy implementation
 
         File Operations:
@@ -2089,15 +2246,17 @@ class IIBKRSearchService(ABC):
             - Writes to: data/universe_with_ibkr.json
 
         IBKR Connection:
-            - Host: 127.0.0.1:4002
-            - Client ID: 20
-            - Connection timeout: 10 seconds
+            - Shared data session from the IBKR session manager (127.0.0.1:4002)
+            - Connects only if the shared link is down (10 second timeout)
 
         Processing Logic:
             - Extracts unique stocks (ticker-based deduplication)
             - Filters to stocks with quantity > 0
-            - Sequential processing with 0.5s delays between stocks
+            - Uncached stocks searched concurrently (IBKR_SEARCH_CONCURRENCY workers, default 8)
+              over one connection, paced by the session's token buckets
+              (45 msg/s overall, 1 reqMatchingSymbols/s)
             - Three-strategy search per stock
+            - Results merged in universe order, so output matches a sequential run
             - Statistics tracking by search method
 
         Returns:
@@ -2112,7 +2271,7 @@ class IIBKRSearchService(ABC):
         Side Effects:
             - Creates universe_with_ibkr.json file
             - Extensive console output matching legacy exactly
-            - IBKR API connection establishment and cleanup
+            - Uses (and if needed establishes) the shared IBKR connection
             - Progress reporting for each stock processed
 
         Console Output:
@@ -2124,6 +2283,44 @@ class IIBKRSearchService(ABC):
         """
         pass
 
+    @abstractmethod
+    def refresh_universe_with_ibkr(self) -> bool:
+        """
+        Refresh universe_with_ibkr.json without searching IBKR
+
+        Used when the stocks to search are unchanged since the last search:
+        the current universe.json is written out with the IBKR details of the
+        previous universe_with_ibkr.json, so quantities stay current.
+
+        Returns:
+            False if either file is missing (a full search is needed)
+        """
+        pass
+
+    @abstractmethod
+    def search_stock(self, stock: Dict[str, Any], force_refresh: bool = False) -> Dict[str, Any]:
+        """
+        Identify a single stock in IBKR, cache first
+
+        Args:
+            stock: Stock dict with ticker, name, currency and optional isin
+            force_refresh: Drop the cached entry and search IBKR again
+
+        Cache Layers:
+            - In-memory LRU keyed by (isin, ticker): found results kept 6h,
+              not-found results 1h; repeat lookups never touch disk or the gateway
+            - SQLite ibkr_search_cache (data/ibkr_cache.db)
+            - IBKR three-strategy search over the shared data session
+
+        Returns:
+            ibkr_details dict (found, symbol, longName, exchange, primaryExchange,
+            conId, search_method, match_score) plus cached: bool
+
+        Raises:
+            IBKRConnectionError: Cache miss and IB Gateway unreachable
+        """
+        pass
+
 
 class ITelegramService(ABC):
     """
@@ -0,0 +1,549 @@
+"""
+Streaming order and fill tracker
+Subscribes once to the shared IBKR order session, syncs open orders, completed
+orders, executions and positions, then applies orderStatus / execDetails /
+commissionReport events as they arrive to an in-memory index keyed by permId
+(and orderId) that is written through to SQLite, so order status is answered
+from memory instead of a fresh gateway snapshot per check
+"""
+
+import logging
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from ibapi.execution import ExecutionFilter
+
+from .ibkr_session_manager import get_ibkr_session_manager, IBKRSession, INFO_ERROR_CODES, ORDER_CLIENT_ID
+from .shared_store import PathRegistry, SQLiteStore
+from ..core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Statuses after which an order receives no further fills
+TERMINAL_ORDER_STATUSES = {"Filled", "Cancelled", "ApiCancelled", "Inactive"}
+
+# Execution sides as reported in execDetails
+EXECUTION_SIDES = {"BOT": "BUY", "SLD": "SELL"}
+
+# Parts of the initial sync, each finished by its *End callback
+SYNC_PARTS = ("open_orders", "completed_orders", "executions", "positions")
+
+ORDER_COLUMNS = (
+    "perm_id", "order_id", "client_id", "symbol", "action", "quantity", "order_type", "currency",
+    "status", "filled", "remaining", "avg_fill_price", "last_fill_price", "why_held",
+    "last_message", "first_seen", "updated_at"
+)
+
+FILL_COLUMNS = (
+    "exec_id", "perm_id", "order_id", "symbol", "side", "shares", "price", "cum_qty", "avg_price",
+    "exchange", "time", "commission", "currency", "realized_pnl", "received_at"
+)
+
+
+def _number(value: Any) -> Optional[float]:
+    """Float value of an IBKR numeric field, None when unset (empty or the UNSET sentinel)"""
+    if value is None or value == "":
+        return None
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return None
+    # UNSET_DOUBLE is sys.float_info.max, UNSET_DECIMAL is 2**127 - 1
+    return None if abs(number) >= 1e37 else number
+
+
+def _now() -> str:
+    return datetime.utcnow().isoformat()
+
+
+class OrderTrackerStore(SQLiteStore):
+    """Tracked orders and their fills in SQLite"""
+
+    def __init__(self, db_path: str = "data/order_tracker.db"):
+        super().__init__(db_path)
+
+    def _initialize_database(self):
+        with self._lock, self._connection() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS tracked_orders (
+                    perm_id INTEGER PRIMARY KEY,
+                    order_id INTEGER,
+                    client_id INTEGER,
+                    symbol TEXT,
+                    action TEXT,
+                    quantity REAL,
+                    order_type TEXT,
+                    currency TEXT,
+                    status TEXT,
+                    filled REAL NOT NULL DEFAULT 0,
+                    remaining REAL,
+                    avg_fill_price REAL,
+                    last_fill_price REAL,
+                    why_held TEXT,
+                    last_message TEXT,
+                    first_seen TEXT NOT NULL,
+                    updated_at TEXT NOT NULL
+                )
+            """)
+            conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_tracked_orders_order_id
+                ON tracked_orders(order_id)
+            """)
+            conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_tracked_orders_status_updated
+                ON tracked_orders(status, updated_at)
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS order_fills (
+                    exec_id TEXT PRIMARY KEY,
+                    perm_id INTEGER NOT NULL,
+                    order_id INTEGER,
+                    symbol TEXT,
+                    side TEXT,
+                    shares REAL NOT NULL,
+                    price REAL NOT NULL,
+                    cum_qty REAL,
+                    avg_price REAL,
+                    exchange TEXT,
+                    time TEXT,
+                    commission REAL,
+                    currency TEXT,
+                    realized_pnl REAL,
+                    received_at TEXT NOT NULL
+                )
+            """)
+            conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_order_fills_perm
+                ON order_fills(perm_id, received_at)
+            """)
+
+    def save_order(self, order: Dict[str, Any]) -> None:
+        """Insert or replace a tracked order"""
+        with self._lock, self._connection() as conn:
+            conn.execute(
+                f"INSERT OR REPLACE INTO tracked_orders ({', '.join(ORDER_COLUMNS)}) "
+                f"VALUES ({', '.join('?' * len(ORDER_COLUMNS))})",
+                tuple(order.get(column) for column in ORDER_COLUMNS)
+            )
+
+    def save_fill(self, fill: Dict[str, Any]) -> None:
+        """Insert or replace a fill (execution corrections reuse the exec ID)"""
+        with self._lock, self._connection() as conn:
+            conn.execute(
+                f"INSERT OR REPLACE INTO order_fills ({', '.join(FILL_COLUMNS)}) "
+                f"VALUES ({', '.join('?' * len(FILL_COLUMNS))})",
+                tuple(fill.get(column) for column in FILL_COLUMNS)
+            )
+
+    def load(self) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """Every tracked order, and every fill in the order it was received"""
+        with self._lock:
+            conn = self._connection()
+            orders = [dict(row) for row in conn.execute(f"SELECT {', '.join(ORDER_COLUMNS)} FROM tracked_orders")]
+            fills = [dict(row) for row in conn.execute(
+                f"SELECT {', '.join(FILL_COLUMNS)} FROM order_fills ORDER BY received_at, rowid"
+            )]
+        return orders, fills
+
+    def prune(self, max_age_days: int) -> List[int]:
+        """Remove finished orders (and their fills) not updated for max_age_days; returns their permIds"""
+        cutoff = (datetime.utcnow() - timedelta(days=max_age_days)).isoformat()
+        terminal = tuple(sorted(TERMINAL_ORDER_STATUSES))
+        marks = ", ".join("?" * len(terminal))
+        with self._lock, self._connection() as conn:
+            expired = [row[0] for row in conn.execute(
+                f"SELECT perm_id FROM tracked_orders WHERE status IN ({marks}) AND updated_at < ?",
+                terminal + (cutoff,)
+            )]
+            self._delete_keys(conn, [("order_fills", "perm_id"), ("tracked_orders", "perm_id")], expired)
+        if expired:
+            logger.info(f"Pruned {len(expired)} finished orders from the order tracker")
+        return expired
+
+
+class OrderTracker:
+    """
+    Live view of every order on the IBKR order session
+
+    An EWrapper-style sink: the session delivers order lifecycle callbacks to it
+    as an order observer (including orders placed by OrderExecutionService) and
+    position updates as a subscriber. start() connects and syncs once; after a
+    dropped connection the next start() syncs again to catch up on missed events.
+    Orders are keyed by permId, which IBKR assigns across clients and sessions;
+    orderId lookups go through a secondary index.
+    """
+
+    def __init__(self, store: OrderTrackerStore, session: Optional[IBKRSession] = None):
+        self.store = store
+        self._session = session
+        self._lock = threading.RLock()
+        self._start_lock = threading.Lock()
+        self._synced = threading.Event()
+        self._sync_done: Dict[str, threading.Event] = {part: threading.Event() for part in SYNC_PARTS}
+        self._sync_request_id: Optional[int] = None
+        self.synced_at: Optional[str] = None
+
+        self._orders: Dict[int, Dict[str, Any]] = {}
+        self._perm_ids: Dict[int, int] = {}
+        self._fills: Dict[int, List[Dict[str, Any]]] = {}
+        self._fills_by_exec: Dict[str, Dict[str, Any]] = {}
+        self._positions: Dict[str, Dict[str, Any]] = {}
+
+        self._prune()
+        orders, fills = store.load()
+        for order in orders:
+            self._index_order(order)
+        for fill in fills:
+            self._index_fill(fill)
+
+    # ------------------------------------------------------------------
+    # Subscription and sync
+    # ------------------------------------------------------------------
+
+    @property
+    def is_synced(self) -> bool:
+        """True once the initial sync completed on the current connection"""
+        return self._synced.is_set()
+
+    def start(self, timeout: Optional[float] = None) -> bool:
+        """
+        Subscribe to the order session and sync its orders, executions and positions
+
+        Only the first call (and the first after a dropped connection) talks to
+        the gateway; it waits for the *End callbacks instead of fixed sleeps.
+        Returns False if the gateway cannot be reached.
+        """
+        if self._synced.is_set():
+            return True
+
+        with self._start_lock:
+            if self._synced.is_set():
+                return True
+
+            timeout = settings.ibkr.order_sync_timeout if timeout is None else timeout
+            session = self._session or get_ibkr_session_manager().get_session(client_id=ORDER_CLIENT_ID)
+            if not session.ensure_connected(timeout=timeout):
+                logger.error("[ERROR] Order tracker could not connect to IB Gateway")
+                return False
+            self._session = session
+            session.subscribe(self)
+            session.observe_orders(self)
+
+            for done in self._sync_done.values():
+                done.clear()
+            self._prune()
+            with self._lock:
+                # reqPositions() replays every open position; ones closed while disconnected must not linger
+                self._positions.clear()
+            self._sync_request_id = session.register_request(self)
+            try:
+                session.reqAllOpenOrders()
+                session.reqCompletedOrders(False)
+                session.reqExecutions(self._sync_request_id, ExecutionFilter())
+                session.reqPositions()
+
+                deadline = time.monotonic() + timeout
+                pending = [
+                    part for part, done in self._sync_done.items()
+                    if not done.wait(max(0.0, deadline - time.monotonic()))
+                ]
+            finally:
+                session.release_request(self._sync_request_id)
+                self._sync_request_id = None
+
+            if pending:
+                # Orders received so far are kept and live events keep flowing
+                logger.warning(f"[WARNING] Order tracker sync incomplete after {timeout}s: {', '.join(pending)}")
+            self.synced_at = _now()
+            self._synced.set()
+            logger.info(f"[OK] Order tracker synced: {len(self._orders)} orders, {len(self._fills_by_exec)} fills")
+            return True
+
+    def stop(self) -> None:
+        """Stop receiving callbacks; start() subscribes and syncs again"""
+        if self._session is not None:
+            self._session.unsubscribe(self)
+            self._session.unobserve_orders(self)
+        self._synced.clear()
+
+    def _prune(self) -> None:
+        """Forget finished orders older than order_history_days, in the store and in memory"""
+        pruned = self.store.prune(settings.ibkr.order_history_days)
+        with self._lock:
+            for perm_id in pruned:
+                order = self._orders.pop(perm_id, None)
+                if order and self._perm_ids.get(order.get("order_id")) == perm_id:
+                    del self._perm_ids[order["order_id"]]
+                for fill in self._fills.pop(perm_id, []):
+                    self._fills_by_exec.pop(fill["exec_id"], None)
+
+    # ------------------------------------------------------------------
+    # State updates
+    # ------------------------------------------------------------------
+
+    def _index_order(self, order: Dict[str, Any]) -> None:
+        self._orders[order["perm_id"]] = order
+        if order.get("order_id"):
+            self._perm_ids[order["order_id"]] = order["perm_id"]
+
+    def _index_fill(self, fill: Dict[str, Any]) -> None:
+        previous = self._fills_by_exec.get(fill["exec_id"])
+        fills = self._fills.setdefault(fill["perm_id"], [])
+        if previous is not None and previous in fills:
+            fills[fills.index(previous)] = fill
+        else:
+            fills.append(fill)
+        self._fills_by_exec[fill["exec_id"]] = fill
+
+    def _order(self, perm_id: int, order_id: Optional[int] = None) -> Dict[str, Any]:
+        """The tracked order for perm_id, created on first sight"""
+        order = self._orders.get(perm_id)
+        if order is None:
+            now = _now()
+            order = {column: None for column in ORDER_COLUMNS}
+            order.update({"perm_id": perm_id, "filled": 0.0, "first_seen": now, "updated_at": now})
+        if order_id:
+            order["order_id"] = order_id
+        self._index_order(order)
+        return order
+
+    def _save(self, order: Dict[str, Any]) -> None:
+        order["updated_at"] = _now()
+        self.store.save_order(order)
+
+    def _apply_order_details(self, order_id: int, contract, order, order_state) -> None:
+        perm_id = getattr(order, "permId", 0)
+        if not perm_id:
+            return
+        with self._lock:
+            tracked = self._order(perm_id, order_id)
+            tracked.update({
+                "client_id": getattr(order, "clientId", None),
+                "symbol": contract.symbol,
+                "action": order.action,
+                "quantity": _number(order.totalQuantity),
+                "order_type": order.orderType,
+                "currency": contract.currency
+            })
+            if order_state.status:
+                tracked["status"] = order_state.status
+            filled = _number(getattr(order, "filledQuantity", None))
+            if filled is not None:
+                tracked["filled"] = max(tracked["filled"] or 0.0, filled)
+            self._save(tracked)
+
+    def openOrder(self, orderId, contract, order, orderState):
+        self._apply_order_details(orderId, contract, order, orderState)
+
+    def completedOrder(self, contract, order, orderState):
+        self._apply_order_details(order.orderId, contract, order, orderState)
+
+    def orderStatus(self, orderId, status, filled, remaining, avgFillPrice, permId,
+                    parentId, lastFillPrice, clientId, whyHeld, *args):
+        if not permId:
+            return
+        with self._lock:
+            tracked = self._order(permId, orderId)
+            tracked.update({
+                "client_id": clientId,
+                "status": status,
+                "filled": _number(filled) or 0.0,
+                "remaining": _number(remaining),
+                "avg_fill_price": _number(avgFillPrice) or None,
+                "last_fill_price": _number(lastFillPrice) or None,
+                "why_held": whyHeld or None
+            })
+            self._save(tracked)
+
+    def execDetails(self, reqId, contract, execution):
+        perm_id = execution.permId
+        if not perm_id:
+            return
+        with self._lock:
+            previous = self._fills_by_exec.get(execution.execId, {})
+            fill = {
+                "exec_id": execution.execId,
+                "perm_id": perm_id,
+                "order_id": execution.orderId,
+                "symbol": contract.symbol,
+                "side": EXECUTION_SIDES.get(execution.side, execution.side),
+                "shares": _number(execution.shares) or 0.0,
+                "price": _number(execution.price) or 0.0,
+                "cum_qty": _number(execution.cumQty),
+                "avg_price": _number(execution.avgPrice),
+                "exchange": execution.exchange,
+                "time": execution.time,
+                # The commission report may have arrived first (or the fill is being resent)
+                "commission": previous.get("commission"),
+                "currency": previous.get("currency") or contract.currency,
+                "realized_pnl": previous.get("realized_pnl"),
+                "received_at": previous.get("received_at") or _now()
+            }
+            self._index_fill(fill)
+            self.store.save_fill(fill)
+
+            tracked = self._order(perm_id, execution.orderId)
+            # Orders filled before the tracker first saw them are known from their fills only
+            tracked["symbol"] = tracked["symbol"] or contract.symbol
+            tracked["action"] = tracked["action"] or fill["side"]
+            tracked["currency"] = tracked["currency"] or contract.currency
+            if fill["cum_qty"] is not None and fill["cum_qty"] >= (tracked["filled"] or 0.0):
+                tracked["filled"] = fill["cum_qty"]
+                tracked["avg_fill_price"] = fill["avg_price"]
+                tracked["last_fill_price"] = fill["price"]
+            self._save(tracked)
+
+    def execDetailsEnd(self, reqId):
+        self._sync_done["executions"].set()
+
+    def commissionReport(self, commissionReport):
+        with self._lock:
+            fill = self._fills_by_exec.get(commissionReport.execId)
+            if fill is None:
+                # Reports normally follow their execution; keep it until execDetails arrives
+                fill = {"exec_id": commissionReport.execId, "perm_id": None}
+                self._fills_by_exec[commissionReport.execId] = fill
+            fill.update({
+                "commission": _number(commissionReport.commission),
+                "currency": commissionReport.currency or fill.get("currency"),
+                "realized_pnl": _number(commissionReport.realizedPNL)
+            })
+            if fill["perm_id"] is not None:
+                self.store.save_fill(fill)
+
+    def error(self, reqId, errorCode, errorString, *args):
+        if errorCode in INFO_ERROR_CODES:
+            return
+        with self._lock:
+            perm_id = self._perm_ids.get(reqId)
+            if perm_id is None:
+                return
+            tracked = self._orders[perm_id]
+            tracked["last_message"] = f"{errorCode}: {errorString}"
+            self._save(tracked)
+
+    def openOrderEnd(self):
+        self._sync_done["open_orders"].set()
+
+    def completedOrdersEnd(self):
+        self._sync_done["completed_orders"].set()
+
+    def position(self, account, contract, position, avgCost):
+        with self._lock:
+            if _number(position):
+                self._positions[contract.symbol] = {
+                    "symbol": contract.symbol,
+                    "position": _number(position),
+                    "avgCost": avgCost,
+                    "currency": contract.currency,
+                    "exchange": contract.exchange
+                }
+            else:
+                self._positions.pop(contract.symbol, None)
+
+    def positionEnd(self):
+        self._sync_done["positions"].set()
+
+    def connectionClosed(self):
+        # Events are missed while the link is down; the next start() syncs again
+        self._synced.clear()
+
+    # ------------------------------------------------------------------
+    # Queries (memory only)
+    # ------------------------------------------------------------------
+
+    def _with_fills(self, order: Dict[str, Any]) -> Dict[str, Any]:
+        fills = self._fills.get(order["perm_id"], [])
+        commissions = [fill["commission"] for fill in fills if fill.get("commission") is not None]
+        result = dict(order)
+        result["fill_ratio"] = (order["filled"] or 0.0) / order["quantity"] if order.get("quantity") else None
+        result["commission"] = sum(commissions) if commissions else None
+        result["fills"] = [dict(fill) for fill in fills]
+        return result
+
+    def get_order(self, order_id: Optional[int] = None, perm_id: Optional[int] = None) -> Optional[Dict[str, Any]]:
+        """
+        A tracked order by orderId or permId, or None
+
+        Includes its fills in the order they were received; each carries the
+        cumulative filled quantity, so the list is the order's fill progress.
+        """
+        with self._lock:
+            if perm_id is None:
+                perm_id = self._perm_ids.get(order_id)
+            order = self._orders.get(perm_id)
+            return self._with_fills(order) if order is not None else None
+
+    def list_orders(
+        self,
+        status: Optional[str] = None,
+        symbol: Optional[str] = None,
+        open_only: bool = False
+    ) -> List[Dict[str, Any]]:
+        """Tracked orders with their fills, most recently updated first"""
+        with self._lock:
+            orders = [
+                self._with_fills(order) for order in self._orders.values()
+                if (status is None or order["status"] == status)
+                and (symbol is None or order["symbol"] == symbol)
+                and not (open_only and order["status"] in TERMINAL_ORDER_STATUSES)
+            ]
+        return sorted(orders, key=lambda order: order["updated_at"], reverse=True)
+
+    def legacy_snapshot(self) -> Dict[str, Dict[Any, Dict[str, Any]]]:
+        """
+        open_orders, completed_orders and positions shaped like IBOrderStatusChecker's
+
+        Orders are keyed by orderId, or by permId for orders placed outside the
+        API (which have no orderId).
+        """
+        open_orders, completed_orders = {}, {}
+        with self._lock:
+            for order in self._orders.values():
+                if not order["symbol"]:
+                    continue
+                fills = self._fills.get(order["perm_id"], [])
+                entry = {
+                    "symbol": order["symbol"],
+                    "action": order["action"],
+                    "quantity": order["quantity"],
+                    "orderType": order["order_type"],
+                    "status": order["status"],
+                    "avgFillPrice": order["avg_fill_price"] if order["avg_fill_price"] is not None else "",
+                    "currency": order["currency"],
+                    "filled": order["filled"],
+                    "remaining": order["remaining"],
+                    "order_id": order["order_id"] or order["perm_id"],
+                    "permId": order["perm_id"],
+                    "fills": [dict(fill) for fill in fills]
+                }
+                target = completed_orders if order["status"] in TERMINAL_ORDER_STATUSES else open_orders
+                target[entry["order_id"]] = entry
+            positions = {symbol: dict(position) for symbol, position in self._positions.items()}
+        return {"open_orders": open_orders, "completed_orders": completed_orders, "positions": positions}
+
+    def get_status(self) -> Dict[str, Any]:
+        """Sync state and sizes for diagnostics"""
+        with self._lock:
+            return {
+                "synced": self.is_synced,
+                "synced_at": self.synced_at,
+                "orders": len(self._orders),
+                "open_orders": sum(
+                    1 for order in self._orders.values() if order["status"] not in TERMINAL_ORDER_STATUSES
+                ),
+                "fills": len(self._fills_by_exec),
+                "positions": len(self._positions)
+            }
+
+
+_order_trackers: PathRegistry[OrderTracker] = PathRegistry(
+    lambda db_path: OrderTracker(OrderTrackerStore(db_path))
+)
+
+
+def get_order_tracker(db_path: str = "data/order_tracker.db") -> OrderTracker:
+    """Get the shared order tracker for a database file"""
+    return _order_trackers.get(db_path)
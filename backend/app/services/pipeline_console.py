@@ -0,0 +1,184 @@
+"""
+Per-step console capture for pipeline steps
+print() output and log records produced while a step runs are routed by context
+variable to that step's capture, which streams every complete line into the
+execution log as it is written and keeps only a bounded tail for the step
+result, so concurrent steps and API requests never see each other's output and
+chatty steps do not grow memory
+"""
+
+import logging
+import sys
+import threading
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Deque, Iterator, List, Optional
+
+# Longer lines (or output without newlines) are split into chunks of this size
+MAX_LINE_LENGTH = 2000
+
+# Log level of the lines written to each stream (stdout, stderr)
+_STREAM_LEVELS = ("INFO", "WARNING")
+
+# Receives (level, message, stream) for every captured line
+ConsoleSink = Callable[[str, str, str], None]
+
+
+class StepConsoleCapture:
+    """
+    Line-oriented capture of one step's console output
+
+    Complete lines go to the sink straight away; a carriage return discards
+    the unfinished line before it, as a terminal would, so progress bars
+    yield their final state instead of every redraw. Only the last
+    tail_lines lines are kept in memory.
+    """
+
+    def __init__(self, sink: ConsoleSink, tail_lines: int):
+        self._sink = sink
+        self._tail: Deque[str] = deque(maxlen=tail_lines)
+        self._partial = ["", ""]
+        self._lock = threading.RLock()
+        self.line_count = 0
+
+    def write(self, index: int, text: str) -> int:
+        """Write text to stdout (index 0) or stderr (index 1)"""
+        with self._lock:
+            *lines, partial = (self._partial[index] + text).split("\n")
+            for line in lines:
+                line = line.rstrip("\r")
+                self._emit(_STREAM_LEVELS[index], line[line.rfind("\r") + 1:], ("stdout", "stderr")[index])
+
+            overwritten = partial.rstrip("\r").rfind("\r")
+            if overwritten >= 0:
+                partial = partial[overwritten + 1:]
+            while len(partial) > MAX_LINE_LENGTH:
+                self._emit(_STREAM_LEVELS[index], partial[:MAX_LINE_LENGTH], ("stdout", "stderr")[index])
+                partial = partial[MAX_LINE_LENGTH:]
+            self._partial[index] = partial
+        return len(text)
+
+    def log(self, level: str, message: str) -> None:
+        """Add a log record; multi-line messages (tracebacks) become one entry"""
+        with self._lock:
+            self._emit(level, message, "log")
+
+    def _emit(self, level: str, line: str, stream: str) -> None:
+        for start in range(0, max(len(line), 1), MAX_LINE_LENGTH):
+            chunk = line[start:start + MAX_LINE_LENGTH]
+            self._tail.append(chunk)
+            self.line_count += 1
+            self._sink(level, chunk, stream)
+
+    def close(self) -> None:
+        """Emit unfinished lines; later writes (from an abandoned thread) still stream"""
+        with self._lock:
+            for index, partial in enumerate(self._partial):
+                if partial.rstrip("\r"):
+                    self.write(index, "\n")
+            self._partial = ["", ""]
+
+    def lines(self) -> List[str]:
+        """The most recent lines, preceded by a note if earlier ones were dropped"""
+        with self._lock:
+            omitted = self.line_count - len(self._tail)
+            tail = list(self._tail)
+        if omitted:
+            return [f"... {omitted} earlier lines omitted - see the execution logs"] + tail
+        return tail
+
+
+# Capture of the step running in the current context (asyncio task or the
+# worker thread it runs a step in)
+_console_capture: ContextVar[Optional[StepConsoleCapture]] = ContextVar(
+    "pipeline_console_capture", default=None
+)
+_console_router_lock = threading.Lock()
+_console_router_users = 0
+
+
+class _ConsoleRouter:
+    """sys.stdout / sys.stderr stand-in writing to the current step's capture"""
+
+    def __init__(self, stream, index: int):
+        self.stream = stream
+        self.index = index
+
+    def write(self, text: str) -> int:
+        capture = _console_capture.get()
+        if capture is None:
+            return self.stream.write(text)
+        return capture.write(self.index, text)
+
+    def flush(self) -> None:
+        if _console_capture.get() is None:
+            self.stream.flush()
+
+    def __getattr__(self, name):
+        return getattr(self.stream, name)
+
+
+class _StepLogHandler(logging.Handler):
+    """Root logging handler adding records emitted inside a step to its capture"""
+
+    def __init__(self):
+        super().__init__()
+        self._local = threading.local()
+
+    def emit(self, record: logging.LogRecord) -> None:
+        capture = _console_capture.get()
+        # A sink that logs must not feed its own records back into the capture
+        if capture is None or getattr(self._local, "active", False):
+            return
+        self._local.active = True
+        try:
+            capture.log(record.levelname, self.format(record))
+        except Exception:
+            self.handleError(record)
+        finally:
+            self._local.active = False
+
+
+_step_log_handler = _StepLogHandler()
+
+
+def _install_console_router() -> None:
+    global _console_router_users
+    with _console_router_lock:
+        if _console_router_users == 0:
+            sys.stdout = _ConsoleRouter(sys.stdout, 0)
+            sys.stderr = _ConsoleRouter(sys.stderr, 1)
+            logging.getLogger().addHandler(_step_log_handler)
+        _console_router_users += 1
+
+
+def _uninstall_console_router() -> None:
+    global _console_router_users
+    with _console_router_lock:
+        _console_router_users -= 1
+        if _console_router_users == 0:
+            logging.getLogger().removeHandler(_step_log_handler)
+            if isinstance(sys.stdout, _ConsoleRouter):
+                sys.stdout = sys.stdout.stream
+            if isinstance(sys.stderr, _ConsoleRouter):
+                sys.stderr = sys.stderr.stream
+
+
+@contextmanager
+def capture_console(sink: ConsoleSink, tail_lines: int) -> Iterator[StepConsoleCapture]:
+    """
+    Capture console output and log records of the current context
+
+    Worker threads started from it with the context copied (PipelineWorkerPool)
+    are captured too.
+    """
+    capture = StepConsoleCapture(sink, tail_lines)
+    _install_console_router()
+    token = _console_capture.set(capture)
+    try:
+        yield capture
+    finally:
+        _console_capture.reset(token)
+        _uninstall_console_router()
+        capture.close()
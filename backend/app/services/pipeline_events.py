@@ -0,0 +1,81 @@
+"""
+Live event fan-out for pipeline executions
+The execution manager publishes step, status and log events as they happen;
+each API stream subscribes to one execution and receives them on its event
+loop, so clients are pushed progress instead of polling status and logs
+"""
+
+import asyncio
+import threading
+from typing import Any, Dict, List, Optional
+
+
+class PipelineEventSubscription:
+    """
+    Queue of events of one execution for one consumer
+
+    A consumer that falls queue_size events behind is marked overflowed and
+    its queue cleared; it re-reads missed log entries from the store instead
+    of holding an unbounded backlog in memory.
+    """
+
+    def __init__(self, execution_id: str, queue_size: int):
+        self.execution_id = execution_id
+        self.loop = asyncio.get_running_loop()
+        self.overflowed = False
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+
+    def _put(self, event: Dict[str, Any]) -> None:
+        try:
+            self._queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.overflowed = True
+            while not self._queue.empty():
+                self._queue.get_nowait()
+
+    async def get(self, timeout: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """Next event, or None if none arrived within timeout seconds"""
+        try:
+            return await asyncio.wait_for(self._queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class PipelineEventBroker:
+    """Thread-safe publisher of execution events to asyncio subscribers"""
+
+    def __init__(self, queue_size: int):
+        self.queue_size = queue_size
+        self._lock = threading.Lock()
+        self._subscriptions: Dict[str, List[PipelineEventSubscription]] = {}
+
+    def subscribe(self, execution_id: str) -> PipelineEventSubscription:
+        """Subscribe to an execution's events; call from the consuming event loop"""
+        subscription = PipelineEventSubscription(execution_id, self.queue_size)
+        with self._lock:
+            self._subscriptions.setdefault(execution_id, []).append(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: PipelineEventSubscription) -> None:
+        with self._lock:
+            subscriptions = self._subscriptions.get(subscription.execution_id, [])
+            if subscription in subscriptions:
+                subscriptions.remove(subscription)
+            if not subscriptions:
+                self._subscriptions.pop(subscription.execution_id, None)
+
+    def publish(self, execution_id: str, event: Dict[str, Any]) -> None:
+        """
+        Deliver an event to the execution's subscribers from any thread
+
+        Events published in order (callers serialize publishing per
+        execution) are received in that order.
+        """
+        with self._lock:
+            subscriptions = list(self._subscriptions.get(execution_id, ()))
+        for subscription in subscriptions:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription._put, event)
+            except RuntimeError:
+                # The subscriber's loop is closed; it will not read again
+                self.unsubscribe(subscription)
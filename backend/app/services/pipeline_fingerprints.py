@@ -0,0 +1,125 @@
+"""
+Input fingerprints for incremental pipeline runs
+Records, per step, a hash of everything the step's output depends on (its
+input files and values, its config slice and the outputs of the steps
+feeding it) together with the files it left behind, so a later run can skip
+a step whose inputs are unchanged and reuse the outputs already on disk
+"""
+
+import hashlib
+import json
+from datetime import datetime
+from typing import Any, Dict, Iterable, Optional
+
+from .shared_store import JsonSidecar, PathRegistry
+
+STATE_FILENAME = ".pipeline_state.json"
+
+
+def digest_value(value: Any) -> str:
+    """Stable hash of a JSON-serialisable value (dict key order does not matter)"""
+    encoded = json.dumps(value, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def digest_file(path: str) -> Optional[str]:
+    """SHA-256 of a file's bytes, or None if it does not exist"""
+    sha = hashlib.sha256()
+    try:
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                sha.update(chunk)
+    except FileNotFoundError:
+        return None
+    return sha.hexdigest()
+
+
+def digest_files(paths: Iterable[str]) -> Dict[str, Optional[str]]:
+    return {path: digest_file(path) for path in paths}
+
+
+class PipelineFingerprints(JsonSidecar):
+    """
+    JSON sidecar of the last successful run of each fingerprinted step
+
+    Besides the step fingerprints it keeps the digest each output file had
+    when the pipeline last wrote it. A step is only skipped while its files
+    still match, so outputs edited by hand or rewritten by a single-step run
+    are recomputed.
+
+    Each file also has a generation, bumped whenever a step creates it from
+    scratch. Steps that modify a file remember the generation they wrote to,
+    so re-creating the file re-runs them even if its new content is identical.
+    """
+
+    SECTIONS = ("steps", "files", "generations")
+
+    def __init__(self, directory: str):
+        super().__init__(directory, STATE_FILENAME)
+
+    def get(self, step_number: int) -> Optional[Dict[str, Any]]:
+        """Recorded entry ({fingerprint, recorded_at, inputs, outputs, generations}) of a step's last successful run"""
+        with self._lock:
+            return self._load()["steps"].get(str(step_number))
+
+    def files_unchanged(self, paths: Iterable[str]) -> bool:
+        """True when every file still has the digest the pipeline last recorded for it"""
+        with self._lock:
+            recorded = dict(self._load()["files"])
+        return all(path in recorded and digest_file(path) == recorded[path] for path in paths)
+
+    def output_digest(self, step_number: int) -> Optional[str]:
+        """Digest of the files a step left behind on its last successful run"""
+        entry = self.get(step_number)
+        return entry.get("output_digest") if entry else None
+
+    def matches(self, step_number: int, fingerprint: str, paths: Iterable[str]) -> Optional[Dict[str, Any]]:
+        """The recorded entry if the step can be skipped, else None"""
+        paths = list(paths)
+        entry = self.get(step_number)
+        if entry is None or entry.get("fingerprint") != fingerprint:
+            return None
+        with self._lock:
+            generations = {path: self._load()["generations"].get(path, 0) for path in paths}
+        if entry.get("generations") != generations:
+            return None
+        return entry if self.files_unchanged(paths) else None
+
+    def record(
+        self,
+        step_number: int,
+        fingerprint: str,
+        paths: Iterable[str],
+        inputs: Optional[Dict[str, Any]] = None,
+        created: Iterable[str] = ()
+    ) -> str:
+        """
+        Store a successful run of a step and the digests of the files it wrote
+
+        created: the files among paths the step wrote from scratch
+        Returns the step's output digest.
+        """
+        files = digest_files(paths)
+        output_digest = digest_value(files)
+        with self._lock:
+            state = self._load()
+            for path in created:
+                state["generations"][path] = state["generations"].get(path, 0) + 1
+            state["steps"][str(step_number)] = {
+                "fingerprint": fingerprint,
+                "recorded_at": datetime.now().isoformat(),
+                "inputs": inputs or {},
+                "output_digest": output_digest,
+                "generations": {path: state["generations"].get(path, 0) for path in files}
+            }
+            state["files"].update(files)
+            self._save()
+        return output_digest
+
+
+_pipeline_fingerprints: PathRegistry[PipelineFingerprints] = PathRegistry(PipelineFingerprints)
+
+
+def get_pipeline_fingerprints(directory: str = "data") -> PipelineFingerprints:
+    """Get the shared fingerprint store for a data directory"""
+    return _pipeline_fingerprints.get(directory)
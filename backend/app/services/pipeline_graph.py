@@ -0,0 +1,160 @@
+"""
+Dependency graph for the 11-step pipeline
+Steps declare the artifacts they read and produce; the graph derives step
+dependencies from them and schedules every step whose inputs are ready, so
+independent steps run concurrently instead of strictly in order
+"""
+
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set
+
+from ..models.schemas import PipelineStepInfo
+
+
+class PipelineGraphError(ValueError):
+    """Raised when step declarations do not form a valid DAG"""
+
+
+class PipelineGraph:
+    """
+    Step DAG built from PipelineStepInfo inputs/outputs
+
+    - A step depends on the step that produces each of its inputs; inputs that
+      no step produces are external (API data, files maintained by hand).
+    - Steps that create or modify the same file never run at the same time,
+      whatever the order they become ready in, because pipeline steps rewrite
+      shared files (universe.json) as a whole.
+    - A step may declare prefetch inputs: work that only needs those artifacts
+      (downloads, parsing) starts as soon as they exist, ahead of the step itself.
+    """
+
+    def __init__(
+        self,
+        steps: Dict[int, PipelineStepInfo],
+        prefetch_inputs: Optional[Dict[int, Iterable[str]]] = None
+    ):
+        self.steps = steps
+        self.producers: Dict[str, int] = {}
+        for number, info in steps.items():
+            for artifact in info.outputs:
+                if artifact in self.producers:
+                    raise PipelineGraphError(
+                        f"Artifact '{artifact}' is produced by both step {self.producers[artifact]} and step {number}"
+                    )
+                self.producers[artifact] = number
+
+        self._dependencies: Dict[int, FrozenSet[int]] = {
+            number: self._producers_of(info.inputs, number) for number, info in steps.items()
+        }
+        self._prefetch_dependencies: Dict[int, FrozenSet[int]] = {
+            number: self._producers_of(inputs, number) for number, inputs in (prefetch_inputs or {}).items()
+        }
+        self._resources: Dict[int, FrozenSet[str]] = {
+            number: frozenset(info.creates_files) | frozenset(info.modifies_files) for number, info in steps.items()
+        }
+        self.order = self._topological_order()
+
+    def _producers_of(self, artifacts: Iterable[str], step_number: int) -> FrozenSet[int]:
+        producers = frozenset(self.producers[a] for a in artifacts if a in self.producers)
+        if step_number in producers:
+            raise PipelineGraphError(f"Step {step_number} consumes its own output")
+        return producers
+
+    def _topological_order(self) -> List[int]:
+        """Steps in dependency order (lowest step number first among ready steps)"""
+        order: List[int] = []
+        done: Set[int] = set()
+        remaining = sorted(self.steps)
+        while remaining:
+            ready = [n for n in remaining if self._dependencies[n] <= done]
+            if not ready:
+                raise PipelineGraphError(f"Dependency cycle between steps {remaining}")
+            order.extend(ready)
+            done.update(ready)
+            remaining = [n for n in remaining if n not in done]
+        return order
+
+    def dependencies(self, step_number: int) -> List[int]:
+        """Steps whose outputs this step reads"""
+        return sorted(self._dependencies[step_number])
+
+    def prefetch_dependencies(self, step_number: int) -> Optional[List[int]]:
+        """Steps the prefetch waits for, or None if the step has no prefetch"""
+        deps = self._prefetch_dependencies.get(step_number)
+        return None if deps is None else sorted(deps)
+
+    def conflicts(self, first: int, second: int) -> bool:
+        """True when two steps write a common file"""
+        return bool(self._resources[first] & self._resources[second])
+
+    def schedule(self, target_steps: Iterable[int]) -> "PipelineSchedule":
+        return PipelineSchedule(self, target_steps)
+
+
+class PipelineSchedule:
+    """
+    Run state of one execution over a subset of the graph
+
+    Dependencies on steps outside the target set are treated as satisfied
+    (their files are expected on disk, as with a step range today). After a
+    failure no further steps or prefetches are released; steps already
+    running are left to finish so no shared file is abandoned half-written.
+    """
+
+    def __init__(self, graph: PipelineGraph, target_steps: Iterable[int]):
+        self.graph = graph
+        self.targets = [n for n in graph.order if n in set(target_steps)]
+        self.pending: Set[int] = set(self.targets)
+        self.running: Set[int] = set()
+        self.completed: List[int] = []
+        self.failed: List[int] = []
+        self.prefetched: Set[int] = set()
+
+    def _satisfied(self, dependencies: Iterable[int]) -> bool:
+        completed = set(self.completed)
+        return all(dep in completed or dep not in self.targets for dep in dependencies)
+
+    def ready_steps(self) -> List[int]:
+        """Pending steps that can start now, in dependency order"""
+        if self.failed:
+            return []
+        ready: List[int] = []
+        for number in self.targets:
+            if number not in self.pending or not self._satisfied(self.graph.dependencies(number)):
+                continue
+            if any(self.graph.conflicts(number, other) for other in self.running | set(ready)):
+                continue
+            ready.append(number)
+        return ready
+
+    def ready_prefetches(self) -> List[int]:
+        """Pending steps whose prefetch can start now"""
+        if self.failed:
+            return []
+        ready = []
+        for number in self.targets:
+            deps = self.graph.prefetch_dependencies(number)
+            if deps is None or number in self.prefetched or number not in self.pending:
+                continue
+            if self._satisfied(deps):
+                ready.append(number)
+        return ready
+
+    def start_prefetch(self, step_number: int) -> None:
+        self.prefetched.add(step_number)
+
+    def start(self, step_number: int) -> None:
+        self.pending.discard(step_number)
+        self.running.add(step_number)
+
+    def finish(self, step_number: int, success: bool) -> None:
+        self.running.discard(step_number)
+        (self.completed if success else self.failed).append(step_number)
+
+    @property
+    def done(self) -> bool:
+        """Nothing running and nothing left that may start"""
+        return not self.running and not self.ready_steps()
+
+    @property
+    def progress_percentage(self) -> float:
+        return len(self.completed) / len(self.targets) * 100 if self.targets else 100.0
@@ -0,0 +1,95 @@
+"""
+Dedicated worker threads for blocking pipeline steps
+Sync steps (CSV parsing, optimisation, IBKR search) run here rather than on the
+event loop or in its default executor, so API requests served by either never
+queue behind a pipeline step
+"""
+
+import asyncio
+import contextvars
+import functools
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Hashable, Optional, Set
+
+from ..core.config import settings
+
+
+class PipelineWorkerPool:
+    """
+    Thread pool for pipeline steps with timeouts and cancellation
+
+    Calls run with the caller's context variables, so per-step console
+    capture follows them into the worker thread. A call that times out or is
+    cancelled stops being awaited, but a running thread cannot be interrupted:
+    it keeps its key busy until it returns, which lets the orchestrator refuse
+    to start a step that would write the same files in the meantime.
+    """
+
+    def __init__(self, max_workers: int):
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="pipeline-step")
+        self._lock = threading.Lock()
+        self._busy: Dict[Hashable, int] = {}
+
+    def busy(self) -> Set[Hashable]:
+        """Keys of calls still running, including ones nobody waits for any more"""
+        with self._lock:
+            return set(self._busy)
+
+    def _track(self, key: Hashable, future: Future) -> None:
+        with self._lock:
+            self._busy[key] = self._busy.get(key, 0) + 1
+
+        def release(_):
+            with self._lock:
+                self._busy[key] -= 1
+                if not self._busy[key]:
+                    del self._busy[key]
+
+        future.add_done_callback(release)
+
+    async def run(
+        self,
+        function: Callable[..., Any],
+        *args: Any,
+        key: Optional[Hashable] = None,
+        timeout: Optional[float] = None,
+        **kwargs: Any
+    ) -> Any:
+        """
+        Run a blocking function in a worker thread and await its result
+
+        Raises asyncio.TimeoutError after timeout seconds.
+        """
+        context = contextvars.copy_context()
+        future = self._executor.submit(functools.partial(context.run, function, *args, **kwargs))
+        if key is not None:
+            self._track(key, future)
+        return await asyncio.wait_for(asyncio.wrap_future(future), timeout)
+
+    def shutdown(self) -> None:
+        """Drop queued calls; running ones finish in the background"""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+_pipeline_worker_pool: Optional[PipelineWorkerPool] = None
+_pipeline_worker_pool_lock = threading.Lock()
+
+
+def get_pipeline_worker_pool() -> PipelineWorkerPool:
+    """Get the shared pipeline worker pool"""
+    global _pipeline_worker_pool
+    with _pipeline_worker_pool_lock:
+        if _pipeline_worker_pool is None:
+            _pipeline_worker_pool = PipelineWorkerPool(settings.pipeline.step_workers)
+        return _pipeline_worker_pool
+
+
+def shutdown_pipeline_worker_pool() -> None:
+    """Release the shared pool at application shutdown"""
+    global _pipeline_worker_pool
+    with _pipeline_worker_pool_lock:
+        if _pipeline_worker_pool is not None:
+            _pipeline_worker_pool.shutdown()
+            _pipeline_worker_pool = None
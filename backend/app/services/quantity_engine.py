@@ -0,0 +1,217 @@
+"""
+Columnar quantity engine for step 7
+Computes eur_price, target_value_eur and lot-rounded quantity for a whole list
+of stocks with NumPy, reproducing QuantityService.calculate_stock_fields exactly
+"""
+
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+
+from .universe_store import set_if_changed
+
+# Minimum tradable lot per currency; JPY stocks trade in 100-share units
+DEFAULT_LOT_SIZES: Dict[str, int] = {"JPY": 100}
+
+# Quantities beyond this cannot round-trip exactly through int64 / float64
+MAX_EXACT_QUANTITY = float(2 ** 53)
+
+MINIMAL_ALLOCATION = 1e-10
+
+
+@dataclass
+class StockColumns:
+    """Parsed inputs for one batch of stocks; rows in `fallback` could not be parsed"""
+    price: np.ndarray
+    eur_exchange_rate: np.ndarray
+    final_target: np.ndarray
+    lot_size: np.ndarray
+    fallback: np.ndarray
+
+
+@dataclass
+class QuantityColumns:
+    """Computed outputs; values in rows flagged by `fallback` are meaningless"""
+    final_target: np.ndarray
+    eur_price: np.ndarray
+    target_value_eur: np.ndarray
+    quantity: np.ndarray
+    lot_adjusted: np.ndarray
+    fallback: np.ndarray
+
+
+def round_half_even(values: np.ndarray, digits: int) -> List[float]:
+    """
+    Python round(value, digits) for every element, as a list of floats
+
+    Scaling by 10**digits and using rint matches Python's correctly-rounded
+    result unless the scaled value sits within floating-point error of a .5
+    tie; those elements (and non-finite or huge ones) use round() itself.
+    """
+    scale = 10.0 ** digits
+    with np.errstate(invalid="ignore", over="ignore"):
+        scaled = values * scale
+        fraction = np.abs(scaled - np.floor(scaled) - 0.5)
+        exact = np.isfinite(scaled) & (np.abs(scaled) < 2.0 ** 52) & (fraction > np.abs(scaled) * 2.0 ** -50 + 1e-9)
+        rounded = (np.rint(scaled) / scale).tolist()
+
+    if not exact.all():
+        plain = values.tolist()
+        for i in np.flatnonzero(~exact).tolist():
+            rounded[i] = round(plain[i], digits)
+    return rounded
+
+
+class QuantityEngine:
+    """
+    Vectorised step 7 quantity calculation
+
+    Rows whose inputs the scalar code would reject or special-case (unparseable
+    numbers, zero exchange rates, non-finite or huge quantities) are handed to
+    a fallback callable - normally QuantityService.calculate_stock_fields - so
+    every stock ends up exactly as the per-dict path would leave it.
+    """
+
+    def __init__(self, lot_sizes: Optional[Dict[str, int]] = None):
+        self.lot_sizes = {
+            currency.upper(): int(size)
+            for currency, size in (DEFAULT_LOT_SIZES if lot_sizes is None else lot_sizes).items()
+        }
+
+    def load_columns(self, stocks: List[Dict[str, Any]], screen_allocation: Optional[float] = None) -> StockColumns:
+        """Parse prices, rates, targets and currencies into arrays"""
+        target_key = "final_target" if screen_allocation is None else "allocation_target"
+        lot_sizes = self.lot_sizes
+        fallback = np.zeros(len(stocks), dtype=bool)
+
+        try:
+            # Fast path: every row parses cleanly
+            price = np.array([float(stock.get("price", 0)) for stock in stocks], dtype=float)
+            rate = np.array([float(stock.get("eur_exchange_rate", 1)) for stock in stocks], dtype=float)
+            target = np.array([float(stock.get(target_key, 0)) for stock in stocks], dtype=float)
+            lot_size = np.array(
+                [lot_sizes.get(stock.get("currency", "").upper(), 1) for stock in stocks], dtype=np.int64
+            )
+        except (ValueError, TypeError, AttributeError, OverflowError):
+            price, rate, target, lot_size = self._load_columns_by_row(stocks, target_key, fallback)
+
+        if screen_allocation is not None:
+            try:
+                target = target * float(screen_allocation)
+            except (ValueError, TypeError):
+                fallback[:] = True
+
+        # price / 0 raises ZeroDivisionError in the scalar path
+        fallback |= rate == 0
+        return StockColumns(price, rate, target, lot_size, fallback)
+
+    def _load_columns_by_row(self, stocks: List[Dict[str, Any]], target_key: str, fallback: np.ndarray):
+        """Row-by-row parse that flags unparseable stocks instead of failing the batch"""
+        count = len(stocks)
+        price = np.zeros(count)
+        rate = np.ones(count)
+        target = np.zeros(count)
+        lot_size = np.ones(count, dtype=np.int64)
+        for i, stock in enumerate(stocks):
+            try:
+                price[i] = float(stock.get("price", 0))
+                rate[i] = float(stock.get("eur_exchange_rate", 1))
+                target[i] = float(stock.get(target_key, 0))
+                lot_size[i] = self.lot_sizes.get(stock.get("currency", "").upper(), 1)
+            except (ValueError, TypeError, AttributeError, OverflowError):
+                fallback[i] = True
+        return price, rate, target, lot_size
+
+    def compute(self, columns: StockColumns, account_value: float) -> QuantityColumns:
+        """Vectorised EUR conversion, target value and lot rounding"""
+        fallback = columns.fallback.copy()
+        safe_rate = np.where(fallback, 1.0, columns.eur_exchange_rate)
+
+        with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+            eur_price = columns.price / safe_rate
+            target_value_eur = float(account_value) * columns.final_target
+            positive = eur_price > 0
+            raw_quantity = np.where(positive, target_value_eur / np.where(positive, eur_price, 1.0), 0.0)
+
+        # int(round(nan/inf)) fails in the scalar path; let it handle those rows
+        fallback |= ~np.isfinite(raw_quantity) | (np.abs(raw_quantity) >= MAX_EXACT_QUANTITY)
+        raw_quantity = np.where(fallback, 0.0, raw_quantity)
+
+        # Lot rounding: round DOWN to whole lots for positive quantities (int() truncation)
+        lots = columns.lot_size
+        lot_rounded = (np.trunc(raw_quantity).astype(np.int64) // lots) * lots
+        needs_lot = (lots > 1) & (raw_quantity > 0)
+        quantity = np.where(needs_lot, lot_rounded, np.rint(raw_quantity).astype(np.int64))
+        lot_adjusted = needs_lot & (lot_rounded != raw_quantity)
+
+        return QuantityColumns(
+            final_target=columns.final_target,
+            eur_price=eur_price,
+            target_value_eur=target_value_eur,
+            quantity=quantity,
+            lot_adjusted=lot_adjusted,
+            fallback=fallback
+        )
+
+    def apply(
+        self,
+        stocks: List[Dict[str, Any]],
+        account_value: float,
+        screen_allocation: Optional[float] = None,
+        fallback: Optional[Callable[[Dict[str, Any], float, Optional[float]], None]] = None
+    ) -> Dict[str, Any]:
+        """
+        Compute and write quantity fields for every stock in place
+
+        Returns:
+            Counts of processed, meaningful / minimal allocation, lot-adjusted
+            (per currency) and fallback rows
+        """
+        columns = self.load_columns(stocks, screen_allocation)
+        results = self.compute(columns, account_value)
+
+        final_targets = results.final_target.tolist()
+        eur_prices = round_half_even(results.eur_price, 6)
+        target_values = round_half_even(results.target_value_eur, 2)
+        quantities = results.quantity.tolist()
+        fallback_rows = results.fallback.tolist()
+
+        lot_adjustments: Dict[str, int] = {}
+        for i in np.flatnonzero(results.lot_adjusted & ~results.fallback).tolist():
+            currency = stocks[i].get("currency", "").upper()
+            lot_adjustments[currency] = lot_adjustments.get(currency, 0) + 1
+
+        fallback_count = 0
+        fallback_targets = []
+        in_screen = screen_allocation is not None
+        rows = zip(stocks, fallback_rows, final_targets, eur_prices, target_values, quantities)
+        for stock, needs_fallback, final_target, eur_price, target_value_eur, quantity in rows:
+            if needs_fallback:
+                fallback_count += 1
+                if fallback is None:
+                    raise ValueError(f"Stock {stock.get('ticker', 'Unknown')} needs the scalar calculation path")
+                fallback(stock, account_value, screen_allocation)
+                fallback_targets.append(float(stock.get("final_target", 0)))
+                continue
+
+            if in_screen:
+                set_if_changed(stock, "screen_target", screen_allocation)
+            set_if_changed(stock, "final_target", final_target)
+            set_if_changed(stock, "eur_price", eur_price)
+            set_if_changed(stock, "target_value_eur", target_value_eur)
+            set_if_changed(stock, "quantity", quantity)
+
+            if MINIMAL_ALLOCATION > final_target > 0:
+                set_if_changed(stock, "allocation_note", "minimal_allocation")
+            elif "allocation_note" in stock:
+                del stock["allocation_note"]
+
+        targets = np.concatenate([results.final_target[~results.fallback], np.asarray(fallback_targets, dtype=float)])
+        return {
+            "processed": len(stocks),
+            "meaningful_allocations": int(np.count_nonzero(targets >= MINIMAL_ALLOCATION)),
+            "minimal_allocations": int(np.count_nonzero((targets > 0) & (targets < MINIMAL_ALLOCATION))),
+            "lot_adjustments": lot_adjustments,
+            "fallback": fallback_count
+        }
@@ -0,0 +1,150 @@
+"""
+Indexed, cached view of Uncle Stock screener CSV exports
+Each export is parsed once per file version into columns with a
+(header, subtitle pattern) -> column map and a ticker -> row index, so field
+lookups no longer re-open and re-scan the CSV on every request
+"""
+
+import csv
+from functools import cached_property
+from itertools import zip_longest
+from typing import Any, Dict, List, Optional, Tuple
+
+from .file_version_cache import FileVersion, FileVersionCache
+
+
+class ScreenerTable:
+    """
+    One parsed version of a screener export
+
+    Exports have three header rows (headers, subheaders, descriptions such as
+    'per share in stock price currency'), optionally preceded by a `sep=`
+    line. Cells are stored stripped, column by column. Matching follows the
+    legacy parser: a field is the first column whose header equals
+    header_name and whose description contains subtitle_pattern, and a row
+    only counts for a field if it reaches both that column and the symbol
+    column.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        version: FileVersion,
+        headers: List[str],
+        subheaders: List[str],
+        descriptions: List[str],
+        rows: List[List[str]]
+    ):
+        self.path = path
+        self.version = version
+        self.headers = headers
+        self.subheaders = subheaders
+        self.descriptions = descriptions
+        self.row_lengths = [len(row) for row in rows]
+        self.columns: List[List[str]] = [
+            [cell.strip() for cell in column] for column in zip_longest(*rows, fillvalue='')
+        ]
+        self.symbol_index = headers.index('symbol') if 'symbol' in headers else None
+
+        # header -> [(column, description)] over the columns that have a description
+        self._header_columns: Dict[str, List[Tuple[int, str]]] = {}
+        for i, (header, description) in enumerate(zip(headers, descriptions)):
+            self._header_columns.setdefault(header, []).append((i, description))
+        self._field_columns: Dict[Tuple[str, str], Optional[int]] = {}
+
+        # Rows with a usable symbol, in file order, and ticker -> those rows
+        self.stock_rows: List[int] = []
+        self.ticker_rows: Dict[str, List[int]] = {}
+        if self.symbol_index is not None and self.symbol_index < len(self.columns):
+            for row, ticker in enumerate(self.columns[self.symbol_index]):
+                if len(ticker) >= 2 and self.row_lengths[row] > self.symbol_index:
+                    self.stock_rows.append(row)
+                    self.ticker_rows.setdefault(ticker, []).append(row)
+
+    @classmethod
+    def from_file(cls, path: str, version: FileVersion) -> "ScreenerTable":
+        """Parse an export; raises if it is unreadable or has fewer than three header rows"""
+        with open(path, 'r', encoding='utf-8') as f:
+            # Skip the sep= line if present
+            first_line = f.readline()
+            if not first_line.startswith('sep='):
+                f.seek(0)
+
+            reader = csv.reader(f)
+            headers = next(reader)
+            subheaders = next(reader)
+            descriptions = next(reader)
+            rows = list(reader)
+        return cls(path, version, headers, subheaders, descriptions, rows)
+
+    def find_column(self, header_name: str, subtitle_pattern: str) -> Optional[int]:
+        """Column of the first header_name whose description contains subtitle_pattern"""
+        key = (header_name, subtitle_pattern)
+        if key not in self._field_columns:
+            self._field_columns[key] = next(
+                (i for i, description in self._header_columns.get(header_name, []) if subtitle_pattern in description),
+                None
+            )
+        return self._field_columns[key]
+
+    @cached_property
+    def available_fields(self) -> List[Tuple[str, str, int]]:
+        """(header, description, column) for every column that has both"""
+        return [
+            (header, description, i)
+            for i, (header, description) in enumerate(zip(self.headers, self.descriptions))
+            if header and description
+        ]
+
+    def _field(self, header_name: str, subtitle_pattern: str, row: int, column: int) -> Dict[str, Any]:
+        return {
+            'ticker': self.columns[self.symbol_index][row],
+            'field': f'{header_name} | {subtitle_pattern}',
+            'value': self.columns[column][row]
+        }
+
+    def field_value(self, ticker: str, header_name: str, subtitle_pattern: str) -> Optional[Dict[str, Any]]:
+        """{'ticker', 'field', 'value'} for one stock, or None if the stock or field is missing"""
+        column = self.find_column(header_name, subtitle_pattern)
+        if column is None or self.symbol_index is None:
+            return None
+        required = max(column, self.symbol_index)
+        for row in self.ticker_rows.get(ticker, ()):
+            if self.row_lengths[row] > required:
+                return self._field(header_name, subtitle_pattern, row, column)
+        return None
+
+    def field_values(self, header_name: str, subtitle_pattern: str) -> List[Dict[str, Any]]:
+        """{'ticker', 'field', 'value'} for every stock, in file order"""
+        column = self.find_column(header_name, subtitle_pattern)
+        if column is None or self.symbol_index is None:
+            return []
+        required = max(column, self.symbol_index)
+        return [
+            self._field(header_name, subtitle_pattern, row, column)
+            for row in self.stock_rows if self.row_lengths[row] > required
+        ]
+
+
+class ScreenerTableCache(FileVersionCache[ScreenerTable]):
+    """
+    Parsed exports, one parse per file version
+
+    Step 1 rewrites exports in place; see FileVersionCache. get() raises on
+    unreadable exports.
+    """
+
+    def __init__(self):
+        super().__init__(ScreenerTable.from_file)
+
+
+# Singleton instance
+_screener_table_cache: Optional[ScreenerTableCache] = None
+
+
+def get_screener_table_cache() -> ScreenerTableCache:
+    """Get the process-wide screener table cache"""
+    global _screener_table_cache
+    if _screener_table_cache is None:
+        _screener_table_cache = ScreenerTableCache()
+    return _screener_table_cache
@@ -0,0 +1,127 @@
+"""
+Building blocks for the process-wide stores kept under the data directory
+SQLiteStore is a database behind one long-lived connection, JsonSidecar a
+small JSON state file next to the files it describes, and PathRegistry hands
+out one shared instance of either per file or directory
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, Callable, Dict, Generic, Iterable, Optional, Sequence, Tuple, TypeVar
+
+from .database_service import CONNECTION_PRAGMAS
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Keys per DELETE statement, well below SQLite's bound-parameter limit
+DELETE_BATCH_SIZE = 500
+
+
+class SQLiteStore(ABC):
+    """
+    SQLite database behind one long-lived connection serialized by a lock
+
+    As in IBKRDatabaseService. Subclasses create their schema in
+    _initialize_database(), which runs on construction.
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.RLock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._initialize_database()
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            for pragma in CONNECTION_PRAGMAS:
+                conn.execute(pragma)
+            self._conn = conn
+        return self._conn
+
+    def close(self):
+        """Close the shared connection; the next call reopens it"""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    @abstractmethod
+    def _initialize_database(self):
+        """Create the store's tables and indexes if they do not exist"""
+        pass
+
+    @staticmethod
+    def _delete_keys(conn: sqlite3.Connection, tables: Iterable[Tuple[str, str]], keys: Sequence[Any]) -> None:
+        """Delete the rows whose column is in keys from every (table, column), in batches"""
+        tables = list(tables)
+        for start in range(0, len(keys), DELETE_BATCH_SIZE):
+            batch = list(keys[start:start + DELETE_BATCH_SIZE])
+            marks = ", ".join("?" * len(batch))
+            for table, column in tables:
+                conn.execute(f"DELETE FROM {table} WHERE {column} IN ({marks})", batch)
+
+
+class JsonSidecar:
+    """
+    JSON state file in a data directory
+
+    Read on first use and replaced atomically (temp file + os.replace) on
+    every save. An unreadable file is treated as empty. Subclasses hold
+    self._lock while reading or changing the dict returned by _load();
+    SECTIONS are top-level keys that always exist.
+    """
+
+    SECTIONS: Tuple[str, ...] = ()
+
+    def __init__(self, directory: str, filename: str):
+        self.directory = directory
+        self.path = os.path.join(directory, filename)
+        self._lock = threading.Lock()
+        self._state: Optional[Dict[str, Any]] = None
+
+    def _load(self) -> Dict[str, Any]:
+        if self._state is None:
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    self._state = json.load(f)
+            except FileNotFoundError:
+                self._state = {}
+            except (OSError, ValueError) as e:
+                logger.warning(f"Ignoring unreadable state file {self.path}: {e}")
+                self._state = {}
+            for section in self.SECTIONS:
+                self._state.setdefault(section, {})
+        return self._state
+
+    def _save(self) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(self._state, f, indent=2, default=str)
+        os.replace(temp_path, self.path)
+
+
+class PathRegistry(Generic[T]):
+    """One shared instance per absolute path, built by factory(path) on first use"""
+
+    def __init__(self, factory: Callable[[str], T]):
+        self._factory = factory
+        self._instances: Dict[str, T] = {}
+        self._lock = threading.Lock()
+
+    def get(self, path: str) -> T:
+        key = os.path.abspath(path)
+        with self._lock:
+            if key not in self._instances:
+                self._instances[key] = self._factory(path)
+            return self._instances[key]
@@ -0,0 +1,130 @@
+"""
+Process-wide cache of parsed universe.json files
+Read-only endpoints share one parse per file version instead of json.load-ing
+the file on every request; derived views are computed once per version
+"""
+
+import json
+from functools import cached_property
+from typing import Any, Dict, List, Optional
+
+import pandas as pd
+
+from .file_version_cache import FileVersion, FileVersionCache
+from .frontier_engine import quarterly_returns_frame
+
+# Number of stocks with quantities echoed back by GET /portfolio/quantities
+QUANTITY_SAMPLE_SIZE = 5
+
+
+class UniverseSnapshot:
+    """
+    One parsed version of a universe file
+
+    `data` is shared between every request that sees this version and must be
+    treated as read-only; callers that need to modify it should deep-copy first.
+    """
+
+    def __init__(self, path: str, version: FileVersion, data: Dict[str, Any]):
+        self.path = path
+        self.version = version
+        self.data = data
+
+    @cached_property
+    def screen_membership(self) -> Dict[str, List[str]]:
+        """Ticker -> screen keys whose stock lists contain it, in screen order"""
+        membership: Dict[str, List[str]] = {}
+        for screen_key, screen_data in self.data.get("screens", {}).items():
+            if not isinstance(screen_data, dict):
+                continue
+            for stock in screen_data.get("stocks", []):
+                if isinstance(stock, dict) and "ticker" in stock:
+                    membership.setdefault(stock["ticker"], []).append(screen_key)
+        return membership
+
+    @cached_property
+    def multi_screen_stocks(self) -> List[tuple]:
+        """(ticker, stock_data) for all_stocks entries listed in more than one screen"""
+        return [
+            (ticker, data) for ticker, data in self.data.get("all_stocks", {}).items()
+            if len(data.get("screens", [])) > 1
+        ]
+
+    @cached_property
+    def quarterly_returns(self) -> pd.DataFrame:
+        """Quarterly screener returns parsed from historical_performance (shared; do not modify)"""
+        return quarterly_returns_frame(self.data)
+
+    @cached_property
+    def quantity_summary(self) -> Dict[str, Any]:
+        """Quantity coverage counts and a sample of calculated positions"""
+        stocks_with_quantities = 0
+        total_stocks = 0
+        sample_stocks = []
+
+        for screen_name, screen_data in self.data.get("screens", {}).items():
+            if isinstance(screen_data, dict) and "stocks" in screen_data:
+                for stock in screen_data["stocks"]:
+                    if isinstance(stock, dict):
+                        total_stocks += 1
+                        if "quantity" in stock:
+                            stocks_with_quantities += 1
+                            if len(sample_stocks) < QUANTITY_SAMPLE_SIZE:
+                                sample_stocks.append({
+                                    "ticker": stock.get("ticker", "Unknown"),
+                                    "screen": screen_name,
+                                    "eur_price": stock.get("eur_price", 0),
+                                    "target_value_eur": stock.get("target_value_eur", 0),
+                                    "quantity": stock.get("quantity", 0),
+                                    "final_target": stock.get("final_target", 0),
+                                    "currency": stock.get("currency", "Unknown"),
+                                    "allocation_note": stock.get("allocation_note")
+                                })
+
+        for stock in self.data.get("all_stocks", {}).values():
+            if isinstance(stock, dict):
+                total_stocks += 1
+                if "quantity" in stock:
+                    stocks_with_quantities += 1
+
+        return {
+            "stocks_with_quantities": stocks_with_quantities,
+            "total_stocks": total_stocks,
+            "sample_stocks": sample_stocks
+        }
+
+
+def _load_snapshot(path: str, version: FileVersion) -> UniverseSnapshot:
+    with open(path, 'r', encoding='utf-8') as f:
+        return UniverseSnapshot(path, version, json.load(f))
+
+
+class UniverseCache(FileVersionCache[UniverseSnapshot]):
+    """
+    Parsed universe files, one parse per file version
+
+    The pipeline rewrites universe.json in place; see FileVersionCache.
+    get() raises on unreadable JSON.
+    """
+
+    def __init__(self):
+        super().__init__(_load_snapshot)
+
+    def snapshot_of(self, data: Dict[str, Any]) -> Optional[UniverseSnapshot]:
+        """Find the cached snapshot whose data is this exact object"""
+        for snapshot in self.values():
+            if snapshot.data is data:
+                return snapshot
+        return None
+
+
+# Singleton instance
+_universe_cache: Optional[UniverseCache] = None
+
+
+def get_universe_cache() -> UniverseCache:
+    """Get the process-wide universe cache"""
+    global _universe_cache
+    if _universe_cache is None:
+        _universe_cache = UniverseCache()
+    return _universe_cache
@@ -0,0 +1,601 @@
+"""
+SQLite-backed universe store
+Keeps data/universe.json as per-stock rows so pipeline steps can read and update
+individual stocks or sections without parsing and re-serialising the whole file,
+while still exporting a byte-identical universe.json for legacy consumers
+"""
+
+import json
+import logging
+import math
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# universe.json is written with json.dump(..., indent=2, ensure_ascii=False)
+INDENT = "  "
+
+SCREENS = "screens"
+ALL_STOCKS = "all_stocks"
+ALL_STOCKS_CONTAINER = "all_stocks"
+SCREEN_CONTAINER_PREFIX = "screen:"
+
+
+def _dumps(value: Any) -> str:
+    return json.dumps(value, indent=2, ensure_ascii=False)
+
+
+def _nest(fragment: str, depth: int) -> str:
+    """Re-indent a depth-0 pretty JSON fragment for embedding at depth"""
+    return fragment.replace("\n", "\n" + INDENT * depth) if depth else fragment
+
+
+def _join_object(items: List[Tuple[str, str]], depth: int) -> str:
+    """Assemble a JSON object from (key, depth-0 fragment) pairs exactly as json.dumps(indent=2) would"""
+    if not items:
+        return "{}"
+    pad = INDENT * (depth + 1)
+    body = ",\n".join(
+        f"{pad}{json.dumps(key, ensure_ascii=False)}: {_nest(fragment, depth + 1)}" for key, fragment in items
+    )
+    return "{\n" + body + "\n" + INDENT * depth + "}"
+
+
+def _join_array(fragments: List[str], depth: int) -> str:
+    if not fragments:
+        return "[]"
+    pad = INDENT * (depth + 1)
+    return "[\n" + ",\n".join(pad + _nest(fragment, depth + 1) for fragment in fragments) + "\n" + INDENT * depth + "]"
+
+
+_ABSENT = object()
+
+# update_stock_fields value that deletes the field
+REMOVE_FIELD = object()
+
+
+class UniverseConflictError(RuntimeError):
+    """Raised when universe.json changed on disk while the store holds unexported writes"""
+
+
+def screen_container(screen_key: str) -> str:
+    """Container holding a screen's stock rows, for update_stock_fields(container=...)"""
+    return SCREEN_CONTAINER_PREFIX + screen_key
+
+
+def set_if_changed(stock: Dict[str, Any], key: str, value: Any) -> None:
+    """
+    Assign stock[key] only if the stored JSON would change
+
+    Keeps TrackedStock rows clean when a step recomputes identical values;
+    0 and 0.0, or 0.0 and -0.0, still count as changes.
+    """
+    current = stock.get(key, _ABSENT)
+    if type(current) is type(value) and current == value:
+        if not isinstance(value, float) or value != 0 or math.copysign(1, value) == math.copysign(1, current):
+            return
+    stock[key] = value
+
+
+class TrackedStock(dict):
+    """
+    Stock dict that remembers whether it was modified since it was loaded
+
+    Only top-level assignments are tracked; code that mutates a nested value in
+    place must reassign the field (stock['x'] = value) for the change to be saved.
+    """
+
+    def __init__(self, *args, origin: Optional[Tuple[str, int]] = None, body: Optional[str] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._origin = origin
+        self._body = body
+        self._dirty = body is None
+
+    def _touch(self):
+        self._dirty = True
+
+    def __setitem__(self, key, value):
+        self._touch()
+        super().__setitem__(key, value)
+
+    def __delitem__(self, key):
+        self._touch()
+        super().__delitem__(key)
+
+    def update(self, *args, **kwargs):
+        self._touch()
+        super().update(*args, **kwargs)
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self._touch()
+        return super().setdefault(key, default)
+
+    def pop(self, *args):
+        self._touch()
+        return super().pop(*args)
+
+    def popitem(self):
+        self._touch()
+        return super().popitem()
+
+    def clear(self):
+        self._touch()
+        super().clear()
+
+    def unchanged_at(self, origin: Tuple[str, int]) -> bool:
+        """True when this stock still matches the stored row at origin"""
+        return not self._dirty and self._origin == origin
+
+
+class UniverseStore:
+    """
+    Row-per-stock store for one universe.json file
+
+    The JSON file stays the interchange format: refresh() re-imports it whenever
+    another writer (legacy CLI code) changed it, and export() writes it back by
+    joining the stored pretty-printed fragments, so only stocks that actually
+    changed are ever re-encoded. The joined stock list of each screen is kept
+    in memory too, so an export only re-joins the screens that were written.
+    """
+
+    def __init__(self, universe_path: str = "data/universe.json", db_path: Optional[str] = None):
+        self.universe_path = Path(universe_path)
+        self.db_path = Path(db_path) if db_path else self.universe_path.with_suffix(".db")
+        self._lock = threading.RLock()
+        self._conn: Optional[sqlite3.Connection] = None
+        # container -> joined stock rows, valid for the stored revision it was built at
+        self._fragments: Dict[str, str] = {}
+        self._fragments_revision: Optional[str] = None
+
+    # ------------------------------------------------------------------
+    # Connection and schema
+    # ------------------------------------------------------------------
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript("""
+                CREATE TABLE IF NOT EXISTS universe_sections (
+                    name TEXT PRIMARY KEY,
+                    position INTEGER NOT NULL,
+                    kind TEXT NOT NULL,
+                    body TEXT
+                );
+                CREATE TABLE IF NOT EXISTS universe_screens (
+                    screen_key TEXT PRIMARY KEY,
+                    position INTEGER NOT NULL,
+                    header TEXT NOT NULL,
+                    stocks_index INTEGER NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS universe_stocks (
+                    container TEXT NOT NULL,
+                    position INTEGER NOT NULL,
+                    stock_key TEXT,
+                    ticker TEXT,
+                    body TEXT NOT NULL,
+                    PRIMARY KEY (container, position)
+                );
+                CREATE INDEX IF NOT EXISTS idx_universe_stocks_ticker ON universe_stocks(ticker);
+                CREATE TABLE IF NOT EXISTS universe_state (
+                    key TEXT PRIMARY KEY,
+                    value TEXT
+                );
+            """)
+            self._conn = conn
+        return self._conn
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def _get_state(self, key: str) -> Optional[str]:
+        row = self._connection().execute("SELECT value FROM universe_state WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _set_state(self, conn: sqlite3.Connection, key: str, value: Optional[str]) -> None:
+        conn.execute("INSERT OR REPLACE INTO universe_state (key, value) VALUES (?, ?)", (key, value))
+
+    def _mark_dirty(self, conn: sqlite3.Connection, containers: Optional[Iterable[str]] = None) -> None:
+        """
+        Flag the universe for export and drop the cached fragments of changed containers
+
+        containers=None drops every fragment. Every write bumps the stored
+        revision, so fragments cached before a write by another store instance
+        on the same database are discarded as a whole.
+        """
+        revision = self._get_state("revision")
+        if containers is None or revision != self._fragments_revision:
+            self._fragments.clear()
+        else:
+            for container in containers:
+                self._fragments.pop(container, None)
+        self._fragments_revision = str(int(revision or 0) + 1)
+        self._set_state(conn, "revision", self._fragments_revision)
+        self._set_state(conn, "dirty", "1")
+
+    def _container_fragment(self, container: str, keyed: bool) -> str:
+        """Joined stock rows of one container at depth 0, cached until the container is written"""
+        fragment = self._fragments.get(container)
+        if fragment is None:
+            rows = self._connection().execute(
+                "SELECT stock_key, body FROM universe_stocks WHERE container = ? ORDER BY position", (container,)
+            ).fetchall()
+            fragment = _join_object(rows, 0) if keyed else _join_array([body for _, body in rows], 0)
+            self._fragments[container] = fragment
+        return fragment
+
+    # ------------------------------------------------------------------
+    # Synchronisation with universe.json
+    # ------------------------------------------------------------------
+
+    def _file_fingerprint(self) -> str:
+        stat = self.universe_path.stat()
+        return f"{stat.st_mtime_ns}:{stat.st_size}"
+
+    def refresh(self) -> bool:
+        """
+        Re-import universe.json if it changed since the store last saw it
+
+        Returns True when an import happened.
+
+        Raises:
+            FileNotFoundError: universe.json does not exist
+            UniverseConflictError: the file changed while the store has unexported writes
+        """
+        with self._lock:
+            if not self.universe_path.exists():
+                raise FileNotFoundError(f"universe.json not found at {self.universe_path}")
+            if self._get_state("fingerprint") == self._file_fingerprint():
+                return False
+            self.import_file()
+            return True
+
+    def import_file(self, force: bool = False) -> None:
+        """
+        Replace the stored universe with the current contents of universe.json
+
+        Refuses to drop writes that were not exported yet unless force is set.
+        """
+        with self._lock:
+            if not force and self._get_state("dirty") == "1":
+                raise UniverseConflictError(
+                    f"{self.universe_path} changed on disk while the universe store has unexported writes"
+                )
+            fingerprint = self._file_fingerprint()
+            with open(self.universe_path, 'r', encoding='utf-8') as f:
+                universe_data = json.load(f)
+
+            with self._connection() as conn:
+                conn.execute("DELETE FROM universe_sections")
+                conn.execute("DELETE FROM universe_screens")
+                conn.execute("DELETE FROM universe_stocks")
+                self._write_tree(conn, universe_data)
+                self._mark_dirty(conn)
+                self._set_state(conn, "fingerprint", fingerprint)
+                self._set_state(conn, "dirty", "0")
+            logger.info(f"Imported {self.universe_path} into universe store")
+
+    @staticmethod
+    def _is_screens(value: Any) -> bool:
+        return isinstance(value, dict) and all(
+            isinstance(screen, dict) and isinstance(screen.get("stocks"), list) for screen in value.values()
+        )
+
+    @staticmethod
+    def _screen_header(screen: Dict[str, Any]) -> Tuple[str, int]:
+        keys = list(screen)
+        header = {key: value for key, value in screen.items() if key != "stocks"}
+        return json.dumps(header, ensure_ascii=False), keys.index("stocks")
+
+    def _write_tree(self, conn: sqlite3.Connection, universe_data: Dict[str, Any]) -> None:
+        sections, screens, stocks = [], [], []
+        for position, (name, value) in enumerate(universe_data.items()):
+            if name == SCREENS and self._is_screens(value):
+                sections.append((name, position, SCREENS, None))
+                for screen_position, (screen_key, screen) in enumerate(value.items()):
+                    header, stocks_index = self._screen_header(screen)
+                    screens.append((screen_key, screen_position, header, stocks_index))
+                    container = screen_container(screen_key)
+                    for index, stock in enumerate(screen["stocks"]):
+                        ticker = stock.get("ticker") if isinstance(stock, dict) else None
+                        stocks.append((container, index, None, ticker, _dumps(stock)))
+            elif name == ALL_STOCKS and isinstance(value, dict):
+                sections.append((name, position, ALL_STOCKS, None))
+                for index, (key, stock) in enumerate(value.items()):
+                    stocks.append((ALL_STOCKS_CONTAINER, index, key, key, _dumps(stock)))
+            else:
+                sections.append((name, position, "value", _dumps(value)))
+
+        conn.executemany("INSERT INTO universe_sections (name, position, kind, body) VALUES (?, ?, ?, ?)", sections)
+        conn.executemany(
+            "INSERT INTO universe_screens (screen_key, position, header, stocks_index) VALUES (?, ?, ?, ?)", screens
+        )
+        conn.executemany(
+            "INSERT INTO universe_stocks (container, position, stock_key, ticker, body) VALUES (?, ?, ?, ?, ?)", stocks
+        )
+
+    def export(self, path: Optional[str] = None, force: bool = False) -> Path:
+        """
+        Write universe.json from the stored fragments
+
+        Output is byte-identical to json.dump(universe, f, indent=2, ensure_ascii=False).
+        Skipped when nothing changed since the last export (unless force or a different path).
+        """
+        with self._lock:
+            target = Path(path) if path else self.universe_path
+            if target == self.universe_path and not force and self._get_state("dirty") == "0" and target.exists():
+                return target
+
+            text = self.dumps()
+            tmp_path = target.with_name(target.name + ".tmp")
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(text)
+            os.replace(tmp_path, target)
+
+            if target == self.universe_path:
+                with self._connection() as conn:
+                    self._set_state(conn, "fingerprint", self._file_fingerprint())
+                    self._set_state(conn, "dirty", "0")
+            return target
+
+    def dumps(self) -> str:
+        """Serialise the stored universe without re-encoding any stock"""
+        with self._lock:
+            conn = self._connection()
+            if self._get_state("revision") != self._fragments_revision:
+                self._fragments.clear()
+                self._fragments_revision = self._get_state("revision")
+
+            items = []
+            for name, kind, body in conn.execute(
+                "SELECT name, kind, body FROM universe_sections ORDER BY position"
+            ).fetchall():
+                if kind == SCREENS:
+                    screen_items = []
+                    for screen_key, header, stocks_index in conn.execute(
+                        "SELECT screen_key, header, stocks_index FROM universe_screens ORDER BY position"
+                    ).fetchall():
+                        fields = [(key, _dumps(value)) for key, value in json.loads(header).items()]
+                        stocks = self._container_fragment(screen_container(screen_key), keyed=False)
+                        fields.insert(stocks_index, ("stocks", stocks))
+                        screen_items.append((screen_key, _join_object(fields, 0)))
+                    items.append((name, _join_object(screen_items, 0)))
+                elif kind == ALL_STOCKS:
+                    items.append((name, self._container_fragment(ALL_STOCKS_CONTAINER, keyed=True)))
+                else:
+                    items.append((name, body))
+            return _join_object(items, 0)
+
+    # ------------------------------------------------------------------
+    # Field-level access
+    # ------------------------------------------------------------------
+
+    def get_section(self, name: str, default: Any = None) -> Any:
+        """Return one top-level value (e.g. metadata) without touching any stock rows"""
+        with self._lock:
+            self.refresh()
+            row = self._connection().execute(
+                "SELECT kind, body FROM universe_sections WHERE name = ?", (name,)
+            ).fetchone()
+            if row is None:
+                return default
+            if row[0] != "value":
+                return self.load()[name]
+            return json.loads(row[1])
+
+    def set_section(self, name: str, value: Any) -> None:
+        """Create or replace one top-level value; new sections are appended like dict assignment"""
+        with self._lock:
+            self.refresh()
+            with self._connection() as conn:
+                row = conn.execute("SELECT position, kind FROM universe_sections WHERE name = ?", (name,)).fetchone()
+                if row is not None and row[1] != "value":
+                    raise ValueError(f"Section '{name}' holds stocks - update it through load()/save()")
+                if row is None:
+                    position = conn.execute("SELECT COALESCE(MAX(position) + 1, 0) FROM universe_sections").fetchone()[0]
+                else:
+                    position = row[0]
+                body = _dumps(value)
+                if row is not None and conn.execute(
+                    "SELECT body FROM universe_sections WHERE name = ?", (name,)
+                ).fetchone()[0] == body:
+                    return
+                conn.execute(
+                    "INSERT OR REPLACE INTO universe_sections (name, position, kind, body) VALUES (?, ?, 'value', ?)",
+                    (name, position, body)
+                )
+                self._mark_dirty(conn, containers=())
+
+    def get_stock_instances(self, ticker: str) -> List[Dict[str, Any]]:
+        """Every copy of a stock (one per screen plus all_stocks), in file order"""
+        with self._lock:
+            self.refresh()
+            rows = self._connection().execute(
+                "SELECT body FROM universe_stocks WHERE ticker = ? ORDER BY container, position", (ticker,)
+            ).fetchall()
+            return [json.loads(body) for (body,) in rows]
+
+    def update_stock_fields(self, updates: Dict[str, Dict[str, Any]], container: Optional[str] = None) -> int:
+        """
+        Set fields on every instance of each ticker in one transaction
+
+        Args:
+            updates: ticker -> {field: value}; a REMOVE_FIELD value deletes the field
+            container: only update the instances in this container
+                (screen_container(screen_key) or ALL_STOCKS_CONTAINER)
+
+        Returns:
+            Number of stock rows whose stored JSON changed
+        """
+        if not updates:
+            return 0
+        with self._lock:
+            self.refresh()
+            conn = self._connection()
+            tickers = list(updates)
+            changed = []
+            for start in range(0, len(tickers), 500):
+                chunk = tickers[start:start + 500]
+                query = (
+                    "SELECT container, position, ticker, body FROM universe_stocks "
+                    f"WHERE ticker IN ({','.join('?' * len(chunk))})"
+                )
+                if container is not None:
+                    query += " AND container = ?"
+                    chunk = chunk + [container]
+                for row_container, position, ticker, body in conn.execute(query, chunk).fetchall():
+                    stock = json.loads(body)
+                    for field, value in updates[ticker].items():
+                        if value is REMOVE_FIELD:
+                            stock.pop(field, None)
+                        else:
+                            stock[field] = value
+                    new_body = _dumps(stock)
+                    if new_body != body:
+                        changed.append((new_body, row_container, position))
+            if changed:
+                with conn:
+                    conn.executemany(
+                        "UPDATE universe_stocks SET body = ? WHERE container = ? AND position = ?", changed
+                    )
+                    self._mark_dirty(conn, {row_container for _, row_container, _ in changed})
+            return len(changed)
+
+    # ------------------------------------------------------------------
+    # Whole-universe access with change tracking
+    # ------------------------------------------------------------------
+
+    def load(self) -> Dict[str, Any]:
+        """
+        Return the full universe dict
+
+        Stocks are TrackedStock instances, so save() only re-encodes stocks
+        that were modified after loading.
+        """
+        with self._lock:
+            self.refresh()
+            conn = self._connection()
+            stocks: Dict[str, List[Any]] = {}
+            keys: Dict[str, List[Optional[str]]] = {}
+            for container, position, stock_key, body in conn.execute(
+                "SELECT container, position, stock_key, body FROM universe_stocks ORDER BY container, position"
+            ):
+                value = json.loads(body)
+                if isinstance(value, dict):
+                    value = TrackedStock(value, origin=(container, position), body=body)
+                stocks.setdefault(container, []).append(value)
+                keys.setdefault(container, []).append(stock_key)
+
+            universe: Dict[str, Any] = {}
+            for name, kind, body in conn.execute("SELECT name, kind, body FROM universe_sections ORDER BY position"):
+                if kind == SCREENS:
+                    screens = {}
+                    for screen_key, header, stocks_index in conn.execute(
+                        "SELECT screen_key, header, stocks_index FROM universe_screens ORDER BY position"
+                    ):
+                        fields = list(json.loads(header).items())
+                        fields.insert(stocks_index, ("stocks", stocks.get(screen_container(screen_key), [])))
+                        screens[screen_key] = dict(fields)
+                    universe[name] = screens
+                elif kind == ALL_STOCKS:
+                    universe[name] = dict(zip(keys.get(ALL_STOCKS_CONTAINER, []), stocks.get(ALL_STOCKS_CONTAINER, [])))
+                else:
+                    universe[name] = json.loads(body)
+            return universe
+
+    def save(self, universe_data: Dict[str, Any]) -> int:
+        """
+        Persist a universe dict, writing only rows that changed
+
+        Returns:
+            Number of stock rows re-encoded
+        """
+        with self._lock:
+            self.refresh()
+            conn = self._connection()
+            sections, screens, rows = [], [], []
+            for position, (name, value) in enumerate(universe_data.items()):
+                if name == SCREENS and self._is_screens(value):
+                    sections.append((name, position, SCREENS, None))
+                    for screen_position, (screen_key, screen) in enumerate(value.items()):
+                        header, stocks_index = self._screen_header(screen)
+                        screens.append((screen_key, screen_position, header, stocks_index))
+                        container = screen_container(screen_key)
+                        for index, stock in enumerate(screen["stocks"]):
+                            ticker = stock.get("ticker") if isinstance(stock, dict) else None
+                            rows.append((container, index, None, ticker, stock))
+                elif name == ALL_STOCKS and isinstance(value, dict):
+                    sections.append((name, position, ALL_STOCKS, None))
+                    for index, (key, stock) in enumerate(value.items()):
+                        rows.append((ALL_STOCKS_CONTAINER, index, key, key, stock))
+                else:
+                    sections.append((name, position, "value", _dumps(value)))
+
+            changed = []
+            for container, index, stock_key, ticker, stock in rows:
+                if isinstance(stock, TrackedStock) and stock.unchanged_at((container, index)):
+                    continue
+                changed.append((container, index, stock_key, ticker, _dumps(stock)))
+
+            live = {(container, index) for container, index, _, _, _ in rows}
+            existing = conn.execute("SELECT container, position FROM universe_stocks").fetchall()
+            removed = [key for key in existing if tuple(key) not in live]
+
+            with conn:
+                conn.execute("DELETE FROM universe_sections")
+                conn.executemany(
+                    "INSERT INTO universe_sections (name, position, kind, body) VALUES (?, ?, ?, ?)", sections
+                )
+                conn.execute("DELETE FROM universe_screens")
+                conn.executemany(
+                    "INSERT INTO universe_screens (screen_key, position, header, stocks_index) VALUES (?, ?, ?, ?)",
+                    screens
+                )
+                conn.executemany("DELETE FROM universe_stocks WHERE container = ? AND position = ?", removed)
+                conn.executemany(
+                    "INSERT OR REPLACE INTO universe_stocks (container, position, stock_key, ticker, body) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    changed
+                )
+                self._mark_dirty(conn, {container for container, *_ in changed + removed})
+
+            # Rows written now match the stored state
+            for container, index, _, _, stock in rows:
+                if isinstance(stock, TrackedStock):
+                    stock._origin = (container, index)
+                    stock._dirty = False
+
+            logger.debug(f"Universe store saved: {len(changed)} stock rows written, {len(removed)} removed")
+            return len(changed)
+
+    @contextmanager
+    def edit(self) -> Iterator[Dict[str, Any]]:
+        """Load the universe, let the caller mutate it, then save only what changed"""
+        universe_data = self.load()
+        yield universe_data
+        self.save(universe_data)
+
+
+# Singleton instances per universe file
+_universe_stores: Dict[str, UniverseStore] = {}
+_universe_stores_lock = threading.Lock()
+
+
+def get_universe_store(universe_path: str = "data/universe.json") -> UniverseStore:
+    """Get universe store instance for a specific universe.json path"""
+    key = str(Path(universe_path).resolve())
+    with _universe_stores_lock:
+        if key not in _universe_stores:
+            _universe_stores[key] = UniverseStore(universe_path)
+        return _universe_stores[key]
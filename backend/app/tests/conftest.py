@@ -3,11 +3,19 @@ Shared test configuration
 """
 import pytest
 import asyncio
+import numpy as np
+import pandas as pd
 from fastapi.testclient import TestClient
 from unittest.mock import Mock, AsyncMock
 from ..main import app
 from ..core.config import Settings
 
+def make_returns(n_screeners: int = 3, quarters: int = 40, seed: int = 3) -> pd.DataFrame:
+    """Synthetic quarterly screener returns with a common market factor"""
+    rng = np.random.default_rng(seed)
+    values = rng.normal(0.03, 0.08, (quarters, n_screeners)) + rng.normal(0, 0.05, (quarters, 1))
+    return pd.DataFrame(values, columns=[f"screener_{i}" for i in range(n_screeners)])
+
 @pytest.fixture
 def test_client():
     """Test client for FastAPI app"""
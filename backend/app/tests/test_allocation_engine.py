@@ -0,0 +1,196 @@
+"""
+Tests for the vectorised step 6 allocation engine
+Final allocations, printed output and updated stocks must match legacy targetter exactly
+"""
+
+import contextlib
+import copy
+import io
+import json
+import random
+from pathlib import Path
+
+import pytest
+
+from ..services.allocation_engine import AllocationEngine, parse_performance
+from ..services.implementations.legacy import targetter
+
+REAL_UNIVERSE = Path(__file__).resolve().parents[2] / "data" / "universe.json"
+
+
+def make_universe(seed: int = 11, screens: int = 4, stocks_per_screen: int = 60):
+    rng = random.Random(seed)
+    changes = ["12.45%", "-5.23%", "0%", "0.0%", "-0.0%", " 3.5 % ", "1_0%", "n/a", None, 7, "", "12.45%"]
+    universe = {
+        "metadata": {"portfolio_optimization": {"optimal_allocations": {}}},
+        "screens": {},
+        "all_stocks": {},
+    }
+    allocations = universe["metadata"]["portfolio_optimization"]["optimal_allocations"]
+    for s in range(screens):
+        key = f"Screen_{s}"
+        stocks = []
+        for i in range(stocks_per_screen - s * 15):
+            ticker = f"T{rng.randint(0, 150)}"  # duplicates within and across screens
+            change = rng.choice(changes + [f"{rng.uniform(-80, 200):.2f}%"] * 6)
+            stock = {"ticker": ticker, "price_180d_change": change}
+            if change is None:
+                del stock["price_180d_change"]
+            stocks.append(stock)
+            universe["all_stocks"][ticker] = dict(stock)
+        universe["screens"][key] = {"name": f"screen {s}", "stocks": stocks}
+        allocations[key if s % 2 else f"screen_{s}"] = round(rng.random(), 4)
+    universe["screens"]["empty"] = {"name": "Empty Screen", "stocks": []}
+    universe["screens"]["unallocated"] = {"name": "Unallocated", "stocks": [{"ticker": "SOLO", "price_180d_change": "1%"}]}
+    return universe
+
+
+def reference_final_allocations(universe):
+    """The per-stock loop legacy targetter.calculate_final_allocations ran before it used the engine"""
+    screener_allocations = targetter.extract_screener_allocations(universe)
+    final_allocations = {}
+
+    print(f"\n{'='*60}")
+    print("CALCULATING FINAL STOCK ALLOCATIONS")
+    print(f"{'='*60}")
+
+    for screen_key, screen_data in universe.get('screens', {}).items():
+        screen_name = screen_data.get('name', screen_key)
+        stocks = screen_data.get('stocks', [])
+        if not stocks:
+            print(f"\nX {screen_name}: No stocks found")
+            continue
+
+        screener_target = 0.0
+        for alloc_key, alloc_value in screener_allocations.items():
+            if alloc_key == screen_key or alloc_key.replace('_', ' ').lower() == screen_name.lower():
+                screener_target = alloc_value
+                break
+
+        print(f"\n{screen_name} (Target: {screener_target*100:.2f}%):")
+        print(f"  Processing {len(stocks)} stocks...")
+
+        for stock, rank, performance in targetter.rank_stocks_in_screener(stocks):
+            ticker = stock.get('ticker', 'UNKNOWN')
+            pocket_allocation = targetter.calculate_pocket_allocation(rank, len(stocks))
+            final_allocation = screener_target * pocket_allocation
+            final_allocations[ticker] = {
+                'ticker': ticker,
+                'screener': screen_name,
+                'rank': rank,
+                'performance_180d': performance,
+                'pocket_allocation': pocket_allocation,
+                'screener_target': screener_target,
+                'final_allocation': final_allocation
+            }
+            print(f"  {rank:2d}. {ticker:<12} | {performance:+6.2f}% | Pocket: {pocket_allocation*100:4.1f}% | Final: {final_allocation*100:5.2f}%")
+
+    return final_allocations
+
+
+def run_legacy(universe):
+    universe = copy.deepcopy(universe)
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        allocations = reference_final_allocations(universe)
+        targetter.update_universe_with_allocations(universe, allocations)
+    return allocations, universe, output.getvalue()
+
+
+def run_engine(universe, engine=None):
+    universe = copy.deepcopy(universe)
+    engine = engine or AllocationEngine()
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        screener_allocations = targetter.extract_screener_allocations(universe)
+        allocations = engine.calculate_final_allocations(universe, screener_allocations)
+        updated = engine.apply_allocations(universe, allocations)
+        print(f"\n+ Updated {updated} stocks with allocation data")
+    return allocations, universe, output.getvalue()
+
+
+class TestAllocationEngineParity:
+    """Identical allocations, stock fields and console output"""
+
+    @pytest.mark.parametrize("seed", [1, 2, 3])
+    def test_random_universe_matches_legacy(self, seed):
+        universe = make_universe(seed)
+
+        expected = run_legacy(universe)
+        actual = run_engine(universe)
+
+        assert json.dumps(actual[0]) == json.dumps(expected[0])
+        assert list(actual[0]) == list(expected[0])
+        assert json.dumps(actual[1]) == json.dumps(expected[1])
+        assert actual[2] == expected[2]
+
+    def test_small_max_ranked_matches_legacy(self, monkeypatch):
+        universe = make_universe(5)
+        monkeypatch.setattr(targetter, "MAX_RANKED_STOCKS", 1)
+
+        expected = run_legacy(universe)
+        actual = run_engine(universe, AllocationEngine(max_ranked_stocks=1))
+
+        assert json.dumps(actual[0]) == json.dumps(expected[0])
+        assert actual[2] == expected[2]
+
+    def test_nan_performance_falls_back_to_legacy_ranking(self):
+        universe = make_universe(4)
+        universe["screens"]["Screen_1"]["stocks"][3]["price_180d_change"] = "nan%"
+
+        expected = run_legacy(universe)
+        actual = run_engine(universe)
+
+        assert json.dumps(actual[0]) == json.dumps(expected[0])
+        assert actual[2] == expected[2]
+
+    def test_legacy_entry_point_matches_reference(self, monkeypatch):
+        universe = make_universe(6)
+        monkeypatch.setattr(targetter, "MAX_RANKED_STOCKS", 7)
+
+        expected_output, output = io.StringIO(), io.StringIO()
+        with contextlib.redirect_stdout(expected_output):
+            expected = reference_final_allocations(copy.deepcopy(universe))
+        with contextlib.redirect_stdout(output):
+            allocations = targetter.calculate_final_allocations(copy.deepcopy(universe))
+
+        assert json.dumps(allocations) == json.dumps(expected)
+        assert output.getvalue() == expected_output.getvalue()
+
+    @pytest.mark.skipif(not REAL_UNIVERSE.exists(), reason="data/universe.json not available")
+    def test_real_universe_matches_legacy(self):
+        universe = json.loads(REAL_UNIVERSE.read_text(encoding="utf-8"))
+        if not universe.get("metadata", {}).get("portfolio_optimization", {}).get("optimal_allocations"):
+            pytest.skip("universe.json has no optimizer results")
+
+        expected = run_legacy(universe)
+        actual = run_engine(universe)
+
+        assert json.dumps(actual[0]) == json.dumps(expected[0])
+        assert json.dumps(actual[1]) == json.dumps(expected[1])
+        assert actual[2] == expected[2]
+
+
+class TestAllocationEngineUnits:
+    """Parsing and in-place updates"""
+
+    def test_parse_performance_matches_legacy_parser(self):
+        values = ["12.45%", "-5.23%", " 3 %", "1_0%", "bad", None, 3, "inf%"]
+
+        assert parse_performance(values).tolist() == [targetter.parse_180d_change(v) for v in values]
+
+    def test_unchanged_allocations_are_not_rewritten(self):
+        universe = make_universe(9)
+        allocations, updated_universe, _ = run_engine(universe)
+        written = []
+
+        class Recording(dict):
+            def __setitem__(self, key, value):
+                written.append(key)
+                super().__setitem__(key, value)
+
+        for screen in updated_universe["screens"].values():
+            screen["stocks"] = [Recording(stock) for stock in screen["stocks"]]
+        AllocationEngine.apply_allocations(updated_universe, allocations)
+
+        assert written == []
@@ -0,0 +1,151 @@
+"""
+Tests for the streaming backtest history parser and its per-version cache
+"""
+
+import os
+
+import pytest
+
+from ..core.config import settings
+from ..services.backtest_history import BacktestHistoryCache, QuarterRecord, parse_backtest_lines, parse_number
+from ..services.implementations.historical_data_service import HistoricalDataService
+from ..services.implementations.legacy.history_parser import parse_backtest_csv
+
+EXPORT = """sep=,
+"Date",18 Aug 2025
+"Trade",Long
+"Number of stocks",24
+"Begin",2008
+"End",Last possible
+"Max per sector",No maximum
+"Rebalance timing",QUARTER[ACTUAL:2008:Q2] Q2
+"Rebalance strategy",Full rebalance
+"Sell strategy",Keep full period
+"Position sizes",Equal position. Maximal position.
+"Compare to",GSPC
+
+,,"Return","Period SD","Average beta","Sharpe ratio","US S&P 500 - Total Return"
+Total return,,1051%,,,,560%
+Yearly return,,15.02%,18%,0.84,0.66,11.41%
+
+2008 Q2,Stocks,,,,,"REY.MI","BDT.DE",,"US S&P 500 - Total Return",
+,Quarter return,1.19%,19%,0.88,-8.60%,5.38%,,-5.72%,
+2008 Q3,Stocks,,,,,"ADEA","9946.T",,"US S&P 500 - Total Return",
+,Quarter return,-10.89%,23%,0.97,2.06%,-14.18%,,-9.14%,
+,Quarter return,4.00%,1%,1.0,,,,
+"""
+
+
+def lines(text: str):
+    return text.splitlines(keepends=True)
+
+
+class TestStreamingParser:
+    """Single pass over the export"""
+
+    def test_metadata_and_statistics(self):
+        history = parse_backtest_lines(lines(EXPORT))
+
+        assert history.metadata["Number of stocks"] == "24"
+        assert history.metadata["Compare to"] == "GSPC"
+        assert history.statistics["Return_yearly"] == "15.02%"
+        assert history.statistics["Period SD_yearly"] == "18%"
+        assert history.statistics["Return_total"] == "1051%"
+
+    def test_statistics_need_both_summary_rows(self):
+        text = EXPORT.replace("Yearly return", "Something else")
+
+        assert parse_backtest_lines(lines(text)).statistics == {}
+
+    def test_quarters_are_typed_and_named_from_header_state(self):
+        quarters = parse_backtest_lines(lines(EXPORT)).quarters
+
+        assert [q.quarter for q in quarters] == ["2008 Q2", "2008 Q3", "2008 Q3"]
+        assert quarters[0].return_pct == pytest.approx(1.19)
+        assert quarters[0].period_sd_pct == pytest.approx(19.0)
+        assert quarters[0].beta == pytest.approx(0.88)
+        assert quarters[0].benchmark_return_pct == pytest.approx(-5.72)
+
+    def test_legacy_format_is_preserved(self):
+        legacy = parse_backtest_lines(lines(EXPORT)).to_legacy_dict()["quarterly_performance"]
+
+        assert legacy[1] == {
+            "quarter": "2008 Q3", "return": "-10.89%", "period_sd": "23%", "beta": "0.97", "benchmark_return": "-9.14%"
+        }
+        assert legacy[2] == {
+            "quarter": "2008 Q3", "return": "4.00%", "period_sd": "1%", "beta": "1.0", "benchmark_return": "1%"
+        }
+
+    def test_quarter_header_lookback_is_limited(self):
+        text = EXPORT.replace(
+            ",Quarter return,1.19%",
+            "\n\n\n\n,Quarter return,1.19%"
+        )
+
+        quarters = parse_backtest_lines(lines(text)).quarters
+
+        assert [q.quarter for q in quarters] == ["2008 Q3", "2008 Q3"]
+
+    def test_legacy_entries_read_back_as_typed_records(self):
+        for quarter in parse_backtest_lines(lines(EXPORT)).quarters:
+            record = QuarterRecord.from_legacy_dict(quarter.to_legacy_dict())
+
+            assert record.to_legacy_dict() == quarter.to_legacy_dict()
+            assert (record.return_pct, record.period_sd_pct, record.beta, record.benchmark_return_pct) == (
+                quarter.return_pct, quarter.period_sd_pct, quarter.beta, quarter.benchmark_return_pct
+            )
+
+    def test_parse_number(self):
+        assert parse_number("1,051%") == 1051.0
+        assert parse_number("") is None
+        assert parse_number("n/a") is None
+
+
+class TestBacktestHistoryCache:
+    """Memoised per file version"""
+
+    def test_unchanged_file_is_parsed_once(self, tmp_path):
+        path = tmp_path / "quality_bloom_backtest_results.csv"
+        path.write_text(EXPORT, encoding="utf-8")
+        cache = BacktestHistoryCache()
+
+        assert cache.get(str(path)) is cache.get(str(path))
+        assert cache.get_stats()["misses"] == 1
+
+        path.write_text(EXPORT.replace("1.19%", "2.50%"), encoding="utf-8")
+        stat = os.stat(path)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+        assert cache.get(str(path)).quarters[0].return_pct == pytest.approx(2.5)
+
+    def test_legacy_results_are_independent_copies(self, tmp_path):
+        path = tmp_path / "quality_bloom_backtest_results.csv"
+        path.write_text(EXPORT, encoding="utf-8")
+
+        first = parse_backtest_csv(str(path))
+        first["quarterly_performance"].clear()
+
+        assert len(parse_backtest_csv(str(path))["quarterly_performance"]) == 3
+
+    def test_missing_file(self, tmp_path):
+        missing = str(tmp_path / "missing.csv")
+
+        assert parse_backtest_csv(missing) == {"error": f"File not found: {missing}"}
+
+
+class TestHistoricalDataService:
+    """All screeners parsed concurrently"""
+
+    @pytest.mark.asyncio
+    async def test_get_all_backtest_data(self, tmp_path, monkeypatch):
+        screens = {"quality_bloom": "quality bloom", "TOR_Surplus": "TOR Surplus"}
+        monkeypatch.setattr(settings.uncle_stock, "uncle_stock_screens", screens)
+        monkeypatch.chdir(tmp_path)
+        (tmp_path / "data" / "files_exports").mkdir(parents=True)
+        (tmp_path / "data" / "files_exports" / "quality_bloom_backtest_results.csv").write_text(EXPORT, encoding="utf-8")
+
+        results = await HistoricalDataService().get_all_backtest_data()
+
+        assert list(results) == ["quality_bloom", "TOR_Surplus"]
+        assert len(results["quality_bloom"]["quarterly_performance"]) == 3
+        assert "error" in results["TOR_Surplus"]
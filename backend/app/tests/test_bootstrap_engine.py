@@ -0,0 +1,128 @@
+"""
+Tests for bootstrap robustness analysis of screener weights
+and GET /api/v1/portfolio/robustness
+"""
+
+import json
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+
+from ..core.dependencies import get_portfolio_optimizer_service
+from ..main import app
+from ..services import bootstrap_engine
+from ..services.bootstrap_engine import BootstrapEngine, bootstrap_indices, optimise_samples, sample_moments
+from ..services.implementations.portfolio_optimizer_service import PortfolioOptimizerService
+from .conftest import make_returns
+
+client = TestClient(app)
+
+
+class TestBootstrapSampling:
+    """Index generation and batched moments"""
+
+    def test_indices_are_reproducible_and_in_range(self):
+        first = bootstrap_indices(20, 50, seed=4)
+
+        assert first.shape == (50, 20)
+        assert first.min() >= 0 and first.max() < 20
+        np.testing.assert_array_equal(first, bootstrap_indices(20, 50, seed=4))
+
+    def test_block_bootstrap_draws_consecutive_quarters(self):
+        indices = bootstrap_indices(12, 10, block_size=4, seed=1)
+
+        blocks = indices.reshape(10, 3, 4)
+        assert np.all((np.diff(blocks, axis=2) % 12) == 1)
+
+    def test_batched_moments_match_numpy(self):
+        values = make_returns(4).to_numpy()
+        indices = bootstrap_indices(len(values), 5, seed=2)
+
+        means, covariances = sample_moments(values, indices)
+
+        for row, sample in enumerate(indices):
+            np.testing.assert_allclose(means[row], values[sample].mean(axis=0))
+            np.testing.assert_allclose(covariances[row], np.cov(values[sample], rowvar=False), atol=1e-15)
+
+
+class TestBootstrapEngine:
+    """Resampled weights and their summary"""
+
+    def test_process_pool_matches_serial(self):
+        returns = make_returns()
+        indices = bootstrap_indices(len(returns), 400, seed=3)
+
+        serial = optimise_samples(returns.to_numpy(), indices, 0.005)
+        pooled = BootstrapEngine(returns, max_workers=2).resample(indices)
+
+        np.testing.assert_array_equal(pooled, serial)
+
+    def test_pool_never_forks_the_server(self):
+        engine = BootstrapEngine(make_returns(), max_workers=2)
+
+        with patch.object(bootstrap_engine, "ProcessPoolExecutor") as pool:
+            pool.return_value.__enter__.return_value.map.return_value = [np.zeros((1, 3))]
+            engine.resample(bootstrap_indices(30, 400, seed=3))
+
+        assert pool.call_args.kwargs["mp_context"].get_start_method() in ("forkserver", "spawn")
+
+    def test_summary_is_consistent(self):
+        result = BootstrapEngine(make_returns(), max_workers=1).run(300, confidence=0.8, seed=7)
+
+        assert result['successful_samples'] == 300
+        assert sum(result['resampled_allocation'].values()) == pytest.approx(1.0)
+        for stats in result['weights'].values():
+            assert 0 <= stats['ci_lower'] <= stats['median'] <= stats['ci_upper'] <= 1
+            assert 0 <= stats['zero_weight_share'] <= 1
+        assert result['full_sample_sharpe']['point_estimate'] >= result['full_sample_sharpe']['ci_upper'] - 1e-6
+
+    def test_dominant_screener_has_narrow_interval(self):
+        rng = np.random.default_rng(0)
+        returns = pd.DataFrame({
+            'strong': rng.normal(0.08, 0.02, 40),
+            'weak': rng.normal(-0.02, 0.10, 40),
+        })
+
+        weights = BootstrapEngine(returns, max_workers=1).run(200, seed=1)['weights']
+
+        assert weights['strong']['ci_lower'] > 0.95
+        assert weights['weak']['ci_upper'] < 0.1
+
+
+class TestRobustnessAPI:
+    """GET /api/v1/portfolio/robustness"""
+
+    @pytest.fixture
+    def service(self, tmp_path):
+        returns = make_returns(quarters=16)
+        universe = {"metadata": {"historical_performance": {
+            screener: {"quarterly_data": [
+                {"quarter": f"Q{i}", "return": f"{value * 100:.4f}%"} for i, value in enumerate(returns[screener])
+            ]}
+            for screener in returns.columns
+        }}, "screens": {}, "all_stocks": {}}
+        path = tmp_path / "universe.json"
+        path.write_text(json.dumps(universe), encoding="utf-8")
+
+        service = PortfolioOptimizerService(str(path))
+        app.dependency_overrides[get_portfolio_optimizer_service] = lambda: service
+        yield service
+        app.dependency_overrides.clear()
+
+    def test_seeded_runs_are_reproducible(self, service):
+        params = {"samples": 50, "seed": 11, "block_size": 2}
+
+        first = client.get("/api/v1/portfolio/robustness", params=params)
+        second = client.get("/api/v1/portfolio/robustness", params=params)
+
+        assert first.status_code == 200
+        assert first.json() == second.json()
+        assert set(first.json()["weights"]) == {"screener_0", "screener_1", "screener_2"}
+
+    def test_sample_count_is_bounded(self, service):
+        response = client.get("/api/v1/portfolio/robustness", params={"samples": 10 ** 6})
+
+        assert response.status_code == 422
@@ -115,7 +115,7 @@ class TestCurrencyServiceSimple:
         # Verify console output
         mock_print.assert_called_with("+ Found 3 unique currencies: CHF, EUR, USD")
 
-    def test_update_universe_with_exchange_rates_success(self):
+    def test_update_universe_with_exchange_rates_success(self, tmp_path, monkeypatch):
         """Test successful universe.json update with exchange rates"""
         # Mock existing universe data
         universe_data = {
@@ -139,18 +139,21 @@ class TestCurrencyServiceSimple:
             "CHF": 0.9500
         }
 
-        # Mock file operations
-        mock_json_data = json.dumps(universe_data)
-        with patch('builtins.open', mock_open(read_data=mock_json_data)) as mock_file, \
-             patch('os.path.exists', return_value=True), \
-             patch('json.load', return_value=universe_data), \
-             patch('json.dump') as mock_dump, \
-             patch('builtins.print') as mock_print:
+        # Rates are written through the universe store into a real universe.json
+        monkeypatch.chdir(tmp_path)
+        (tmp_path / "data").mkdir()
+        with open(tmp_path / "data" / "universe.json", "w", encoding="utf-8") as f:
+            json.dump(universe_data, f, indent=2, ensure_ascii=False)
 
+        with patch('builtins.print') as mock_print:
             result = self.service.update_universe_with_exchange_rates(exchange_rates)
 
         # Verify successful result
         assert result is True
+        with open(tmp_path / "data" / "universe.json", encoding="utf-8") as f:
+            saved = json.load(f)
+        assert [s["eur_exchange_rate"] for s in saved["screens"]["screen1"]["stocks"]] == [1.05, 0.95]
+        assert saved["all_stocks"]["SAP"]["eur_exchange_rate"] == 1.0
 
         # Verify console output includes progress messages
         print_calls = [str(call) for call in mock_print.call_args_list]
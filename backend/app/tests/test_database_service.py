@@ -0,0 +1,199 @@
+"""
+Tests for the SQLite IBKR search cache
+Covers the shared connection, bulk lookups and bulk inserts
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from ..services.database_service import IBKRDatabaseService
+from ..services.memory_cache import TTLLRUCache, MISSING
+
+
+def found_row(isin: str, ticker: str, con_id: int = 1234):
+    return {
+        'isin': isin,
+        'ticker': ticker,
+        'name': f"{ticker} Corp",
+        'currency': "USD",
+        'found': True,
+        'ibkr_details': {
+            'found': True,
+            'symbol': ticker,
+            'contract_id': con_id,
+            'search_method': 'isin'
+        }
+    }
+
+
+@pytest.fixture
+def db_service(tmp_path):
+    service = IBKRDatabaseService(str(tmp_path / "ibkr_cache.db"))
+    yield service
+    service.close()
+
+
+class TestIBKRDatabaseService:
+    """Cache storage and lookup"""
+
+    def test_connection_uses_wal_mode(self, db_service):
+        mode = db_service._connection().execute("PRAGMA journal_mode").fetchone()[0]
+
+        assert mode == "wal"
+
+    def test_bulk_store_and_bulk_lookup(self, db_service):
+        rows = [found_row(f"US{i:010d}", f"T{i}", con_id=i + 1) for i in range(1500)]
+
+        assert db_service.store_results_bulk(rows) == 1500
+
+        keys = [(r['isin'], r['ticker']) for r in rows] + [("US_MISSING", "NOPE")]
+        entries = db_service.get_cached_results(keys)
+
+        assert len(entries) == 1500
+        assert entries[("US0000000042", "T42")].ibkr_contract_id == 43
+        assert ("US_MISSING", "NOPE") not in entries
+
+    def test_bulk_lookup_skips_expired_entries(self, db_service):
+        db_service.store_results_bulk([found_row("US0000000001", "OLD")])
+        with db_service._connection() as conn:
+            conn.execute("UPDATE ibkr_search_cache SET search_date = ?",
+                         ((datetime.now() - timedelta(days=400)).isoformat(),))
+        db_service.invalidate("US0000000001", "OLD")
+
+        assert db_service.get_cached_results([("US0000000001", "OLD")]) == {}
+        assert db_service.get_cached_result("US0000000001", "OLD") is None
+
+    def test_store_result_matches_single_lookup(self, db_service):
+        assert db_service.store_result("US0378331005", "AAPL", "Apple Inc", "USD", True,
+                                       {'symbol': 'AAPL', 'contract_id': 265598, 'search_method': 'ticker'})
+
+        entry = db_service.get_cached_result("US0378331005", "AAPL")
+
+        assert entry.ibkr_symbol == "AAPL"
+        assert entry.search_method == "ticker"
+
+    def test_get_cached_stocks_splits_hits_and_misses(self, db_service):
+        not_found = {'found': False, 'ibkr_details': {'found': False, 'search_attempted': True}}
+        db_service.store_results_bulk([
+            found_row("US0000000001", "HIT"),
+            {**found_row("US0000000002", "MISSED"), **not_found},
+            {**found_row("US0000000004", "STALE"), **not_found}
+        ])
+        with db_service._connection() as conn:
+            conn.execute("UPDATE ibkr_search_cache SET search_date = ? WHERE ticker = 'STALE'",
+                         ((datetime.now() - timedelta(days=2)).isoformat(),))
+        db_service.invalidate("US0000000004", "STALE")
+        stocks = [
+            {'isin': "US0000000001", 'ticker': "HIT", 'name': "Hit"},
+            {'isin': "US0000000002", 'ticker': "MISSED", 'name': "Recently not found"},
+            {'isin': "US0000000004", 'ticker': "STALE", 'name': "Not found two days ago"},
+            {'isin': "US0000000003", 'ticker': "NEW", 'name': "Never searched"},
+            {'isin': "", 'ticker': "NOISIN", 'name': "No ISIN"}
+        ]
+
+        cached, uncached = db_service.get_cached_stocks(stocks)
+
+        # Recent not-found results are served from cache instead of re-querying IBKR
+        assert [s['ticker'] for s in cached] == ["HIT", "MISSED"]
+        assert cached[0]['ibkr_details']['conId'] == 1234
+        assert cached[1]['ibkr_details']['found'] is False
+        assert [s['ticker'] for s in uncached] == ["STALE", "NEW", "NOISIN"]
+
+    def test_failed_bulk_store_rolls_back(self, db_service):
+        bad = found_row("US0000000009", "BAD")
+        bad['name'] = None  # violates NOT NULL
+
+        assert db_service.store_results_bulk([found_row("US0000000008", "OK"), bad]) == 0
+        assert db_service.get_cache_stats()['total_entries'] == 0
+
+    def test_close_reopens_on_next_use(self, db_service):
+        db_service.store_results_bulk([found_row("US0000000001", "A")])
+        db_service.close()
+
+        assert db_service.get_cached_result("US0000000001", "A") is not None
+
+
+class TestIBKRDatabaseMemoryLayer:
+    """Hot in-memory layer in front of SQLite"""
+
+    def test_repeat_lookups_do_not_touch_disk(self, db_service):
+        db_service.store_results_bulk([found_row("US0000000001", "A")])
+        db_service.get_cached_results([("US0000000001", "A"), ("US0000000002", "ABSENT")])
+        db_service.close()
+        db_service._connection = None  # any disk access now fails
+
+        hits = db_service.get_cached_results([("US0000000001", "A"), ("US0000000002", "ABSENT")])
+
+        assert list(hits) == [("US0000000001", "A")]
+        # Only the first lookup of the absent key went to SQLite
+        assert db_service._memory.get_stats()['misses'] == 1
+
+    def test_store_refreshes_memory_entry(self, db_service):
+        assert db_service.get_cached_result("US0000000001", "A") is None
+
+        db_service.store_result("US0000000001", "A", "A Corp", "USD", True,
+                                {'symbol': 'A', 'contract_id': 7, 'search_method': 'ticker'})
+
+        assert db_service.get_cached_result("US0000000001", "A").ibkr_contract_id == 7
+
+    def test_negative_entries_use_shorter_ttl(self, tmp_path):
+        service = IBKRDatabaseService(str(tmp_path / "ttl.db"),
+                                      positive_ttl=timedelta(hours=6), negative_ttl=timedelta(seconds=0))
+        service.store_results_bulk([found_row("US0000000001", "A")])
+        service.get_cached_result("US0000000002", "ABSENT")
+
+        assert service._memory.get(("US0000000001", "A")) is not None
+        assert service._memory.get(("US0000000002", "ABSENT")) is MISSING
+        service.close()
+
+    def test_invalidate_forces_disk_read(self, db_service):
+        db_service.store_results_bulk([found_row("US0000000001", "A")])
+        with db_service._connection() as conn:
+            conn.execute("DELETE FROM ibkr_search_cache")
+
+        assert db_service.get_cached_result("US0000000001", "A") is not None
+        assert db_service.invalidate("US0000000001", "A") is True
+        assert db_service.get_cached_result("US0000000001", "A") is None
+
+    def test_cache_stats_include_memory_counters(self, db_service):
+        db_service.get_cached_result("US0000000001", "A")
+        db_service.get_cached_result("US0000000001", "A")
+
+        memory = db_service.get_cache_stats()['memory_cache']
+
+        assert (memory['hits'], memory['misses'], memory['entries']) == (1, 1, 1)
+        assert 'evictions' in memory
+
+
+class TestTTLLRUCache:
+    """Bounded LRU with per-entry TTL"""
+
+    def test_evicts_least_recently_used(self):
+        cache = TTLLRUCache(max_entries=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        assert cache.get("b") is MISSING
+        assert (cache.get("a"), cache.get("c")) == (1, 3)
+        assert cache.evictions == 1
+
+    def test_entries_expire_after_ttl(self):
+        now = [0.0]
+        cache = TTLLRUCache(clock=lambda: now[0])
+        cache.set("short", "x", ttl=5)
+        cache.set("long", "y", ttl=50)
+        now[0] = 10.0
+
+        assert cache.get("short") is MISSING
+        assert cache.get("long") == "y"
+        assert cache.expirations == 1
+
+    def test_cached_none_is_a_hit(self):
+        cache = TTLLRUCache()
+        cache.set("absent", None)
+
+        assert cache.get("absent") is None
+        assert cache.hits == 1
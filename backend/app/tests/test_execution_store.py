@@ -0,0 +1,143 @@
+"""
+Tests for the persistent pipeline execution store and the execution manager on top of it
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from ..models.schemas import PipelineStepResult, PipelineStepStatus
+from ..services.execution_store import PipelineExecutionStore
+from ..services.implementations.pipeline_orchestrator_service import PipelineExecutionManager
+
+
+def execution(execution_id, status="completed", start_time=None, **extra):
+    record = {
+        "execution_id": execution_id,
+        "status": status,
+        "start_time": start_time or datetime.utcnow(),
+        "completed_steps": [1],
+        "failed_step": None,
+        "created_files": {1: ["data/universe.json"]},
+        "step_results": {},
+        "metadata": {"execution_type": "full_pipeline"}
+    }
+    record.update(extra)
+    return record
+
+
+def log(execution_id, message, step_number=None, level="INFO"):
+    return {
+        "timestamp": datetime.utcnow(),
+        "execution_id": execution_id,
+        "step_number": step_number,
+        "level": level,
+        "message": message,
+        "details": None
+    }
+
+
+@pytest.fixture
+def store(tmp_path):
+    return PipelineExecutionStore(str(tmp_path / "executions.db"))
+
+
+class TestPipelineExecutionStore:
+    """Indexed, paginated history and logs"""
+
+    def test_history_is_paged_most_recent_first(self, store):
+        start = datetime(2025, 1, 1)
+        for day in range(5):
+            status = "failed" if day % 2 else "completed"
+            store.save_execution(execution(f"run-{day}", status, start + timedelta(days=day)))
+
+        page, total = store.list_executions(limit=2, offset=1)
+        failed, failed_total = store.list_executions(status="failed")
+
+        assert [row["execution_id"] for row in page] == ["run-3", "run-2"]
+        assert total == 5
+        assert page[1]["success"] is True
+        assert page[1]["total_files_created"] == 1
+        assert [row["execution_id"] for row in failed] == ["run-3", "run-1"]
+        assert failed_total == 2
+
+    def test_logs_are_filtered_and_paged(self, store):
+        store.append_logs([log("run", f"entry {i}", step_number=1 + i % 2) for i in range(6)])
+        store.append_logs([log("run", "boom", step_number=2, level="ERROR"), log("other", "x")])
+
+        page, total = store.get_logs("run", step_number=2, limit=2, offset=1)
+        errors, _ = store.get_logs("run", level="error")
+
+        assert [entry["message"] for entry in page] == ["entry 3", "entry 5"]
+        assert total == 4
+        assert isinstance(page[0]["timestamp"], datetime)
+        assert [entry["message"] for entry in errors] == ["boom"]
+
+    def test_retention_keeps_recent_and_running_executions(self, store):
+        now = datetime.utcnow()
+        store.save_execution(execution("old", start_time=now - timedelta(days=200)))
+        for i in range(3):
+            store.save_execution(execution(f"run-{i}", start_time=now - timedelta(minutes=i)))
+        store.save_execution(execution("live", "running", now - timedelta(days=300)))
+        store.append_logs([log("old", "gone"), log("run-2", "gone"), log("run-0", "kept")])
+
+        assert store.prune(max_executions=2, max_age_days=90) == 2
+
+        ids = {row["execution_id"] for row in store.list_executions()[0]}
+        assert ids == {"run-0", "run-1", "live"}
+        assert store.get_logs("old")[1] == 0
+        assert store.get_logs("run-2")[1] == 0
+        assert store.get_logs("run-0")[1] == 1
+
+    def test_reopening_cancels_interrupted_executions(self, tmp_path, store):
+        store.save_execution(execution("live", "running"))
+        store.close()
+
+        reopened = PipelineExecutionStore(str(tmp_path / "executions.db"))
+
+        assert reopened.get_execution("live")["status"] == "cancelled"
+
+
+class TestPipelineExecutionManager:
+    """Live runs in memory, finished runs in the store"""
+
+    def test_finished_execution_is_released_and_restored(self, store):
+        manager = PipelineExecutionManager(store)
+        manager.create_execution("run", "individual_step", {"execution_type": "individual_step"})
+        manager.add_step_result("run", PipelineStepResult(
+            step_number=2, step_name="Parse Data", status=PipelineStepStatus.COMPLETED,
+            success=True, execution_time=1.0, start_time=datetime.utcnow(), created_files=["data/universe.json"]
+        ))
+        manager.update_execution_status("run", "completed")
+
+        assert manager._executions == {} and manager._logs == {}
+        restored = PipelineExecutionManager(store).get_execution_status("run")
+        assert restored["status"] == "completed"
+        assert isinstance(restored["end_time"], datetime)
+        assert restored["step_results"][2].step_name == "Parse Data"
+        assert restored["created_files"] == {2: ["data/universe.json"]}
+
+    def test_live_logs_beyond_the_ring_buffer_come_from_the_store(self, store):
+        manager = PipelineExecutionManager(store, live_log_capacity=3)
+        manager.create_execution("run", "full_pipeline", {"execution_type": "full_pipeline"})
+        for i in range(3):
+            manager.add_log_entry("run", "INFO", f"entry {i}", step_number=1)
+
+        assert manager.get_execution_logs("run", limit=2) == (manager.get_execution_logs("run")[0][:2], 3)
+
+        for i in range(3, 5):
+            manager.add_log_entry("run", "INFO", f"entry {i}", step_number=1)
+        entries, total = manager.get_execution_logs("run")
+
+        assert len(manager._logs["run"]) == 3
+        assert total == 5
+        assert [entry["message"] for entry in entries] == [f"entry {i}" for i in range(5)]
+
+    def test_metadata_of_finished_execution_can_be_updated(self, store):
+        manager = PipelineExecutionManager(store)
+        manager.create_execution("run", "step_range", {"execution_type": "step_range"})
+        manager.update_execution_status("run", "failed")
+
+        manager.update_metadata("run", is_resumed=True)
+
+        assert store.list_executions()[0][0]["is_resumed"] is True
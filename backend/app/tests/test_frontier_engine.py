@@ -0,0 +1,151 @@
+"""
+Tests for the batch allocation engine (efficient frontier, minimum variance, risk parity)
+and GET /api/v1/portfolio/allocation-methods
+"""
+
+import json
+
+import numpy as np
+import pytest
+from unittest.mock import patch
+from fastapi.testclient import TestClient
+from scipy.optimize import minimize
+
+from ..core.dependencies import get_portfolio_optimizer_service
+from ..main import app
+from ..services.frontier_engine import FrontierEngine, quarterly_returns_frame
+from ..services.implementations.legacy import portfolio_optimizer as legacy
+from ..services.implementations.portfolio_optimizer_service import PortfolioOptimizerService
+from .conftest import make_returns
+
+client = TestClient(app)
+
+
+def reference_min_variance(engine: FrontierEngine, target_return=None) -> float:
+    n_assets = len(engine.columns)
+    constraints = [{'type': 'eq', 'fun': lambda x: x.sum() - 1}]
+    if target_return is not None:
+        constraints.append({'type': 'eq', 'fun': lambda x: x @ engine.mean - target_return})
+    result = minimize(
+        lambda w: w @ engine.covariance @ w, np.full(n_assets, 1 / n_assets), method='SLSQP',
+        bounds=[(0, 1)] * n_assets, constraints=constraints, options={'ftol': 1e-15, 'maxiter': 1000}
+    )
+    return result.fun
+
+
+class TestFrontierEngineSolves:
+    """Each method against its defining property"""
+
+    @pytest.mark.parametrize("n_screeners,quarters", [(3, 60), (12, 40), (60, 20)])
+    def test_min_variance_matches_reference_solver(self, n_screeners, quarters):
+        engine = FrontierEngine(make_returns(n_screeners, quarters))
+
+        weights = engine.min_variance()
+
+        assert weights.min() >= 0
+        assert weights.sum() == pytest.approx(1.0)
+        assert weights @ engine.covariance @ weights <= reference_min_variance(engine) * (1 + 1e-8)
+
+    def test_risk_parity_equalises_risk_contributions(self):
+        engine = FrontierEngine(make_returns(15))
+
+        contributions = engine.risk_contributions(engine.risk_parity())
+
+        np.testing.assert_allclose(contributions, np.full(15, 1 / 15), rtol=1e-8)
+
+    def test_efficient_frontier_hits_targets_with_minimum_variance(self):
+        engine = FrontierEngine(make_returns(8))
+
+        frontier = engine.efficient_frontier(10)
+        stats = engine.batch_stats(frontier)
+
+        assert frontier.shape == (10, 8)
+        assert np.all(np.diff(stats['expected_annual_return']) > 0)
+        assert np.all(np.diff(stats['annual_volatility']) >= -1e-12)
+        target = float(frontier[4] @ engine.mean)
+        assert frontier[4] @ engine.covariance @ frontier[4] <= reference_min_variance(engine, target) * (1 + 1e-7)
+
+    def test_run_solves_min_variance_once(self):
+        engine = FrontierEngine(make_returns(6))
+        solve = engine.min_variance
+
+        with patch.object(engine, "min_variance", wraps=solve) as min_variance:
+            results = engine.run(frontier_points=5)
+
+        assert min_variance.call_count == 1
+        assert results['efficient_frontier'][0]['weights'] == results['methods']['min_variance']['weights']
+
+    def test_max_sharpe_matches_step_4(self):
+        returns = make_returns(6)
+
+        engine_weights = FrontierEngine(returns).run(5)['methods']['max_sharpe']['weights']
+        step4_weights = PortfolioOptimizerService().optimize_portfolio(returns)['optimal_weights']
+
+        for screener, weight in step4_weights.items():
+            assert engine_weights[screener] == pytest.approx(weight, abs=1e-9)
+
+    def test_zero_variance_screener_gets_no_risk_budget(self):
+        returns = make_returns(4)
+        returns['cash'] = 0.005
+
+        engine = FrontierEngine(returns)
+
+        assert engine.risk_parity()[-1] == 0.0
+        assert engine.inverse_volatility()[-1] == 0.0
+        assert engine.risk_parity().sum() == pytest.approx(1.0)
+
+
+class TestQuarterlyReturnsFrame:
+    """Returns parsing shared by step 4 and the universe snapshot"""
+
+    def test_matches_legacy_extraction(self):
+        universe = {"metadata": {"historical_performance": {
+            "a": {"quarterly_data": [{"quarter": "2023Q1", "return": "5.00%"}, {"quarter": "2023Q2", "return": "-1.5%"}]},
+            "b": {"quarterly_data": [{"quarter": "2023Q1", "return": "2%"}, {"quarter": "2023Q2", "return": "3%"}]},
+            "no_data": {"summary": {}},
+        }}}
+
+        assert quarterly_returns_frame(universe).equals(legacy.extract_quarterly_returns(universe))
+
+
+class TestAllocationMethodsAPI:
+    """GET /api/v1/portfolio/allocation-methods"""
+
+    @pytest.fixture
+    def service(self, tmp_path):
+        returns = make_returns(3, quarters=12)
+        universe = {"metadata": {"historical_performance": {
+            screener: {"quarterly_data": [
+                {"quarter": f"Q{i}", "return": f"{value * 100:.4f}%"} for i, value in enumerate(returns[screener])
+            ]}
+            for screener in returns.columns
+        }}, "screens": {}, "all_stocks": {}}
+        path = tmp_path / "universe.json"
+        path.write_text(json.dumps(universe), encoding="utf-8")
+
+        service = PortfolioOptimizerService(str(path))
+        app.dependency_overrides[get_portfolio_optimizer_service] = lambda: service
+        yield service
+        app.dependency_overrides.clear()
+
+    def test_returns_every_method_and_frontier(self, service):
+        response = client.get("/api/v1/portfolio/allocation-methods", params={"frontier_points": 7})
+
+        assert response.status_code == 200
+        data = response.json()
+        assert set(data["methods"]) == {"max_sharpe", "min_variance", "risk_parity", "inverse_volatility", "equal_weight"}
+        assert len(data["efficient_frontier"]) == 7
+        for method in data["methods"].values():
+            assert sum(method["weights"].values()) == pytest.approx(1.0)
+
+    def test_missing_universe_returns_404(self, service, tmp_path):
+        service.universe_path = str(tmp_path / "missing.json")
+
+        response = client.get("/api/v1/portfolio/allocation-methods")
+
+        assert response.status_code == 404
+
+    def test_frontier_points_are_bounded(self, service):
+        response = client.get("/api/v1/portfolio/allocation-methods", params={"frontier_points": 1})
+
+        assert response.status_code == 422
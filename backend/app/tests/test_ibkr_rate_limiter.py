@@ -0,0 +1,82 @@
+"""
+Tests for IBKR message pacing
+Uses a fake clock so the token bucket can be checked without real sleeps
+"""
+
+import pytest
+
+from ..services.ibkr_rate_limiter import TokenBucket, IBKRPacer, MAX_MESSAGES_PER_SECOND
+
+
+class FakeClock:
+    """Monotonic clock that only advances when sleep() is called"""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class TestTokenBucket:
+    """Token bucket rate limiting"""
+
+    def test_burst_up_to_capacity_without_waiting(self):
+        clock = FakeClock()
+        bucket = TokenBucket(rate=5, clock=clock, sleep=clock.sleep)
+
+        waits = [bucket.acquire() for _ in range(5)]
+
+        assert waits == [0.0] * 5
+        assert clock.sleeps == []
+
+    def test_waits_once_bucket_is_empty(self):
+        clock = FakeClock()
+        bucket = TokenBucket(rate=5, clock=clock, sleep=clock.sleep)
+        for _ in range(5):
+            bucket.acquire()
+
+        wait = bucket.acquire()
+
+        assert wait == pytest.approx(0.2)
+        assert bucket.get_stats()["throttled"] == 1
+
+    def test_long_run_rate_never_exceeds_limit(self):
+        clock = FakeClock()
+        bucket = TokenBucket(rate=10, clock=clock, sleep=clock.sleep)
+
+        for _ in range(110):
+            bucket.acquire()
+
+        # 10 burst tokens + 100 paced tokens at 10/s
+        assert clock.now == pytest.approx(10.0)
+
+    def test_refill_is_capped_at_capacity(self):
+        clock = FakeClock()
+        bucket = TokenBucket(rate=2, capacity=2, clock=clock, sleep=clock.sleep)
+        clock.now = 100.0
+
+        waits = [bucket.acquire() for _ in range(3)]
+
+        assert waits[:2] == [0.0, 0.0]
+        assert waits[2] == pytest.approx(0.5)
+
+    def test_rejects_non_positive_rate(self):
+        with pytest.raises(ValueError):
+            TokenBucket(rate=0)
+
+
+class TestIBKRPacer:
+    """Per-connection pacing buckets"""
+
+    def test_default_limits_stay_under_gateway_limits(self):
+        pacer = IBKRPacer()
+
+        assert pacer.messages.rate == MAX_MESSAGES_PER_SECOND < 50
+        assert pacer.matching_symbols.rate == 1.0
+        assert pacer.matching_symbols.capacity == 1.0
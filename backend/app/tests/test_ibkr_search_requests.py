@@ -0,0 +1,236 @@
+"""
+Tests for request/response handling in the IBKR search wrapper
+Each request resolves its own Future from IBKR callbacks routed through the shared session
+"""
+
+import threading
+from types import SimpleNamespace
+from unittest.mock import Mock, patch
+
+import pytest
+
+from ..core.exceptions import IBKRConnectionError
+from ..services.database_service import IBKRDatabaseService
+from ..services.ibkr_session_manager import IBKRSession, DATA_CLIENT_ID
+from ..services.implementations import ibkr_search_service as search_module
+from ..services.implementations.ibkr_search_service import IBApi, IBKRSearchService
+
+
+def make_contract_details(symbol: str, con_id: int):
+    contract = SimpleNamespace(symbol=symbol, currency="USD", exchange="SMART",
+                               primaryExchange="NASDAQ", conId=con_id, secType="STK")
+    return SimpleNamespace(contract=contract, longName=f"{symbol} Inc")
+
+
+def make_search_app():
+    """IBApi bound to a session whose handshake already completed"""
+    session = IBKRSession(client_id=DATA_CLIENT_ID)
+    session.isConnected = Mock(return_value=True)
+    session.nextValidId(1)
+    session.managedAccounts("DU123456")
+    session.reqContractDetails = Mock()
+    session.reqMatchingSymbols = Mock()
+    return session, session.bind(IBApi(), subscribe=False)
+
+
+class TestIBApiRequestFutures:
+    """Per-reqId futures replace shared completion flags"""
+
+    def test_contract_details_resolve_on_end(self):
+        session, app = make_search_app()
+
+        def respond(req_id, contract):
+            session.contractDetails(req_id, make_contract_details("AAPL", 265598))
+            session.contractDetailsEnd(req_id)
+
+        session.reqContractDetails.side_effect = respond
+
+        results = IBKRSearchService()._request_contract_details(app, Mock())
+
+        assert [r["conId"] for r in results] == [265598]
+        assert app.handler.contract_details == []  # No shared slot written
+        assert session.get_status()["pending_requests"] == 0
+
+    def test_error_resolves_request_with_no_results(self):
+        session, app = make_search_app()
+        session.reqContractDetails.side_effect = (
+            lambda req_id, contract: session.error(req_id, 200, "No security definition has been found")
+        )
+
+        assert IBKRSearchService()._request_contract_details(app, Mock()) == []
+
+    def test_warnings_do_not_end_the_request(self):
+        session, app = make_search_app()
+
+        def respond(req_id, contract):
+            session.error(req_id, 2158, "Sec-def data farm connection is OK")
+            session.error(req_id, 10167, "Displaying delayed market data")
+            session.contractDetails(req_id, make_contract_details("AAPL", 265598))
+            session.contractDetailsEnd(req_id)
+
+        session.reqContractDetails.side_effect = respond
+
+        results = IBKRSearchService()._request_contract_details(app, Mock())
+
+        assert [r["conId"] for r in results] == [265598]
+
+    def test_matching_symbols_resolve_without_end_callback(self):
+        session, app = make_search_app()
+
+        def respond(req_id, pattern):
+            stock = SimpleNamespace(contract=SimpleNamespace(symbol="SAP", secType="STK",
+                                                             currency="EUR", exchange="IBIS"))
+            option = SimpleNamespace(contract=SimpleNamespace(symbol="SAP", secType="OPT",
+                                                              currency="EUR", exchange="DTB"))
+            session.symbolSamples(req_id, [stock, option])
+
+        session.reqMatchingSymbols.side_effect = respond
+
+        results = IBKRSearchService()._request_matching_symbols(app, "SAP")
+
+        assert [(r["symbol"], r["secType"]) for r in results] == [("SAP", "STK")]
+
+    def test_concurrent_requests_keep_results_separate(self):
+        session, app = make_search_app()
+        pending = {}
+        sent = threading.Semaphore(0)
+
+        def record(req_id, contract):
+            pending[contract] = req_id
+            sent.release()
+
+        session.reqContractDetails.side_effect = record
+        results = {}
+
+        def search(symbol):
+            results[symbol] = IBKRSearchService()._request_contract_details(app, symbol)
+
+        threads = [threading.Thread(target=search, args=(s,)) for s in ("AAPL", "MSFT")]
+        for thread in threads:
+            thread.start()
+        assert sent.acquire(timeout=5) and sent.acquire(timeout=5)
+        # Answer out of order on the reader side
+        session.contractDetails(pending["MSFT"], make_contract_details("MSFT", 272093))
+        session.contractDetails(pending["AAPL"], make_contract_details("AAPL", 265598))
+        session.contractDetailsEnd(pending["MSFT"])
+        session.contractDetailsEnd(pending["AAPL"])
+        for thread in threads:
+            thread.join(timeout=5)
+
+        assert [r["symbol"] for r in results["AAPL"]] == ["AAPL"]
+        assert [r["symbol"] for r in results["MSFT"]] == ["MSFT"]
+
+    def test_timeout_returns_empty_and_releases_request(self):
+        session, app = make_search_app()
+        service = IBKRSearchService()
+
+        results = service._await_request(app, lambda req_id: None, timeout=0.05)
+
+        assert results == []
+        assert app.handler._pending == {}
+        assert session.get_status()["pending_requests"] == 0
+
+
+class TestConcurrentStockSearch:
+    """Several stocks in flight over one session"""
+
+    def test_results_keep_input_order_and_overlap(self):
+        service = IBKRSearchService()
+        stocks = [{"ticker": f"T{i}", "name": f"Stock {i}", "currency": "USD"} for i in range(6)]
+        in_flight, peak = [0], [0]
+        lock = threading.Lock()
+        all_started = threading.Barrier(3, timeout=5)
+
+        def search(app, stock):
+            with lock:
+                in_flight[0] += 1
+                peak[0] = max(peak[0], in_flight[0])
+            if stock["ticker"] in ("T0", "T1", "T2"):
+                all_started.wait()
+            with lock:
+                in_flight[0] -= 1
+            if stock["ticker"] == "T3":
+                return None, 0.0, "not_found"
+            return {"symbol": stock["ticker"], "exchange": "SMART"}, 1.0, "ticker"
+
+        service.search_uncached_stock = search
+
+        outcomes = service.search_stocks_concurrently(Mock(), stocks, max_workers=3)
+
+        assert peak[0] >= 3
+        assert [o[0]["symbol"] if o[0] else None for o in outcomes] == ["T0", "T1", "T2", None, "T4", "T5"]
+
+    def test_failed_stock_is_reported_not_found(self):
+        service = IBKRSearchService()
+        service.search_uncached_stock = Mock(side_effect=RuntimeError("socket dropped"))
+
+        outcomes = service.search_stocks_concurrently(Mock(), [{"ticker": "X", "name": "X", "currency": "USD"}])
+
+        assert outcomes == [(None, 0.0, "not_found")]
+
+
+class TestSingleStockSearch:
+    """Cache-first lookup used by the search-stock endpoint"""
+
+    STOCK = {"ticker": "AAPL", "isin": "US0378331005", "name": "Apple Inc", "currency": "USD"}
+
+    @pytest.fixture
+    def service(self, tmp_path):
+        db_service = IBKRDatabaseService(str(tmp_path / "ibkr_cache.db"))
+        service = IBKRSearchService()
+        service._get_db_service = lambda: db_service
+        service.search_uncached_stock = Mock(return_value=(
+            {"symbol": "AAPL", "longName": "APPLE INC", "exchange": "SMART", "conId": 265598}, 0.95, "isin"
+        ))
+        yield service
+        db_service.close()
+
+    def patch_gateway(self, connected=True):
+        session = Mock()
+        session.ensure_connected.return_value = connected
+        manager = Mock()
+        manager.get_session.return_value = session
+        return patch.object(search_module, "get_ibkr_session_manager", return_value=manager)
+
+    def test_repeat_lookup_is_served_from_cache(self, service):
+        with self.patch_gateway() as mock_manager:
+            first = service.search_stock(self.STOCK)
+            second = service.search_stock(self.STOCK)
+
+        assert (first["cached"], second["cached"]) == (False, True)
+        assert second["conId"] == 265598
+        assert mock_manager.call_count == 1
+        service.search_uncached_stock.assert_called_once()
+
+    def test_stock_without_isin_is_cached_by_ticker(self, service):
+        stock = {**self.STOCK, "isin": None}
+
+        with self.patch_gateway():
+            service.search_stock(stock)
+            second = service.search_stock(stock)
+
+        assert second["cached"] is True
+        service.search_uncached_stock.assert_called_once()
+
+    def test_force_refresh_searches_again(self, service):
+        with self.patch_gateway():
+            service.search_stock(self.STOCK)
+            refreshed = service.search_stock(self.STOCK, force_refresh=True)
+
+        assert refreshed["cached"] is False
+        assert service.search_uncached_stock.call_count == 2
+
+    def test_not_found_result_is_cached(self, service):
+        service.search_uncached_stock.return_value = (None, 0.0, "not_found")
+
+        with self.patch_gateway():
+            service.search_stock(self.STOCK)
+            again = service.search_stock(self.STOCK)
+
+        assert again == {"found": False, "search_attempted": True, "cached": True}
+        service.search_uncached_stock.assert_called_once()
+
+    def test_cache_miss_without_gateway_raises(self, service):
+        with self.patch_gateway(connected=False):
+            with pytest.raises(IBKRConnectionError):
+                service.search_stock(self.STOCK)
@@ -0,0 +1,255 @@
+"""
+Tests for the shared IBKR session manager
+Covers request/order ID allocation, callback routing and connection reuse without a live gateway
+"""
+
+import pytest
+from unittest.mock import Mock, patch
+
+from ..services.ibkr_session_manager import (
+    IBKRSession,
+    IBKRSessionManager,
+    REQUEST_ID_BASE,
+    DATA_CLIENT_ID,
+    ORDER_CLIENT_ID
+)
+
+
+class RecordingHandler:
+    """Minimal EWrapper-style sink that records every callback it receives"""
+
+    def __init__(self):
+        self.calls = []
+        self.connected = False
+        self.account_id = None
+
+    def connectAck(self):
+        self.connected = True
+
+    def managedAccounts(self, accountsList):
+        self.account_id = accountsList.split(",")[0]
+
+    def contractDetailsEnd(self, reqId):
+        self.calls.append(("contractDetailsEnd", reqId))
+
+    def error(self, reqId, errorCode, errorString, *args):
+        self.calls.append(("error", reqId, errorCode))
+
+    def orderStatus(self, orderId, status, *args):
+        self.calls.append(("orderStatus", orderId, status))
+
+    def position(self, account, contract, position, avgCost):
+        self.calls.append(("position", contract, position))
+
+
+def make_ready_session(client_id: int = DATA_CLIENT_ID) -> IBKRSession:
+    """Session that behaves as if the gateway handshake already completed"""
+    session = IBKRSession(client_id=client_id)
+    session.isConnected = Mock(return_value=True)
+    session.nextValidId(100)
+    session.managedAccounts("DU123456,DU654321")
+    return session
+
+
+class TestIBKRSessionRouting:
+    """Callback routing between callers sharing one connection"""
+
+    def test_request_ids_are_unique_and_above_order_ids(self):
+        session = IBKRSession()
+        ids = [session.next_request_id() for _ in range(5)]
+
+        assert ids == list(range(REQUEST_ID_BASE, REQUEST_ID_BASE + 5))
+
+    def test_request_callbacks_reach_only_their_owner(self):
+        session = make_ready_session()
+        first, second = RecordingHandler(), RecordingHandler()
+        first_id = session.register_request(first)
+        second_id = session.register_request(second)
+
+        session.contractDetailsEnd(second_id)
+        session.error(first_id, 200, "No security definition")
+
+        assert first.calls == [("error", first_id, 200)]
+        assert second.calls == [("contractDetailsEnd", second_id)]
+
+    def test_released_request_falls_back_to_subscribers(self):
+        session = make_ready_session()
+        owner, listener = RecordingHandler(), RecordingHandler()
+        session.subscribe(listener)
+        req_id = session.register_request(owner)
+        session.release_request(req_id)
+
+        session.contractDetailsEnd(req_id)
+
+        assert owner.calls == []
+        assert listener.calls == [("contractDetailsEnd", req_id)]
+
+    def test_order_ids_allocated_from_next_valid_id(self):
+        session = make_ready_session(ORDER_CLIENT_ID)
+        handler = RecordingHandler()
+
+        first = session.register_order(handler)
+        second = session.register_order(handler)
+        session.orderStatus(second, "Submitted", 0, 10, 0.0, 1, 0, 0.0, ORDER_CLIENT_ID, "", 0.0)
+
+        assert (first, second) == (100, 101)
+        assert session.next_order_id == 102
+        assert handler.calls == [("orderStatus", 101, "Submitted")]
+
+    def test_order_errors_route_to_order_owner(self):
+        session = make_ready_session(ORDER_CLIENT_ID)
+        handler = RecordingHandler()
+        order_id = session.register_order(handler)
+
+        session.error(order_id, 201, "Order rejected")
+
+        assert handler.calls == [("error", order_id, 201)]
+
+    def test_order_observers_see_routed_and_broadcast_order_callbacks(self):
+        session = make_ready_session(ORDER_CLIENT_ID)
+        owner, observer = RecordingHandler(), RecordingHandler()
+        order_id = session.register_order(owner)
+        session.subscribe(observer)
+        session.observe_orders(observer)
+
+        session.orderStatus(order_id, "Submitted", 0, 10, 0, 9001, 0, 0, ORDER_CLIENT_ID, "", 0)
+        session.orderStatus(555, "Filled", 10, 0, 1.0, 9002, 0, 1.0, 0, "", 0)
+        session.position("DU123456", "AAPL", 10, 150.0)
+
+        assert owner.calls == [("orderStatus", order_id, "Submitted")]
+        assert observer.calls == [
+            ("orderStatus", order_id, "Submitted"),
+            ("orderStatus", 555, "Filled"),
+            ("position", "AAPL", 10)
+        ]
+
+    def test_register_order_requires_handshake(self):
+        session = IBKRSession(client_id=ORDER_CLIENT_ID)
+
+        with pytest.raises(RuntimeError):
+            session.register_order(RecordingHandler())
+
+    def test_unowned_callbacks_broadcast_to_subscribers(self):
+        session = make_ready_session()
+        first, second = RecordingHandler(), RecordingHandler()
+
+        with session.subscription(first):
+            session.subscribe(second)
+            session.position("DU123456", "AAPL", 10, 150.0)
+
+        session.position("DU123456", "MSFT", 5, 300.0)
+
+        assert first.calls == [("position", "AAPL", 10)]
+        assert second.calls == [("position", "AAPL", 10), ("position", "MSFT", 5)]
+
+    def test_failing_handler_does_not_break_dispatch(self):
+        session = make_ready_session()
+        broken, healthy = Mock(), RecordingHandler()
+        broken.position.side_effect = ValueError("boom")
+        session.subscribe(broken)
+        session.subscribe(healthy)
+
+        session.position("DU123456", "AAPL", 10, 150.0)
+
+        assert healthy.calls == [("position", "AAPL", 10)]
+
+    def test_bind_replays_handshake_and_routes_requests(self):
+        session = make_ready_session()
+        session.reqPositions = Mock()
+        handler = RecordingHandler()
+
+        view = session.bind(handler)
+        view.reqPositions()
+        view.disconnect()
+
+        assert handler.account_id == "DU123456"
+        assert handler.connected is False
+        session.reqPositions.assert_called_once_with()
+        assert handler not in session._subscribers
+
+
+class TestIBKRSessionConnection:
+    """Connection reuse and reconnect behaviour"""
+
+    def test_ready_session_skips_handshake(self):
+        session = make_ready_session()
+        session.connect = Mock()
+
+        assert session.ensure_connected(timeout=1) is True
+        session.connect.assert_not_called()
+
+    def test_failed_connect_returns_false(self):
+        session = IBKRSession()
+        session.connect = Mock()
+        session.isConnected = Mock(return_value=False)
+
+        assert session.ensure_connected(timeout=0.1) is False
+
+    def test_connection_closed_forces_reconnect(self):
+        session = make_ready_session()
+        session.connect = Mock()
+        session.run = Mock()
+        assert session.is_ready
+
+        session.connectionClosed()
+        assert not session.is_ready
+
+        # Handshake never completes on the fake socket, so the reconnect times out
+        assert session.ensure_connected(timeout=0.1) is False
+        session.connect.assert_called_once_with("127.0.0.1", 4002, clientId=DATA_CLIENT_ID)
+
+
+class TestIBKRSessionPacing:
+    """Outbound traffic is paced per connection"""
+
+    def test_every_outbound_message_takes_a_token(self):
+        session = make_ready_session()
+        session.conn = Mock()
+        session.serverVersion = Mock(return_value=151)
+        session.pacer.messages.acquire = Mock(return_value=0.0)
+
+        session.reqPositions()
+        session.reqAccountSummary(9001, "All", "NetLiquidation")
+
+        assert session.pacer.messages.acquire.call_count == 2
+        assert session.conn.sendMsg.call_count == 2
+
+    def test_matching_symbols_use_their_own_throttle(self):
+        session = make_ready_session()
+        session.conn = Mock()
+        session.serverVersion = Mock(return_value=151)
+        session.pacer.matching_symbols.acquire = Mock(return_value=0.0)
+
+        session.reqMatchingSymbols(session.next_request_id(), "SAP")
+
+        session.pacer.matching_symbols.acquire.assert_called_once_with()
+        assert "pacing" in session.get_status()
+
+
+class TestIBKRSessionManager:
+    """Process-wide session registry"""
+
+    def test_sessions_shared_per_gateway_and_client(self):
+        manager = IBKRSessionManager()
+
+        data = manager.get_session(client_id=DATA_CLIENT_ID)
+
+        assert manager.get_session(client_id=DATA_CLIENT_ID) is data
+        assert manager.get_session(client_id=ORDER_CLIENT_ID) is not data
+        assert manager.get_session("10.0.0.5", 4002, DATA_CLIENT_ID) is not data
+
+    def test_connect_returns_none_when_gateway_unreachable(self):
+        manager = IBKRSessionManager()
+
+        with patch.object(IBKRSession, "ensure_connected", return_value=False):
+            assert manager.connect() is None
+
+    def test_status_lists_every_session(self):
+        manager = IBKRSessionManager()
+        manager.get_session(client_id=DATA_CLIENT_ID)
+        manager.get_session(client_id=ORDER_CLIENT_ID)
+
+        status = manager.get_status()
+
+        assert [s["client_id"] for s in status] == [DATA_CLIENT_ID, ORDER_CLIENT_ID]
+        assert all(s["connected"] is False for s in status)
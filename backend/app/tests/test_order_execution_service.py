@@ -8,10 +8,12 @@ import json
 import os
 import tempfile
 import asyncio
+import threading
 from unittest.mock import Mock, patch, AsyncMock, MagicMock
 from datetime import datetime
 
 from ..services.interfaces import IOrderExecutionService
+from ..services.implementations import order_execution_service as order_execution_module
 from ..services.implementations.order_execution_service import OrderExecutionService, OrderExecutionError, IBKRConnectionError
 from ..core.dependencies import get_order_execution_service
 
@@ -154,51 +156,51 @@ class TestOrderExecutionService:
         finally:
             os.unlink(temp_file)
 
+    def patch_session(self, connected=True, account_id="DU123456"):
+        """Patch the shared IBKR session manager with a fake order session"""
+        session = Mock()
+        session.ensure_connected.return_value = connected
+        session.account_id = account_id
+        session.next_order_id = 100 if connected else None
+        manager = Mock()
+        manager.get_session.return_value = session
+        return session, patch.object(order_execution_module, 'get_ibkr_session_manager', return_value=manager)
+
     @pytest.mark.asyncio
     async def test_connect_to_ibkr_success(self, service):
         """Test successful IBKR connection"""
-        # Mock the legacy IBOrderExecutor
-        with patch('backend.app.services.implementations.order_execution_service.IBOrderExecutor') as mock_executor_class:
-            mock_executor = Mock()
-            mock_executor.connected = True
-            mock_executor.nextorderId = 100
-            mock_executor.account_id = "DU123456"
-            mock_executor_class.return_value = mock_executor
+        session, session_patch = self.patch_session()
 
+        with session_patch as mock_manager:
             result = await service.connect_to_ibkr()
 
-            assert result is True
-            assert service.execution_api is not None
-            mock_executor.connect.assert_called_once_with("127.0.0.1", 4002, clientId=20)
+        assert result is True
+        assert service.execution_api is not None
+        mock_manager.return_value.get_session.assert_called_once_with("127.0.0.1", 4002, 20)
+        session.bind.assert_called_once()
 
     @pytest.mark.asyncio
     async def test_connect_to_ibkr_timeout(self, service):
         """Test IBKR connection timeout"""
-        with patch('backend.app.services.implementations.order_execution_service.IBOrderExecutor') as mock_executor_class:
-            mock_executor = Mock()
-            mock_executor.connected = False
-            mock_executor.nextorderId = None
-            mock_executor_class.return_value = mock_executor
+        session, session_patch = self.patch_session(connected=False, account_id=None)
 
+        with session_patch:
             with pytest.raises(IBKRConnectionError) as exc_info:
                 await service.connect_to_ibkr(timeout=1)
 
-            assert exc_info.value.error_code == "IBKR_CONNECTION_FAILED"
+        assert exc_info.value.error_code == "IBKR_CONNECTION_FAILED"
+        session.bind.assert_not_called()
 
     @pytest.mark.asyncio
     async def test_connect_to_ibkr_no_account_id(self, service):
         """Test IBKR connection without account ID"""
-        with patch('backend.app.services.implementations.order_execution_service.IBOrderExecutor') as mock_executor_class:
-            mock_executor = Mock()
-            mock_executor.connected = True
-            mock_executor.nextorderId = 100
-            mock_executor.account_id = None  # No account ID
-            mock_executor_class.return_value = mock_executor
+        session, session_patch = self.patch_session(account_id=None)  # No account ID
 
+        with session_patch:
             with pytest.raises(IBKRConnectionError) as exc_info:
                 await service.connect_to_ibkr(timeout=1)
 
-            assert exc_info.value.error_code == "IBKR_ACCOUNT_ID_MISSING"
+        assert exc_info.value.error_code == "IBKR_ACCOUNT_ID_MISSING"
 
     def test_create_ibkr_contract(self, service):
         """Test IBKR contract creation"""
@@ -270,6 +272,67 @@ class TestOrderExecutionService:
 
         assert exc_info.value.error_code == "IBKR_NOT_CONNECTED"
 
+    def connect_fake_session(self, service, respond):
+        """Attach a fake order session; respond(tracker, order_id) runs on a gateway thread per placed order"""
+        order_ids = iter(range(100, 200))
+        routes = {}
+        placed = []
+
+        def register_order(tracker):
+            order_id = next(order_ids)
+            routes[order_id] = tracker
+            return order_id
+
+        def place_order(order_id, contract, order):
+            placed.append((order_id, contract))
+            threading.Thread(target=respond, args=(routes[order_id], order_id)).start()
+
+        service.session = Mock()
+        service.session.register_order.side_effect = register_order
+        service.execution_api = Mock(handler=Mock(), orders_status={}, placeOrder=place_order)
+        return placed
+
+    @pytest.mark.asyncio
+    async def test_orders_are_pipelined_until_acknowledged(self, service, mock_orders_data, monkeypatch):
+        """Every order is placed without waiting; acks and rejections resolve each order"""
+        monkeypatch.setattr(order_execution_module.settings.ibkr, "orders_per_second", 1000.0)
+        mock_orders_data["orders"].append(dict(mock_orders_data["orders"][0], action="SELL"))
+        service.orders_data = mock_orders_data
+
+        def respond(tracker, order_id):
+            if order_id == 101:
+                tracker.error(order_id, 201, "Order rejected - reason: no trading permissions")
+            else:
+                tracker.orderStatus(order_id, "PreSubmitted", 0, 100, 0.0, 1, 0, 0.0, 20, "", 0.0)
+
+        placed = self.connect_fake_session(service, respond)
+
+        result = await service.execute_orders()
+
+        assert [order_id for order_id, _ in placed] == [100, 101, 102, 103]
+        assert placed[0][1] is placed[3][1]
+        assert [order['status'] for order in result['order_results']] == ['submitted', 'rejected', 'submitted', 'submitted']
+        assert result['order_results'][0]['ack_status'] == 'PreSubmitted'
+        assert result['order_results'][1]['error'].startswith("201:")
+        assert result['executed_count'] == 3 and result['failed_count'] == 1
+        assert result['execution_summary']['acknowledged_orders'] == 4
+        assert result['execution_summary']['max_ack_latency_ms'] >= 0
+        service.execution_api.handler.error.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_unacknowledged_orders_stay_submitted(self, service, mock_orders_data, monkeypatch):
+        """Orders without an ack within the timeout are reported as pending"""
+        monkeypatch.setattr(order_execution_module.settings.ibkr, "orders_per_second", 1000.0)
+        monkeypatch.setattr(order_execution_module.settings.ibkr, "order_ack_timeout", 0.05)
+        service.orders_data = mock_orders_data
+        self.connect_fake_session(service, lambda tracker, order_id: None)
+
+        result = await service.execute_orders()
+
+        assert result['executed_count'] == 3
+        assert [order['acknowledged'] for order in result['order_results']] == [False] * 3
+        assert result['execution_summary']['median_ack_latency_ms'] is None
+
     @pytest.mark.asyncio
     async def test_get_order_statuses_not_connected(self, service):
         """Test get order statuses without IBKR connection"""
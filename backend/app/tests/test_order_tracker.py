@@ -0,0 +1,242 @@
+"""
+Tests for the streaming order and fill tracker
+Feeds EWrapper callbacks directly; no gateway is needed
+"""
+
+import pytest
+from unittest.mock import Mock, patch
+
+from ibapi.commission_report import CommissionReport
+from ibapi.contract import Contract
+from ibapi.execution import Execution
+from ibapi.order import Order
+from ibapi.order_state import OrderState
+
+from ..services.implementations import order_status_service
+from ..services.implementations.order_status_service import OrderStatusChecker
+from ..services.order_tracker import OrderTracker, OrderTrackerStore
+
+
+def make_contract(symbol="AAPL", currency="USD"):
+    contract = Contract()
+    contract.symbol = symbol
+    contract.currency = currency
+    return contract
+
+
+def make_order(perm_id, order_id=101, action="BUY", quantity=100):
+    order = Order()
+    order.orderId = order_id
+    order.permId = perm_id
+    order.action = action
+    order.totalQuantity = quantity
+    order.orderType = "MKT"
+    return order
+
+
+def make_state(status):
+    state = OrderState()
+    state.status = status
+    return state
+
+
+def make_execution(exec_id, perm_id, shares, price, cum_qty, avg_price, order_id=101):
+    execution = Execution()
+    execution.execId = exec_id
+    execution.permId = perm_id
+    execution.orderId = order_id
+    execution.side = "BOT"
+    execution.shares = shares
+    execution.price = price
+    execution.cumQty = cum_qty
+    execution.avgPrice = avg_price
+    execution.time = "20260105 15:30:00"
+    return execution
+
+
+def make_commission(exec_id, commission):
+    report = CommissionReport()
+    report.execId = exec_id
+    report.commission = commission
+    report.currency = "USD"
+    report.realizedPNL = 1.7976931348623157e308
+    return report
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / "order_tracker.db")
+
+
+@pytest.fixture
+def tracker(db_path):
+    return OrderTracker(OrderTrackerStore(db_path))
+
+
+class TestOrderTrackerEvents:
+    """Incremental application of order, fill and commission events"""
+
+    def test_fills_are_applied_incrementally(self, tracker):
+        contract = make_contract()
+        tracker.openOrder(101, contract, make_order(9001), make_state("Submitted"))
+        tracker.orderStatus(101, "Submitted", 0, 100, 0, 9001, 0, 0, 20, "", 0)
+        tracker.execDetails(-1, contract, make_execution("e1", 9001, 40, 10.0, 40, 10.0))
+        tracker.commissionReport(make_commission("e1", 1.0))
+
+        partial = tracker.get_order(order_id=101)
+        assert partial["status"] == "Submitted"
+        assert partial["filled"] == 40
+        assert partial["fill_ratio"] == 0.4
+
+        tracker.execDetails(-1, contract, make_execution("e2", 9001, 60, 11.0, 100, 10.6))
+        tracker.orderStatus(101, "Filled", 100, 0, 10.6, 9001, 0, 11.0, 20, "", 0)
+
+        order = tracker.get_order(perm_id=9001)
+        assert order["status"] == "Filled"
+        assert order["filled"] == 100
+        assert order["avg_fill_price"] == 10.6
+        assert order["commission"] == 1.0
+        assert [(fill["exec_id"], fill["cum_qty"]) for fill in order["fills"]] == [("e1", 40), ("e2", 100)]
+        assert order["fills"][0]["realized_pnl"] is None
+
+        snapshot = tracker.legacy_snapshot()
+        assert snapshot["open_orders"] == {}
+        assert snapshot["completed_orders"][101]["status"] == "Filled"
+        assert snapshot["completed_orders"][101]["quantity"] == 100
+
+    def test_state_survives_restart(self, tracker, db_path):
+        contract = make_contract()
+        tracker.orderStatus(101, "Submitted", 40, 60, 10.0, 9001, 0, 10.0, 20, "", 0)
+        tracker.execDetails(-1, contract, make_execution("e1", 9001, 40, 10.0, 40, 10.0))
+        tracker.commissionReport(make_commission("e1", 1.0))
+        tracker.store.close()
+
+        restarted = OrderTracker(OrderTrackerStore(db_path))
+        order = restarted.get_order(order_id=101)
+
+        assert not restarted.is_synced
+        assert order["status"] == "Submitted"
+        assert order["symbol"] == "AAPL"
+        assert [(fill["exec_id"], fill["commission"]) for fill in order["fills"]] == [("e1", 1.0)]
+
+    def test_fill_before_order_details_and_early_commission(self, tracker):
+        tracker.commissionReport(make_commission("e1", 2.5))
+        tracker.execDetails(-1, make_contract("7203", "JPY"), make_execution("e1", 9002, 100, 2500.0, 100, 2500.0, order_id=0))
+
+        order = tracker.get_order(perm_id=9002)
+        assert order["symbol"] == "7203"
+        assert order["action"] == "BUY"
+        assert order["filled"] == 100
+        assert order["commission"] == 2.5
+        assert tracker.get_order(order_id=0) is None
+        assert tracker.legacy_snapshot()["open_orders"][9002]["permId"] == 9002
+
+    def test_order_errors_are_recorded(self, tracker):
+        tracker.orderStatus(101, "PreSubmitted", 0, 100, 0, 9001, 0, 0, 20, "", 0)
+        tracker.error(101, 399, "Order will not be placed until market opens")
+        tracker.error(555, 201, "Order rejected")
+
+        assert tracker.get_order(order_id=101)["last_message"] == "399: Order will not be placed until market opens"
+        assert tracker.get_order(order_id=555) is None
+
+    def test_positions_follow_updates(self, tracker):
+        tracker.position("DU123456", make_contract("AAPL"), 100, 150.0)
+        tracker.position("DU123456", make_contract("MSFT"), 5, 300.0)
+        tracker.position("DU123456", make_contract("MSFT"), 0, 0.0)
+
+        assert list(tracker.legacy_snapshot()["positions"]) == ["AAPL"]
+
+
+class TestOrderTrackerSync:
+    """One-time subscription and sync with the order session"""
+
+    def fake_session(self, tracker):
+        session = Mock()
+        session.ensure_connected.return_value = True
+        session.register_request.return_value = 1_000_001
+        session.reqAllOpenOrders.side_effect = tracker.openOrderEnd
+        session.reqCompletedOrders.side_effect = lambda api_only: tracker.completedOrdersEnd()
+        session.reqExecutions.side_effect = lambda req_id, exec_filter: tracker.execDetailsEnd(req_id)
+        session.reqPositions.side_effect = tracker.positionEnd
+        tracker._session = session
+        return session
+
+    def test_start_syncs_once_until_connection_drops(self, tracker):
+        session = self.fake_session(tracker)
+
+        assert tracker.start(timeout=1)
+        assert tracker.start(timeout=1)
+        assert session.reqAllOpenOrders.call_count == 1
+        session.subscribe.assert_called_with(tracker)
+        session.observe_orders.assert_called_with(tracker)
+        session.release_request.assert_called_once_with(1_000_001)
+
+        tracker.connectionClosed()
+        assert tracker.start(timeout=1)
+        assert session.reqAllOpenOrders.call_count == 2
+        assert tracker.get_status()["synced"] is True
+
+    def test_start_fails_without_gateway(self, tracker):
+        session = self.fake_session(tracker)
+        session.ensure_connected.return_value = False
+
+        assert tracker.start(timeout=1) is False
+        assert not tracker.is_synced
+        session.reqAllOpenOrders.assert_not_called()
+
+    def test_incomplete_sync_keeps_received_orders(self, tracker):
+        session = self.fake_session(tracker)
+        session.reqPositions.side_effect = None
+
+        assert tracker.start(timeout=0.05)
+        assert tracker.is_synced
+
+    def test_resync_drops_positions_closed_while_disconnected(self, tracker):
+        session = self.fake_session(tracker)
+        tracker.position("DU123456", make_contract("AAPL"), 100, 150.0)
+        tracker.position("DU123456", make_contract("MSFT"), 5, 300.0)
+
+        def replay_positions():
+            tracker.position("DU123456", make_contract("AAPL"), 100, 150.0)
+            tracker.positionEnd()
+
+        session.reqPositions.side_effect = replay_positions
+        tracker.connectionClosed()
+
+        assert tracker.start(timeout=1)
+        assert list(tracker.legacy_snapshot()["positions"]) == ["AAPL"]
+
+    def test_each_sync_prunes_expired_orders(self, tracker):
+        self.fake_session(tracker)
+        tracker.orderStatus(101, "Filled", 100, 0, 10.0, 9001, 0, 10.0, 20, "", 0)
+        tracker.execDetails(-1, make_contract(), make_execution("e1", 9001, 100, 10.0, 100, 10.0))
+        tracker.orderStatus(102, "Submitted", 0, 50, 0, 9002, 0, 0, 20, "", 0)
+        expired = dict(tracker.get_order(perm_id=9001), updated_at="2020-01-01T00:00:00")
+        expired.pop("fills")
+        tracker.store.save_order(expired)
+
+        assert tracker.start(timeout=1)
+
+        assert tracker.get_order(perm_id=9001) is None
+        assert tracker.get_order(order_id=101) is None
+        assert tracker.get_order(perm_id=9002)["status"] == "Submitted"
+        assert [order["perm_id"] for order in tracker.store.load()[0]] == [9002]
+        assert tracker.store.load()[1] == []
+
+
+class TestOrderStatusChecker:
+    """Order status checks read the tracker over the shared order session"""
+
+    def test_connect_requires_an_account_id(self, tracker):
+        tracker.start = Mock(return_value=True)
+        session = Mock(account_id=None)
+
+        with patch.object(order_status_service, "get_order_tracker", return_value=tracker), \
+                patch.object(order_status_service, "get_ibkr_session_manager") as manager:
+            manager.return_value.get_session.return_value = session
+            checker = OrderStatusChecker()
+            assert checker.connect_to_ibkr() is False
+
+            session.account_id = "DU123456"
+            assert checker.connect_to_ibkr() is True
+            assert checker.api.account_id == "DU123456"
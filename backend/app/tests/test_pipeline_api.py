@@ -9,6 +9,7 @@ from fastapi.testclient import TestClient
 from unittest.mock import Mock, patch, AsyncMock
 import asyncio
 
+from ..core.dependencies import get_pipeline_orchestrator_service
 from ..main import app
 from ..services.implementations.pipeline_orchestrator_service import PipelineOrchestratorService
 
@@ -382,7 +383,7 @@ class TestPipelineAPI:
             data = response.json()
 
             assert data["status_filter"] == "completed"
-            mock_orchestrator_service.get_pipeline_history.assert_called_with(10, "completed")
+            mock_orchestrator_service.get_pipeline_history.assert_called_with(10, "completed", 0)
 
     def test_get_pipeline_history_invalid_limit(self, client, mock_orchestrator_service):
         """Test GET /api/v1/pipeline/history with invalid limit"""
@@ -533,4 +534,47 @@ class TestPipelineAPICLICompatibility:
 
             # Error message should match CLI pattern
             assert data["success"] is False
-            assert "Step 5 failed" in data["error_message"]
\ No newline at end of file
+            assert "Step 5 failed" in data["error_message"]
+
+class TestExecutionEventsAPI:
+    """Server-sent event stream of a pipeline run"""
+
+    @pytest.fixture
+    def orchestrator(self):
+        service = AsyncMock(spec=PipelineOrchestratorService)
+        service.get_execution_status.return_value = {"execution_id": "run-1", "status": "running"}
+        service.stream_calls = []
+
+        async def stream(execution_id, offset=0, heartbeat=None):
+            service.stream_calls.append((execution_id, offset))
+            yield {"event": "status", "offset": None, "data": {"status": "running"}}
+            yield {"event": "heartbeat", "offset": None, "data": {}}
+            yield {"event": "log", "offset": 4, "data": {"message": "Starting Parse Data"}}
+            yield {"event": "status", "offset": None, "data": {"status": "completed"}}
+
+        service.stream_execution_events = stream
+        app.dependency_overrides[get_pipeline_orchestrator_service] = lambda: service
+        yield service
+        app.dependency_overrides.clear()
+
+    def test_events_are_streamed_with_log_offsets(self, orchestrator):
+        response = TestClient(app).get(
+            "/api/v1/pipeline/runs/run-1/events", headers={"Last-Event-ID": "4"}
+        )
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/event-stream")
+        assert response.text == (
+            'event: status\ndata: {"status": "running"}\n\n'
+            ": heartbeat\n\n"
+            'id: 5\nevent: log\ndata: {"message": "Starting Parse Data"}\n\n'
+            'event: status\ndata: {"status": "completed"}\n\n'
+        )
+        assert orchestrator.stream_calls == [("run-1", 4)]
+
+    def test_unknown_execution(self, orchestrator):
+        orchestrator.get_execution_status.return_value = {"execution_id": "run-1", "status": "not_found"}
+
+        response = TestClient(app).get("/api/v1/pipeline/runs/run-1/events")
+
+        assert response.status_code == 404
@@ -0,0 +1,93 @@
+"""
+Tests for per-step console capture
+"""
+
+import asyncio
+import logging
+import sys
+
+import pytest
+
+from ..services.pipeline_console import MAX_LINE_LENGTH, StepConsoleCapture, capture_console
+
+
+def recorder():
+    lines = []
+    return lines, lambda level, line, stream: lines.append((level, line, stream))
+
+
+class TestStepConsoleCapture:
+    """Line splitting and the bounded tail"""
+
+    def test_lines_stream_as_they_complete(self):
+        lines, sink = recorder()
+        capture = StepConsoleCapture(sink, tail_lines=10)
+
+        capture.write(0, "first\nsec")
+        assert lines == [("INFO", "first", "stdout")]
+
+        capture.write(0, "ond\n\n")
+        capture.write(1, "oops")
+        capture.close()
+
+        assert [line for _, line, _ in lines] == ["first", "second", "", "oops"]
+        assert lines[-1] == ("WARNING", "oops", "stderr")
+
+    def test_carriage_return_overwrites_the_line(self):
+        lines, sink = recorder()
+        capture = StepConsoleCapture(sink, tail_lines=10)
+
+        capture.write(1, "\r 10%")
+        capture.write(1, "\r 50%")
+        capture.write(1, "\r100%\r\n")
+
+        assert [line for _, line, _ in lines] == ["100%"]
+
+    def test_memory_is_bounded(self):
+        lines, sink = recorder()
+        capture = StepConsoleCapture(sink, tail_lines=3)
+
+        for i in range(10):
+            capture.write(0, f"line {i}\n")
+        capture.write(0, "x" * (MAX_LINE_LENGTH * 2 + 5))
+
+        assert len(lines) == 12
+        assert capture.lines() == [
+            "... 9 earlier lines omitted - see the execution logs",
+            "line 9",
+            "x" * MAX_LINE_LENGTH,
+            "x" * MAX_LINE_LENGTH
+        ]
+
+
+class TestCaptureConsole:
+    """Context-local routing of prints and log records"""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_captures_do_not_interfere(self):
+        async def step(name):
+            lines, sink = recorder()
+            with capture_console(sink, tail_lines=10) as capture:
+                for i in range(3):
+                    print(f"{name} {i}")
+                    await asyncio.sleep(0)
+                await asyncio.to_thread(print, f"{name} thread")
+            return capture.lines()
+
+        first, second = await asyncio.gather(step("a"), step("b"))
+
+        assert first == ["a 0", "a 1", "a 2", "a thread"]
+        assert second == ["b 0", "b 1", "b 2", "b thread"]
+
+    def test_log_records_are_captured_in_context_only(self):
+        lines, sink = recorder()
+        logger = logging.getLogger("pipeline-console-test")
+        logger.setLevel(logging.INFO)
+        original = sys.stdout
+
+        with capture_console(sink, tail_lines=10):
+            logger.warning("inside")
+        logger.warning("outside")
+
+        assert lines == [("WARNING", "inside", "log")]
+        assert sys.stdout is original
@@ -0,0 +1,74 @@
+"""
+Tests for the pipeline step fingerprint store
+"""
+
+from ..services.pipeline_fingerprints import STATE_FILENAME, PipelineFingerprints, digest_file, digest_value
+
+
+class TestDigests:
+    """Stable hashes of values and files"""
+
+    def test_value_digest_ignores_key_order(self):
+        assert digest_value({"a": 1, "b": [1, 2]}) == digest_value({"b": [1, 2], "a": 1})
+        assert digest_value({"a": 1}) != digest_value({"a": 2})
+
+    def test_missing_file(self, tmp_path):
+        assert digest_file(str(tmp_path / "missing.csv")) is None
+
+
+class TestPipelineFingerprints:
+    """Recorded runs and output files"""
+
+    def test_match_requires_fingerprint_and_unchanged_files(self, tmp_path):
+        output = tmp_path / "universe.json"
+        output.write_text("{}")
+        store = PipelineFingerprints(str(tmp_path))
+        store.record(4, "abc", [str(output)], {"portfolio": {"max_allocation": 0.1}})
+
+        assert store.matches(4, "abc", [str(output)])["inputs"] == {"portfolio": {"max_allocation": 0.1}}
+        assert store.matches(4, "def", [str(output)]) is None
+        assert store.matches(5, "abc", [str(output)]) is None
+
+        output.write_text('{"edited": true}')
+
+        assert store.matches(4, "abc", [str(output)]) is None
+
+    def test_output_digest_follows_file_contents(self, tmp_path):
+        output = tmp_path / "universe.json"
+        output.write_text("{}")
+        store = PipelineFingerprints(str(tmp_path))
+
+        first = store.record(5, "abc", [str(output)])
+        assert store.record(5, "def", [str(output)]) == first
+        output.write_text('{"rates": 1.1}')
+        assert store.record(5, "def", [str(output)]) != first
+        assert store.output_digest(5) != first
+        assert store.output_digest(6) is None
+
+    def test_recreated_file_invalidates_steps_that_modified_it(self, tmp_path):
+        output = tmp_path / "universe.json"
+        output.write_text("{}")
+        store = PipelineFingerprints(str(tmp_path))
+        store.record(2, "parse", [str(output)], created=[str(output)])
+        store.record(3, "history", [str(output)])
+
+        assert store.matches(3, "history", [str(output)])
+
+        # Same content, but the history step's additions would be gone
+        store.record(2, "parse", [str(output)], created=[str(output)])
+
+        assert store.matches(2, "parse", [str(output)])
+        assert store.matches(3, "history", [str(output)]) is None
+
+    def test_state_survives_restart(self, tmp_path):
+        PipelineFingerprints(str(tmp_path)).record(2, "abc", [])
+
+        assert PipelineFingerprints(str(tmp_path)).get(2)["fingerprint"] == "abc"
+
+    def test_unreadable_state_is_ignored(self, tmp_path):
+        (tmp_path / STATE_FILENAME).write_text("not json")
+        store = PipelineFingerprints(str(tmp_path))
+
+        assert store.get(2) is None
+        store.record(2, "abc", [])
+        assert store.get(2)["fingerprint"] == "abc"
@@ -0,0 +1,536 @@
+"""
+Tests for the pipeline step DAG and the orchestrator's concurrent, incremental executor
+"""
+
+import asyncio
+import json
+import os
+import threading
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from ..core import dependencies
+from ..core.config import settings
+from ..models.schemas import PipelineStepInfo, PipelineStepStatus
+from ..services.backtest_history import BacktestHistoryCache
+from ..services.implementations import pipeline_orchestrator_service
+from ..services.implementations.ibkr_search_service import IBKRSearchService
+from ..services.implementations.pipeline_orchestrator_service import PipelineOrchestratorService
+from ..services.pipeline_events import PipelineEventBroker
+from ..services.pipeline_graph import PipelineGraph, PipelineGraphError
+from ..services.pipeline_workers import PipelineWorkerPool
+
+
+def step(number, inputs=(), outputs=(), modifies=()):
+    return PipelineStepInfo(
+        step_number=number,
+        step_name=f"Step {number}",
+        description="",
+        aliases=[],
+        creates_files=[],
+        modifies_files=list(modifies),
+        inputs=list(inputs),
+        outputs=list(outputs)
+    )
+
+
+@pytest.fixture
+def orchestrator(tmp_path, monkeypatch):
+    # Fingerprints and step files resolve under data/ in the working directory
+    monkeypatch.chdir(tmp_path)
+    telegram = Mock()
+    telegram.notify_step_start = AsyncMock()
+    telegram.notify_step_complete = AsyncMock()
+    telegram.notify_pipeline_start = AsyncMock()
+    telegram.notify_pipeline_complete = AsyncMock()
+    service = PipelineOrchestratorService(*[Mock() for _ in range(11)], telegram)
+    service.ibkr_search_service.extract_unique_stocks = IBKRSearchService().extract_unique_stocks
+    return service
+
+
+def install_steps(service, overrides=None, prefetch_rates=None, account=(10000.0, "EUR")):
+    """Replace every step with a recording stub; overrides maps step -> function"""
+    calls = []
+
+    def make(number):
+        def run(**kwargs):
+            calls.append((number, kwargs))
+            return True
+        return run
+
+    service._step_functions = {number: make(number) for number in range(1, 12)}
+    service._step_functions.update(overrides or {})
+    service._step_prefetch[3] = (["backtest_exports"], lambda: {})
+    service._step_prefetch[5] = ([], prefetch_rates or (lambda: {"exchange_rates": {"EUR": 1.0}}))
+    service._step_prefetch[7] = ([], lambda: {"account": account})
+    return calls
+
+
+def write_universe(**contents):
+    os.makedirs("data", exist_ok=True)
+    with open("data/universe.json", "w") as f:
+        json.dump(contents, f)
+    return True
+
+
+def write_quantities(quantities):
+    """Step 7 stub writing one screen with the given ticker -> quantity"""
+    stocks = [{"ticker": ticker, "name": ticker, "quantity": quantity} for ticker, quantity in quantities.items()]
+    return lambda **kwargs: write_universe(screens={"quality_bloom": {"stocks": stocks}})
+
+
+async def wait_idle(service):
+    """Wait for worker threads left behind by a timed-out or cancelled step"""
+    for _ in range(500):
+        if not service.worker_pool.busy():
+            return
+        await asyncio.sleep(0.01)
+
+
+class TestPipelineGraph:
+    """Dependencies derived from declared artifacts"""
+
+    def test_orchestrator_declares_real_dependencies(self, orchestrator):
+        info = orchestrator._step_info
+
+        assert info[3].dependencies == [1, 2]
+        assert info[5].dependencies == [2]
+        assert info[7].dependencies == [5, 6]
+        assert info[8].dependencies == [7]
+
+    def test_duplicate_producer_is_rejected(self):
+        with pytest.raises(PipelineGraphError):
+            PipelineGraph({1: step(1, outputs=["a"]), 2: step(2, outputs=["a"])})
+
+    def test_cycle_is_rejected(self):
+        with pytest.raises(PipelineGraphError):
+            PipelineGraph({1: step(1, ["b"], ["a"]), 2: step(2, ["a"], ["b"])})
+
+    def test_steps_writing_one_file_never_overlap(self):
+        graph = PipelineGraph({
+            1: step(1, outputs=["u"]),
+            2: step(2, ["u"], ["x"], modifies=["u.json"]),
+            3: step(3, ["u"], ["y"], modifies=["u.json"]),
+            4: step(4, ["u"], ["z"]),
+        })
+        schedule = graph.schedule([1, 2, 3, 4])
+        schedule.start(1)
+        schedule.finish(1, True)
+
+        assert schedule.ready_steps() == [2, 4]
+
+    def test_steps_outside_the_range_count_as_done(self):
+        graph = PipelineGraph({1: step(1, outputs=["a"]), 2: step(2, ["a"], ["b"])})
+
+        assert graph.schedule([2]).ready_steps() == [2]
+
+    def test_failure_stops_new_steps(self):
+        graph = PipelineGraph({1: step(1, outputs=["a"]), 2: step(2, outputs=["b"]), 3: step(3, ["a"])})
+        schedule = graph.schedule([1, 2, 3])
+        schedule.start(1)
+        schedule.start(2)
+        schedule.finish(2, False)
+        schedule.finish(1, True)
+
+        assert schedule.ready_steps() == []
+        assert schedule.done
+
+
+class TestConcurrentPipeline:
+    """run_full_pipeline executes the DAG"""
+
+    def test_history_prefetch_parses_exports_by_screen_name(self, orchestrator, monkeypatch):
+        # Screen keys and names differ; exports are named after the screen name
+        monkeypatch.setattr(settings.uncle_stock, "uncle_stock_screens", {"bloom": "quality bloom"})
+        os.makedirs("data/files_exports")
+        with open("data/files_exports/quality_bloom_backtest_results.csv", "w", encoding="utf-8") as f:
+            f.write("sep=,\n")
+        cache = BacktestHistoryCache()
+        monkeypatch.setattr(pipeline_orchestrator_service, "get_backtest_history_cache", lambda: cache)
+
+        assert orchestrator._prefetch_history() == {}
+        assert cache.get_stats()["files"] == 1
+
+    @pytest.mark.asyncio
+    async def test_full_pipeline_runs_every_step(self, orchestrator):
+        calls = install_steps(orchestrator)
+
+        result = await orchestrator.run_full_pipeline("exec-1")
+
+        assert result["success"] is True
+        assert result["completed_steps"] == list(range(1, 12))
+        assert dict(calls)[5] == {"exchange_rates": {"EUR": 1.0}}
+        status = await orchestrator.get_execution_status("exec-1")
+        assert status["progress_percentage"] == 100
+        assert status["running_steps"] == []
+
+    @pytest.mark.asyncio
+    async def test_rate_prefetch_overlaps_step_one(self, orchestrator):
+        rates_started = threading.Event()
+
+        def fetch_rates():
+            rates_started.set()
+            print("fetching rates")
+            return {"exchange_rates": {"EUR": 1.0}}
+
+        def step1():
+            print("step 1 started")
+            # Only succeeds if the prefetch runs while step 1 is still running
+            return rates_started.wait(timeout=5)
+
+        install_steps(orchestrator, {1: step1}, prefetch_rates=fetch_rates)
+
+        result = await orchestrator.run_step_range(1, 5, "exec-2")
+
+        assert result["success"] is True
+        assert result["step_results"][1].console_output == ["step 1 started"]
+        assert result["step_results"][5].console_output == ["fetching rates"]
+
+    @pytest.mark.asyncio
+    async def test_console_output_streams_into_execution_log(self, orchestrator, monkeypatch):
+        monkeypatch.setattr(settings.pipeline, "console_tail_lines", 2)
+        seen_while_running = []
+
+        def step2():
+            for i in range(5):
+                print(f"parsed {i}")
+            entries, _ = orchestrator.execution_manager.get_execution_logs("exec-log", step_number=2)
+            seen_while_running.extend(entry["message"] for entry in entries)
+            return True
+
+        install_steps(orchestrator, {2: step2})
+
+        result = await orchestrator.run_step_range(2, 2, "exec-log")
+        logs = await orchestrator.get_execution_logs("exec-log", step_number=2)
+
+        assert seen_while_running[1:] == [f"parsed {i}" for i in range(5)]
+        assert result["step_results"][2].console_output[1:] == ["parsed 3", "parsed 4"]
+        assert [entry["message"] for entry in logs["logs"] if entry["details"] == {"console": "stdout"}] == [
+            f"parsed {i}" for i in range(5)
+        ]
+
+    @pytest.mark.asyncio
+    async def test_failure_stops_dependent_steps(self, orchestrator):
+        calls = install_steps(orchestrator, {4: lambda: False})
+
+        result = await orchestrator.run_full_pipeline("exec-3")
+
+        assert result["success"] is False
+        assert result["failed_step"] == 4
+        assert result["error_message"] == "Step 4 failed - stopping pipeline"
+        assert not {number for number, _ in calls} & {6, 7, 8, 9, 10, 11}
+
+    @pytest.mark.asyncio
+    async def test_individual_step_fetches_its_own_rates(self, orchestrator):
+        calls = install_steps(orchestrator)
+
+        result = await orchestrator.run_individual_step(5, "exec-4")
+
+        assert result["success"] is True
+        assert calls == [(5, {})]
+
+
+class TestIncrementalPipeline:
+    """Steps with unchanged inputs are skipped"""
+
+    @pytest.mark.asyncio
+    async def test_unchanged_run_skips_fingerprinted_steps(self, orchestrator):
+        install_steps(orchestrator)
+        await orchestrator.run_full_pipeline("first")
+        calls = install_steps(orchestrator)
+
+        result = await orchestrator.run_full_pipeline("second")
+
+        assert result["success"] is True
+        assert result["completed_steps"] == list(range(1, 12))
+        assert result["skipped_steps"] == [2, 3, 4, 5, 6, 7, 8]
+        assert [number for number, _ in calls] == [1, 9, 10, 11]
+        skipped = result["step_results"][4]
+        assert skipped.status == PipelineStepStatus.SKIPPED
+        assert skipped.fingerprint
+        assert skipped.console_output[-1].startswith("Inputs unchanged since")
+
+    @pytest.mark.asyncio
+    async def test_changed_input_reruns_step_and_downstream(self, orchestrator):
+        install_steps(orchestrator, {5: lambda exchange_rates: write_universe(rates=exchange_rates)})
+        await orchestrator.run_full_pipeline("first")
+        calls = install_steps(
+            orchestrator,
+            {5: lambda exchange_rates: write_universe(rates=exchange_rates)},
+            prefetch_rates=lambda: {"exchange_rates": {"EUR": 1.1}}
+        )
+
+        result = await orchestrator.run_full_pipeline("second")
+
+        # Step 5 ran through its override; 8 searches the same (no) stocks
+        assert result["skipped_steps"] == [2, 3, 4, 6, 8]
+        assert [number for number, _ in calls] == [1, 7, 9, 10, 11]
+
+    @pytest.mark.asyncio
+    async def test_upstream_rewriting_the_same_output_does_not_rerun_downstream(self, orchestrator):
+        install_steps(orchestrator)
+        await orchestrator.run_full_pipeline("first")
+        calls = install_steps(orchestrator, prefetch_rates=lambda: {"exchange_rates": {"EUR": 1.1}})
+
+        result = await orchestrator.run_full_pipeline("second")
+
+        assert result["skipped_steps"] == [2, 3, 4, 6, 7, 8]
+        assert [number for number, _ in calls] == [1, 5, 9, 10, 11]
+
+    @pytest.mark.asyncio
+    async def test_ibkr_search_reruns_only_when_stocks_to_search_change(self, orchestrator):
+        orchestrator.quantity_service.round_account_value_conservatively = lambda value: value
+        install_steps(orchestrator, {7: write_quantities({"AAPL": 10, "MSFT": 0})})
+        await orchestrator.run_full_pipeline("first")
+
+        calls = install_steps(orchestrator, {7: write_quantities({"AAPL": 12, "MSFT": 0})}, account=(12000.0, "EUR"))
+        result = await orchestrator.run_full_pipeline("second")
+
+        assert result["skipped_steps"] == [2, 3, 4, 5, 6, 8]
+        assert [number for number, _ in calls] == [1, 9, 10, 11]
+        orchestrator.ibkr_search_service.refresh_universe_with_ibkr.assert_called_once_with()
+
+        calls = install_steps(orchestrator, {7: write_quantities({"AAPL": 12, "MSFT": 5})}, account=(15000.0, "EUR"))
+        result = await orchestrator.run_full_pipeline("third")
+
+        assert result["skipped_steps"] == [2, 3, 4, 5, 6]
+        assert [number for number, _ in calls] == [1, 8, 9, 10, 11]
+
+    @pytest.mark.asyncio
+    async def test_unrefreshable_ibkr_output_reruns_search(self, orchestrator):
+        install_steps(orchestrator)
+        await orchestrator.run_full_pipeline("first")
+        orchestrator.ibkr_search_service.refresh_universe_with_ibkr.return_value = False
+        calls = install_steps(orchestrator)
+
+        result = await orchestrator.run_full_pipeline("second")
+
+        assert result["skipped_steps"] == [2, 3, 4, 5, 6, 7]
+        assert [number for number, _ in calls] == [1, 8, 9, 10, 11]
+
+    @pytest.mark.asyncio
+    async def test_recreated_universe_reruns_steps_that_modify_it(self, orchestrator, monkeypatch):
+        monkeypatch.setattr(settings.uncle_stock, "uncle_stock_screens", {"quality_bloom": "quality bloom"})
+        export = orchestrator._export_paths("current_screen")[0]
+        os.makedirs(os.path.dirname(export))
+        with open(export, "w") as f:
+            f.write("Ticker\nAAPL\n")
+        install_steps(orchestrator)
+        await orchestrator.run_step_range(2, 3, "first")
+
+        # Step 2 re-runs and writes the same (here: no) universe, dropping step 3's additions
+        with open(export, "w") as f:
+            f.write("Ticker\nAAPL\nMSFT\n")
+        calls = install_steps(orchestrator)
+        result = await orchestrator.run_step_range(2, 3, "second")
+
+        assert result["skipped_steps"] == []
+        assert [number for number, _ in calls] == [2, 3]
+
+    @pytest.mark.asyncio
+    async def test_changed_export_reruns_downstream_steps(self, orchestrator, monkeypatch):
+        monkeypatch.setattr(settings.uncle_stock, "uncle_stock_screens", {"quality_bloom": "quality bloom"})
+        export = orchestrator._export_paths("current_screen")[0]
+        os.makedirs(os.path.dirname(export))
+        with open(export, "w") as f:
+            f.write("Ticker\nAAPL\n")
+        install_steps(orchestrator)
+        await orchestrator.run_full_pipeline("first")
+
+        with open(export, "w") as f:
+            f.write("Ticker\nMSFT\n")
+        calls = install_steps(orchestrator)
+        result = await orchestrator.run_full_pipeline("second")
+
+        # No stock quantities changed, so there is nothing new to search
+        assert result["skipped_steps"] == [8]
+        assert len(calls) == 10
+
+    @pytest.mark.asyncio
+    async def test_edited_output_file_reruns_step_and_downstream(self, orchestrator):
+        os.makedirs("data", exist_ok=True)
+        install_steps(orchestrator)
+        await orchestrator.run_step_range(2, 4, "first")
+
+        with open("data/universe.json", "w") as f:
+            f.write("{}")
+        result = await orchestrator.run_step_range(2, 4, "second")
+
+        assert result["skipped_steps"] == []
+
+    @pytest.mark.asyncio
+    async def test_force_reruns_every_step(self, orchestrator):
+        install_steps(orchestrator)
+        await orchestrator.run_full_pipeline("first")
+        calls = install_steps(orchestrator)
+
+        result = await orchestrator.run_full_pipeline("second", force=True)
+
+        assert result["skipped_steps"] == []
+        assert len(calls) == 11
+
+    @pytest.mark.asyncio
+    async def test_failed_step_is_not_recorded(self, orchestrator):
+        install_steps(orchestrator, {4: lambda: False})
+        await orchestrator.run_step_range(2, 4, "first")
+        calls = install_steps(orchestrator)
+
+        result = await orchestrator.run_step_range(2, 4, "second")
+
+        assert result["skipped_steps"] == [2, 3]
+        assert [number for number, _ in calls] == [4]
+
+
+class TestStepWorkers:
+    """Blocking steps run in the worker pool with timeouts and cancellation"""
+
+    @pytest.mark.asyncio
+    async def test_status_is_served_while_a_blocking_step_runs(self, orchestrator):
+        release = threading.Event()
+        install_steps(orchestrator, {2: lambda: release.wait(timeout=5)})
+
+        run = asyncio.create_task(orchestrator.run_step_range(2, 2, "exec-5", force=True))
+        for _ in range(100):
+            status = await orchestrator.get_execution_status("exec-5")
+            if status["running_steps"] == [2]:
+                break
+            await asyncio.sleep(0.01)
+        release.set()
+
+        assert status["running_steps"] == [2]
+        assert (await run)["success"] is True
+
+    @pytest.mark.asyncio
+    async def test_timed_out_step_fails_and_blocks_conflicting_steps(self, orchestrator, monkeypatch):
+        release = threading.Event()
+        monkeypatch.setattr(settings.pipeline, "step_timeouts", {3: 0.05})
+        install_steps(orchestrator, {3: lambda: release.wait(timeout=5)})
+
+        result = await orchestrator.run_step_range(3, 3, "exec-6", force=True)
+        retry = await orchestrator.run_step_range(4, 4, "exec-7", force=True)
+        release.set()
+        await wait_idle(orchestrator)
+
+        assert result["failed_step"] == 3
+        assert result["step_results"][3].error_message == "Step 3 timed out after 0.05s"
+        assert retry["success"] is False
+        assert "Step 3 from a cancelled or timed-out run is still running" in retry["step_results"][4].error_message
+
+    @pytest.mark.asyncio
+    async def test_cancel_stops_the_run(self, orchestrator):
+        started = threading.Event()
+        release = threading.Event()
+
+        def step2():
+            started.set()
+            return release.wait(timeout=5)
+
+        calls = install_steps(orchestrator, {2: step2})
+        run = asyncio.create_task(orchestrator.run_full_pipeline("exec-8", force=True))
+        await asyncio.to_thread(started.wait, 5)
+
+        cancelled = await orchestrator.cancel_execution("exec-8")
+        result = await run
+        release.set()
+        await wait_idle(orchestrator)
+
+        assert cancelled["success"] is True
+        assert result["success"] is False
+        assert result["error_message"] == "Pipeline cancelled"
+        assert result["completed_steps"] == [1]
+        assert result["step_results"][2].error_message.startswith("Step 2 cancelled")
+        assert [number for number, _ in calls] == [1]
+        assert (await orchestrator.get_execution_status("exec-8"))["status"] == "cancelled"
+        assert (await orchestrator.cancel_execution("exec-8"))["success"] is False
+
+    @pytest.mark.asyncio
+    async def test_step_one_runs_on_the_server_loop(self, orchestrator):
+        orchestrator.screener_service.fetch_all_screener_data = AsyncMock(
+            return_value={"quality_bloom": {"success": True, "constituents_changed": True}}
+        )
+        orchestrator.screener_service.fetch_all_screener_histories = AsyncMock(return_value={})
+
+        assert await orchestrator._step1_fetch_data() is True
+        assert orchestrator.screen_changes == {"quality_bloom": True}
+
+    @pytest.mark.asyncio
+    async def test_step_seven_runs_in_the_worker_pool(self, orchestrator, monkeypatch):
+        quantity_orchestrator = Mock()
+        quantity_orchestrator.update_quantities.side_effect = lambda account: threading.current_thread()
+        monkeypatch.setattr(dependencies, "get_quantity_orchestrator_service", lambda: quantity_orchestrator)
+
+        thread = await orchestrator._call_step_function(
+            orchestrator._step_functions[7], key=7, account=(10000.0, "EUR")
+        )
+
+        assert thread is not threading.current_thread()
+        quantity_orchestrator.update_quantities.assert_called_once_with((10000.0, "EUR"))
+
+    @pytest.mark.asyncio
+    async def test_pool_keeps_key_busy_until_the_thread_returns(self):
+        pool = PipelineWorkerPool(max_workers=1)
+        release = threading.Event()
+
+        with pytest.raises(asyncio.TimeoutError):
+            await pool.run(release.wait, 5, key=3, timeout=0.01)
+        assert pool.busy() == {3}
+
+        release.set()
+        await pool.run(lambda: None)
+        assert pool.busy() == set()
+        pool.shutdown()
+
+
+class TestExecutionEvents:
+    """Live event stream of an execution"""
+
+    @pytest.mark.asyncio
+    async def test_stream_follows_a_run_until_it_finishes(self, orchestrator):
+        release = threading.Event()
+        install_steps(orchestrator, {2: lambda: release.wait(timeout=5)})
+        run = asyncio.create_task(orchestrator.run_step_range(2, 3, "exec-live"))
+        while orchestrator.execution_manager.get_execution_status("exec-live") is None:
+            await asyncio.sleep(0.01)
+        events = []
+
+        async def follow():
+            async for event in orchestrator.stream_execution_events("exec-live", heartbeat=0.05):
+                events.append(event)
+                if event["event"] == "heartbeat":
+                    release.set()
+
+        await asyncio.wait_for(asyncio.gather(run, follow()), 5)
+        _, total = orchestrator.execution_manager.get_execution_logs("exec-live")
+
+        assert events[0]["event"] == "status"
+        assert events[-1]["data"]["status"] == "completed"
+        assert events[-1]["data"]["progress_percentage"] == 100
+        assert "heartbeat" in [event["event"] for event in events]
+        assert [event["offset"] for event in events if event["event"] == "log"] == list(range(total))
+        assert [event["data"]["step_number"] for event in events if event["event"] == "step_complete"] == [2, 3]
+
+    @pytest.mark.asyncio
+    async def test_finished_run_is_replayed_from_offset(self, orchestrator):
+        install_steps(orchestrator)
+        await orchestrator.run_step_range(2, 3, "exec-done")
+        entries, total = orchestrator.execution_manager.get_execution_logs("exec-done")
+
+        events = [event async for event in orchestrator.stream_execution_events("exec-done", offset=2)]
+
+        assert events[0]["data"]["status"] == "completed"
+        assert [event["data"]["message"] for event in events[1:]] == [entry["message"] for entry in entries[2:]]
+        assert events[-1]["offset"] == total - 1
+        assert [event async for event in orchestrator.stream_execution_events("missing")] == []
+
+    @pytest.mark.asyncio
+    async def test_slow_subscriber_is_marked_overflowed(self):
+        broker = PipelineEventBroker(queue_size=2)
+        subscription = broker.subscribe("run")
+
+        for offset in range(3):
+            broker.publish("run", {"event": "log", "offset": offset})
+        await asyncio.sleep(0)
+
+        assert subscription.overflowed
+        assert await subscription.get(0.01) is None
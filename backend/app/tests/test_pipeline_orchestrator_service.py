@@ -426,11 +426,16 @@ class TestPipelineOrchestratorServiceCLICompatibility:
         # Step 2 depends on step 1
         assert step_info[2].dependencies == [1]
 
-        # Step 3 depends on step 2
-        assert step_info[3].dependencies == [2]
+        # Step 3 reads the backtest exports (step 1) and universe.json (step 2)
+        assert step_info[3].dependencies == [1, 2]
 
-        # Each subsequent step depends on the previous one
-        for i in range(2, 12):
+        # Currency update only needs the universe; quantities need targets and rates
+        assert step_info[5].dependencies == [2]
+        assert step_info[6].dependencies == [4]
+        assert step_info[7].dependencies == [5, 6]
+
+        # The remaining steps depend on the previous one
+        for i in [4, 8, 9, 10, 11]:
             assert step_info[i].dependencies == [i-1]
 
     def test_file_creation_patterns(self, orchestrator_service):
@@ -0,0 +1,141 @@
+"""
+Tests for the vectorised step 7 quantity engine
+The engine must leave every stock exactly as QuantityService.calculate_stock_fields would
+"""
+
+import copy
+import json
+import random
+
+import numpy as np
+import pytest
+
+from ..services.quantity_engine import QuantityEngine, round_half_even
+from ..services.implementations.quantity_service import QuantityService
+
+
+def make_stocks(count: int, seed: int = 7):
+    rng = random.Random(seed)
+    currencies = ["USD", "EUR", "JPY", "jpy", "GBP", "AUD"]
+    stocks = []
+    for i in range(count):
+        stock = {
+            "ticker": f"T{i}",
+            "currency": rng.choice(currencies),
+            "price": round(rng.uniform(0.01, 5000), rng.randint(0, 4)),
+            "eur_exchange_rate": rng.choice([1, 1.0, 0.92, 157.3, 1.78, "1.1"]),
+            "allocation_target": rng.choice([0, 0.0, rng.random() * 0.1, 1e-12, "0.05"]),
+            "final_target": rng.choice([0, rng.random() * 0.05, 5e-11]),
+        }
+        if rng.random() < 0.2:
+            stock["allocation_note"] = "minimal_allocation"
+        stocks.append(stock)
+    return stocks
+
+
+EDGE_STOCKS = [
+    {"ticker": "BADPRICE", "price": "n/a", "currency": "USD", "allocation_target": 0.1},
+    {"ticker": "ZERORATE", "price": 10, "eur_exchange_rate": 0, "currency": "USD", "allocation_target": 0.1},
+    {"ticker": "NEGRATE", "price": 10, "eur_exchange_rate": -0.0, "currency": "USD", "allocation_target": 0.1},
+    {"ticker": "NOPRICE", "currency": "JPY", "allocation_target": 0.1},
+    {"ticker": "NEGATIVE", "price": 10, "currency": "JPY", "allocation_target": -0.1},
+    {"ticker": "NANPRICE", "price": float("nan"), "currency": "EUR", "allocation_target": 0.1},
+    {"ticker": "NONE", "price": None, "currency": "EUR", "allocation_target": 0.1},
+    {"ticker": "HALF", "price": 4, "currency": "EUR", "allocation_target": 0.0001, "final_target": 0.0001},
+    {"ticker": "NOCURRENCY", "price": 12.5, "allocation_target": 0.2},
+]
+
+
+def scalar_result(stocks, account_value, screen_allocation):
+    service = QuantityService()
+    stocks = copy.deepcopy(stocks)
+    for stock in stocks:
+        service.calculate_stock_fields(stock, account_value, screen_allocation)
+    return json.dumps(stocks)
+
+
+def engine_result(stocks, account_value, screen_allocation):
+    service = QuantityService()
+    stocks = copy.deepcopy(stocks)
+    QuantityEngine().apply(stocks, account_value, screen_allocation, fallback=service.calculate_stock_fields)
+    return json.dumps(stocks)
+
+
+class TestQuantityEngineEquivalence:
+    """Byte-identical results against the per-dict implementation"""
+
+    @pytest.mark.parametrize("screen_allocation", [None, 0, 0.35, 1])
+    @pytest.mark.parametrize("account_value", [20000, 123456.78])
+    def test_random_universe_matches_scalar(self, screen_allocation, account_value):
+        stocks = make_stocks(500) + EDGE_STOCKS
+
+        assert engine_result(stocks, account_value, screen_allocation) == \
+            scalar_result(stocks, account_value, screen_allocation)
+
+    def test_calculate_stock_quantities_matches_scalar(self):
+        universe = {
+            "metadata": {"portfolio_optimization": {"optimal_allocations": {"a": 0.6, "b": 0.4}}},
+            "screens": {"a": {"stocks": make_stocks(50, 1)}, "b": {"stocks": make_stocks(50, 2)}},
+            "all_stocks": {s["ticker"]: s for s in make_stocks(80, 3)},
+        }
+        allocations = universe["metadata"]["portfolio_optimization"]["optimal_allocations"]
+        expected = copy.deepcopy(universe)
+        service = QuantityService()
+        for name, screen in expected["screens"].items():
+            for stock in screen["stocks"]:
+                service.calculate_stock_fields(stock, 50000.0, allocations[name])
+        for stock in expected["all_stocks"].values():
+            service.calculate_stock_fields(stock, 50000.0, None)
+
+        processed = service.calculate_stock_quantities(universe, 50000.0)
+
+        assert processed == 180
+        assert json.dumps(universe) == json.dumps(expected)
+
+
+class TestRoundHalfEven:
+    """Vectorised rounding must equal Python's round()"""
+
+    def test_matches_builtin_round_including_ties(self):
+        rng = random.Random(3)
+        values = [rng.uniform(-1e4, 1e4) for _ in range(20000)]
+        values += [2.675, 0.125, 0.0000005, 1.0000005, 1234.565, -0.005, -0.0, 1e300, float("inf")]
+        array = np.array(values)
+
+        for digits in (2, 6):
+            expected = [round(v, digits) for v in values]
+            assert [repr(v) for v in round_half_even(array, digits)] == [repr(v) for v in expected]
+
+
+class TestQuantityEngineLots:
+    """Per-currency lot sizes"""
+
+    def test_custom_lot_table_rounds_down_to_whole_lots(self):
+        stocks = [
+            {"ticker": "0700.HK", "currency": "HKD", "price": 1, "eur_exchange_rate": 1, "final_target": 0.0789},
+            {"ticker": "7203.T", "currency": "JPY", "price": 1, "eur_exchange_rate": 1, "final_target": 0.0789},
+            {"ticker": "AAPL", "currency": "USD", "price": 1, "eur_exchange_rate": 1, "final_target": 0.0789},
+        ]
+
+        stats = QuantityEngine({"JPY": 100, "hkd": 500}).apply(stocks, 10000)
+
+        assert [s["quantity"] for s in stocks] == [500, 700, 789]
+        assert stats["lot_adjustments"] == {"HKD": 1, "JPY": 1}
+
+    def test_unchanged_fields_are_not_rewritten(self):
+        stock = {"ticker": "AAPL", "currency": "USD", "price": 10.0, "final_target": 0.1}
+        QuantityEngine().apply([stock], 1000)
+        written = []
+
+        class Recording(dict):
+            def __setitem__(self, key, value):
+                written.append(key)
+                super().__setitem__(key, value)
+
+        QuantityEngine().apply([Recording(stock)], 1000)
+
+        assert written == []
+
+    def test_rows_needing_scalar_path_require_fallback(self):
+        with pytest.raises(ValueError):
+            QuantityEngine().apply([{"ticker": "X", "price": "bad"}], 1000)
@@ -13,83 +13,82 @@ import tempfile
 import os
 
 # Test target services
+from ..services.implementations import account_service as account_service_module
 from ..services.implementations.account_service import AccountService
 from ..services.implementations.quantity_service import QuantityService
 from ..services.implementations.quantity_orchestrator_service import QuantityOrchestratorService
+from ..services.quantity_engine import QuantityEngine
 
 
 class TestAccountService:
-    """Test IBKR account service functionality"""
+    """Test IBKR account service functionality over the shared IBKR session"""
 
     @pytest.fixture
     def account_service(self):
         """Create AccountService instance for testing"""
         return AccountService()
 
-    @pytest.fixture
-    def mock_ibapi_success(self):
-        """Mock successful IBKR API responses"""
-        mock_app = Mock()
-        mock_app.connected = True
-        mock_app.account_id = "DU123456"
-        mock_app.account_summary = {
-            "NetLiquidation": {
-                "value": "10000.50",
-                "currency": "EUR"
-            }
-        }
-        mock_app.connect.return_value = None
-        mock_app.disconnect.return_value = None
-        mock_app.run.return_value = None
-        mock_app.reqAccountSummary.return_value = None
-        mock_app.cancelAccountSummary.return_value = None
-        return mock_app
+    def make_session(self, connected=True, account_id="DU123456", summary=None):
+        """Fake shared session that answers reqAccountSummary through the registered handler"""
+        session = Mock()
+        session.ensure_connected.return_value = connected
+        session.account_id = account_id
+        handlers = {}
 
-    @pytest.fixture
-    def mock_ibapi_failure(self):
-        """Mock failed IBKR API connection"""
-        mock_app = Mock()
-        mock_app.connected = False
-        mock_app.account_id = None
-        mock_app.account_summary = {}
-        mock_app.connect.return_value = None
-        mock_app.disconnect.return_value = None
-        mock_app.run.return_value = None
-        return mock_app
+        def register_request(handler):
+            handlers[9002] = handler
+            return 9002
+
+        def req_account_summary(req_id, group, tags):
+            handler = handlers[req_id]
+            for tag, (value, currency) in (summary or {}).items():
+                handler.accountSummary(req_id, account_id, tag, value, currency)
+            handler.accountSummaryEnd(req_id)
+
+        session.register_request.side_effect = register_request
+        session.reqAccountSummary.side_effect = req_account_summary
+        return session
+
+    def patch_session(self, session):
+        manager = Mock()
+        manager.get_session.return_value = session
+        return patch.object(account_service_module, 'get_ibkr_session_manager', return_value=manager)
 
     @pytest.mark.asyncio
-    async def test_get_account_value_success(self, account_service, mock_ibapi_success):
+    async def test_get_account_value_success(self, account_service):
         """Test successful account value fetching"""
-        with patch('app.services.implementations.account_service.IBApi', return_value=mock_ibapi_success):
-            with patch('time.sleep'):  # Skip sleep delays in tests
-                total_value, currency = await account_service.get_account_total_value()
+        session = self.make_session(summary={"NetLiquidation": ("10000.50", "EUR")})
+
+        with self.patch_session(session):
+            total_value, currency = await account_service.get_account_total_value()
 
         assert total_value == 10000.50
         assert currency == "EUR"
-        mock_ibapi_success.connect.assert_called_once_with("127.0.0.1", 4002, clientId=3)
-        mock_ibapi_success.reqAccountSummary.assert_called_once_with(9002, "All", "NetLiquidation")
+        session.reqAccountSummary.assert_called_once_with(9002, "All", "NetLiquidation")
+        session.cancelAccountSummary.assert_called_once_with(9002)
+        session.release_request.assert_called_once_with(9002)
+        # Shared connection stays open for the next caller
+        session.disconnect.assert_not_called()
 
     @pytest.mark.asyncio
-    async def test_get_account_value_connection_failure(self, account_service, mock_ibapi_failure):
+    async def test_get_account_value_connection_failure(self, account_service):
         """Test connection failure handling"""
-        with patch('app.services.implementations.account_service.IBApi', return_value=mock_ibapi_failure):
-            with patch('time.sleep'):
-                total_value, currency = await account_service.get_account_total_value()
+        session = self.make_session(connected=False, account_id=None)
+
+        with self.patch_session(session):
+            total_value, currency = await account_service.get_account_total_value()
 
         assert total_value is None
         assert currency is None
+        session.reqAccountSummary.assert_not_called()
 
     @pytest.mark.asyncio
     async def test_get_account_value_no_account_id(self, account_service):
         """Test handling when no account ID is received"""
-        mock_app = Mock()
-        mock_app.connected = True
-        mock_app.account_id = None  # No account ID received
-        mock_app.account_summary = {}
+        session = self.make_session(account_id=None)
 
-        with patch('..services.implementations.account_service.IBApi', return_value=mock_app):
-            with patch('time.sleep'):
-                total_value, currency = await account_service.get_account_total_value()
+        with self.patch_session(session):
+            total_value, currency = await account_service.get_account_total_value()
 
         assert total_value is None
         assert currency is None
@@ -97,29 +96,21 @@ class TestAccountService:
     @pytest.mark.asyncio
     async def test_get_account_value_no_liquidation_data(self, account_service):
         """Test handling when NetLiquidation data is missing"""
-        mock_app = Mock()
-        mock_app.connected = True
-        mock_app.account_id = "DU123456"
-        mock_app.account_summary = {}  # No NetLiquidation data
-        mock_app.connect.return_value = None
-        mock_app.disconnect.return_value = None
-        mock_app.run.return_value = None
-        mock_app.reqAccountSummary.return_value = None
-        mock_app.cancelAccountSummary.return_value = None
-
-        with patch('..services.implementations.account_service.IBApi', return_value=mock_app):
-            with patch('time.sleep'):
-                total_value, currency = await account_service.get_account_total_value()
+        session = self.make_session(summary={})
+
+        with self.patch_session(session):
+            total_value, currency = await account_service.get_account_total_value()
 
         assert total_value is None
         assert currency is None
 
     @pytest.mark.asyncio
-    async def test_test_connection_success(self, account_service, mock_ibapi_success):
+    async def test_test_connection_success(self, account_service):
         """Test connection testing functionality"""
-        with patch('app.services.implementations.account_service.IBApi', return_value=mock_ibapi_success):
-            with patch('time.sleep'):
-                result = await account_service.test_connection()
+        session = self.make_session()
+
+        with self.patch_session(session):
+            result = await account_service.test_connection()
 
         assert result["connected"] is True
         assert result["account_id"] == "DU123456"
@@ -127,11 +118,12 @@ class TestAccountService:
         assert result["error_message"] is None
 
     @pytest.mark.asyncio
-    async def test_test_connection_failure(self, account_service, mock_ibapi_failure):
+    async def test_test_connection_failure(self, account_service):
         """Test connection testing with failure"""
-        with patch('app.services.implementations.account_service.IBApi', return_value=mock_ibapi_failure):
-            with patch('time.sleep'):
-                result = await account_service.test_connection()
+        session = self.make_session(connected=False, account_id=None)
+
+        with self.patch_session(session):
+            result = await account_service.test_connection()
 
         assert result["connected"] is False
         assert result["account_id"] is None
@@ -257,9 +249,24 @@ class TestQuantityService:
 
         # Should have printed adjustment message
         print_calls = [call.args[0] for call in mock_print.call_args_list]
-        adjustment_printed = any("Japanese stock" in call and "adjusted quantity" in call for call in print_calls)
+        adjustment_printed = any(
+            "JPY stock TYO:7203" in call and "adjusted quantity" in call and "lot size 100" in call
+            for call in print_calls
+        )
         assert adjustment_printed, "Should print Japanese stock adjustment message"
 
+    def test_calculate_stock_fields_uses_configured_lot_sizes(self, quantity_service):
+        """The scalar path rounds with the same lot sizes as the quantity engine"""
+        quantity_service.quantity_engine = QuantityEngine({"HKD": 500})
+        hong_kong_stock = {"ticker": "0700.HK", "price": 10.0, "eur_exchange_rate": 1.0, "currency": "HKD", "final_target": 0.1}
+        japanese_stock = {"ticker": "TYO:7203", "price": 10.0, "eur_exchange_rate": 1.0, "currency": "JPY", "final_target": 0.1}
+
+        quantity_service.calculate_stock_fields(hong_kong_stock, 126000.0)
+        quantity_service.calculate_stock_fields(japanese_stock, 126000.0)
+
+        assert hong_kong_stock["quantity"] == 1000
+        assert japanese_stock["quantity"] == 1260
+
     def test_calculate_stock_fields_minimal_allocation(self, quantity_service, sample_stock):
         """Test handling of very small allocations"""
         stock = sample_stock.copy()
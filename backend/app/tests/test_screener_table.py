@@ -0,0 +1,112 @@
+"""
+Tests for the indexed screener export reader and the legacy field lookups built on it
+"""
+
+import os
+
+import pytest
+
+from ..services.implementations.legacy.parser import extract_field_data, find_available_fields
+from ..services.screener_table import ScreenerTableCache, get_screener_table_cache
+
+EXPORT = (
+    'sep=,\n'
+    '"symbol","name","Price","Price","Price"\n'
+    '"","","","",""\n'
+    '"","","per share in stock price currency","180d change","1y change"\n'
+    '"AAA.AX"," Alpha ","1.50"," 12% ","20%"\n'
+    '"B","Too short","2","3%","4%"\n'
+    '"CCC","Short row","3.25"\n'
+    '"DDD.L","Delta","4.00","-5%","1%"\n'
+)
+
+
+@pytest.fixture
+def export_path(tmp_path):
+    path = tmp_path / "quality_bloom_current_screen.csv"
+    path.write_text(EXPORT, encoding="utf-8")
+    return str(path)
+
+
+class TestScreenerTable:
+    """Column map and ticker index"""
+
+    def test_field_matches_header_and_subtitle_substring(self, export_path):
+        table = ScreenerTableCache().get(export_path)
+
+        assert table.find_column("Price", "180d") == 3
+        assert table.find_column("Price", "per share") == 2
+        assert table.find_column("Price", "5y change") is None
+        assert table.field_value("AAA.AX", "Price", "180d change") == {
+            "ticker": "AAA.AX", "field": "Price | 180d change", "value": "12%"
+        }
+
+    def test_rows_must_reach_the_requested_column(self, export_path):
+        table = ScreenerTableCache().get(export_path)
+
+        assert table.field_value("CCC", "Price", "per share")["value"] == "3.25"
+        assert table.field_value("CCC", "Price", "180d change") is None
+        assert [row["ticker"] for row in table.field_values("Price", "180d change")] == ["AAA.AX", "DDD.L"]
+
+    def test_single_character_symbols_are_skipped(self, export_path):
+        table = ScreenerTableCache().get(export_path)
+
+        assert table.field_value("B", "Price", "180d change") is None
+        assert "B" not in table.ticker_rows
+
+    def test_available_fields(self, export_path):
+        fields = ScreenerTableCache().get(export_path).available_fields
+
+        assert fields == [
+            ("Price", "per share in stock price currency", 2),
+            ("Price", "180d change", 3),
+            ("Price", "1y change", 4),
+        ]
+
+
+class TestScreenerTableCache:
+    """One parse per file version"""
+
+    def test_lookups_reuse_the_parsed_table(self, export_path):
+        cache = ScreenerTableCache()
+
+        first = cache.get(export_path)
+        second = cache.get(export_path)
+
+        assert first is second
+        assert cache.get_stats()["misses"] == 1
+        assert cache.get_stats()["hits"] == 1
+
+    def test_rewritten_file_is_parsed_again(self, export_path):
+        cache = ScreenerTableCache()
+        cache.get(export_path)
+
+        with open(export_path, "a", encoding="utf-8") as f:
+            f.write('"EEE.PA","Echo","5","6%","7%"\n')
+        stat = os.stat(export_path)
+        os.utime(export_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+        assert cache.get(export_path).field_value("EEE.PA", "Price", "1y")["value"] == "7%"
+
+    def test_missing_file(self, tmp_path):
+        assert ScreenerTableCache().get(str(tmp_path / "missing.csv")) is None
+
+
+class TestLegacyFieldLookups:
+    """extract_field_data / find_available_fields keep their legacy results"""
+
+    def test_extract_field_data(self, export_path):
+        assert extract_field_data(export_path, "Price", "1y change", "DDD.L")["value"] == "1%"
+        assert extract_field_data(export_path, "Price", "1y change", "ZZZ") is None
+        assert len(extract_field_data(export_path, "Price", "per share")) == 3
+        assert get_screener_table_cache().get(export_path) is get_screener_table_cache().get(export_path)
+
+    def test_missing_file_returns_empty_results(self, tmp_path):
+        missing = str(tmp_path / "missing.csv")
+
+        assert extract_field_data(missing, "Price", "180d change", "AAA.AX") is None
+        assert extract_field_data(missing, "Price", "180d change") == []
+        assert find_available_fields(missing) == []
+
+    def test_find_available_fields(self, export_path):
+        assert [column for _, _, column in find_available_fields(export_path)] == [2, 3, 4]
@@ -0,0 +1,66 @@
+"""
+Tests for the shared SQLite store base, JSON sidecar and per-path registry
+"""
+
+import os
+
+import pytest
+
+from ..services.shared_store import DELETE_BATCH_SIZE, JsonSidecar, PathRegistry, SQLiteStore
+
+
+class KeyStore(SQLiteStore):
+    def _initialize_database(self):
+        with self._lock, self._connection() as conn:
+            conn.execute("CREATE TABLE IF NOT EXISTS items (key INTEGER PRIMARY KEY)")
+            conn.execute("CREATE TABLE IF NOT EXISTS notes (key INTEGER)")
+
+
+class Sidecar(JsonSidecar):
+    SECTIONS = ("entries",)
+
+    def __init__(self, directory):
+        super().__init__(directory, ".state.json")
+
+    def put(self, key, value):
+        with self._lock:
+            self._load()["entries"][key] = value
+            self._save()
+
+
+class TestSQLiteStore:
+    def test_subclasses_must_define_their_schema(self, tmp_path):
+        with pytest.raises(TypeError):
+            SQLiteStore(str(tmp_path / "keys.db"))
+
+    def test_delete_keys_spans_batches_and_tables(self, tmp_path):
+        store = KeyStore(str(tmp_path / "nested" / "keys.db"))
+        keys = list(range(DELETE_BATCH_SIZE * 2 + 7))
+        with store._lock, store._connection() as conn:
+            conn.executemany("INSERT INTO items (key) VALUES (?)", [(key,) for key in keys])
+            conn.executemany("INSERT INTO notes (key) VALUES (?)", [(key,) for key in keys])
+            store._delete_keys(conn, [("notes", "key"), ("items", "key")], keys[1:])
+            remaining = [conn.execute(f"SELECT key FROM {table}").fetchall() for table in ("items", "notes")]
+        store.close()
+
+        assert [[row[0] for row in rows] for rows in remaining] == [[0], [0]]
+
+
+class TestJsonSidecar:
+    def test_state_round_trips_and_survives_corruption(self, tmp_path):
+        Sidecar(str(tmp_path)).put("a", 1)
+
+        assert Sidecar(str(tmp_path))._load() == {"entries": {"a": 1}}
+        assert not os.path.exists(tmp_path / ".state.json.tmp")
+
+        (tmp_path / ".state.json").write_text("not json")
+        assert Sidecar(str(tmp_path))._load() == {"entries": {}}
+
+
+class TestPathRegistry:
+    def test_one_instance_per_absolute_path(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        registry = PathRegistry(Sidecar)
+
+        assert registry.get("data") is registry.get(str(tmp_path / "data"))
+        assert registry.get("other") is not registry.get("data")
@@ -0,0 +1,97 @@
+"""
+Tests for the analytic-gradient Sharpe optimiser (step 4)
+Weights and statistics must match the legacy pandas objective within solver tolerance
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+from scipy.optimize import approx_fprime
+
+from ..services.implementations.legacy import portfolio_optimizer as legacy
+from ..services.implementations.portfolio_optimizer_service import PortfolioOptimizerService
+from ..services.sharpe_optimizer import SharpeOptimizer
+from .conftest import make_returns
+
+
+class TestSharpeOptimizerMoments:
+    """Objective and gradient"""
+
+    def test_stats_match_pandas_calculation(self):
+        returns = make_returns(6)
+        weights = np.random.default_rng(1).dirichlet(np.ones(6))
+
+        expected = legacy.calculate_portfolio_stats(weights, returns)
+
+        assert SharpeOptimizer(returns).portfolio_stats(weights) == pytest.approx(expected, rel=1e-12)
+        assert SharpeOptimizer(returns).negative_sharpe(weights)[0] == pytest.approx(-expected[2], rel=1e-12)
+
+    def test_gradient_matches_finite_differences(self):
+        optimizer = SharpeOptimizer(make_returns(8))
+        weights = np.random.default_rng(2).dirichlet(np.ones(8))
+
+        numeric = approx_fprime(weights, lambda w: optimizer.negative_sharpe(w)[0], 1e-7)
+
+        np.testing.assert_allclose(optimizer.negative_sharpe(weights)[1], numeric, rtol=1e-4, atol=1e-6)
+
+    def test_zero_volatility_has_zero_sharpe(self):
+        returns = pd.DataFrame({"a": [0.01] * 8, "b": [0.01] * 8})
+
+        value, gradient = SharpeOptimizer(returns).negative_sharpe(np.array([0.5, 0.5]))
+
+        assert value == 0.0
+        assert not gradient.any()
+
+    def test_missing_values_are_rejected(self):
+        returns = make_returns(3)
+        returns.iloc[2, 1] = np.nan
+
+        with pytest.raises(ValueError):
+            SharpeOptimizer(returns)
+
+
+class TestSharpeOptimizerResults:
+    """Optimised weights against the legacy finite-difference optimiser"""
+
+    @pytest.mark.parametrize("n_screeners", [2, 5, 30])
+    def test_weights_match_legacy(self, n_screeners):
+        returns = make_returns(n_screeners)
+
+        expected = legacy.optimize_portfolio(returns)
+        actual = PortfolioOptimizerService().optimize_portfolio(returns)
+
+        assert actual['optimization_success']
+        for screener, weight in expected['optimal_weights'].items():
+            assert actual['optimal_weights'][screener] == pytest.approx(weight, abs=1e-5)
+        assert actual['portfolio_stats']['sharpe_ratio'] == pytest.approx(
+            expected['portfolio_stats']['sharpe_ratio'], rel=1e-6
+        )
+        assert actual['correlation_matrix'] == expected['correlation_matrix']
+
+    def test_warm_start_from_previous_allocations(self):
+        returns = make_returns(5)
+        service = PortfolioOptimizerService()
+        previous = service.optimize_portfolio(returns)['optimal_weights']
+
+        warm = service.optimize_portfolio(returns, previous_weights=previous)
+
+        for screener, weight in previous.items():
+            assert warm['optimal_weights'][screener] == pytest.approx(weight, abs=1e-5)
+
+    def test_initial_weights_cover_new_screeners(self):
+        optimizer = SharpeOptimizer(make_returns(4))
+
+        start = optimizer.initial_weights({"screener_0": 0.5, "screener_1": 0.5, "retired": 1.0})
+
+        assert start.sum() == pytest.approx(1.0)
+        assert start[2] == start[3] > 0
+        assert start[0] == start[1] > start[2]
+        np.testing.assert_array_equal(optimizer.initial_weights({"retired": 1.0}), np.full(4, 0.25))
+
+    def test_missing_values_use_legacy_objective(self):
+        returns = make_returns(3)
+        returns.iloc[0, 0] = np.nan
+
+        result = PortfolioOptimizerService().optimize_portfolio(returns)
+
+        assert sum(result['optimal_weights'].values()) == pytest.approx(1.0)
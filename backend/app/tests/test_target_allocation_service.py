@@ -9,6 +9,7 @@ import tempfile
 from unittest.mock import Mock, patch, MagicMock
 from typing import Dict, Any
 
+from ..services.implementations import target_allocation_service as target_allocation_module
 from ..services.implementations.target_allocation_service import TargetAllocationService
 from ..core.config import settings
 
@@ -244,17 +245,32 @@ class TestTargetAllocationService:
             expected_final = 0.35 * settings.portfolio.max_allocation
             assert abs(aapl_data["final_allocation"] - expected_final) < 0.001
 
-    @patch('json.load')
-    @patch('builtins.open')
     @patch('os.path.exists')
-    def test_load_universe_data_success(self, mock_exists, mock_open, mock_json_load, service, sample_universe_data):
+    def test_load_universe_data_success(self, mock_exists, service, sample_universe_data):
         """Test successful universe data loading"""
         mock_exists.return_value = True
-        mock_json_load.return_value = sample_universe_data
 
-        result = service.load_universe_data()
+        with patch.object(target_allocation_module, 'get_universe_store') as mock_store:
+            mock_store.return_value.load.return_value = sample_universe_data
+            result = service.load_universe_data()
+
         assert result == sample_universe_data
-        mock_open.assert_called_once_with("data/universe.json", 'r', encoding='utf-8')
+        mock_store.assert_called_once_with("data/universe.json")
+
+    def test_save_allocations_writes_fields_through_the_store(self, service, sample_universe_data):
+        """Allocation fields go to the store by ticker; universe_data is left untouched"""
+        allocations = {
+            "AAPL": {"rank": 1, "pocket_allocation": 0.1, "screener_target": 0.35, "final_allocation": 0.035}
+        }
+
+        with patch.object(target_allocation_module, 'get_universe_store') as mock_store:
+            assert service.save_allocations(sample_universe_data, allocations) is True
+
+        mock_store.return_value.update_stock_fields.assert_called_once_with({
+            "AAPL": {"rank": 1, "allocation_target": 0.1, "screen_target": 0.35, "final_target": 0.035}
+        })
+        mock_store.return_value.export.assert_called_once_with()
+        assert "rank" not in sample_universe_data["screens"]["quality_bloom"]["stocks"][0]
 
     @patch('os.path.exists')
     def test_load_universe_data_file_not_found(self, mock_exists, service):
@@ -338,29 +354,35 @@ class TestTargetAllocationService:
         assert result["summary_stats"]["total_stocks"] == 2
         assert result["summary_stats"]["stocks_with_allocation"] == 2
 
-    @patch('backend.app.services.implementations.legacy.targetter.main')
-    def test_main_success(self, mock_legacy_main, service):
+    def test_main_success(self, service, sample_universe_data):
         """Test successful main execution"""
-        mock_legacy_main.return_value = True
+        allocations = {"AAPL": {"final_allocation": 0.035}}
+        with patch.object(service, 'load_universe_data', return_value=sample_universe_data) as mock_load, \
+             patch.object(service, 'calculate_final_allocations', return_value=allocations), \
+             patch.object(service, 'display_allocation_summary'), \
+             patch.object(service, 'save_allocations', return_value=True) as mock_save:
+            result = service.main()
 
-        result = service.main()
         assert result is True
-        mock_legacy_main.assert_called_once()
+        mock_load.assert_called_once_with(read_only=True)
+        mock_save.assert_called_once_with(sample_universe_data, allocations)
 
-    @patch('backend.app.services.implementations.legacy.targetter.main')
-    def test_main_failure(self, mock_legacy_main, service):
+    def test_main_failure(self, service, sample_universe_data):
         """Test main execution failure"""
-        mock_legacy_main.return_value = False
+        with patch.object(service, 'load_universe_data', return_value=sample_universe_data), \
+             patch.object(service, 'calculate_final_allocations', return_value={"AAPL": {}}), \
+             patch.object(service, 'display_allocation_summary'), \
+             patch.object(service, 'save_allocations', return_value=False) as mock_save:
+            result = service.main()
 
-        result = service.main()
         assert result is False
+        mock_save.assert_called_once()
 
-    @patch('backend.app.services.implementations.legacy.targetter.main')
-    def test_main_exception(self, mock_legacy_main, service):
+    def test_main_exception(self, service):
         """Test main execution with exception"""
-        mock_legacy_main.side_effect = Exception("Test error")
+        with patch.object(service, 'load_universe_data', side_effect=Exception("Test error")):
+            result = service.main()
 
-        result = service.main()
         assert result is False
 
 
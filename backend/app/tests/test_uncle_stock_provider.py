@@ -0,0 +1,284 @@
+"""
+Tests for the pooled aiohttp Uncle Stock provider
+Runs against a local aiohttp server, so no real API calls are made
+"""
+import asyncio
+import threading
+import time
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from ..core.config import settings
+from ..core.exceptions import UncleStockRateLimitError
+from ..services.implementations.file_manager import FileManager
+from ..services.implementations.uncle_stock_provider import UncleStockProvider
+
+SCREENS = {"quality_bloom": "quality bloom", "TOR_Surplus": "TOR Surplus", "Moat_Companies": "Moat Companies"}
+
+# Each fake endpoint answers after this delay
+RESPONSE_DELAY = 0.2
+
+
+class FakeUncleStock:
+    """Local stand-in for /csv and /backtest-result with scriptable failures"""
+
+    def __init__(self):
+        self.failures = {}  # query -> list of status codes to return before succeeding
+        self.symbols = {}  # query -> symbols returned by /csv (default: two derived from the query)
+        self.etag = None
+        self.calls = []
+        self.request_headers = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.app = web.Application()
+        self.app.router.add_get("/csv", self.csv)
+        self.app.router.add_get("/backtest-result", self.history)
+
+    async def _respond(self, request: web.Request, body: str) -> web.Response:
+        query = request.query["query"]
+        self.calls.append((request.path, query))
+        self.request_headers.append(request.headers)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(RESPONSE_DELAY)
+        finally:
+            self.in_flight -= 1
+
+        pending = self.failures.get(query)
+        if pending:
+            return web.Response(status=pending.pop(0), text="try again")
+        if self.etag:
+            if request.headers.get("If-None-Match") == self.etag:
+                return web.Response(status=304)
+            return web.Response(text=body, headers={"ETag": self.etag})
+        return web.Response(text=body)
+
+    async def csv(self, request: web.Request) -> web.Response:
+        query = request.query["query"]
+        symbols = self.symbols.get(query, [f"{query[:3].upper()}1", f"{query[:3].upper()}2"])
+        rows = "".join(f'"{symbol}","Name"\n' for symbol in symbols)
+        return await self._respond(request, f'sep=,\n"Symbol","Name"\n{rows}')
+
+    async def history(self, request: web.Request) -> web.Response:
+        return await self._respond(request, '"Annual return","12.5%"\n"Sharpe ratio","0.9"\n')
+
+
+@pytest.fixture
+def fake_api():
+    return FakeUncleStock()
+
+
+@pytest.fixture
+def provider_factory(fake_api, monkeypatch, tmp_path):
+    """Build providers pointed at a running FakeUncleStock server, exporting to tmp_path"""
+    monkeypatch.setattr(settings.uncle_stock, "user_id", "test_user")
+    monkeypatch.setattr(settings.uncle_stock, "uncle_stock_screens", SCREENS)
+    monkeypatch.setattr(settings.uncle_stock, "retry_backoff", 0.01)
+    monkeypatch.setattr(settings.uncle_stock, "data_exports_dir", str(tmp_path))
+
+    async def build():
+        server = TestServer(fake_api.app)
+        await server.start_server()
+        provider = UncleStockProvider(FileManager())
+        provider.base_url = str(server.make_url("")).rstrip("/")
+        return provider, server
+
+    return build
+
+
+class TestUncleStockProvider:
+    """Concurrent fetching over one pooled session"""
+
+    @pytest.mark.asyncio
+    async def test_all_screens_fetched_concurrently_in_config_order(self, provider_factory, fake_api):
+        provider, server = await provider_factory()
+        try:
+            start = time.perf_counter()
+            stocks, histories = await asyncio.gather(provider.get_all_screeners(), provider.get_all_screener_histories())
+            elapsed = time.perf_counter() - start
+        finally:
+            await provider.close()
+            await server.close()
+
+        assert list(stocks) == list(SCREENS)
+        assert stocks["TOR_Surplus"]["data"] == ["TOR1", "TOR2"]
+        assert histories["quality_bloom"]["data"] == {"Annual return": "12.5%", "Sharpe ratio": "0.9"}
+        # Six requests of RESPONSE_DELAY each, overlapping rather than back to back
+        assert fake_api.max_in_flight == 6
+        assert elapsed < 3 * RESPONSE_DELAY
+
+    @pytest.mark.asyncio
+    async def test_concurrency_is_bounded(self, provider_factory, fake_api):
+        provider, server = await provider_factory()
+        provider.max_concurrent_requests = 2
+        try:
+            await provider.get_all_screeners()
+        finally:
+            await provider.close()
+            await server.close()
+
+        assert fake_api.max_in_flight == 2
+
+    @pytest.mark.asyncio
+    async def test_transient_errors_are_retried(self, provider_factory, fake_api):
+        fake_api.failures["quality bloom"] = [503, 429]
+        provider, server = await provider_factory()
+        try:
+            result = await provider.get_current_stocks("quality bloom")
+        finally:
+            await provider.close()
+            await server.close()
+
+        assert result["success"] is True
+        assert len(fake_api.calls) == 3
+
+    @pytest.mark.asyncio
+    async def test_rate_limit_raises_after_last_attempt(self, provider_factory, fake_api):
+        fake_api.failures["quality bloom"] = [429] * 5
+        provider, server = await provider_factory()
+        try:
+            with pytest.raises(UncleStockRateLimitError):
+                await provider.get_current_stocks("quality bloom")
+        finally:
+            await provider.close()
+            await server.close()
+
+        assert len(fake_api.calls) == settings.uncle_stock.retry_attempts
+
+    @pytest.mark.asyncio
+    async def test_client_errors_are_not_retried(self, provider_factory, fake_api):
+        fake_api.failures["quality bloom"] = [404]
+        provider, server = await provider_factory()
+        try:
+            result = await provider.get_current_stocks("quality bloom")
+        finally:
+            await provider.close()
+            await server.close()
+
+        assert result == {"success": False, "data": "API returned status 404", "raw_response": "try again"}
+        assert len(fake_api.calls) == 1
+
+    @pytest.mark.asyncio
+    async def test_session_is_reused(self, provider_factory):
+        provider, server = await provider_factory()
+        try:
+            await provider.get_current_stocks("quality bloom")
+            session = provider.session
+            await provider.get_screener_history("quality bloom")
+            assert provider.session is session
+        finally:
+            await provider.close()
+            await server.close()
+
+        assert provider.session is None
+
+
+    @pytest.mark.asyncio
+    async def test_each_event_loop_keeps_its_own_session(self, provider_factory):
+        provider, server = await provider_factory()
+
+        async def fetch_on_another_loop():
+            await provider.get_screener_history("quality bloom")
+            other = provider.session
+            await provider.close()
+            return other
+
+        try:
+            await provider.get_current_stocks("quality bloom")
+            session = provider.session
+            other = await asyncio.to_thread(asyncio.run, fetch_on_another_loop())
+
+            assert other is not session and other.closed
+            assert provider.session is session and not session.closed
+        finally:
+            await provider.close()
+            await server.close()
+
+
+class TestDeltaFetching:
+    """Unchanged exports are not rewritten and report no change"""
+
+    @pytest.mark.asyncio
+    async def test_unchanged_download_leaves_file_untouched(self, provider_factory, tmp_path):
+        provider, server = await provider_factory()
+        path = tmp_path / "quality_bloom_current_screen.csv"
+        try:
+            first = await provider.get_current_stocks("quality bloom")
+            mtime = path.stat().st_mtime_ns
+            second = await provider.get_current_stocks("quality bloom")
+        finally:
+            await provider.close()
+            await server.close()
+
+        assert first["changed"] is True and first["constituents_changed"] is True
+        assert second["changed"] is False and second["constituents_changed"] is False
+        assert second["data"] == first["data"]
+        assert path.stat().st_mtime_ns == mtime
+
+    @pytest.mark.asyncio
+    async def test_new_constituents_are_signalled(self, provider_factory, fake_api):
+        provider, server = await provider_factory()
+        try:
+            await provider.get_current_stocks("quality bloom")
+            fake_api.symbols["quality bloom"] = ["QUA1", "NEW"]
+            result = await provider.get_current_stocks("quality bloom")
+        finally:
+            await provider.close()
+            await server.close()
+
+        assert result["changed"] is True and result["constituents_changed"] is True
+        assert result["data"] == ["QUA1", "NEW"]
+
+    @pytest.mark.asyncio
+    async def test_etag_is_sent_back_and_304_reuses_file(self, provider_factory, fake_api, tmp_path):
+        fake_api.etag = '"v1"'
+        provider, server = await provider_factory()
+        try:
+            await provider.get_screener_history("quality bloom")
+            result = await provider.get_screener_history("quality bloom")
+        finally:
+            await provider.close()
+            await server.close()
+
+        assert "If-None-Match" not in fake_api.request_headers[0]
+        assert fake_api.request_headers[1]["If-None-Match"] == '"v1"'
+        assert result["changed"] is False
+        assert result["data"] == {"Annual return": "12.5%", "Sharpe ratio": "0.9"}
+
+    @pytest.mark.asyncio
+    async def test_edited_file_is_rewritten(self, provider_factory, tmp_path):
+        provider, server = await provider_factory()
+        try:
+            await provider.get_current_stocks("quality bloom")
+            path = tmp_path / "quality_bloom_current_screen.csv"
+            path.write_text("edited by hand", encoding="utf-8")
+            result = await provider.get_current_stocks("quality bloom")
+        finally:
+            await provider.close()
+            await server.close()
+
+        assert result["changed"] is True
+        assert "edited by hand" not in path.read_text(encoding="utf-8")
+
+    @pytest.mark.asyncio
+    async def test_exports_are_written_off_the_event_loop(self, provider_factory, monkeypatch):
+        provider, server = await provider_factory()
+        save_export = provider._save_export
+        threads = []
+
+        def recording_save(*args):
+            threads.append(threading.current_thread())
+            return save_export(*args)
+
+        monkeypatch.setattr(provider, "_save_export", recording_save)
+        try:
+            result = await provider.get_current_stocks("quality bloom")
+        finally:
+            await provider.close()
+            await server.close()
+
+        assert result["changed"] is True
+        assert threads and threads[0] is not threading.current_thread()
@@ -0,0 +1,110 @@
+"""
+Tests for the process-wide parsed-universe cache
+Covers version keyed reuse, invalidation on rewrite and the precomputed views
+"""
+
+import json
+import os
+from unittest.mock import patch
+
+import pytest
+
+from ..services import universe_cache as universe_cache_module
+from ..services.universe_cache import UniverseCache
+from ..services.implementations.universe_service import create_universe_service
+
+
+def make_universe():
+    return {
+        "metadata": {"total_stocks": 3},
+        "screens": {
+            "quality": {"name": "Quality", "stocks": [
+                {"ticker": "AAPL", "quantity": 3, "eur_price": 170.0, "currency": "USD"},
+                {"ticker": "SAP", "currency": "EUR"},
+            ]},
+            "value": {"name": "Value", "stocks": [
+                {"ticker": "AAPL", "quantity": 2, "currency": "USD"},
+                {"ticker": "BMW", "quantity": 7, "currency": "EUR"},
+            ]},
+        },
+        "all_stocks": {
+            "AAPL": {"ticker": "AAPL", "screens": ["Quality", "Value"], "quantity": 5},
+            "SAP": {"ticker": "SAP", "screens": ["Quality"]},
+            "BMW": {"ticker": "BMW", "screens": ["Value"], "quantity": 7},
+        },
+    }
+
+
+def write_universe(path, universe_data):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(universe_data, f, indent=2)
+
+
+@pytest.fixture
+def universe_file(tmp_path):
+    path = tmp_path / "universe.json"
+    write_universe(path, make_universe())
+    return path
+
+
+class TestUniverseCache:
+    """Parse once per (path, mtime_ns, size)"""
+
+    def test_repeat_reads_share_one_parse(self, universe_file):
+        cache = UniverseCache()
+
+        first = cache.get(universe_file)
+        second = cache.get(str(universe_file))
+
+        assert first is second
+        assert cache.get_stats()["misses"] == 1
+        assert cache.get_stats()["hits"] == 1
+
+    def test_rewrite_is_picked_up(self, universe_file):
+        cache = UniverseCache()
+        old = cache.get(universe_file)
+
+        universe_data = make_universe()
+        universe_data["metadata"]["total_stocks"] = 42
+        write_universe(universe_file, universe_data)
+        os.utime(universe_file, ns=(0, 1))
+
+        new = cache.get(universe_file)
+
+        assert new is not old
+        assert new.data["metadata"]["total_stocks"] == 42
+
+    def test_missing_file_returns_none(self, tmp_path):
+        assert UniverseCache().get(tmp_path / "missing.json") is None
+
+    def test_derived_views(self, universe_file):
+        snapshot = UniverseCache().get(universe_file)
+
+        assert snapshot.screen_membership["AAPL"] == ["quality", "value"]
+        assert [ticker for ticker, _ in snapshot.multi_screen_stocks] == ["AAPL"]
+        summary = snapshot.quantity_summary
+        assert (summary["stocks_with_quantities"], summary["total_stocks"]) == (5, 7)
+        assert [s["ticker"] for s in summary["sample_stocks"]] == ["AAPL", "AAPL", "BMW"]
+
+
+class TestUniverseServiceCaching:
+    """Read-only universe endpoints go through the shared cache"""
+
+    def test_load_universe_reuses_snapshot_views(self, universe_file):
+        cache = UniverseCache()
+        service = create_universe_service()
+
+        with patch.object(universe_cache_module, "_universe_cache", cache):
+            universe = service.load_universe(str(universe_file))
+            again = service.load_universe(str(universe_file))
+            multi = service.get_stocks_in_multiple_screens(universe)
+
+        assert universe is again
+        assert multi is cache.get(universe_file).multi_screen_stocks
+
+    def test_uncached_universe_still_scanned(self):
+        service = create_universe_service()
+
+        multi = service.get_stocks_in_multiple_screens(make_universe())
+
+        assert [ticker for ticker, _ in multi] == ["AAPL"]
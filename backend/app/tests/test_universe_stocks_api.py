@@ -0,0 +1,108 @@
+"""
+Tests for the paginated / streamed universe stock listing
+GET /api/v1/universe/stocks with cursor pagination, projection, screen filters and NDJSON
+"""
+
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+from ..main import app
+
+client = TestClient(app)
+
+
+@pytest.fixture
+def universe_path(tmp_path):
+    universe = {
+        "metadata": {"total_stocks": 5},
+        "screens": {
+            "quality_bloom": {"name": "quality bloom", "stocks": []},
+            "TOR_Surplus": {"name": "TOR Surplus", "stocks": []},
+        },
+        "all_stocks": {
+            f"T{i}": {
+                "ticker": f"T{i}",
+                "price": 10.0 + i,
+                "quantity": i,
+                "sector": "Tech",
+                "screens": ["quality bloom"] if i % 2 == 0 else ["TOR Surplus"],
+            }
+            for i in range(5)
+        },
+    }
+    path = tmp_path / "universe.json"
+    path.write_text(json.dumps(universe, indent=2), encoding="utf-8")
+    return str(path)
+
+
+class TestUniverseStocksListing:
+    """JSON pages"""
+
+    def test_cursor_walks_every_stock_once(self, universe_path):
+        tickers, cursor = [], None
+        while True:
+            params = {"universe_path": universe_path, "limit": 2}
+            if cursor:
+                params["cursor"] = cursor
+            page = client.get("/api/v1/universe/stocks", params=params).json()
+            tickers += [stock["ticker"] for stock in page["stocks"]]
+            cursor = page["next_cursor"]
+            if cursor is None:
+                break
+
+        assert tickers == ["T0", "T1", "T2", "T3", "T4"]
+
+    def test_fields_projection_and_screen_filter(self, universe_path):
+        response = client.get("/api/v1/universe/stocks", params={
+            "universe_path": universe_path,
+            "fields": "price,quantity",
+            "screens": "TOR_Surplus",
+        })
+
+        assert response.status_code == 200
+        assert response.json()["stocks"] == [
+            {"ticker": "T1", "price": 11.0, "quantity": 1},
+            {"ticker": "T3", "price": 13.0, "quantity": 3},
+        ]
+
+    def test_invalid_cursor_is_rejected(self, universe_path):
+        response = client.get("/api/v1/universe/stocks", params={
+            "universe_path": universe_path, "cursor": "not-a-cursor"
+        })
+
+        assert response.status_code == 400
+
+    def test_missing_universe_returns_404(self, tmp_path):
+        response = client.get("/api/v1/universe/stocks", params={
+            "universe_path": str(tmp_path / "missing.json")
+        })
+
+        assert response.status_code == 404
+
+
+class TestUniverseStocksNDJSON:
+    """Streamed one-stock-per-line mode"""
+
+    def test_streams_every_matching_stock(self, universe_path):
+        response = client.get("/api/v1/universe/stocks", params={
+            "universe_path": universe_path, "format": "ndjson", "fields": "ticker", "screens": "quality bloom"
+        })
+
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        assert lines == [{"ticker": "T0"}, {"ticker": "T2"}, {"ticker": "T4"}]
+
+    def test_truncated_stream_ends_with_cursor(self, universe_path):
+        first = client.get("/api/v1/universe/stocks", params={
+            "universe_path": universe_path, "format": "ndjson", "fields": "ticker", "limit": 3
+        })
+        lines = [json.loads(line) for line in first.text.splitlines()]
+
+        assert [line["ticker"] for line in lines[:3]] == ["T0", "T1", "T2"]
+        rest = client.get("/api/v1/universe/stocks", params={
+            "universe_path": universe_path, "format": "ndjson", "fields": "ticker",
+            "cursor": lines[3]["next_cursor"]
+        })
+        assert [json.loads(line)["ticker"] for line in rest.text.splitlines()] == ["T3", "T4"]
@@ -0,0 +1,228 @@
+"""
+Tests for the SQLite-backed universe store
+Covers byte-compatible export, field-level updates and change tracking
+"""
+
+import json
+import os
+from pathlib import Path
+
+import pytest
+
+from ..services.universe_store import (
+    ALL_STOCKS_CONTAINER,
+    REMOVE_FIELD,
+    TrackedStock,
+    UniverseConflictError,
+    UniverseStore,
+    screen_container
+)
+
+REPO_UNIVERSE = Path(__file__).parent.parent.parent / "data" / "universe.json"
+
+
+def make_universe():
+    stocks = [
+        {"ticker": "AAPL", "name": "Apple Inc", "price": 190.5, "currency": "USD"},
+        {"ticker": "SAP", "name": "SAP SE – Walldorf", "price": 120.0, "currency": "EUR"},
+    ]
+    return {
+        "metadata": {"screens": ["quality"], "total_stocks": 2},
+        "screens": {
+            "quality": {"name": "Quality", "count": 2, "stocks": [dict(s) for s in stocks]},
+            "empty": {"name": "Empty", "count": 0, "stocks": []},
+        },
+        "all_stocks": {s["ticker"]: dict(s) for s in stocks},
+    }
+
+
+def write_universe(path: Path, universe_data) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(universe_data, f, indent=2, ensure_ascii=False)
+
+
+def legacy_dump(universe_data) -> str:
+    return json.dumps(universe_data, indent=2, ensure_ascii=False)
+
+
+@pytest.fixture
+def universe_file(tmp_path):
+    path = tmp_path / "universe.json"
+    write_universe(path, make_universe())
+    return path
+
+
+@pytest.fixture
+def store(universe_file):
+    store = UniverseStore(str(universe_file))
+    yield store
+    store.close()
+
+
+class TestUniverseStoreExport:
+    """Export stays byte-identical to the legacy json.dump output"""
+
+    def test_round_trip_is_byte_identical(self, store, universe_file):
+        original = universe_file.read_text(encoding="utf-8")
+        store.refresh()
+
+        assert store.dumps() == original
+        assert store.export(force=True).read_text(encoding="utf-8") == original
+
+    @pytest.mark.skipif(not REPO_UNIVERSE.exists(), reason="no universe.json in data directory")
+    def test_round_trip_of_real_universe(self, tmp_path):
+        path = tmp_path / "universe.json"
+        path.write_bytes(REPO_UNIVERSE.read_bytes())
+        store = UniverseStore(str(path))
+        try:
+            store.refresh()
+            assert store.dumps() == REPO_UNIVERSE.read_text(encoding="utf-8")
+        finally:
+            store.close()
+
+    def test_export_matches_legacy_dump_after_edit(self, store, universe_file):
+        with store.edit() as universe_data:
+            universe_data["all_stocks"]["AAPL"]["quantity"] = 12
+            universe_data["screens"]["quality"]["stocks"][1]["eur_price"] = 120.0
+            universe_data["account_total_value"] = {"value": 10000, "currency": "EUR"}
+
+        store.export()
+
+        assert universe_file.read_text(encoding="utf-8") == legacy_dump(universe_data)
+
+
+class TestUniverseStoreUpdates:
+    """Incremental writes"""
+
+    def test_save_only_rewrites_changed_stocks(self, store):
+        universe_data = store.load()
+        assert isinstance(universe_data["all_stocks"]["AAPL"], TrackedStock)
+
+        universe_data["all_stocks"]["AAPL"]["quantity"] = 5
+        universe_data["metadata"]["total_stocks"] = 3
+
+        assert store.save(universe_data) == 1
+        assert store.save(universe_data) == 0
+        assert store.get_section("metadata")["total_stocks"] == 3
+
+    def test_added_and_removed_stocks_are_persisted(self, store, universe_file):
+        with store.edit() as universe_data:
+            universe_data["screens"]["quality"]["stocks"].pop(0)
+            universe_data["all_stocks"]["MSFT"] = {"ticker": "MSFT", "price": 400.0}
+
+        store.export()
+        on_disk = json.loads(universe_file.read_text(encoding="utf-8"))
+
+        assert [s["ticker"] for s in on_disk["screens"]["quality"]["stocks"]] == ["SAP"]
+        assert list(on_disk["all_stocks"]) == ["AAPL", "SAP", "MSFT"]
+
+    def test_update_stock_fields_touches_every_instance(self, store, universe_file):
+        updated = store.update_stock_fields({"SAP": {"eur_exchange_rate": 1.0}})
+        store.export()
+        on_disk = json.loads(universe_file.read_text(encoding="utf-8"))
+
+        assert updated == 2
+        assert on_disk["screens"]["quality"]["stocks"][1]["eur_exchange_rate"] == 1.0
+        assert on_disk["all_stocks"]["SAP"]["eur_exchange_rate"] == 1.0
+        assert "eur_exchange_rate" not in on_disk["all_stocks"]["AAPL"]
+
+    def test_update_stock_fields_in_one_container(self, store, universe_file):
+        store.update_stock_fields({"SAP": {"quantity": 5, "name": REMOVE_FIELD}}, container=screen_container("quality"))
+        store.export()
+        on_disk = json.loads(universe_file.read_text(encoding="utf-8"))
+
+        assert on_disk["screens"]["quality"]["stocks"][1] == {
+            "ticker": "SAP", "price": 120.0, "currency": "EUR", "quantity": 5
+        }
+        assert on_disk["all_stocks"]["SAP"] == make_universe()["all_stocks"]["SAP"]
+        assert store.update_stock_fields({"SAP": {"quantity": 5}}, container=screen_container("quality")) == 0
+        assert store.update_stock_fields({"SAP": {"quantity": 5}}, container=ALL_STOCKS_CONTAINER) == 1
+
+    def test_export_rejoins_only_changed_containers(self, store, universe_file):
+        store.update_stock_fields({"AAPL": {"quantity": 1}})
+        store.export()
+        cached = dict(store._fragments)
+
+        store.update_stock_fields({"AAPL": {"quantity": 2}}, container=ALL_STOCKS_CONTAINER)
+        assert set(store._fragments) == set(cached) - {ALL_STOCKS_CONTAINER}
+        store.export()
+
+        expected = make_universe()
+        expected["screens"]["quality"]["stocks"][0]["quantity"] = 1
+        expected["all_stocks"]["AAPL"]["quantity"] = 2
+        assert universe_file.read_text(encoding="utf-8") == legacy_dump(expected)
+
+    def test_writes_from_another_store_drop_cached_fragments(self, store, universe_file):
+        store.refresh()
+        store.dumps()
+        other = UniverseStore(str(universe_file))
+        other.update_stock_fields({"AAPL": {"quantity": 3}}, container=ALL_STOCKS_CONTAINER)
+        other.close()
+
+        assert json.loads(store.dumps())["all_stocks"]["AAPL"]["quantity"] == 3
+
+    def test_set_section_appends_new_keys(self, store, universe_file):
+        store.set_section("account_total_value", {"value": 5000, "currency": "EUR"})
+        store.export()
+
+        assert list(json.loads(universe_file.read_text(encoding="utf-8")))[-1] == "account_total_value"
+
+    def test_export_skipped_when_nothing_changed(self, store, universe_file):
+        store.refresh()
+        before = universe_file.stat().st_mtime_ns
+
+        store.export()
+
+        assert universe_file.stat().st_mtime_ns == before
+
+
+class TestUniverseStoreSync:
+    """Legacy writers that still rewrite universe.json directly"""
+
+    def test_external_rewrite_is_reimported(self, store, universe_file):
+        assert store.get_section("metadata")["total_stocks"] == 2
+
+        universe_data = make_universe()
+        universe_data["metadata"]["total_stocks"] = 99
+        write_universe(universe_file, universe_data)
+        os.utime(universe_file, ns=(0, 1))
+
+        assert store.refresh() is True
+        assert store.get_section("metadata")["total_stocks"] == 99
+
+    def test_external_rewrite_over_unexported_writes_raises(self, store, universe_file):
+        store.update_stock_fields({"AAPL": {"price": 200.0}})
+
+        universe_data = make_universe()
+        universe_data["metadata"]["total_stocks"] = 99
+        write_universe(universe_file, universe_data)
+        os.utime(universe_file, ns=(0, 1))
+
+        with pytest.raises(UniverseConflictError):
+            store.refresh()
+        with pytest.raises(UniverseConflictError):
+            store.save(store.load())
+
+        store.import_file(force=True)
+        assert store.get_section("metadata")["total_stocks"] == 99
+
+    def test_save_picks_up_external_rewrite(self, store, universe_file):
+        universe_data = store.load()
+
+        external = make_universe()
+        external["metadata"]["total_stocks"] = 99
+        write_universe(universe_file, external)
+        os.utime(universe_file, ns=(0, 1))
+
+        universe_data["all_stocks"]["AAPL"]["price"] = 200.0
+        store.save(universe_data)
+        store.export()
+
+        saved = json.loads(universe_file.read_text(encoding="utf-8"))
+        assert saved["all_stocks"]["AAPL"]["price"] == 200.0
+
+    def test_missing_file_raises(self, tmp_path):
+        store = UniverseStore(str(tmp_path / "missing.json"))
+
+        with pytest.raises(FileNotFoundError):
+            store.load()
@@ -0,0 +1,99 @@
+"""
+Benchmark for the IBKR search cache (data/ibkr_cache.db access patterns)
+
+Compares the previous access pattern - a fresh sqlite3 connection and
+transaction per stock - with the shared-connection bulk methods
+get_cached_results() / store_results_bulk().
+
+Usage:
+    python benchmark_ibkr_cache.py            # 1k and 10k stocks
+    python benchmark_ibkr_cache.py 500 5000   # custom sizes
+"""
+
+import json
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from app.services.database_service import IBKRDatabaseService
+
+
+def make_rows(count):
+    return [{
+        'isin': f"US{i:010d}",
+        'ticker': f"T{i}",
+        'name': f"Stock {i}",
+        'currency': "USD",
+        'found': True,
+        'ibkr_details': {'found': True, 'symbol': f"T{i}", 'contract_id': i + 1, 'search_method': 'isin'}
+    } for i in range(count)]
+
+
+def legacy_store(db_path, rows):
+    """One connection and one commit per stock"""
+    for row in rows:
+        details = row['ibkr_details']
+        with sqlite3.connect(db_path) as conn:
+            conn.execute("""
+                INSERT OR REPLACE INTO ibkr_search_cache
+                (isin, ticker, name, currency, found, ibkr_symbol, ibkr_contract_id,
+                 search_method, search_date, raw_ibkr_details)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, (row['isin'], row['ticker'], row['name'], row['currency'], row['found'],
+                  details['symbol'], details['contract_id'], details['search_method'],
+                  datetime.now().isoformat(), json.dumps(details)))
+            conn.commit()
+
+
+def legacy_lookup(db_path, keys):
+    """One connection and one query per stock"""
+    cutoff = (datetime.now() - timedelta(days=365)).isoformat()
+    hits = 0
+    for isin, ticker in keys:
+        with sqlite3.connect(db_path) as conn:
+            row = conn.execute("""
+                SELECT * FROM ibkr_search_cache
+                WHERE isin = ? AND ticker = ? AND search_date > ?
+                ORDER BY search_date DESC
+                LIMIT 1
+            """, (isin, ticker, cutoff)).fetchone()
+            hits += row is not None
+    return hits
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def run(count, workdir):
+    rows = make_rows(count)
+    keys = [(r['isin'], r['ticker']) for r in rows]
+
+    legacy_path = workdir / f"legacy_{count}.db"
+    IBKRDatabaseService(str(legacy_path)).close()  # schema only
+    _, legacy_store_time = timed(legacy_store, legacy_path, rows)
+    legacy_hits, legacy_lookup_time = timed(legacy_lookup, legacy_path, keys)
+
+    service = IBKRDatabaseService(str(workdir / f"bulk_{count}.db"))
+    _, bulk_store_time = timed(service.store_results_bulk, rows)
+    entries, bulk_lookup_time = timed(service.get_cached_results, keys)
+    service.close()
+
+    assert legacy_hits == len(entries) == count
+
+    print(f"{count:>7} stocks | store: {legacy_store_time:8.3f}s -> {bulk_store_time:7.3f}s "
+          f"({legacy_store_time / bulk_store_time:6.1f}x) | lookup: {legacy_lookup_time:8.3f}s -> "
+          f"{bulk_lookup_time:7.3f}s ({legacy_lookup_time / bulk_lookup_time:6.1f}x)")
+
+
+if __name__ == "__main__":
+    sizes = [int(arg) for arg in sys.argv[1:]] or [1000, 10000]
+    print("IBKR cache benchmark: per-stock connections (before) -> shared connection + bulk (after)")
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in sizes:
+            run(size, Path(tmp))
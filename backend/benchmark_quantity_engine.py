@@ -0,0 +1,79 @@
+"""
+Benchmark for step 7 quantity calculation
+
+Compares the per-dict QuantityService.calculate_stock_fields loop with the
+vectorised QuantityEngine on synthetic universes, and checks both produce
+identical stocks.
+
+Usage:
+    python benchmark_quantity_engine.py                 # 1k, 10k and 100k stocks
+    python benchmark_quantity_engine.py 5000 50000      # custom sizes
+"""
+
+import contextlib
+import copy
+import io
+import json
+import random
+import sys
+import time
+
+from app.services.implementations.quantity_service import QuantityService
+from app.services.quantity_engine import QuantityEngine
+
+ACCOUNT_VALUE = 250000.0
+SCREEN_ALLOCATION = 0.35
+
+
+def make_stocks(count, seed=42):
+    rng = random.Random(seed)
+    currencies = [("USD", 1.08), ("EUR", 1.0), ("JPY", 162.4), ("GBP", 0.85), ("HKD", 8.45)]
+    stocks = []
+    for i in range(count):
+        currency, rate = rng.choice(currencies)
+        stocks.append({
+            'ticker': f"T{i}",
+            'currency': currency,
+            'price': round(rng.uniform(1, 3000), 2),
+            'eur_exchange_rate': rate,
+            'allocation_target': rng.choice([0.0, rng.random() * 0.1]),
+            'final_target': rng.random() * 0.05,
+        })
+    return stocks
+
+
+def timed(fn):
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        fn()
+    return time.perf_counter() - start
+
+
+def run(size):
+    service = QuantityService()
+    engine = QuantityEngine()
+    stocks = make_stocks(size)
+    scalar_stocks = copy.deepcopy(stocks)
+    engine_stocks = copy.deepcopy(stocks)
+
+    def scalar():
+        for stock in scalar_stocks:
+            service.calculate_stock_fields(stock, ACCOUNT_VALUE, SCREEN_ALLOCATION)
+
+    def vectorised():
+        engine.apply(engine_stocks, ACCOUNT_VALUE, SCREEN_ALLOCATION, fallback=service.calculate_stock_fields)
+
+    scalar_time = timed(scalar)
+    engine_time = timed(vectorised)
+    identical = json.dumps(scalar_stocks) == json.dumps(engine_stocks)
+
+    print(f"{size:>7} stocks: per-dict {scalar_time * 1000:8.1f} ms | "
+          f"vectorised {engine_time * 1000:8.1f} ms | "
+          f"{scalar_time / engine_time:5.1f}x | identical={identical}")
+
+
+if __name__ == "__main__":
+    sizes = [int(arg) for arg in sys.argv[1:]] or [1000, 10000, 100000]
+    print("Step 7 quantity benchmark: calculate_stock_fields loop (before) -> QuantityEngine (after)")
+    for size in sizes:
+        run(size)
@@ -6,6 +6,7 @@ Production-ready scheduler for automated daily and monthly pipeline execution
 
 import os
 import sys
+import json
 import asyncio
 import requests
 import time
@@ -31,6 +32,9 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Execution statuses after which nothing changes
+FINISHED_STATUSES = ("completed", "failed", "cancelled")
+
 
 class PipelineScheduler:
     """
@@ -48,6 +52,7 @@ class PipelineScheduler:
         """Initialize scheduler with API configuration"""
         self.api_base = f"{api_base_url}/api/v1"
         self.timeout = 30  # API request timeout in seconds
+        self.event_timeout = 60  # Longest silence on the event stream (the API sends heartbeats)
         self.max_retries = 3
 
         # Validate environment
@@ -261,11 +266,86 @@ class PipelineScheduler:
             }
 
     async def _monitor_execution(self, execution_id: str, execution_type: str, max_wait: int = 1800) -> None:
-        """Monitor background execution until completion"""
-        start_time = time.time()
+        """Follow background execution through its event stream until completion"""
+        deadline = time.time() + max_wait
+        offset = 0
+        last_status = None
+        failures = 0
+
+        while failures < self.max_retries:
+            try:
+                with requests.get(
+                    f"{self.api_base}/pipeline/runs/{execution_id}/events",
+                    params={"offset": offset},
+                    stream=True,
+                    timeout=(self.timeout, self.event_timeout)
+                ) as response:
+                    if response.status_code != 200:
+                        logger.warning(f"Event stream unavailable: {response.status_code} - {response.text}")
+                        break
+
+                    for event, event_id, data in self._read_events(response):
+                        failures = 0
+                        if event_id is not None:
+                            offset = int(event_id)
+
+                        if event == "status":
+                            current_status = data.get("status")
+                            if current_status != last_status:
+                                logger.info(f"Execution {execution_id} status: {current_status}")
+                                last_status = current_status
+                            if current_status in FINISHED_STATUSES:
+                                logger.info(f"Execution {execution_id} finished with status: {current_status}")
+                                return
+                        elif event == "step_complete":
+                            logger.info(
+                                f"Execution {execution_id} step {data.get('step_number')} "
+                                f"finished: {data.get('status')}"
+                            )
+
+                        if time.time() > deadline:
+                            logger.warning(f"Execution {execution_id} monitoring timed out after {max_wait}s")
+                            return
+
+            except (requests.exceptions.RequestException, ValueError) as e:
+                logger.error(f"Event stream error for execution {execution_id}: {e}")
+
+            # The stream ended before the execution finished - reconnect from the last log offset
+            failures += 1
+            if failures < self.max_retries:
+                await asyncio.sleep(2 ** failures)
+
+        logger.warning(f"Falling back to polling the status of execution {execution_id}")
+        await self._poll_execution(execution_id, deadline, max_wait)
+
+    @staticmethod
+    def _read_events(response):
+        """Parse a server-sent event stream into (event, id, data) tuples; comments yield heartbeats"""
+        event, event_id, data = "message", None, []
+        for line in response.iter_lines(decode_unicode=True):
+            if line is None:
+                continue
+            if not line:
+                if data:
+                    yield event, event_id, json.loads("\n".join(data))
+                event, event_id, data = "message", None, []
+            elif line.startswith(":"):
+                yield "heartbeat", None, {}
+            else:
+                field, _, value = line.partition(":")
+                value = value[1:] if value.startswith(" ") else value
+                if field == "event":
+                    event = value
+                elif field == "id":
+                    event_id = value
+                elif field == "data":
+                    data.append(value)
+
+    async def _poll_execution(self, execution_id: str, deadline: float, max_wait: int) -> None:
+        """Poll execution status until completion, for APIs without the event stream"""
         last_status = None
 
-        while time.time() - start_time < max_wait:
+        while time.time() < deadline:
             try:
                 status_data = await self._make_api_request("GET", f"/pipeline/runs/{execution_id}/status")
                 current_status = status_data.get("status")
@@ -274,7 +354,7 @@ class PipelineScheduler:
                     logger.info(f"Execution {execution_id} status: {current_status}")
                     last_status = current_status
 
-                if current_status in ["completed", "failed"]:
+                if current_status in FINISHED_STATUSES:
                     logger.info(f"Execution {execution_id} finished with status: {current_status}")
                     break
 